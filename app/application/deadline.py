@@ -0,0 +1,54 @@
+"""Per-request latency budget (deadline) carried through the search pipeline."""
+import contextvars
+import time
+from typing import Callable, Optional
+
+_active: contextvars.ContextVar = contextvars.ContextVar("deadline", default=None)
+
+
+def remaining_budget() -> Optional[float]:
+    """현재 실행 중인 작업의 남은 예산(초) - Deadline.bind로 감싼 작업 밖이면 None."""
+    deadline = _active.get()
+    return deadline.remaining() if deadline is not None else None
+
+
+class Deadline:
+    """요청 단위 지연 예산. 각 단계는 remaining()으로 남은 시간을 확인하고 단계적으로 품질을 낮춘다."""
+
+    def __init__(self, budget_seconds: float):
+        self.budget = budget_seconds
+        self.started_at = time.monotonic()
+        self.expires_at = self.started_at + budget_seconds
+
+    @classmethod
+    def from_ms(cls, budget_ms: float) -> Optional["Deadline"]:
+        """budget_ms <= 0 이면 예산 없음(None)."""
+        if budget_ms <= 0:
+            return None
+        return cls(budget_ms / 1000.0)
+
+    def remaining(self) -> float:
+        """남은 시간(초), 0 미만이면 0."""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0.0
+
+    def elapsed_ms(self) -> float:
+        return (time.monotonic() - self.started_at) * 1000
+
+    def bind(self, fn: Callable) -> Callable:
+        """
+        fn 실행 동안 이 deadline을 현재 예산으로 지정 (스레드 풀 작업에 예산 전달).
+        하위 계층(예: Qdrant 재시도, Gemini 스케줄러 대기)은 remaining_budget()으로 남은 시간을 확인한다.
+        호출한 쪽의 contextvars(예: rewrite_priority lane)도 함께 전달.
+        """
+        context = contextvars.copy_context()
+
+        def call(*args, **kwargs):
+            _active.set(self)
+            return fn(*args, **kwargs)
+
+        def run(*args, **kwargs):
+            return context.copy().run(call, *args, **kwargs)
+        return run
@@ -0,0 +1,182 @@
+"""N-way query fusion - query variants, rule-based weights and vectorized score aggregation by point id."""
+import re
+from dataclasses import dataclass, field, replace
+from typing import Dict, Hashable, List, Optional, Sequence
+import numpy as np
+from app.domain.entities import QAPair, QueryProfile
+from app.infrastructure.embedding_cache import normalize_text
+
+_BRAND_PATTERN = re.compile(r"(?<![A-Za-z])(?:perso\s*\.?\s*ai|perso)(?![A-Za-z])|퍼소", flags=re.IGNORECASE)
+
+
+@dataclass
+class QueryVariant:
+    """검색에 쓰이는 질의 변형 (name: 가중치 규칙의 키)."""
+    name: str
+    text: str
+    weight: float = 0.0
+
+
+@dataclass
+class WeightRule:
+    """QueryProfile 조건(when) → 변형별 가중치 (빈 조건 = 기본 규칙)."""
+    name: str
+    weights: Dict[str, float]
+    when: Dict[str, str] = field(default_factory=dict)
+
+    def matches(self, profile: QueryProfile) -> bool:
+        return profile.matches(self.when, "ensemble")
+
+
+# 기존 _get_ensemble_weights와 같은 판단 순서/가중치 (original 가중치를 original + brand로 나눔)
+# query_rules.json의 "weights"로 교체 가능
+DEFAULT_WEIGHT_RULES: List[WeightRule] = [
+    WeightRule(
+        name="formal",  # 정형 질문 (존댓말, 의문사) → 원본 신뢰
+        when={"type": "formal"},
+        weights={"original": 0.5, "brand": 0.45, "rewritten": 0.05},
+    ),
+    WeightRule(
+        name="short",  # 매우 짧은 질문 (< 5자) → Gemini 약간 신뢰
+        when={"length": "short"},
+        weights={"original": 0.2, "brand": 0.2, "rewritten": 0.6},
+    ),
+    WeightRule(
+        name="informal",  # 구어체/반말 → Gemini 강력 신뢰 (비정형 → 정형화 필수)
+        when={"marker": "informal"},
+        weights={"original": 0.05, "brand": 0.05, "rewritten": 0.9},
+    ),
+    WeightRule(name="default", weights={"original": 0.25, "brand": 0.25, "rewritten": 0.5}),
+]
+
+
+def weight_rules_from_config(rows: Optional[Sequence[dict]]) -> List[WeightRule]:
+    """
+    설정의 "weights" 목록 → WeightRule (없으면 기본 규칙, 위에서부터 처음 맞는 규칙 적용).
+
+    형식: [{"name": "...", "when": {"type": "formal"}, "weights": {"original": 0.5, ...}}, ...]
+    """
+    if not rows:
+        return list(DEFAULT_WEIGHT_RULES)
+    return [WeightRule(name=r["name"], weights=r["weights"], when=r.get("when", {})) for r in rows]
+
+
+def normalize_brand(query: str) -> str:
+    """브랜드 표기 정규화 (persoai / perso ai / 퍼소 → Perso.ai)."""
+    return _BRAND_PATTERN.sub("Perso.ai", query)
+
+
+def candidate_key(pair: QAPair) -> Hashable:
+    """병합 키: 포인트(QA) id, 없으면 질문 문자열."""
+    return pair.id if pair.id is not None else pair.question
+
+
+class FusionEngine:
+    """
+    여러 질의 변형의 검색 결과를 QA id 기준으로 병합.
+
+    - 변형별 가중치는 규칙 테이블(weight_rules)에서 QueryProfile로 결정
+    - 같은 텍스트의 변형은 하나로 합치고 가중치를 더함 (중복 검색 없음)
+    - 빠진 변형(예: rewrite 실패)의 가중치는 남은 변형에 비례 재분배
+    - 점수 집계: (후보 × 변형) 점수 행렬 @ 가중치 벡터
+    - 어휘 결과는 가중합 결과와 Reciprocal Rank Fusion으로 결합
+    """
+
+    def __init__(self, weight_rules: Optional[Sequence[WeightRule]] = None, rrf_k: int = 60):
+        self.weight_rules = list(weight_rules or DEFAULT_WEIGHT_RULES)
+        self.rrf_k = rrf_k
+
+    def select_rule(self, profile: QueryProfile) -> WeightRule:
+        for rule in self.weight_rules:
+            if rule.matches(profile):
+                return rule
+        return self.weight_rules[-1]
+
+    def variants(
+        self, profile: QueryProfile, rewritten: Optional[str] = None, include_rewritten: bool = True
+    ) -> List[QueryVariant]:
+        """
+        질의 변형 목록 (original, brand, rewritten 순) + 가중치.
+
+        Args:
+            include_rewritten: False면 rewrite 이전 단계 변형만 (가중치 정규화 없이 반환)
+        """
+        weights = self.select_rule(profile).weights
+        query = profile.text
+        candidates = [("original", query), ("brand", normalize_brand(query))]
+        if include_rewritten and rewritten:
+            candidates.append(("rewritten", rewritten))
+
+        merged: List[QueryVariant] = []
+        by_text: Dict[str, QueryVariant] = {}
+        for name, text in candidates:
+            key = profile.normalized if name == "original" else normalize_text(text)
+            weight = weights.get(name, 0.0)
+            if key in by_text:
+                by_text[key].weight += weight
+                continue
+            variant = QueryVariant(name=name, text=text, weight=weight)
+            by_text[key] = variant
+            merged.append(variant)
+
+        if include_rewritten:
+            total = sum(v.weight for v in merged)
+            if total > 0:
+                for v in merged:
+                    v.weight /= total
+        return merged
+
+    def fuse(self, variants: Sequence[QueryVariant], results: Sequence[List[QAPair]], top_k: int) -> List[QAPair]:
+        """변형별 결과를 id 기준 가중합 (점수 행렬 × 가중치 벡터) → 상위 top_k."""
+        index: Dict[Hashable, int] = {}
+        representative: List[QAPair] = []
+        for pairs in results:
+            for pair in pairs:
+                key = candidate_key(pair)
+                if key not in index:
+                    index[key] = len(representative)
+                    representative.append(pair)
+        if not representative:
+            return []
+
+        scores = np.zeros((len(representative), len(variants)), dtype=np.float64)
+        for col, pairs in enumerate(results):
+            for pair in pairs:
+                row = index[candidate_key(pair)]
+                scores[row, col] = max(scores[row, col], pair.score or 0.0)
+        combined = scores @ np.asarray([v.weight for v in variants], dtype=np.float64)
+
+        order = np.argsort(-combined, kind="stable")[:top_k]
+        return [
+            QAPair(
+                question=representative[i].question,
+                answer=representative[i].answer,
+                score=float(combined[i]),
+                id=representative[i].id,
+            )
+            for i in order
+        ]
+
+    def fuse_lexical(self, vector_candidates: List[QAPair], lexical_candidates: List[QAPair], top_k: int) -> List[QAPair]:
+        """
+        벡터(가중합) 결과와 어휘 결과를 Reciprocal Rank Fusion으로 결합.
+
+        순서는 RRF 점수로 정하고, 가드에 쓰는 score는 벡터(가중 코사인) 점수만 사용.
+        키워드 커버리지는 단일 키워드("요금")만으로도 1.0이 되는 다른 척도라 가드 점수에 섞지 않으며,
+        어휘 결과에만 있는 후보는 score=0.0 (순위에는 기여하지만 가드를 통과하지 못함).
+        """
+        rrf: Dict[Hashable, float] = {}
+        best: Dict[Hashable, QAPair] = {}
+        for ranked in (vector_candidates, lexical_candidates):
+            for rank, candidate in enumerate(ranked):
+                key = candidate_key(candidate)
+                rrf[key] = rrf.get(key, 0.0) + 1.0 / (self.rrf_k + rank + 1)
+        for candidate in lexical_candidates:
+            best.setdefault(candidate_key(candidate), replace(candidate, score=0.0))
+        for candidate in vector_candidates:
+            key = candidate_key(candidate)
+            if key not in best or (best[key].score or 0.0) < (candidate.score or 0.0):
+                best[key] = candidate
+        # 동점(각 목록 같은 순위)이면 벡터 점수가 높은 후보 우선
+        order = sorted(rrf, key=lambda k: (rrf[k], best[k].score or 0.0), reverse=True)[:top_k]
+        return [best[k] for k in order]
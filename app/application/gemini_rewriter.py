@@ -1,7 +1,10 @@
 """Gemini API 기반 Query Rewriting (구어체 → 정식 질문 변환)"""
 import os
-from typing import Optional
+import re
+from typing import List, Optional, Tuple
 import google.generativeai as genai
+from app.infrastructure.embedding_cache import normalize_text
+from app.infrastructure.memory_cache import TTLCache
 
 
 class GeminiQueryRewriter:
@@ -24,11 +27,21 @@ class GeminiQueryRewriter:
         "Perso.ai 고객센터는 어떻게 문의하나요?",
     ]
     
-    def __init__(self, api_key: Optional[str] = None, model_name: str = "gemini-2.0-flash"):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model_name: str = "gemini-2.0-flash",
+        standard_questions: Optional[List[str]] = None,
+        system_prompt: Optional[str] = None,
+        service_name: str = "",
+    ):
         """
         Args:
             api_key: Gemini API 키 (없으면 환경변수에서 로드)
             model_name: Gemini 모델명 (기본: gemini-1.5-flash)
+            standard_questions: KB별 표준 질문 (없으면 Perso.ai 13개)
+            system_prompt: KB별 시스템 프롬프트 (없으면 standard_questions로 범용 프롬프트 생성)
+            service_name: 범용 프롬프트에 들어갈 서비스명
         """
         self.api_key = api_key or os.getenv("GEMINI_API_KEY")
         if not self.api_key:
@@ -36,11 +49,35 @@ class GeminiQueryRewriter:
         
         genai.configure(api_key=self.api_key)
         self.model = genai.GenerativeModel(model_name)
-        self.system_prompt = self._build_system_prompt()
+        self.standard_questions = list(standard_questions or self.STANDARD_QUESTIONS)
+        if system_prompt:
+            self.system_prompt = system_prompt
+        elif standard_questions:
+            self.system_prompt = self.build_generic_prompt(service_name or "서비스", self.standard_questions)
+        else:
+            self.system_prompt = self._build_system_prompt()
     
-    def _build_system_prompt(self) -> str:
+    @staticmethod
+    def build_generic_prompt(service_name: str, questions: List[str]) -> str:
+        """표준 질문 목록만으로 만드는 범용 프롬프트 (Perso.ai 이외 KB용, Few-shot 없음)."""
+        questions_list = "\n".join([f"{i+1}. {q}" for i, q in enumerate(questions)])
+        
+        return f"""당신은 {service_name} 챗봇의 질문 변환 전문가입니다.
+사용자의 구어체/반말 질문을 아래 {len(questions)}개 표준 질문 중 **의미적으로 관련된** 형태로 변환하세요.
+
+[표준 질문 목록] ({service_name} 관련 질문만 해당)
+{questions_list}
+
+[변환 규칙]
+1. 질문이 {service_name}와 관련이 없으면(날씨, 일반 지식, 다른 주제 등) "[NO_MATCH]"만 출력하세요.
+2. 관련 질문이면 핵심 키워드로 의도를 파악해 가장 가까운 표준 질문 하나를 그대로 출력하세요.
+3. 추가 설명이나 서술형은 제외하고 질문 형태로만 출력하세요.
+"""
+    
+    @classmethod
+    def _build_system_prompt(cls) -> str:
         """Few-shot 프롬프트 생성 (의도 분류 기반)"""
-        questions_list = "\n".join([f"{i+1}. {q}" for i, q in enumerate(self.STANDARD_QUESTIONS)])
+        questions_list = "\n".join([f"{i+1}. {q}" for i, q in enumerate(cls.STANDARD_QUESTIONS)])
         
         return f"""당신은 Perso.ai 챗봇의 질문 변환 전문가입니다.
 사용자의 구어체/반말 질문을 아래 13개 표준 질문 중 **의미적으로 관련된** 형태로 변환하세요.
@@ -206,6 +243,15 @@ class GeminiQueryRewriter:
 - 추가 설명이나 서술형은 제외하고 질문 형태로만 출력하세요.
 """
     
+    @classmethod
+    def few_shot_examples(cls) -> List[Tuple[str, str]]:
+        """
+        프롬프트의 Few-shot (입력, 출력) 쌍 ([NO_MATCH] 예시 제외).
+        인제스트 시 표준 질문의 paraphrase 벡터로 재사용 (API 키 불필요).
+        """
+        pairs = re.findall(r'입력: "(.+?)"\n출력: (.+)', cls._build_system_prompt())
+        return [(src, dst.strip()) for src, dst in pairs if "NO_MATCH" not in dst]
+    
     def rewrite(self, query: str) -> str:
         """
         구어체 질문을 정식 질문으로 변환.
@@ -265,3 +311,34 @@ class GeminiQueryRewriter:
         """
         return [self.rewrite(q) for q in queries]
 
+
+
+class CachedRewriter:
+    """
+    rewrite 결과 메모리 캐시 (정규화 질의 키).
+
+    - 같은 질의의 반복 Gemini 호출 제거 (프리워밍으로 자주 묻는 질의를 미리 채움)
+    - API 오류 시 원본이 그대로 반환되므로, 입력과 같은 결과는 캐시하지 않음
+    - 예산 초과로 호출자가 기다리지 않아도 호출이 끝나면 캐시에 남아 다음 요청이 사용
+    """
+    
+    def __init__(self, rewriter, cache: TTLCache):
+        self.rewriter = rewriter
+        self.cache = cache
+        self.calls = 0  # 실제 Gemini 호출 수 (프리워밍 quota 계산용)
+    
+    def lookup(self, query: str) -> Optional[str]:
+        """캐시된 rewrite (없으면 None) - Gemini를 호출하지 않음."""
+        return self.cache.get(normalize_text(query))
+    
+    def fetch(self, query: str) -> str:
+        """Gemini 호출 후 캐시 저장 (lookup miss 이후 경로)."""
+        self.calls += 1
+        rewritten = self.rewriter.rewrite(query)
+        if rewritten and normalize_text(rewritten) != normalize_text(query):
+            self.cache.put(normalize_text(query), rewritten)
+        return rewritten
+    
+    def rewrite(self, query: str) -> str:
+        cached = self.lookup(query)
+        return cached if cached is not None else self.fetch(query)
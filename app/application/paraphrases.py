@@ -0,0 +1,100 @@
+"""Paraphrase sources for multi-vector indexing (few-shot examples, curated file, query logs)."""
+import json
+import os
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional
+from app.application.gemini_rewriter import GeminiQueryRewriter
+from app.infrastructure.embedding_cache import normalize_text
+from app.infrastructure.query_log import iter_query_log
+
+
+def fewshot_paraphrases() -> Dict[str, List[str]]:
+    """Gemini 프롬프트의 Few-shot 입력 → 표준 질문."""
+    result: Dict[str, List[str]] = defaultdict(list)
+    for src, dst in GeminiQueryRewriter.few_shot_examples():
+        result[dst].append(src)
+    return dict(result)
+
+
+def load_curated(path: str) -> Dict[str, List[str]]:
+    """
+    큐레이션 paraphrase 파일 (JSON).
+
+    형식: {"표준 질문": ["paraphrase 1", "paraphrase 2", ...], ...}
+    """
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    return {q: list(ps) for q, ps in data.items()}
+
+
+def paraphrases_from_logs(
+    path: str,
+    min_score: float = 0.85,
+    min_count: int = 1,
+    max_per_question: int = 20,
+) -> Dict[str, List[str]]:
+    """
+    질의 로그(컬럼형 저장소 디렉터리 또는 jsonl)에서 높은 점수로 매칭된 실제 사용자 질의 추출.
+
+    Args:
+        min_score: 이 점수 이상으로 정상 응답(verdict=ok)된 질의만 사용
+        min_count: 최소 등장 횟수 (일회성 질의 제외)
+        max_per_question: 표준 질문당 최대 개수 (빈도순)
+    """
+    counts: Dict[str, Counter] = defaultdict(Counter)
+    for record in iter_query_log(path):
+        matched = record.get("matched_question")
+        if record.get("verdict") != "ok" or not matched or (record.get("score") or 0.0) < min_score:
+            continue
+        counts[matched][normalize_text(record.get("query", ""))] += 1
+    return {
+        q: [text for text, n in c.most_common(max_per_question) if n >= min_count and text]
+        for q, c in counts.items()
+    }
+
+
+def merge_paraphrases(
+    questions: Optional[Iterable[str]],
+    *sources: Optional[Dict[str, List[str]]],
+    max_per_question: int = 32,
+) -> Dict[str, List[str]]:
+    """
+    여러 출처를 합쳐 표준 질문별 paraphrase 목록 생성.
+    표준 질문과 같은 문장, 중복(정규화 기준)은 제외하고,
+    questions가 주어지면 데이터셋에 없는 질문은 버리고 표기를 데이터셋 질문에 맞춘다.
+    """
+    wanted = {normalize_text(q): q for q in questions} if questions is not None else None
+    merged: Dict[str, List[str]] = {}
+    seen: Dict[str, set] = {}
+    for source in sources:
+        for question, paraphrases in (source or {}).items():
+            canonical = question if wanted is None else wanted.get(normalize_text(question))
+            if canonical is None:
+                continue
+            bucket = merged.setdefault(canonical, [])
+            keys = seen.setdefault(canonical, {normalize_text(canonical)})
+            for text in paraphrases:
+                key = normalize_text(text)
+                if not key or key in keys or len(bucket) >= max_per_question:
+                    continue
+                keys.add(key)
+                bucket.append(text.strip())
+    return merged
+
+
+def collect_paraphrases(
+    questions: Optional[Iterable[str]] = None,
+    curated_path: Optional[str] = None,
+    log_path: Optional[str] = None,
+    log_min_score: float = 0.85,
+    use_fewshot: bool = True,
+) -> Dict[str, List[str]]:
+    """Few-shot + 큐레이션 파일 + (선택) 질의 로그를 합친 paraphrase 목록."""
+    sources = []
+    if use_fewshot:
+        sources.append(fewshot_paraphrases())
+    if curated_path and os.path.exists(curated_path):
+        sources.append(load_curated(curated_path))
+    if log_path and os.path.exists(log_path):
+        sources.append(paraphrases_from_logs(log_path, min_score=log_min_score))
+    return merge_paraphrases(questions, *sources)
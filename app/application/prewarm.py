@@ -0,0 +1,166 @@
+"""Startup prewarming - replay frequent/standard queries to fill caches before readiness."""
+import json
+import os
+import threading
+import time
+from collections import Counter
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+from app.application.deadline import Deadline
+from app.infrastructure.embedding_cache import normalize_text
+from app.infrastructure.query_log import iter_query_log, load_columns
+
+
+def top_logged_queries(path: str, top_n: int, kbs: Optional[Sequence[str]] = None) -> List[str]:
+    """
+    질의 로그에서 가장 자주 들어온 정규화 질의 top_n (컬럼형 저장소는 벡터 집계, jsonl은 순회).
+
+    kbs: 이 KB id들의 질의만 (""는 KB 구분 이전 기록, None이면 전체)
+    """
+    if not os.path.exists(path):
+        return []
+    if os.path.isdir(path):
+        return [q["query"] for q in load_columns(path, kbs=kbs).top_queries(top_n)]
+    counts: Counter = Counter()
+    for record in iter_query_log(path):
+        if not isinstance(record, dict) or (kbs is not None and (record.get("kb") or "") not in kbs):
+            continue
+        query = normalize_text(record.get("query", ""))
+        if query:
+            counts[query] += 1
+    return [q for q, _ in counts.most_common(top_n)]
+
+
+def save_dataset_questions(path: str, questions: Iterable[str], source: Optional[str] = None):
+    """인제스트한 QA 질문 목록을 JSON으로 저장 (서버는 pandas/openpyxl 없이 이 파일만 읽음)."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"source": source, "questions": list(questions)}, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def load_dataset_questions(path: str) -> List[str]:
+    """save_dataset_questions로 저장한 질문 목록 (파일이 없으면 빈 목록)."""
+    if not path or not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        return list(json.load(f).get("questions", []))
+
+
+def merge_queries(*sources: Iterable[str]) -> List[str]:
+    """출처 순서를 유지하며 정규화 기준 중복 제거."""
+    seen, merged = set(), []
+    for source in sources:
+        for query in source:
+            key = normalize_text(query)
+            if key and key not in seen:
+                seen.add(key)
+                merged.append(key)
+    return merged
+
+
+class Prewarmer:
+    """
+    백그라운드 프리워밍: 질의 목록을 파이프라인에 흘려 모델 로딩, 커넥션, 임베딩/rewrite/답변 캐시를 채운다.
+
+    - 시간 예산(time_budget), 질의 수(max_queries), Gemini 호출 수(max_rewrites) 중 하나라도 소진되면 중단
+    - 각 질의는 남은 시간 예산을 deadline으로 받음 (느린 Gemini/quota 대기 한 건이 예산을 넘기지 않음)
+    - 완료(또는 실패/중단) 후 ready=True → /readyz가 200으로 전환
+    - 개별 질의 실패는 건너뛰고 계속 진행 (프리워밍 실패로 서비스가 준비되지 않는 일은 없음)
+    """
+
+    def __init__(
+        self,
+        search: Callable[[str, Optional[Deadline]], object],
+        queries: Callable[[], Sequence[str]],
+        time_budget: float = 60.0,
+        max_queries: int = 100,
+        max_rewrites: Optional[int] = None,
+        rewrite_calls: Optional[Callable[[], int]] = None,
+        setup: Sequence[Callable[[], object]] = (),
+    ):
+        """
+        Args:
+            search: 질의 1건 실행 (예: lambda q, deadline: use_case.search(q, deadline=deadline))
+            queries: 프리워밍 질의 목록 생성 (백그라운드에서 호출 - 로그/엑셀 읽기 포함)
+            rewrite_calls: 누적 Gemini 호출 수 (max_rewrites 판단용)
+            setup: 질의 전에 실행할 준비 단계 (모델 로딩, 커넥션 수립 등)
+        """
+        self.search = search
+        self.queries = queries
+        self.time_budget = time_budget
+        self.max_queries = max_queries
+        self.max_rewrites = max_rewrites
+        self.rewrite_calls = rewrite_calls
+        self.setup = list(setup)
+        self.state = "pending"
+        self.warmed = 0
+        self.failed = 0
+        self.planned = 0
+        self.stop_reason: Optional[str] = None
+        self.elapsed = 0.0
+        self._thread: Optional[threading.Thread] = None
+        self._done = threading.Event()
+
+    @property
+    def ready(self) -> bool:
+        return self._done.is_set()
+
+    def start(self) -> "Prewarmer":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.run, name="prewarm", daemon=True)
+            self._thread.start()
+        return self
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._done.wait(timeout)
+
+    def run(self):
+        started = time.perf_counter()
+        self.state = "running"
+        try:
+            for step in self.setup:
+                step()
+            queries = list(self.queries())[: self.max_queries]
+            self.planned = len(queries)
+            rewrites_at_start = self.rewrite_calls() if self.rewrite_calls else 0
+
+            for query in queries:
+                remaining = self.time_budget - (time.perf_counter() - started)
+                if remaining <= 0:
+                    self.stop_reason = "time_budget"
+                    break
+                if (
+                    self.max_rewrites is not None
+                    and self.rewrite_calls is not None
+                    and self.rewrite_calls() - rewrites_at_start >= self.max_rewrites
+                ):
+                    self.stop_reason = "rewrite_quota"
+                    break
+                try:
+                    self.search(query, Deadline(remaining))
+                    self.warmed += 1
+                except Exception as e:
+                    self.failed += 1
+                    print(f"[Prewarm] 질의 실패 ({query}): {type(e).__name__}: {e}")
+            self.state = "done"
+        except Exception as e:
+            self.state = "failed"
+            print(f"[Prewarm] 프리워밍 실패: {type(e).__name__}: {e}")
+        finally:
+            self.elapsed = time.perf_counter() - started
+            self._done.set()
+            print(
+                f"[Prewarm] {self.state}: {self.warmed}/{self.planned}개 질의, "
+                f"{self.elapsed:.1f}s" + (f" (중단: {self.stop_reason})" if self.stop_reason else "")
+            )
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "state": self.state,
+            "planned": self.planned,
+            "warmed": self.warmed,
+            "failed": self.failed,
+            "stop_reason": self.stop_reason,
+            "elapsed_s": round(self.elapsed, 2),
+        }
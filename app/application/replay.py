@@ -0,0 +1,223 @@
+"""Offline replay/evaluation - labeled queries, recorded Gemini responses, accuracy + latency report."""
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence
+import numpy as np
+from app.application.deadline import Deadline
+from app.infrastructure.embedding_cache import normalize_text
+from app.infrastructure.query_log import iter_query_log
+
+STAGES = ("lexical", "rewrite", "search_original", "search_rewritten", "rerank", "total")
+
+
+@dataclass
+class LabeledQuery:
+    """평가 질의 (expected: 정답 표준 질문, None이면 거부되어야 하는 질의)."""
+    query: str
+    expected: Optional[str]
+
+
+def load_labeled_queries(path: str) -> List[LabeledQuery]:
+    """
+    라벨 질의셋 (JSONL).
+
+    형식: {"query": "요금 얼마야?", "expected": "Perso.ai의 요금제는 어떻게 구성되어 있나요?"}
+          expected가 null이면 fallback(거부)이 정답
+    """
+    items = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                row = json.loads(line)
+                items.append(LabeledQuery(query=row["query"], expected=row.get("expected")))
+    return items
+
+
+def load_log_queries(path: str, limit: Optional[int] = None) -> List[LabeledQuery]:
+    """
+    질의 로그(컬럼형 저장소 디렉터리 또는 jsonl)를 라벨셋으로 사용 (정규화 기준 중복 제거).
+
+    라벨은 기록 당시 응답(verdict=ok → matched_question, fallback → None)이므로,
+    정확도가 아니라 기존 동작 대비 변경(회귀) 비율로 해석해야 한다.
+    """
+    items: Dict[str, LabeledQuery] = {}
+    for record in iter_query_log(path):
+        key = normalize_text(record.get("query", ""))
+        if not key or key in items:
+            continue
+        expected = record.get("matched_question") if record.get("verdict") == "ok" else None
+        items[key] = LabeledQuery(query=record["query"], expected=expected or None)
+        if limit and len(items) >= limit:
+            break
+    return list(items.values())
+
+
+class RecordedRewriter:
+    """
+    기록된 Gemini 응답으로 rewrite (결정적, 오프라인).
+
+    - 기록 파일: {"질의": {"output": "표준 질문" | "[NO_MATCH]", "latency_ms": 420.0}, ...} (값이 문자열이어도 됨)
+    - 기록에 없는 질의: live rewriter가 있으면 호출 후 기록 (save()로 저장), 없으면 원본 질의 그대로 반환
+    - replay_latency=True면 기록된 지연만큼 대기 (Gemini 포함 end-to-end 지연 재현)
+    """
+
+    def __init__(self, path: Optional[str] = None, live=None, replay_latency: bool = False):
+        self.path = path
+        self.live = live
+        self.replay_latency = replay_latency
+        self.records: Dict[str, dict] = {}
+        self.misses = 0
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for query, value in json.load(f).items():
+                    record = value if isinstance(value, dict) else {"output": value}
+                    self.records[normalize_text(query)] = record
+
+    def rewrite(self, query: str) -> str:
+        key = normalize_text(query)
+        record = self.records.get(key)
+        if record is None:
+            if self.live is None:
+                self.misses += 1
+                return query
+            t0 = time.perf_counter()
+            output = self.live.rewrite(query)
+            record = {"output": output, "latency_ms": round((time.perf_counter() - t0) * 1000, 1)}
+            with self._lock:
+                self.records[key] = record
+        elif self.replay_latency and record.get("latency_ms"):
+            time.sleep(record["latency_ms"] / 1000.0)
+        return record["output"]
+
+    def save(self, path: Optional[str] = None):
+        path = path or self.path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.records, f, ensure_ascii=False, indent=2)
+
+
+class IdentityRewriter:
+    """Gemini 없이 원본 질의를 그대로 사용 (rewrite 생략 구성 비교용)."""
+
+    def rewrite(self, query: str) -> str:
+        return query
+
+
+@dataclass
+class EvalReport:
+    """
+    구성별 평가 결과.
+
+    - accuracy: 정답 표준 질문으로 응답 + 거부 대상 질의를 거부한 비율
+    - precision/recall: 가드 통과(응답)를 양성으로 본 가드 판정 품질
+      (TP: 올바른 답변, FP: 잘못된 답변 또는 거부 대상에 응답, FN: 답이 있는데 거부)
+    """
+    name: str
+    total: int = 0
+    correct: int = 0
+    tp: int = 0
+    fp: int = 0
+    fn: int = 0
+    errors: int = 0
+    timings: Dict[str, List[float]] = field(default_factory=dict)
+    strategies: Dict[str, int] = field(default_factory=dict)
+    failures: List[dict] = field(default_factory=list)
+
+    @property
+    def accuracy(self) -> float:
+        return self.correct / self.total if self.total else 0.0
+
+    @property
+    def precision(self) -> float:
+        return self.tp / (self.tp + self.fp) if self.tp + self.fp else 0.0
+
+    @property
+    def recall(self) -> float:
+        return self.tp / (self.tp + self.fn) if self.tp + self.fn else 0.0
+
+    @property
+    def f1(self) -> float:
+        p, r = self.precision, self.recall
+        return 2 * p * r / (p + r) if p + r else 0.0
+
+    def percentile(self, stage: str, q: float) -> Optional[float]:
+        values = self.timings.get(stage)
+        return float(np.percentile(values, q)) if values else None
+
+
+def evaluate(
+    name: str,
+    search: Callable,
+    queries: Sequence[LabeledQuery],
+    deadline_ms: float = 0.0,
+    warmup: int = 1,
+) -> EvalReport:
+    """
+    라벨 질의셋을 QASearchUseCase.search로 재생해 정확도/가드 판정/단계별 지연 집계.
+
+    Args:
+        search: use_case.search (query, deadline) → SearchResult
+        deadline_ms: 요청 지연 예산 (0 = 제한 없음)
+        warmup: 지연 집계에서 제외할 첫 요청 수 (모델/커넥션 초기화)
+    """
+    report = EvalReport(name=name)
+    for i, item in enumerate(queries):
+        try:
+            result = search(item.query, deadline=Deadline.from_ms(deadline_ms))
+        except Exception as e:
+            report.errors += 1
+            report.failures.append({"query": item.query, "expected": item.expected, "error": str(e)})
+            continue
+
+        report.total += 1
+        answered = result.is_valid
+        right = answered and item.expected is not None and result.matched_question == item.expected
+        if right or (not answered and item.expected is None):
+            report.correct += 1
+        else:
+            report.failures.append({
+                "query": item.query,
+                "expected": item.expected,
+                "got": result.matched_question if answered else None,
+                "score": round(result.score, 3),
+            })
+        if answered:
+            report.tp += right
+            report.fp += not right
+        elif item.expected is not None:
+            report.fn += 1
+
+        report.strategies[result.strategy] = report.strategies.get(result.strategy, 0) + 1
+        if i >= warmup:
+            for stage, ms in result.timings.items():
+                report.timings.setdefault(stage, []).append(ms)
+    return report
+
+
+def format_reports(reports: Sequence[EvalReport]) -> str:
+    """구성별 정확도/가드 판정 표 + 단계별 지연(p50/p95) 표 (markdown)."""
+    lines = [
+        "| config | n | accuracy | precision | recall | F1 | errors | strategy |",
+        "|---|---|---|---|---|---|---|---|",
+    ]
+    for r in reports:
+        strategy = ", ".join(f"{k}={v}" for k, v in sorted(r.strategies.items()))
+        lines.append(
+            f"| {r.name} | {r.total} | {r.accuracy:.3f} | {r.precision:.3f} | {r.recall:.3f} "
+            f"| {r.f1:.3f} | {r.errors} | {strategy} |"
+        )
+
+    stages = [s for s in STAGES if any(s in r.timings for r in reports)]
+    lines += ["", "| config | " + " | ".join(f"{s} p50/p95 (ms)" for s in stages) + " |"]
+    lines.append("|---|" + "---|" * len(stages))
+    for r in reports:
+        cells = []
+        for s in stages:
+            p50, p95 = r.percentile(s, 50), r.percentile(s, 95)
+            cells.append("-" if p50 is None else f"{p50:.1f} / {p95:.1f}")
+        lines.append(f"| {r.name} | " + " | ".join(cells) + " |")
+    return "\n".join(lines)
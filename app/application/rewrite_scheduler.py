@@ -0,0 +1,325 @@
+"""Gemini rewrite scheduler - token-bucket quota (RPM/TPM), priority lanes and duplicate merging."""
+import contextvars
+import heapq
+import itertools
+import math
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Tuple
+from app.application.deadline import remaining_budget
+from app.infrastructure.embedding_cache import normalize_text
+
+INTERACTIVE = "interactive"
+BATCH = "batch"
+LANES = (INTERACTIVE, BATCH)  # 앞쪽 lane이 우선
+
+# contextvar - Deadline.bind로 스레드 풀에 넘긴 rewrite도 호출한 쪽 lane을 유지
+_lane: contextvars.ContextVar = contextvars.ContextVar("rewrite_lane", default=None)
+
+
+@contextmanager
+def rewrite_priority(lane: str):
+    """이 컨텍스트에서 발생하는 rewrite를 lane으로 분류 (예: 프리워밍 → BATCH)."""
+    token = _lane.set(lane)
+    try:
+        yield
+    finally:
+        _lane.reset(token)
+
+
+def current_lane() -> str:
+    return _lane.get() or INTERACTIVE
+
+
+def estimate_tokens(text: str) -> int:
+    """보수적 토큰 추정 (한글은 대략 1~2자당 1토큰 → 2자당 1토큰으로 계산)."""
+    return math.ceil(len(text) / 2)
+
+
+class TokenBucket:
+    """
+    분당 rate만큼 채워지는 토큰 버킷 (capacity = 한 번에 쓸 수 있는 최대량, 기본은 1분치).
+
+    잠금 없음 - RewriteScheduler의 lock 안에서만 사용.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = float(capacity if capacity is not None else rate_per_minute)
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self.used = 0.0
+
+    def available(self) -> float:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        return self._tokens
+
+    def can_take(self, n: float, keep: float = 0.0) -> bool:
+        """n개를 가져가도 keep개 이상 남는지."""
+        return self.available() - n >= keep
+
+    def take(self, n: float):
+        self.available()
+        self._tokens -= n
+        self.used += n
+
+    def time_until(self, n: float, keep: float = 0.0) -> float:
+        """n개(+keep)가 채워질 때까지 남은 시간(초)."""
+        missing = n + keep - self.available()
+        return max(0.0, missing / self.rate) if self.rate > 0 else float("inf")
+
+
+class _Job:
+    __slots__ = ("rewriter", "query", "key", "lane", "cost", "future", "enqueued", "started", "merged")
+
+    def __init__(self, rewriter, query: str, key: Tuple[int, str], lane: str, cost: int, enqueued: float):
+        self.rewriter = rewriter
+        self.query = query
+        self.key = key
+        self.lane = lane
+        self.cost = cost
+        self.future: Future = Future()
+        self.enqueued = enqueued
+        self.started = False
+        self.merged = 0
+
+
+class RewriteScheduler:
+    """
+    프로세스 안 모든 KB의 Gemini 호출을 한 곳에서 배분 (프로세스당 하나).
+
+    quota는 API 키 단위라 여러 프로세스(gunicorn 워커)가 같은 키를 쓰면 버킷도 나눠 가져야 한다 -
+    호출자가 rpm/tpm에 워커별 몫을 넘김 (backend/app.py는 GEMINI_RPM/TPM ÷ WEB_CONCURRENCY).
+
+    - RPM/TPM 토큰 버킷: 호출 1건 = 요청 1 + (프롬프트 + 질의 + 출력 상한) 추정 토큰
+    - 우선순위 lane: 대기열에서 INTERACTIVE(/ask)가 BATCH(rewrite_batch, 프리워밍)보다 먼저 나감
+    - INTERACTIVE는 quota가 없으면 기다리지 않고 즉시 원본 질의 반환 (fail fast → 원본 검색)
+    - BATCH는 버킷에 batch_reserve 비율만큼 남겨 두고 실행 - 모자라면 채워질 때까지 대기
+    - 같은 (rewriter, 정규화 질의)가 대기/실행 중이면 새 호출 없이 결과 공유 (lane은 높은 쪽으로 승격)
+    """
+
+    def __init__(
+        self,
+        rpm: float,
+        tpm: Optional[float] = None,
+        workers: int = 4,
+        batch_reserve: float = 0.2,
+        max_queue: int = 64,
+        max_output_tokens: int = 50,
+        clock: Callable[[], float] = time.monotonic,
+        log_interval: float = 10.0,
+    ):
+        # 워커별 몫이 분당 1건 미만이어도 한 건은 담을 수 있게 (충전 속도는 그대로)
+        self.requests = TokenBucket(rpm, capacity=max(rpm, 1.0), clock=clock)
+        self.tokens = TokenBucket(tpm, clock=clock) if tpm else None
+        self.workers = max(1, workers)
+        self.batch_reserve = batch_reserve
+        self.max_queue = max_queue
+        self.max_output_tokens = max_output_tokens
+        self._clock = clock
+
+        self._cond = threading.Condition()
+        self._heap: List[Tuple[int, int, _Job]] = []
+        self._seq = itertools.count()
+        self._pending: Dict[Tuple[int, str], _Job] = {}
+        self._queued = 0
+        self._threads: List[threading.Thread] = []
+        self._closed = False
+
+        # 카운터 (메트릭 노출용)
+        self._counts = {lane: {"submitted": 0, "completed": 0, "merged": 0, "rejected": 0, "failed": 0} for lane in LANES}
+        self._wait_total = {lane: 0.0 for lane in LANES}
+        self._wait_max = {lane: 0.0 for lane in LANES}
+        self.log_interval = log_interval
+        self._last_log = float("-inf")
+        self._suppressed = 0
+
+    def cost(self, rewriter, query: str) -> int:
+        prompt = getattr(rewriter, "system_prompt", "")
+        return estimate_tokens(prompt) + estimate_tokens(query) + self.max_output_tokens
+
+    def _quota_ok(self, cost: int, keep: float) -> bool:
+        if not self.requests.can_take(1, keep * self.requests.capacity):
+            return False
+        return self.tokens is None or self.tokens.can_take(cost, keep * self.tokens.capacity)
+
+    def _take(self, cost: int):
+        self.requests.take(1)
+        if self.tokens is not None:
+            self.tokens.take(cost)
+
+    def _refill_delay(self, cost: int, keep: float) -> float:
+        delay = self.requests.time_until(1, keep * self.requests.capacity)
+        if self.tokens is not None:
+            delay = max(delay, self.tokens.time_until(cost, keep * self.tokens.capacity))
+        return delay
+
+    def _start_workers(self):
+        while len(self._threads) < self.workers:
+            thread = threading.Thread(target=self._work, name=f"gemini-{len(self._threads)}", daemon=True)
+            self._threads.append(thread)
+            thread.start()
+
+    def submit(self, rewriter, query: str, lane: str = INTERACTIVE) -> Future:
+        """
+        rewrite 예약 → Future[str]. quota/대기열이 없으면 (INTERACTIVE만) 원본 질의로 바로 완료된 Future.
+        """
+        key = (id(rewriter), normalize_text(query))
+        with self._cond:
+            self._counts[lane]["submitted"] += 1
+            job = self._pending.get(key)
+            if job is not None and (job.started or LANES.index(lane) >= LANES.index(job.lane)):
+                job.merged += 1
+                self._counts[lane]["merged"] += 1
+                return job.future
+
+            cost = self.cost(rewriter, query)
+            rejected = False
+            if lane == INTERACTIVE:
+                queue_full = job is None and self._queued >= self.max_queue
+                rejected = queue_full or not self._quota_ok(cost, 0.0)
+                if rejected:
+                    self._counts[lane]["rejected"] += 1
+                    log, suppressed = self._should_log()
+                else:
+                    self._take(cost)  # 대기열에 들어가는 순간 quota 확보 (실행 시점에 다시 거절되지 않음)
+                    cost = 0
+
+            if not rejected:
+                if job is not None:
+                    # 대기 중인 BATCH 작업 승격: 우선순위 항목을 한 번 더 넣고, 먼저 꺼낸 쪽만 실행
+                    job.merged += 1
+                    self._counts[lane]["merged"] += 1
+                    job.lane, job.cost = lane, cost
+                    heapq.heappush(self._heap, (LANES.index(lane), next(self._seq), job))
+                    self._cond.notify()
+                    return job.future
+
+                job = _Job(rewriter, query, key, lane, cost, self._clock())
+                self._pending[key] = job
+                self._queued += 1
+                heapq.heappush(self._heap, (LANES.index(lane), next(self._seq), job))
+                self._start_workers()
+                self._cond.notify()
+                return job.future
+
+        # 거절 로그는 lock 밖에서, log_interval초에 한 번만 (건수는 stats()의 rejected)
+        if log:
+            extra = f" (이전 {suppressed}건 생략)" if suppressed else ""
+            print(f"[Gemini] quota 소진 → 원본 사용{extra}: {query}")
+        future: Future = Future()
+        future.set_result(query)
+        return future
+
+    def _should_log(self) -> Tuple[bool, int]:
+        """거절 로그를 지금 출력할지 + 그동안 생략한 건수 (self._cond 안에서 호출)."""
+        now = time.monotonic()
+        if now - self._last_log < self.log_interval:
+            self._suppressed += 1
+            return False, 0
+        suppressed, self._suppressed, self._last_log = self._suppressed, 0, now
+        return True, suppressed
+
+    def _next(self) -> Optional[_Job]:
+        """실행할 다음 작업 (BATCH는 예비분을 남길 수 있을 때만). 닫히면 None."""
+        with self._cond:
+            while True:
+                if self._closed:
+                    return None
+                while self._heap and self._heap[0][2].started:
+                    heapq.heappop(self._heap)  # 승격으로 중복 삽입된 항목
+                if not self._heap:
+                    self._cond.wait()
+                    continue
+                _, _, job = self._heap[0]
+                if job.cost and not self._quota_ok(job.cost, self.batch_reserve):
+                    # INTERACTIVE가 들어오면 notify로 깨어나 먼저 처리
+                    self._cond.wait(min(60.0, self._refill_delay(job.cost, self.batch_reserve)))
+                    continue
+                heapq.heappop(self._heap)
+                if job.cost:
+                    self._take(job.cost)
+                job.started = True
+                self._queued -= 1
+                waited = self._clock() - job.enqueued
+                self._wait_total[job.lane] += waited
+                self._wait_max[job.lane] = max(self._wait_max[job.lane], waited)
+                return job
+
+    def _work(self):
+        while True:
+            job = self._next()
+            if job is None:
+                return
+            try:
+                result = job.rewriter.rewrite(job.query)
+            except Exception as e:
+                with self._cond:
+                    self._pending.pop(job.key, None)
+                    self._counts[job.lane]["failed"] += 1
+                job.future.set_exception(e)
+                continue
+            with self._cond:
+                self._pending.pop(job.key, None)
+                self._counts[job.lane]["completed"] += 1
+            job.future.set_result(result)
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def stats(self) -> dict:
+        with self._cond:
+            lanes = {}
+            for lane in LANES:
+                started = self._counts[lane]["completed"] + self._counts[lane]["failed"]
+                lanes[lane] = {
+                    **self._counts[lane],
+                    "queue_wait_avg_ms": (self._wait_total[lane] / started * 1000) if started else 0.0,
+                    "queue_wait_max_ms": self._wait_max[lane] * 1000,
+                }
+            quota = {
+                "rpm": self.requests.capacity,
+                "requests_available": round(self.requests.available(), 2),
+                "requests_used": int(self.requests.used),
+            }
+            if self.tokens is not None:
+                quota.update({
+                    "tpm": self.tokens.capacity,
+                    "tokens_available": round(self.tokens.available()),
+                    "tokens_used": int(self.tokens.used),
+                })
+            return {"queue_depth": self._queued, "quota": quota, "lanes": lanes}
+
+
+class ScheduledRewriter:
+    """KB별 GeminiQueryRewriter를 공용 RewriteScheduler로 실행 (lane은 호출 스레드의 rewrite_priority)."""
+
+    def __init__(self, rewriter, scheduler: RewriteScheduler):
+        self.rewriter = rewriter
+        self.scheduler = scheduler
+
+    @property
+    def system_prompt(self) -> str:
+        return getattr(self.rewriter, "system_prompt", "")
+
+    def rewrite(self, query: str) -> str:
+        """예약 후 대기 - 요청 예산(remaining_budget) 안에 끝나지 않으면 원본 질의 (대기 중인 작업은 계속 진행)."""
+        if not query or not query.strip():
+            return query
+        future = self.scheduler.submit(self.rewriter, query, current_lane())
+        try:
+            return future.result(timeout=remaining_budget())
+        except FutureTimeoutError:
+            return query
+
+    def rewrite_batch(self, queries: List[str]) -> List[str]:
+        """일괄 변환은 BATCH lane (대화형 요청에 quota 예비분을 남기고 실행)."""
+        futures = [self.scheduler.submit(self.rewriter, q, BATCH) for q in queries]
+        return [f.result() for f in futures]
@@ -1,10 +1,17 @@
 """Application use cases - business logic orchestration."""
-from typing import Optional
-import re
-from app.domain.entities import SearchResult, QAPair
-from app.domain.repositories import Retriever
+from typing import Callable, List, Optional
+import time
+from dataclasses import replace
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from app.domain.entities import SearchResult, QAPair, QueryProfile
+from app.domain.repositories import Reranker, Retriever
 from app.infrastructure.guards import HallucinationGuard
+from app.infrastructure.lexical import LexicalRetriever
+from app.infrastructure.memory_cache import TTLCache
+from app.infrastructure.query_profile import QueryProfiler
 from app.application.gemini_rewriter import GeminiQueryRewriter
+from app.application.deadline import Deadline
+from app.application.fusion import FusionEngine, QueryVariant
 
 
 class QASearchUseCase:
@@ -15,139 +22,409 @@ class QASearchUseCase:
         retriever: Retriever, 
         guard: HallucinationGuard, 
         top_k: int = 5,
-        rewriter: Optional[GeminiQueryRewriter] = None
+        rewriter: Optional[GeminiQueryRewriter] = None,
+        fallback_retriever: Optional[Retriever] = None,
+        search_reserve: float = 0.2,
+        executor: Optional[ThreadPoolExecutor] = None,
+        external_executor: Optional[ThreadPoolExecutor] = None,
+        lexical_retriever: Optional[LexicalRetriever] = None,
+        rrf_k: int = 60,
+        rewrite_skip_score: Optional[float] = None,
+        reranker: Optional[Reranker] = None,
+        rerank_margin: float = 0.05,
+        rerank_timeout: float = 0.15,
+        fusion: Optional[FusionEngine] = None,
+        profiler: Optional[QueryProfiler] = None,
+        answer_cache: Optional[TTLCache] = None,
     ):
+        """
+        Args:
+            fallback_retriever: Qdrant 지연/장애 시 사용할 로컬 인덱스 (LocalIndexRetriever)
+            search_reserve: 지연 예산 중 벡터 검색용으로 남겨둘 시간(초) - Gemini 대기 상한 계산에 사용
+            executor: 예산이 있을 때 벡터 검색을 타임아웃과 함께 실행할 스레드 풀
+            external_executor: Gemini/재정렬 호출용 스레드 풀 - 검색과 분리해, 타임아웃 후에도
+                끝나지 않은 외부 호출이 워커를 붙잡아도 원본 질문 검색은 계속 실행됨
+            lexical_retriever: n-gram BM25 검색 - 벡터 결과와 RRF로 결합, 확실한 키워드 매칭은 단축 응답
+            rrf_k: Reciprocal Rank Fusion 상수 (클수록 하위 순위 영향 증가)
+            rewrite_skip_score: 원본 질문 검색 점수가 이 값 이상이면 Gemini rewrite 생략
+                (paraphrase 형제 벡터 색인 시 구어체 질문도 직접 매칭되므로). None이면 항상 rewrite.
+            reranker: cross-encoder 재정렬 (1·2위 점수 차가 rerank_margin 미만일 때만 실행)
+            rerank_timeout: 재정렬 지연 상한(초) - 초과 시 Ensemble 순서 유지 ("no_rerank")
+            fusion: 질의 변형/가중치 규칙/점수 병합 엔진 (없으면 기본 규칙 테이블)
+            profiler: 요청당 한 번 질의 분류 (없으면 guard의 profiler 공유)
+            answer_cache: 정규화 질의 → 최종 결과 캐시 (강등 없이 계산된 결과만 저장)
+        """
         self.retriever = retriever
         self.guard = guard
         self.top_k = top_k
         self.rewriter = rewriter or GeminiQueryRewriter()
+        self.fallback_retriever = fallback_retriever
+        self.search_reserve = search_reserve
+        self._executor = executor or ThreadPoolExecutor(max_workers=8, thread_name_prefix="qa-search")
+        self._external_executor = external_executor or ThreadPoolExecutor(max_workers=8, thread_name_prefix="qa-external")
+        self.lexical_retriever = lexical_retriever
+        self.fusion = fusion or FusionEngine(rrf_k=rrf_k)
+        self.profiler = profiler or guard.profiler
+        self.answer_cache = answer_cache
+        self.rewrite_skip_score = rewrite_skip_score
+        self.reranker = reranker
+        self.rerank_margin = rerank_margin
+        self.rerank_timeout = rerank_timeout
+    
+    def _call(
+        self,
+        fn: Callable,
+        deadline: Optional[Deadline],
+        reserve: float = 0.0,
+        executor: Optional[ThreadPoolExecutor] = None,
+    ):
+        """
+        예산이 있으면 스레드 풀(기본: 검색 풀)에서 (남은 시간 - reserve) 타임아웃으로 실행, 없으면 직접 호출.
+        작업 스레드에는 deadline을 전달 (Qdrant 재시도가 예산을 넘기지 않도록).
+        """
+        if deadline is None:
+            return fn()
+        timeout = deadline.remaining() - reserve
+        if timeout <= 0:
+            raise FutureTimeoutError()
+        return (executor or self._executor).submit(deadline.bind(fn)).result(timeout=timeout)
     
-    def _get_ensemble_weights(self, query: str) -> tuple[float, float]:
+    def _retrieve(
+        self,
+        queries: List[str],
+        deadline: Optional[Deadline],
+        degraded: List[str],
+        future: Optional[Future] = None,
+    ) -> List[List[QAPair]]:
         """
-        질문 유형에 따라 Ensemble 가중치를 동적으로 결정.
+        변형 질의들을 한 번의 배치 벡터 검색으로 처리.
+        Qdrant가 예산 내에 응답하지 않거나 실패하면 로컬 캐시 인덱스로 fallback.
+        fallback이 없으면 예산 초과 시 빈 결과("search_timeout") → 가드가 fallback 메시지를 반환.
+        """
+        if self.fallback_retriever is None:
+            try:
+                if future is not None:
+                    return future.result(timeout=max(0.0, deadline.remaining()) if deadline else None)
+                return self._call(lambda: self.retriever.search_batch(queries, top_k=self.top_k), deadline)
+            except FutureTimeoutError:
+                print(f"[Search] 예산 내 Qdrant 응답 없음 (fallback 인덱스 없음) → 빈 결과")
+                if "search_timeout" not in degraded:
+                    degraded.append("search_timeout")
+                return [[] for _ in queries]
         
-        Args:
-            query: 사용자 질문
-            
-        Returns:
-            (original_weight, rewritten_weight) 튜플
+        try:
+            if future is not None:
+                return future.result(timeout=max(0.0, deadline.remaining()) if deadline else None)
+            return self._call(lambda: self.retriever.search_batch(queries, top_k=self.top_k), deadline)
+        except Exception as e:
+            print(f"[Search] Qdrant 지연/오류 → 로컬 인덱스 사용: {type(e).__name__}")
+            if "local_index" not in degraded:
+                degraded.append("local_index")
+            return self.fallback_retriever.search_batch(queries, top_k=self.top_k)
+    
+    def _timed_retrieve(
+        self,
+        variants: List[QueryVariant],
+        deadline: Optional[Deadline],
+        degraded: List[str],
+        timings: dict,
+        stage: str,
+        future: Optional[Future] = None,
+        started: Optional[float] = None,
+    ) -> List[List[QAPair]]:
+        t0 = started if started is not None else time.perf_counter()
+        try:
+            return self._retrieve([v.text for v in variants], deadline, degraded, future)
+        finally:
+            timings[stage] = (time.perf_counter() - t0) * 1000
+    
+    def _rerank(
+        self,
+        query: str,
+        candidates: List[QAPair],
+        deadline: Optional[Deadline],
+        degraded: List[str],
+        timings: dict,
+    ) -> List[QAPair]:
         """
-        # 1) 정형 질문 패턴 (존댓말, 의문사)
-        formal_patterns = r"무엇인가요|어떻게|어떤.{1,5}인가요|얼마인가요|누구|언제|어디|입니까"
-        if re.search(formal_patterns, query):
-            return (0.95, 0.05)  # 원본 신뢰 (이미 정형화됨)
-        
-        # 2) 매우 짧은 질문 (< 5자)
-        if len(query.strip()) < 5:
-            return (0.4, 0.6)  # Gemini 약간 신뢰
-        
-        # 3) 구어체/반말 패턴
-        informal_patterns = r"뭐야|뭐임|뭐예요|얼마야|있어\?|해\?|필요해|지원해|알려줘|설명해줘|가르쳐줘|말해줘|뭐하는|무슨|어떤|이거|그거|프로젝트"
-        if re.search(informal_patterns, query, flags=re.IGNORECASE):
-            return (0.1, 0.9)  # Gemini 강력 신뢰 (비정형 → 정형화 필수)
-        
-        # 4) 기본값
-        return (0.5, 0.5)  # 균형
+        상위 후보가 근소한 차이일 때만 cross-encoder로 재정렬.
+        지연 상한(rerank_timeout, 남은 예산)을 넘기거나 실패하면 기존 순서 그대로 반환.
+        """
+        if self.reranker is None or len(candidates) < 2:
+            return candidates
+        if (candidates[0].score or 0.0) - (candidates[1].score or 0.0) >= self.rerank_margin:
+            return candidates
+
+        t0 = time.perf_counter()
+        timeout = self.rerank_timeout if deadline is None else min(self.rerank_timeout, deadline.remaining())
+        if timeout <= 0:
+            # 예산 소진 - 결과를 기다리지 않을 forward pass는 풀에 넣지 않음
+            degraded.append("no_rerank")
+            return candidates
+        try:
+            scores = self._external_executor.submit(self.reranker.score, query, candidates).result(timeout=timeout)
+        except Exception as e:
+            print(f"[Rerank] 지연 상한 초과/오류 → Ensemble 순서 유지: {type(e).__name__}")
+            degraded.append("no_rerank")
+            return candidates
+        finally:
+            timings["rerank"] = (time.perf_counter() - t0) * 1000
+        order = sorted(range(len(candidates)), key=lambda i: scores[i], reverse=True)
+        return [candidates[i] for i in order]
     
-    def search(self, query: str) -> SearchResult:
+    def _fallback_result(self, score: float, degradation: str, timings: dict, **extra) -> SearchResult:
+        return SearchResult(
+            answer=self.guard.get_fallback_message(),
+            score=score,
+            matched_question="",
+            sources=[],
+            is_valid=False,
+            degradation=degradation,
+            timings=timings,
+            **extra,
+        )
+    
+    def search(
+        self,
+        query: str,
+        deadline: Optional[Deadline] = None,
+        on_provisional: Optional[Callable[[SearchResult], None]] = None,
+    ) -> SearchResult:
         """
         사용자 쿼리에 대한 답변 검색 및 가드 적용.
-        Ensemble 방식: 원본 질문 + Gemini 정규화 질문의 검색 결과를 결합.
+        Ensemble 방식: 질의 변형(원본, 브랜드 정규화, Gemini 정규화)의 검색 결과를 QA id 기준으로 가중 결합.
+        
+        지연 예산(deadline)이 주어지면 단계별로 남은 시간을 확인하고 단계적으로 강등:
+        - Gemini가 예산 내 응답 없음 → 원본 질문 검색만 사용 ("no_rewrite")
+        - Qdrant 지연/장애 → 로컬 캐시 인덱스 사용 ("local_index")
+        
+        어휘 검색(lexical_retriever)이 있으면 먼저 실행해, 확실한 키워드 매칭이면 임베딩/Gemini 없이 바로 응답.
+        rewrite_skip_score가 있으면 원본 검색을 먼저 확인해, 충분히 높으면 Gemini 없이 응답 (strategy="vector").
         
         Args:
             query: 사용자 질문
+            deadline: 요청 단위 지연 예산 (None이면 제한 없음)
+            on_provisional: 스트리밍용 콜백 - Gemini를 기다리기 전에 원본 질문 검색 결과가
+                가드를 통과하면 잠정 결과(strategy="provisional")로 한 번 호출 (캐시/단축 응답은 호출 없음)
             
         Returns:
-            SearchResult (answer, score, matched_question, sources, is_valid)
+            SearchResult (answer, score, matched_question, sources, is_valid, degradation, timings)
         """
-        # 1) Gemini API로 관련성 체크 및 정규화
-        rewritten_query = self.rewriter.rewrite(query)
+        t_start = time.perf_counter()
         
-        # 1-1) Perso.ai와 관련 없는 질문 필터링
-        if rewritten_query == "[NO_MATCH]":
-            return SearchResult(
-                answer=self.guard.get_fallback_message(),
-                score=0.0,
-                matched_question="",
-                sources=[],
-                is_valid=False
-            )
+        # 질의 분류는 한 번만: 가중치 규칙, 동적 임계값, 캐시 키가 같은 QueryProfile 사용
+        profile = self.profiler.profile(query)
         
-        # 2) Ensemble 검색: 원본 + 정규화 질문 모두 검색 (동적 가중치)
-        # 2-1) 동적 가중치 결정
-        original_weight, rewritten_weight = self._get_ensemble_weights(query)
+        # 답변 캐시: 같은 (정규화) 질의는 검색/Gemini 없이 이전 결과 재사용 (strategy="cache")
+        if self.answer_cache is not None:
+            cached = self.answer_cache.get(profile.cache_key)
+            if cached is not None:
+                return replace(
+                    cached,
+                    timings={"total": (time.perf_counter() - t_start) * 1000},
+                    strategy="cache",
+                    cache_hits=["answer"],
+                )
         
-        # 2-2) 원본 질문으로 검색 (실제 벡터 유사도)
-        original_candidates = self.retriever.search(query, top_k=self.top_k)
+        result = self._search(query, profile, deadline, t_start, on_provisional)
         
-        # 2-3) 정규화된 질문으로 검색 (보완적 검색)
-        rewritten_candidates = self.retriever.search(rewritten_query, top_k=self.top_k)
+        # 강등된 결과(예산 초과/로컬 인덱스)는 품질이 낮을 수 있으므로 캐시하지 않음
+        if self.answer_cache is not None and result.degradation == "full":
+            self.answer_cache.put(profile.cache_key, result)
+        return result
+    
+    def _provisional(
+        self,
+        query: str,
+        profile: QueryProfile,
+        pre_variants: List[QueryVariant],
+        pre_results: List[List[QAPair]],
+        lexical_candidates: List[QAPair],
+        timings: dict,
+        t_start: float,
+    ) -> Optional[SearchResult]:
+        """
+        rewrite 이전 변형만으로 만든 잠정 결과 ("no_rewrite" 강등과 같은 가중치, 재정렬 없음).
+        가드를 통과하지 못하면 None (fallback 메시지를 잠정 답변으로 내보내지 않음).
+        """
+        results_by_text = {v.text: r for v, r in zip(pre_variants, pre_results)}
+        variants = self.fusion.variants(profile)  # rewrite 없이 정규화된 가중치
+        candidates = self.fusion.fuse(variants, [results_by_text[v.text] for v in variants], self.top_k)
+        if lexical_candidates:
+            candidates = self.fusion.fuse_lexical(candidates, lexical_candidates, self.top_k)
+        if not candidates:
+            return None
+        best = candidates[0]
+        score = best.score or 0.0
+        if not self.guard.is_valid(score, query=query, profile=profile):
+            return None
+        timings["provisional"] = (time.perf_counter() - t_start) * 1000
+        return SearchResult(
+            answer=best.answer,
+            score=score,
+            matched_question=best.question,
+            sources=[
+                f"Q: {best.question}",
+                f"A: {best.answer}",
+                f"Score: {score:.3f}"
+            ],
+            is_valid=True,
+            timings=dict(timings),
+            strategy="provisional",
+        )
+    
+    def _search(
+        self,
+        query: str,
+        profile: QueryProfile,
+        deadline: Optional[Deadline],
+        t_start: float,
+        on_provisional: Optional[Callable[[SearchResult], None]] = None,
+    ) -> SearchResult:
+        timings: dict = {}
+        degraded: List[str] = []
+        cache_hits: List[str] = []
         
-        # 2-4) 두 검색 결과를 결합 (동적 가중치 적용)
-        from typing import Dict
-        combined_scores: Dict[str, float] = {}
-        candidate_map: Dict[str, QAPair] = {}
+        # 0-0) 어휘 검색: 확실한 키워드 매칭이면 임베딩/Gemini 단계 생략
+        lexical_candidates: List[QAPair] = []
+        if self.lexical_retriever is not None:
+            t0 = time.perf_counter()
+            lexical_candidates, confident = self.lexical_retriever.confident(query, top_k=self.top_k)
+            timings["lexical"] = (time.perf_counter() - t0) * 1000
+            if confident:
+                best = lexical_candidates[0]
+                timings["total"] = (time.perf_counter() - t_start) * 1000
+                return SearchResult(
+                    answer=best.answer,
+                    score=best.score,
+                    matched_question=best.question,
+                    sources=[
+                        f"Q: {best.question}",
+                        f"A: {best.answer}",
+                        f"Score: {best.score:.3f}"
+                    ],
+                    is_valid=True,
+                    timings=timings,
+                    strategy="lexical",
+                )
         
-        # 원본 검색 결과 (동적 가중치)
-        for candidate in original_candidates:
-            combined_scores[candidate.question] = (candidate.score or 0.0) * original_weight
-            candidate_map[candidate.question] = candidate
+        # 0) rewrite 이전 변형(원본, 브랜드 정규화)은 한 번의 배치로 검색
+        #    예산이 있으면 Gemini 호출과 병렬로 시작 (rewrite에 의존하지 않음)
+        pre_variants = self.fusion.variants(profile, include_rewritten=False)
+        pre_future: Optional[Future] = None
+        pre_started = time.perf_counter()
+        if deadline is not None:
+            pre_future = self._executor.submit(
+                deadline.bind(self.retriever.search_batch), [v.text for v in pre_variants], top_k=self.top_k
+            )
         
-        # 정규화 검색 결과 (동적 가중치, 기존 점수에 추가)
-        for candidate in rewritten_candidates:
-            if candidate.question in combined_scores:
-                combined_scores[candidate.question] += (candidate.score or 0.0) * rewritten_weight
-            else:
-                combined_scores[candidate.question] = (candidate.score or 0.0) * rewritten_weight
-                candidate_map[candidate.question] = candidate
-        
-        # 2-5) Top-K 후보 선택 (Cross-Encoder 입력용)
-        if not combined_scores:
-            ensemble_candidates = []
-        else:
-            # Ensemble 점수 상위 Top-K 선택
-            sorted_questions = sorted(
-                combined_scores.items(), 
-                key=lambda x: x[1], 
-                reverse=True
-            )[:self.top_k]
-            
-            ensemble_candidates = [
-                QAPair(
-                    question=q,
-                    answer=candidate_map[q].answer,
-                    score=score
+        # 0-1) Gemini rewrite도 원본 검색과 동시에 시작 (캐시 hit이면 호출 없음)
+        #      rewrite 생략 판단/잠정 답변만 원본 검색을 기다리고, Gemini 왕복은 그동안 진행
+        t_rewrite = time.perf_counter()
+        lookup = getattr(self.rewriter, "lookup", None)
+        cached_rewrite = lookup(query) if lookup else None
+        lookup_ms = (time.perf_counter() - t_rewrite) * 1000
+        fetch = getattr(self.rewriter, "fetch", self.rewriter.rewrite)
+        rewrite_future: Optional[Future] = None
+        if cached_rewrite is None and deadline is not None:
+            rewrite_future = self._external_executor.submit(deadline.bind(fetch), query)
+        
+        # 0-2) paraphrase 벡터와 강하게 매칭되면 rewrite 결과를 쓰지 않음 (진행 중인 호출은 취소/무시)
+        #      스트리밍이면 같은 원본 검색 결과로 잠정 답변을 먼저 내보냄 (첫 응답이 Gemini 왕복을 기다리지 않음)
+        pre_results: Optional[List[List[QAPair]]] = None
+        strategy = "ensemble"
+        if self.rewrite_skip_score is not None or on_provisional is not None:
+            pre_results = self._timed_retrieve(
+                pre_variants, deadline, degraded, timings, "search_original",
+                future=pre_future, started=pre_started if pre_future else None,
+            )
+            top = max(((r[0].score or 0.0) for r in pre_results if r), default=0.0)
+            if self.rewrite_skip_score is not None and top >= self.rewrite_skip_score:
+                strategy = "vector"
+                if rewrite_future is not None:
+                    rewrite_future.cancel()  # 아직 시작 전이면 취소, 실행 중이면 결과 무시
+            elif on_provisional is not None:
+                provisional = self._provisional(
+                    query, profile, pre_variants, pre_results, lexical_candidates, timings, t_start
                 )
-                for q, score in sorted_questions
-            ]
+                if provisional is not None:
+                    on_provisional(provisional)
+        
+        # 1) Gemini rewrite 결과 대기 (rewrite 이후 변형 검색 시간은 남겨둠)
+        rewritten_query: Optional[str] = None
+        if strategy != "vector":
+            if cached_rewrite is not None:
+                # rewrite 캐시 hit이면 스레드 풀/예산 대기 없이 바로 사용
+                rewritten_query = cached_rewrite
+                cache_hits.append("rewrite")
+                timings["rewrite"] = lookup_ms
+            else:
+                try:
+                    if rewrite_future is None:
+                        rewritten_query = fetch(query)  # 예산 없음: 직접 호출
+                    else:
+                        timeout = deadline.remaining() - self.search_reserve
+                        if timeout <= 0:
+                            raise FutureTimeoutError()
+                        rewritten_query = rewrite_future.result(timeout=timeout)
+                except FutureTimeoutError:
+                    print(f"[Deadline] Gemini 예산 초과 → 원본 질문만 사용: {query}")
+                    rewritten_query = None
+                    degraded.append("no_rewrite")
+                timings["rewrite"] = (time.perf_counter() - t_rewrite) * 1000
         
-        # 3) 최종 후보 선택 (Ensemble 결과 사용)
-        candidates = ensemble_candidates
+        # 1-1) Perso.ai와 관련 없는 질문 필터링
+        if rewritten_query == "[NO_MATCH]":
+            timings["total"] = (time.perf_counter() - t_start) * 1000
+            return self._fallback_result(
+                0.0, "+".join(degraded) or "full", timings, rewritten=rewritten_query, cache_hits=cache_hits
+            )
+        
+        # 2) N-way 융합: 변형별 가중치는 규칙 테이블에서 결정
+        #    (같은 텍스트 변형은 합치고, rewrite가 없으면 남은 변형으로 가중치 재분배)
+        variants = self.fusion.variants(profile, rewritten_query)
+        
+        # 2-1) rewrite 이전 변형 검색 결과
+        if pre_results is None:
+            pre_results = self._timed_retrieve(
+                pre_variants, deadline, degraded, timings, "search_original",
+                future=pre_future, started=pre_started if pre_future else None,
+            )
+        results_by_text = {v.text: r for v, r in zip(pre_variants, pre_results)}
+        
+        # 2-2) rewrite 이후 새로 생긴 변형만 추가 배치 검색
+        new_variants = [v for v in variants if v.text not in results_by_text]
+        if new_variants:
+            new_results = self._timed_retrieve(new_variants, deadline, degraded, timings, "search_rewritten")
+            results_by_text.update({v.text: r for v, r in zip(new_variants, new_results)})
+        
+        # 2-3) 점수 행렬 × 가중치 → QA id 기준 Top-K (Cross-Encoder 재정렬 입력)
+        ensemble_candidates = self.fusion.fuse(variants, [results_by_text[v.text] for v in variants], self.top_k)
+        
+        # 3) 최종 후보 선택 (어휘 결과가 있으면 RRF 결합 → 근소한 차이면 cross-encoder 재정렬)
+        candidates = (
+            self.fusion.fuse_lexical(ensemble_candidates, lexical_candidates, self.top_k)
+            if lexical_candidates else ensemble_candidates
+        )
+        candidates = self._rerank(query, candidates, deadline, degraded, timings)
         
         # 4) 최고 점수 결과 선택
         best_result: Optional[QAPair] = candidates[0] if candidates else None
         best_score = best_result.score or 0.0 if best_result else 0.0
         
+        degradation = "+".join(degraded) or "full"
+        timings["total"] = (time.perf_counter() - t_start) * 1000
+        
         # 5) 결과 없음 처리
         if not best_result:
-            return SearchResult(
-                answer=self.guard.get_fallback_message(),
-                score=0.0,
-                matched_question="",
-                sources=[],
-                is_valid=False
-            )
+            return self._fallback_result(0.0, degradation, timings, rewritten=rewritten_query, cache_hits=cache_hits)
         
-        # 6) 동적 임계값 가드 적용
-        is_valid = self.guard.is_valid(best_score, query=query)
+        # 6) 동적 임계값 가드 적용 (rewrite 유무와 무관하게 원본 질문 기준 임계값)
+        is_valid = self.guard.is_valid(best_score, query=query, profile=profile)
         
         if not is_valid:
-            return SearchResult(
-                answer=self.guard.get_fallback_message(),
-                score=best_score,
-                matched_question="",
-                sources=[],
-                is_valid=False
+            return self._fallback_result(
+                best_score, degradation, timings, rewritten=rewritten_query, cache_hits=cache_hits
             )
         
         # 7) 유효한 결과 반환
@@ -160,7 +437,12 @@ class QASearchUseCase:
                 f"A: {best_result.answer}",
                 f"Score: {best_score:.3f}"
             ],
-            is_valid=True
+            is_valid=True,
+            degradation=degradation,
+            timings=timings,
+            strategy=strategy,
+            rewritten=rewritten_query,
+            cache_hits=cache_hits,
         )
 
 
@@ -1,6 +1,6 @@
 """Domain entities - core business objects."""
-from dataclasses import dataclass
-from typing import Optional, List
+from dataclasses import dataclass, field
+from typing import Optional, List, Dict, Tuple, Union
 
 
 @dataclass
@@ -9,6 +9,7 @@ class QAPair:
     question: str
     answer: str
     score: Optional[float] = None
+    id: Optional[Union[int, str]] = None  # QA(표준 질문 포인트) id - 같은 질문 문자열의 다른 QA 구분용
 
 
 @dataclass
@@ -19,5 +20,49 @@ class SearchResult:
     matched_question: str
     sources: List[str]
     is_valid: bool  # 임계값 통과 여부
+    degradation: str = "full"  # 지연 예산 초과 시 적용된 강등 단계 (예: "no_rewrite", "local_index", "search_timeout")
+    timings: Dict[str, float] = field(default_factory=dict)  # 단계별 소요 시간(ms)
+    strategy: str = "ensemble"  # 응답 경로 ("ensemble" / "vector": Gemini 생략 / "lexical": 임베딩·Gemini 생략 / "cache": 답변 캐시 / "provisional": 스트리밍 잠정 답변)
+    rewritten: Optional[str] = None  # Gemini 정규화 질의 (rewrite 생략/실패 시 None)
+    cache_hits: List[str] = field(default_factory=list)  # 캐시로 대체된 단계 ("answer", "rewrite")
 
 
+@dataclass
+class QueryProfile:
+    """
+    질의 분류 결과 (요청당 한 번 계산, Ensemble 가중치·동적 임계값·캐시가 공유).
+
+    규칙 조건(when)은 profile 속성으로 표현: {"type": ..., "length": ..., "marker": ...}
+    표지는 사용처("ensemble" 가중치, "guard" 임계값)별로 따로 매칭 - type/marker 조건은 사용처 기준.
+    """
+    text: str
+    normalized: str  # NFC + 공백 정리 - 하위 캐시 키
+    length_class: str  # "short"(매우 짧음) / "keyword"(3어절 이하) / "normal"
+    # 사용처별 매칭 표지 (예: {"ensemble": {"informal": ("뭐야",)}, "guard": {...}})
+    markers: Dict[str, Dict[str, Tuple[str, ...]]] = field(default_factory=dict)
+    type_order: Tuple[str, ...] = ("formal", "informal")
+
+    @property
+    def cache_key(self) -> str:
+        return self.normalized
+
+    def markers_for(self, consumer: str) -> Dict[str, Tuple[str, ...]]:
+        return self.markers.get(consumer, {})
+
+    def query_type(self, consumer: str) -> str:
+        """type_order 순서로 처음 표지가 있는 분류, 없으면 "keyword"(짧은 질의) / "default"."""
+        found = self.markers_for(consumer)
+        query_type = next((name for name in self.type_order if found.get(name)), None)
+        if query_type is None:
+            query_type = "keyword" if self.length_class != "normal" else "default"
+        return query_type
+
+    def matches(self, when: Dict[str, str], consumer: str) -> bool:
+        """consumer 표지 기준으로 규칙 조건을 모두 만족하는지 (빈 조건은 항상 참)."""
+        if "type" in when and self.query_type(consumer) != when["type"]:
+            return False
+        if "length" in when and self.length_class != when["length"]:
+            return False
+        if "marker" in when and not self.markers_for(consumer).get(when["marker"]):
+            return False
+        return True
@@ -21,6 +21,15 @@ class Retriever(ABC):
         """
         pass
     
+    def search_batch(self, queries: List[str], top_k: int = 3) -> List[List[QAPair]]:
+        """
+        여러 쿼리를 한 번에 검색 (구현체가 배치 임베딩/배치 검색으로 재정의).
+        
+        Returns:
+            queries 순서대로의 결과 목록
+        """
+        return [self.search(q, top_k=top_k) for q in queries]
+    
 
 class Embedder(ABC):
     """임베딩 생성 인터페이스 (OCP 준수)."""
@@ -39,3 +48,19 @@ class Embedder(ABC):
         pass
 
 
+class Reranker(ABC):
+    """(질문, 후보) 쌍 재정렬 인터페이스 (OCP 준수)."""
+    
+    @abstractmethod
+    def score(self, query: str, candidates: List[QAPair]) -> List[float]:
+        """
+        각 후보의 관련도 점수.
+        
+        Args:
+            query: 사용자 질문
+            candidates: 재정렬할 후보 QA 쌍
+            
+        Returns:
+            candidates 순서대로의 점수 (클수록 관련)
+        """
+        pass
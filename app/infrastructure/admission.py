@@ -0,0 +1,126 @@
+"""Admission control - bounded concurrency + short wait queue for CPU-bound stages."""
+import os
+import time
+import threading
+from contextlib import contextmanager
+from typing import List, Optional
+from app.domain.repositories import Embedder
+
+
+class AdmissionRejected(Exception):
+    """대기열 초과/대기 시간 초과로 요청을 거절할 때 발생 (→ HTTP 503 + Retry-After)."""
+
+    def __init__(self, name: str, reason: str, retry_after: int):
+        super().__init__(f"{name}: {reason}")
+        self.name = name
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    동시 실행 수 제한 + 짧은 대기열.
+
+    - 동시 실행 슬롯(max_concurrency)이 비어 있으면 즉시 통과
+    - 슬롯이 없으면 최대 max_queue개까지 max_wait초 동안 대기
+    - 대기열이 가득 찼거나 대기 시간을 넘기면 AdmissionRejected로 즉시 거절 (load shedding)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrency: Optional[int] = None,
+        max_queue: Optional[int] = None,
+        max_wait: float = 0.5,
+        retry_after: int = 1,
+    ):
+        self.name = name
+        self.max_concurrency = max_concurrency or os.cpu_count() or 1
+        self.max_queue = self.max_concurrency * 2 if max_queue is None else max_queue
+        self.max_wait = max_wait
+        self.retry_after = retry_after
+
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self._queued = 0
+
+        # 카운터 (메트릭 노출용)
+        self._admitted = 0
+        self._rejected_queue_full = 0
+        self._rejected_timeout = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def acquire(self):
+        """슬롯 획득 (실패 시 AdmissionRejected)."""
+        with self._cond:
+            # 대기자가 있으면 새 요청이 새치기하지 않도록 대기열 뒤에 선다
+            if self._in_flight < self.max_concurrency and self._queued == 0:
+                self._in_flight += 1
+                self._admitted += 1
+                return
+
+            if self._queued >= self.max_queue:
+                self._rejected_queue_full += 1
+                raise AdmissionRejected(self.name, "queue full", self.retry_after)
+
+            self._queued += 1
+            start = time.monotonic()
+            deadline = start + self.max_wait
+            try:
+                while self._in_flight >= self.max_concurrency:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._rejected_timeout += 1
+                        raise AdmissionRejected(self.name, "queue timeout", self.retry_after)
+                    self._cond.wait(remaining)
+            finally:
+                self._queued -= 1
+
+            waited = time.monotonic() - start
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+            self._in_flight += 1
+            self._admitted += 1
+
+    def release(self):
+        """슬롯 반환."""
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify()
+
+    @contextmanager
+    def slot(self):
+        """`with controller.slot():` 형태로 사용."""
+        self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def stats(self) -> dict:
+        """현재 상태 및 누적 카운터."""
+        with self._cond:
+            return {
+                "max_concurrency": self.max_concurrency,
+                "max_queue": self.max_queue,
+                "in_flight": self._in_flight,
+                "queue_depth": self._queued,
+                "admitted": self._admitted,
+                "rejected_queue_full": self._rejected_queue_full,
+                "rejected_timeout": self._rejected_timeout,
+                "wait_avg_ms": (self._wait_total / self._admitted * 1000) if self._admitted else 0.0,
+                "wait_max_ms": self._wait_max * 1000,
+            }
+
+
+class AdmissionControlledEmbedder(Embedder):
+    """Embedder 데코레이터: encode 호출 전에 AdmissionController 슬롯 획득."""
+
+    def __init__(self, embedder: Embedder, controller: AdmissionController):
+        self.embedder = embedder
+        self.controller = controller
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        with self.controller.slot():
+            return self.embedder.embed(texts)
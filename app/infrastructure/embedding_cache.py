@@ -0,0 +1,222 @@
+"""Persistent, content-addressed embedding cache (SQLite) shared by ingest and serving."""
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import List, Optional, Sequence
+import numpy as np
+
+
+def normalize_text(text: str) -> str:
+    """캐시 키용 정규화: NFC + 공백 정리."""
+    return " ".join(unicodedata.normalize("NFC", text or "").split())
+
+
+def cache_key(model_name: str, text: str) -> str:
+    """(모델명, 정규화 텍스트) 해시."""
+    raw = f"{model_name}\x1f{normalize_text(text)}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class SQLiteEmbeddingCache:
+    """
+    (모델명, 텍스트 해시) → float32 벡터 BLOB 저장소.
+
+    - 여러 프로세스(ingest, gunicorn 워커)가 같은 파일을 공유할 수 있도록 WAL 모드 사용
+    - 연결은 프로세스별로 지연 생성 (preload 후 fork된 워커가 master의 연결을 공유하지 않도록)
+    - read_only=True (서빙): 조회만 - 요청 경로에서 쓰기/커밋이 없어 다른 워커·ingest의 쓰기 잠금을 기다리지 않음
+    - 쓰기 모드 (ingest): last_access 갱신은 모아 두었다가 다음 put_many 트랜잭션에서 한 번에 반영
+    - max_entries 초과 시 last_access 기준 LRU 제거 (항목 수는 누적 카운터로 추적, 초과 시에만 COUNT 재확인)
+    - compact(): LRU 제거 + VACUUM으로 파일 크기 회수
+    """
+
+    def __init__(self, path: str, max_entries: int = 200_000, read_only: bool = False, flush_every: int = 1000):
+        self.path = path
+        self.max_entries = max_entries
+        self.read_only = read_only
+        self.flush_every = flush_every
+        if not read_only:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn_obj: Optional[sqlite3.Connection] = None
+        self._conn_pid: Optional[int] = None
+        self._count = 0
+        self._touched: dict = {}  # key → last_access (쓰기 모드에서 다음 커밋까지 보류)
+        self.hits = 0
+        self.misses = 0
+        _ = self._conn  # 스키마 생성 (경로 오류는 생성 시점에 드러나도록)
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        if self._conn_obj is None or self._conn_pid != os.getpid():
+            if self.read_only:
+                # 읽기 전용: WAL 읽기는 쓰기 잠금과 무관 (잠금 대기 상한도 짧게)
+                conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False, timeout=1)
+            else:
+                conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS embeddings (
+                        key TEXT PRIMARY KEY,
+                        model TEXT NOT NULL,
+                        dim INTEGER NOT NULL,
+                        vector BLOB NOT NULL,
+                        last_access REAL NOT NULL
+                    )
+                    """
+                )
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_last_access ON embeddings(last_access)")
+                conn.commit()
+                self._count = conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+            self._conn_obj = conn
+            self._conn_pid = os.getpid()
+            self._lock = threading.Lock()
+            self._touched = {}
+        return self._conn_obj
+
+    def get_many(self, model_name: str, texts: Sequence[str]) -> List[Optional[np.ndarray]]:
+        """texts 순서대로 캐시된 벡터 (없으면 None). 디스크 쓰기 없음."""
+        keys = [cache_key(model_name, t) for t in texts]
+        found = {}
+        with self._lock:
+            # SQLite 변수 개수 제한 대응: 500개씩 조회
+            for i in range(0, len(keys), 500):
+                batch = keys[i:i + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT key, dim, vector FROM embeddings WHERE key IN ({placeholders})", batch
+                ).fetchall()
+                for key, dim, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32, count=dim)
+            if found and not self.read_only:
+                now = time.time()
+                self._touched.update((k, now) for k in found)
+                if len(self._touched) >= self.flush_every:
+                    self._flush_touched()
+                    self._conn.commit()
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return [found.get(k) for k in keys]
+
+    def _flush_touched(self):
+        """보류된 last_access 갱신 반영 (lock 안에서 호출, 커밋은 호출자)."""
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE embeddings SET last_access = ? WHERE key = ?", [(t, k) for k, t in self._touched.items()]
+            )
+            self._touched = {}
+
+    def put_many(self, model_name: str, texts: Sequence[str], vectors: Sequence[Sequence[float]]):
+        """벡터 저장 (+ 보류된 last_access 갱신) 후 용량 초과 시 LRU 제거. 읽기 전용이면 무시."""
+        if self.read_only:
+            return
+        now = time.time()
+        rows = []
+        for text, vec in zip(texts, vectors):
+            arr = np.asarray(vec, dtype=np.float32)
+            rows.append((cache_key(model_name, text), model_name, arr.shape[0], arr.tobytes(), now))
+        with self._lock:
+            self._flush_touched()
+            # 같은 (모델, 텍스트)의 벡터는 같으므로 기존 항목은 last_access만 갱신 → 새 항목 수 = 삽입된 행 수
+            cur = self._conn.executemany(
+                "INSERT OR IGNORE INTO embeddings (key, model, dim, vector, last_access) VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._count += max(0, cur.rowcount)
+            self._conn.executemany("UPDATE embeddings SET last_access = ? WHERE key = ?", [(now, r[0]) for r in rows])
+            self._conn.commit()
+        if self._count > self.max_entries:
+            self.evict()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def evict(self) -> int:
+        """max_entries를 넘는 만큼 가장 오래 사용되지 않은 항목 제거."""
+        if self.read_only:
+            return 0
+        with self._lock:
+            self._flush_touched()
+            # 다른 프로세스의 쓰기로 카운터가 어긋날 수 있으므로 제거 시점에만 실제 개수 확인
+            self._count = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+            excess = self._count - self.max_entries
+            if excess <= 0:
+                self._conn.commit()
+                return 0
+            self._conn.execute(
+                "DELETE FROM embeddings WHERE key IN "
+                "(SELECT key FROM embeddings ORDER BY last_access ASC LIMIT ?)",
+                (excess,),
+            )
+            self._conn.commit()
+            self._count -= excess
+            return excess
+
+    def compact(self, model_name: Optional[str] = None) -> dict:
+        """
+        LRU 제거 + (선택) 다른 모델의 항목 삭제 + VACUUM.
+
+        Args:
+            model_name: 지정하면 이 모델 이외의 항목을 모두 삭제 (모델 교체 후 정리)
+        """
+        removed = 0
+        if model_name:
+            with self._lock:
+                cur = self._conn.execute("DELETE FROM embeddings WHERE model != ?", (model_name,))
+                removed += cur.rowcount
+                self._conn.commit()
+        removed += self.evict()
+        with self._lock:
+            self._conn.execute("VACUUM")
+        return {"removed": removed, "entries": len(self), "bytes": os.path.getsize(self.path)}
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "path": self.path,
+            "entries": len(self),
+            "max_entries": self.max_entries,
+            "read_only": self.read_only,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+def open_default_cache(read_only: bool = False) -> Optional[SQLiteEmbeddingCache]:
+    """
+    EMBED_CACHE_PATH 환경변수 기반 캐시 (빈 값이면 비활성).
+
+    read_only: 서빙용 - ingest가 채운 파일을 조회만 (파일이 없으면 비활성)
+    """
+    path = os.getenv("EMBED_CACHE_PATH", "data/embedding_cache.sqlite")
+    if not path:
+        return None
+    max_entries = int(os.getenv("EMBED_CACHE_MAX_ENTRIES", "200000"))
+    try:
+        return SQLiteEmbeddingCache(path, max_entries=max_entries, read_only=read_only)
+    except Exception as e:
+        print(f"[EmbedCache] 캐시 비활성 ({path}): {e}")
+        return None
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="임베딩 캐시 관리")
+    parser.add_argument("command", choices=["stats", "compact"])
+    parser.add_argument("--path", default=os.getenv("EMBED_CACHE_PATH", "data/embedding_cache.sqlite"))
+    parser.add_argument("--max-entries", type=int, default=int(os.getenv("EMBED_CACHE_MAX_ENTRIES", "200000")))
+    parser.add_argument("--model", default=None, help="compact 시 이 모델 이외의 항목 삭제")
+    args = parser.parse_args()
+
+    cache = SQLiteEmbeddingCache(args.path, max_entries=args.max_entries)
+    if args.command == "compact":
+        print(cache.compact(model_name=args.model))
+    else:
+        print(cache.stats())
@@ -0,0 +1,463 @@
+"""
+Embedding server - dedicated model process(es) behind a Unix domain socket, results via shared memory.
+
+API 워커(HTTP)는 모델을 로드하지 않고 RemoteEmbedder로 요청만 보낸다.
+서버는 여러 워커의 요청을 짧은 대기(max_wait_ms) 동안 모아 한 번의 배치 forward pass로 처리하고,
+벡터는 연결마다 클라이언트가 만든 공유 메모리 블록에 float32로 직접 써서 돌려준다 (리스트 직렬화 없음).
+
+프로토콜 (4바이트 길이 + JSON, 요청/응답 1:1):
+    hello              → {"dim", "model", "pid"}
+    attach {shm}       → {"ok"}                           연결 전용 공유 메모리 등록
+    embed {texts}      → {"rows", "dim", "inline": false}  벡터는 공유 메모리에 기록
+                       → {"rows", "dim", "inline": true} + rows×dim×4 바이트   (공유 메모리보다 클 때)
+    오류               → {"error"}
+
+실행:
+    python -m app.infrastructure.embedding_server --socket /tmp/perso-embed.sock --processes 2
+"""
+import json
+import os
+import queue
+import signal
+import socket
+import struct
+import threading
+import time
+from dataclasses import dataclass, field
+from multiprocessing import shared_memory
+from typing import List, Optional, Tuple
+import numpy as np
+from app.domain.repositories import Embedder
+
+_HEADER = struct.Struct("!I")
+
+
+class EmbeddingServerError(RuntimeError):
+    """임베딩 서버가 요청 처리 중 오류를 응답했을 때 (연결은 계속 사용 가능)."""
+
+
+def _send(sock: socket.socket, message: dict, data: Optional[memoryview] = None):
+    body = json.dumps(message, ensure_ascii=False).encode("utf-8")
+    sock.sendall(_HEADER.pack(len(body)) + body)
+    if data is not None:
+        sock.sendall(data)
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytearray:
+    buf = bytearray(size)
+    view = memoryview(buf)
+    received = 0
+    while received < size:
+        n = sock.recv_into(view[received:])
+        if n == 0:
+            raise ConnectionError("연결 종료")
+        received += n
+    return buf
+
+
+def _recv(sock: socket.socket) -> dict:
+    (size,) = _HEADER.unpack(_recv_exact(sock, _HEADER.size))
+    return json.loads(_recv_exact(sock, size).decode("utf-8"))
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """클라이언트 소유 공유 메모리에 연결 (정리는 소유자가 하므로 resource tracker 등록 해제)."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+    except TypeError:
+        shm = shared_memory.SharedMemory(name=name)
+        try:
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(shm._name, "shared_memory")
+        except Exception:
+            pass
+        return shm
+
+
+@dataclass
+class _Job:
+    texts: List[str]
+    done: threading.Event = field(default_factory=threading.Event)
+    result: Optional[np.ndarray] = None
+    error: Optional[str] = None
+
+
+class EmbeddingServer:
+    """
+    모델 프로세스 측 서버 (프로세스당 모델 1개, 연결당 스레드 1개, 배치 스레드 1개).
+
+    - 연결 스레드는 요청을 배치 큐에 넣고 결과를 기다린다
+    - 배치 스레드는 첫 요청 이후 max_wait_ms 동안 (또는 max_batch개 텍스트까지) 요청을 모아 embed 1회 호출
+    """
+
+    def __init__(self, embedder: Embedder, max_batch: int = 32, max_wait_ms: float = 2.0, model_name: str = ""):
+        self.embedder = embedder
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self.model_name = model_name or getattr(embedder, "model_name", "")
+        self.dim: Optional[int] = None
+        self._queue: "queue.Queue[Optional[_Job]]" = queue.Queue()
+        self._batcher: Optional[threading.Thread] = None
+        self._listener: Optional[socket.socket] = None
+        self._lock = threading.Lock()
+        self.connections = 0
+        self.requests = 0
+        self.batches = 0
+        self.texts = 0
+        self.max_batch_seen = 0
+
+    def start(self) -> "EmbeddingServer":
+        """배치 스레드 시작 + 차원 확인 (모델 로딩 겸 워밍업)."""
+        if self._batcher is None:
+            self._batcher = threading.Thread(target=self._batch_loop, name="embed-batcher", daemon=True)
+            self._batcher.start()
+            self.dim = int(self.embed(["warmup"]).shape[1])
+        return self
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """배치 큐를 거쳐 임베딩 (float32, texts 순서)."""
+        job = _Job(list(texts))
+        self._queue.put(job)
+        job.done.wait()
+        if job.error is not None:
+            raise EmbeddingServerError(job.error)
+        return job.result
+
+    def _collect(self, first: _Job) -> List[_Job]:
+        jobs, count = [first], len(first.texts)
+        deadline = time.monotonic() + self.max_wait
+        while count < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                job = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if job is None:
+                self._queue.put(None)  # 종료 신호는 다음 루프에서 처리
+                break
+            jobs.append(job)
+            count += len(job.texts)
+        return jobs
+
+    def _batch_loop(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            jobs = self._collect(first)
+            texts = [t for job in jobs for t in job.texts]
+            try:
+                vectors = np.asarray(self.embedder.embed(texts), dtype=np.float32)
+                offset = 0
+                for job in jobs:
+                    job.result = vectors[offset: offset + len(job.texts)]
+                    offset += len(job.texts)
+            except Exception as e:
+                for job in jobs:
+                    job.error = f"{type(e).__name__}: {e}"
+            finally:
+                with self._lock:
+                    self.batches += 1
+                    self.requests += len(jobs)
+                    self.texts += len(texts)
+                    self.max_batch_seen = max(self.max_batch_seen, len(texts))
+                for job in jobs:
+                    job.done.set()
+
+    def _handle(self, conn: socket.socket):
+        shm: Optional[shared_memory.SharedMemory] = None
+        with self._lock:
+            self.connections += 1
+        try:
+            while True:
+                message = _recv(conn)
+                op = message.get("op")
+                if op == "hello":
+                    _send(conn, {"dim": self.dim, "model": self.model_name, "pid": os.getpid()})
+                elif op == "attach":
+                    if shm is not None:
+                        shm.close()
+                    shm = _attach(message["shm"])
+                    _send(conn, {"ok": True})
+                elif op == "embed":
+                    try:
+                        vectors = np.ascontiguousarray(self.embed(message["texts"]))
+                    except EmbeddingServerError as e:
+                        _send(conn, {"error": str(e)})
+                        continue
+                    header = {"rows": int(vectors.shape[0]), "dim": int(vectors.shape[1]) if vectors.ndim == 2 else 0}
+                    data = memoryview(vectors).cast("B")
+                    if shm is not None and vectors.nbytes <= shm.size:
+                        shm.buf[: vectors.nbytes] = data
+                        _send(conn, {**header, "inline": False})
+                    else:
+                        _send(conn, {**header, "inline": True}, data)
+                else:
+                    _send(conn, {"error": f"unknown op: {op}"})
+        except (ConnectionError, OSError):
+            pass  # 클라이언트 연결 종료
+        finally:
+            if shm is not None:
+                shm.close()
+            conn.close()
+            with self._lock:
+                self.connections -= 1
+
+    def serve_forever(self, listener: socket.socket):
+        """수락 루프 (listener는 여러 프로세스가 공유 가능 - 커널이 연결을 분배)."""
+        self.start()
+        self._listener = listener
+        print(f"[EmbedServer] pid={os.getpid()} ready (dim={self.dim}, max_batch={self.max_batch})")
+        while True:
+            try:
+                conn, _ = listener.accept()
+            except OSError:
+                break  # shutdown()
+            threading.Thread(target=self._handle, args=(conn,), name="embed-conn", daemon=True).start()
+
+    def shutdown(self):
+        if self._listener is not None:
+            try:
+                self._listener.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self._listener.close()
+        self._queue.put(None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "connections": self.connections,
+                "requests": self.requests,
+                "batches": self.batches,
+                "texts": self.texts,
+                "avg_batch": self.texts / self.batches if self.batches else 0.0,
+                "max_batch": self.max_batch_seen,
+            }
+
+
+def bind_listener(path: str, backlog: int = 128) -> socket.socket:
+    """Unix 소켓 바인드 (이전 실행이 남긴 소켓 파일은 제거)."""
+    if os.path.exists(path):
+        os.unlink(path)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(path)
+    listener.listen(backlog)
+    return listener
+
+
+class _Connection:
+    """클라이언트 연결 1개 + 연결 전용 공유 메모리 (capacity행까지 공유 메모리로 수신)."""
+
+    def __init__(self, path: str, timeout: float, capacity: int):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.shm: Optional[shared_memory.SharedMemory] = None
+        try:
+            self.sock.settimeout(timeout)
+            self.sock.connect(path)
+            hello = self.call({"op": "hello"})
+            self.dim, self.model_name, self.server_pid = hello["dim"], hello.get("model"), hello.get("pid")
+            self.shm = shared_memory.SharedMemory(create=True, size=max(1, capacity * self.dim * 4))
+            self.call({"op": "attach", "shm": self.shm.name})
+        except Exception:
+            self.close()
+            raise
+
+    def call(self, message: dict) -> dict:
+        _send(self.sock, message)
+        reply = _recv(self.sock)
+        if "error" in reply:
+            raise EmbeddingServerError(reply["error"])
+        return reply
+
+    def embed(self, texts: List[str]) -> Tuple[List[List[float]], bool]:
+        reply = self.call({"op": "embed", "texts": texts})
+        rows, dim = reply["rows"], reply["dim"]
+        if reply["inline"]:
+            data = _recv_exact(self.sock, rows * dim * 4)
+            return np.frombuffer(data, dtype=np.float32).reshape(rows, dim).tolist(), True
+        view = np.frombuffer(self.shm.buf, dtype=np.float32, count=rows * dim).reshape(rows, dim)
+        vectors = view.tolist()
+        del view  # 공유 메모리 버퍼 참조 해제 (close 가능하도록)
+        return vectors, False
+
+    def close(self):
+        self.sock.close()
+        if self.shm is not None:
+            try:
+                self.shm.close()
+                self.shm.unlink()
+            except (BufferError, FileNotFoundError):
+                pass
+            self.shm = None
+
+
+class RemoteEmbedder(Embedder):
+    """
+    임베딩 서버 클라이언트 (API 워커용 Embedder 구현체, 모델을 로드하지 않음).
+
+    - 연결 풀: 스레드마다 연결을 빌려 쓰고 반납 (동시 요청 = 동시 연결 → 서버에서 함께 배치됨)
+    - 끊긴 연결(서버 재시작 등)은 새 연결로 1회 재시도, 그래도 실패하면 ConnectionError
+      → QASearchUseCase의 검색 실패 처리(로컬 인덱스/fallback)로 이어짐
+    """
+
+    def __init__(self, socket_path: str, timeout: float = 5.0, capacity: int = 64, max_idle: int = 16):
+        """
+        Args:
+            socket_path: 임베딩 서버 Unix 소켓 경로
+            timeout: 연결/응답 대기 시간(초)
+            capacity: 연결당 공유 메모리 크기(행 수), 초과 요청은 소켓으로 전송
+            max_idle: 풀에 유지할 유휴 연결 수
+        """
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self.capacity = capacity
+        self.max_idle = max_idle
+        self.cache = None  # 임베딩 캐시는 서버 측에서 사용
+        self.model_name: Optional[str] = None
+        self._idle: List[_Connection] = []
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.inline = 0
+        self.errors = 0
+        self.reconnects = 0
+
+    def _acquire(self) -> _Connection:
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        conn = _Connection(self.socket_path, self.timeout, self.capacity)
+        self.model_name = conn.model_name
+        return conn
+
+    def _release(self, conn: _Connection):
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        for attempt in range(2):
+            conn = None
+            try:
+                conn = self._acquire()
+                vectors, inline = conn.embed(list(texts))
+            except EmbeddingServerError:
+                if conn is not None:
+                    self._release(conn)
+                with self._lock:
+                    self.errors += 1
+                raise
+            except (OSError, ConnectionError, ValueError) as e:
+                if conn is not None:
+                    conn.close()
+                with self._lock:
+                    if attempt == 0:
+                        self.reconnects += 1
+                        continue
+                    self.errors += 1
+                raise ConnectionError(f"임베딩 서버 연결 실패 ({self.socket_path}): {e}") from e
+            self._release(conn)
+            with self._lock:
+                self.requests += 1
+                self.inline += inline
+            return vectors
+
+    def ping(self) -> dict:
+        """서버 연결 확인 (차원/모델/서버 pid)."""
+        conn = self._acquire()
+        info = {"dim": conn.dim, "model": conn.model_name, "pid": conn.server_pid}
+        self._release(conn)
+        return info
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "socket": self.socket_path,
+                "model": self.model_name,
+                "requests": self.requests,
+                "inline": self.inline,
+                "errors": self.errors,
+                "reconnects": self.reconnects,
+                "idle_connections": len(self._idle),
+            }
+
+
+def _serve(listener: socket.socket, args):
+    """모델 프로세스 1개: torch 스레드 설정 → 모델 로드 → 공유 listener에서 수락."""
+    threads = args.threads or max(1, (os.cpu_count() or 1) // args.processes)
+    os.environ["OMP_NUM_THREADS"] = str(threads)
+    try:
+        import torch
+        torch.set_num_threads(threads)
+    except Exception as e:
+        print(f"[EmbedServer] torch 스레드 설정 실패: {e}")
+
+    from app.infrastructure.embedding_cache import open_default_cache
+    from app.infrastructure.repositories import SentenceTransformerEmbedder
+
+    embedder = SentenceTransformerEmbedder(
+        args.model,
+        cache=None if args.no_cache else open_default_cache(read_only=True),
+        batch_size=args.max_batch,
+    )
+    EmbeddingServer(embedder, max_batch=args.max_batch, max_wait_ms=args.max_wait_ms).serve_forever(listener)
+
+
+def main():
+    import argparse
+    import multiprocessing
+
+    parser = argparse.ArgumentParser(description="임베딩 서버 (Unix 소켓 + 공유 메모리)")
+    parser.add_argument("--socket", default=os.getenv("EMBED_SERVER_SOCKET") or "/tmp/perso-embed.sock")
+    parser.add_argument("--model", default=os.getenv("EMBED_MODEL", "snunlp/KR-SBERT-V40K-klueNLI-augSTS"))
+    parser.add_argument("--processes", type=int, default=int(os.getenv("EMBED_SERVER_PROCESSES", "1")), help="모델 프로세스 수")
+    parser.add_argument("--threads", type=int, default=0, help="프로세스당 torch 스레드 (0 = 코어 수 / 프로세스 수)")
+    parser.add_argument("--max-batch", type=int, default=int(os.getenv("EMBED_SERVER_MAX_BATCH", "32")))
+    parser.add_argument("--max-wait-ms", type=float, default=float(os.getenv("EMBED_SERVER_MAX_WAIT_MS", "2")))
+    parser.add_argument("--no-cache", action="store_true", help="영구 임베딩 캐시 비활성")
+    args = parser.parse_args()
+
+    listener = bind_listener(args.socket)
+    print(f"[EmbedServer] {args.socket} (processes={args.processes}, model={args.model})")
+    if args.processes <= 1:
+        try:
+            _serve(listener, args)
+        finally:
+            os.unlink(args.socket)
+        return
+
+    # 같은 listener를 상속한 모델 프로세스 N개 (모델 로딩은 fork 이후 - 프로세스별 torch 스레드 풀)
+    ctx = multiprocessing.get_context("fork")
+    workers = [ctx.Process(target=_serve, args=(listener, args), name=f"embed-{i}") for i in range(args.processes)]
+    for worker in workers:
+        worker.start()
+
+    def stop(*_):
+        for worker in workers:
+            worker.terminate()
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    try:
+        for worker in workers:
+            worker.join()
+    finally:
+        if os.path.exists(args.socket):
+            os.unlink(args.socket)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,64 +1,89 @@
 """Hallucination guard - similarity threshold and source reference."""
-import re
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+from app.domain.entities import QueryProfile
 from app.infrastructure.config import settings
+from app.infrastructure.query_profile import QueryProfiler
+
+
+@dataclass
+class ThresholdRule:
+    """QueryProfile 조건(when) → 임계값 (None = 기본 임계값)."""
+    name: str
+    threshold: Optional[float] = None
+    when: Dict[str, str] = field(default_factory=dict)
+
+
+# 위에서부터 처음 맞는 규칙 적용 - query_rules.json의 "thresholds"로 교체 가능
+DEFAULT_THRESHOLD_RULES: List[ThresholdRule] = [
+    ThresholdRule(name="short", threshold=0.85, when={"length": "short"}),  # 매우 짧은 질문: 엄격 (모호함 방지)
+    ThresholdRule(name="informal", threshold=0.35, when={"marker": "informal"}),  # 구어체: 매우 관대 (Gemini가 의미 필터링)
+    ThresholdRule(name="formal", threshold=None, when={"marker": "formal"}),  # 의문사 있는 정식 질문: 기본
+    ThresholdRule(name="keyword", threshold=0.65, when={"length": "keyword"}),  # 명사형/키워드 질문: 중간
+    ThresholdRule(name="default", threshold=None),
+]
+
+
+def threshold_rules_from_config(rows: Optional[Sequence[dict]]) -> List[ThresholdRule]:
+    """설정의 "thresholds" 목록 → ThresholdRule (없으면 기본 규칙)."""
+    if not rows:
+        return list(DEFAULT_THRESHOLD_RULES)
+    return [ThresholdRule(name=r["name"], threshold=r.get("threshold"), when=r.get("when", {})) for r in rows]
 
 
 class HallucinationGuard:
     """Guard against hallucinations using similarity threshold and source reference."""
     
-    def __init__(self, threshold: Optional[float] = None, use_dynamic: bool = True):
+    def __init__(
+        self,
+        threshold: Optional[float] = None,
+        use_dynamic: bool = True,
+        profiler: Optional[QueryProfiler] = None,
+        threshold_rules: Optional[Sequence[ThresholdRule]] = None,
+    ):
         self.base_threshold = threshold or settings.similarity_threshold
         self.use_dynamic = use_dynamic
+        self.profiler = profiler or QueryProfiler()
+        self.threshold_rules = list(threshold_rules or DEFAULT_THRESHOLD_RULES)
         self.fallback_message = "죄송해요, 제가 가지고 있는 데이터셋에는 해당 내용이 없어요. 비슷한 질문으로 다시 시도해보세요."
     
-    def get_dynamic_threshold(self, query: str) -> float:
+    def get_dynamic_threshold(self, query: str, profile: Optional[QueryProfile] = None) -> float:
         """
-        질문 유형에 따라 동적 임계값 조정.
+        질문 유형에 따라 동적 임계값 조정 (규칙 테이블에서 처음 맞는 규칙).
         
         - 매우 짧은 질문(< 5자): 엄격 (0.85) - 모호함 방지
-        - 구어체/반말: 관대 (0.55)
-        - 의문사 있는 질문: 기본 (0.75)
+        - 구어체/반말: 관대 (0.35)
+        - 의문사 있는 질문: 기본 (base_threshold)
         - 명사형/짧은 질문: 중간 (0.65)
+        
+        Args:
+            profile: 요청 단계에서 이미 계산한 QueryProfile (없으면 query로 분류)
         """
         if not self.use_dynamic:
             return self.base_threshold
         
-        # 매우 짧은 질문(< 5자): 엄격하게 처리 (모호함 방지)
-        if len(query.strip()) < 5:
-            return 0.85  # 엄격
-        
-        # 구어체/반말 패턴 감지: 관대하게 처리 (5자 이상)
-        informal_patterns = r"뭐야|뭐임|뭐예요|얼마야|있어\?|해\?|필요해|지원해|알려줘|설명해줘|가르쳐줘|말해줘|뭐하는|무슨|어떤|이거"
-        if re.search(informal_patterns, query, flags=re.IGNORECASE):
-            return 0.35  # 매우 관대 (Gemini가 의미 필터링 수행)
-        
-        # 의문사 있는 정식 질문: 기본
-        if re.search(r"무엇인가요|어떻게|얼마인가요|누구|언제|어디|왜", query):
-            return self.base_threshold
-        
-        # 명사형/키워드 질문: 중간
-        if len(query.split()) <= 3:
-            return 0.65
-        
+        profile = profile or self.profiler.profile(query)
+        for rule in self.threshold_rules:
+            if profile.matches(rule.when, "guard"):
+                return self.base_threshold if rule.threshold is None else rule.threshold
         return self.base_threshold
     
-    def is_valid(self, similarity_score: float, query: str = "") -> bool:
+    def is_valid(self, similarity_score: float, query: str = "", profile: Optional[QueryProfile] = None) -> bool:
         """
         유사도 점수가 임계값 이상인지 확인 (동적 임계값 적용).
         
         Args:
             similarity_score: 유사도 점수 (0.0 to 1.0)
             query: 사용자 질문 (동적 임계값 계산용)
+            profile: 사용자 질문의 QueryProfile (있으면 재분류 없이 사용)
             
         Returns:
             임계값 통과 여부
         """
-        threshold = self.get_dynamic_threshold(query) if query else self.base_threshold
-        return similarity_score >= threshold
+        if profile is None and not query:
+            return similarity_score >= self.base_threshold
+        return similarity_score >= self.get_dynamic_threshold(query, profile=profile)
         
     def get_fallback_message(self) -> str:
         """임계값 미달 시 반환할 메시지."""
         return self.fallback_message
-
-
@@ -0,0 +1,220 @@
+"""Multi-tenant knowledge bases - per-KB config, lazy loading, LRU eviction under a memory budget."""
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Generic, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class UnknownKnowledgeBase(KeyError):
+    """설정에 없는 KB id (→ HTTP 404)."""
+
+    def __init__(self, kb_id: str):
+        super().__init__(kb_id)
+        self.kb_id = kb_id
+
+
+@dataclass
+class KnowledgeBaseConfig:
+    """
+    KB 하나의 설정 (None 필드는 서버 기본값 사용).
+
+    - standard_questions/prompt_path: Gemini rewrite 대상 표준 질문과 시스템 프롬프트
+      (둘 다 없으면 GeminiQueryRewriter 기본값 = Perso.ai)
+    - local_index_path/lexical_index_path/pca_path: 컬렉션 버전에 묶인 로컬 인덱스·PCA 투영 파일 (KB마다 별도)
+    """
+    id: str
+    collection: str
+    name: str = ""
+    standard_questions: Optional[List[str]] = None
+    prompt_path: Optional[str] = None
+    threshold: Optional[float] = None
+    query_rules_path: Optional[str] = None
+    local_index_path: Optional[str] = None
+    lexical_index_path: Optional[str] = None
+    pca_path: Optional[str] = None
+
+    def load_prompt(self) -> Optional[str]:
+        if not self.prompt_path:
+            return None
+        with open(self.prompt_path, encoding="utf-8") as f:
+            return f.read()
+
+
+def load_kb_configs(
+    path: Optional[str],
+    default_collection: str,
+    data_dir: str = "data/kb",
+) -> Tuple[Dict[str, KnowledgeBaseConfig], str]:
+    """
+    KB 설정 파일 (JSON) → (id → 설정, 기본 KB id).
+
+    형식:
+        {"default": "perso",
+         "knowledge_bases": [
+            {"id": "perso", "collection": "qa_collection", "name": "Perso.ai"},
+            {"id": "acme", "collection": "acme_faq", "name": "ACME",
+             "standard_questions": ["..."], "prompt_path": "kb/acme/prompt.txt", "threshold": 0.8}]}
+
+    파일이 없으면 default_collection 하나짜리 "default" KB (기존 단일 KB 동작).
+    기본 KB가 아닌 KB의 로컬 인덱스 경로 기본값은 data_dir/<id>/ 아래.
+    """
+    if not path or not os.path.exists(path):
+        return {"default": KnowledgeBaseConfig(id="default", collection=default_collection)}, "default"
+
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    configs: Dict[str, KnowledgeBaseConfig] = {}
+    for row in data.get("knowledge_bases", []):
+        config = KnowledgeBaseConfig(**row)
+        if config.id in configs:
+            raise ValueError(f"KB id 중복: {config.id}")
+        configs[config.id] = config
+    if not configs:
+        raise ValueError(f"KB 설정이 비어 있습니다: {path}")
+
+    default = data.get("default") or next(iter(configs))
+    if default not in configs:
+        raise ValueError(f"기본 KB가 목록에 없습니다: {default}")
+    for kb_id, config in configs.items():
+        if kb_id != default:
+            config.local_index_path = config.local_index_path or os.path.join(data_dir, kb_id, "local_index.npz")
+            config.lexical_index_path = config.lexical_index_path or os.path.join(data_dir, kb_id, "lexical_index.json")
+            config.pca_path = config.pca_path or os.path.join(data_dir, kb_id, "pca_projection.npz")
+    return configs, default
+
+
+class KnowledgeBaseRegistry(Generic[T]):
+    """
+    KB id → 리소스 (첫 요청 시 loader로 로드, LRU 제거).
+
+    - 같은 KB의 동시 첫 요청은 한 번만 로드 (KB별 로드 잠금, 다른 KB 요청은 막지 않음)
+    - 로드 후 max_loaded 또는 memory_budget(바이트, sizeof 추정치 합)을 넘으면
+      가장 오래 사용하지 않은 KB부터 제거 (방금 로드한 KB와 pinned KB는 제외)
+    - 제거된 리소스는 on_evict로 정리 (진행 중인 요청은 기존 객체로 끝까지 처리)
+    """
+
+    def __init__(
+        self,
+        configs: Dict[str, KnowledgeBaseConfig],
+        loader: Callable[[KnowledgeBaseConfig], T],
+        default: str,
+        max_loaded: int = 0,
+        memory_budget: int = 0,
+        sizeof: Callable[[T], int] = lambda _: 0,
+        on_evict: Optional[Callable[[str, T], None]] = None,
+        pinned: Tuple[str, ...] = (),
+    ):
+        """
+        Args:
+            max_loaded: 동시에 메모리에 둘 KB 수 (0 = 제한 없음)
+            memory_budget: KB 리소스 메모리 예산 바이트 (0 = 제한 없음)
+            pinned: 제거하지 않을 KB id (예: 기본 KB)
+        """
+        self.configs = configs
+        self.loader = loader
+        self.default = default
+        self.max_loaded = max_loaded
+        self.memory_budget = memory_budget
+        self.sizeof = sizeof
+        self.on_evict = on_evict
+        self.pinned = set(pinned)
+        self._loaded: "OrderedDict[str, T]" = OrderedDict()
+        self._load_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.loads = 0
+        self.evictions = 0
+        self.load_ms: Dict[str, float] = {}
+
+    def resolve(self, kb_id: Optional[str]) -> str:
+        kb_id = kb_id or self.default
+        if kb_id not in self.configs:
+            raise UnknownKnowledgeBase(kb_id)
+        return kb_id
+
+    def peek(self, kb_id: Optional[str] = None) -> Optional[T]:
+        """로드된 리소스 (없으면 None, 로드하지 않음)."""
+        with self._lock:
+            return self._loaded.get(kb_id or self.default)
+
+    def get(self, kb_id: Optional[str] = None) -> T:
+        kb_id = self.resolve(kb_id)
+        with self._lock:
+            resource = self._loaded.get(kb_id)
+            if resource is not None:
+                self._loaded.move_to_end(kb_id)
+                return resource
+            load_lock = self._load_locks.setdefault(kb_id, threading.Lock())
+
+        with load_lock:
+            with self._lock:
+                resource = self._loaded.get(kb_id)
+            if resource is not None:
+                return resource
+            started = time.perf_counter()
+            resource = self.loader(self.configs[kb_id])
+            with self._lock:
+                self._loaded[kb_id] = resource
+                self.loads += 1
+                self.load_ms[kb_id] = round((time.perf_counter() - started) * 1000, 1)
+                victims = self._select_victims(keep=kb_id)
+            print(f"[KB] {kb_id} 로드 ({self.load_ms[kb_id]:.0f} ms, 로드된 KB {len(self._loaded)}개)")
+        self._dispose(victims)
+        return resource
+
+    def _select_victims(self, keep: str) -> List[Tuple[str, T]]:
+        """예산 초과분을 LRU 순으로 골라 _loaded에서 제거 (잠금 안에서 호출)."""
+        victims = []
+        total = sum(self.sizeof(r) for r in self._loaded.values()) if self.memory_budget else 0
+        for kb_id in list(self._loaded):
+            over_count = self.max_loaded and len(self._loaded) > self.max_loaded
+            over_memory = self.memory_budget and total > self.memory_budget
+            if not (over_count or over_memory):
+                break
+            if kb_id == keep or kb_id in self.pinned:
+                continue
+            resource = self._loaded.pop(kb_id)
+            total -= self.sizeof(resource) if self.memory_budget else 0
+            victims.append((kb_id, resource))
+        return victims
+
+    def _dispose(self, victims: List[Tuple[str, T]]):
+        for kb_id, resource in victims:
+            self.evictions += 1
+            print(f"[KB] {kb_id} 제거 (LRU)")
+            if self.on_evict is not None:
+                try:
+                    self.on_evict(kb_id, resource)
+                except Exception as e:
+                    print(f"[KB] {kb_id} 정리 실패: {e}")
+
+    def evict(self, kb_id: str) -> bool:
+        with self._lock:
+            resource = self._loaded.pop(kb_id, None)
+        if resource is None:
+            return False
+        self._dispose([(kb_id, resource)])
+        return True
+
+    def loaded(self) -> List[str]:
+        with self._lock:
+            return list(self._loaded)
+
+    def stats(self) -> dict:
+        with self._lock:
+            loaded = list(self._loaded.items())
+        return {
+            "configured": len(self.configs),
+            "default": self.default,
+            "loaded": [kb_id for kb_id, _ in loaded],
+            "memory_bytes": sum(self.sizeof(r) for _, r in loaded),
+            "memory_budget": self.memory_budget or None,
+            "max_loaded": self.max_loaded or None,
+            "loads": self.loads,
+            "evictions": self.evictions,
+            "load_ms": dict(self.load_ms),
+        }
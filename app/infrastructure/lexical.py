@@ -0,0 +1,215 @@
+"""Lexical retriever - character n-gram BM25 inverted index over questions and answers."""
+import json
+import math
+import os
+import re
+import unicodedata
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Sequence, Tuple
+from qdrant_client import QdrantClient
+from app.domain.entities import QAPair
+from app.domain.repositories import Retriever
+
+_NON_WORD = re.compile(r"[^\w]+")
+
+
+def tokenize(text: str, ngram_range: Tuple[int, int] = (2, 3)) -> List[str]:
+    """
+    어절 단위 문자 n-gram.
+
+    형태소 분석기 없이도 조사/어미가 붙은 형태("요금은", "요금제")가 같은 n-gram("요금")을 공유한다.
+    n-gram은 어절 경계를 넘지 않으며, 최소 길이보다 짧은 어절(예: "AI")은 그대로 사용.
+    """
+    lo, hi = ngram_range
+    normalized = _NON_WORD.sub(" ", unicodedata.normalize("NFC", text or "").lower())
+    grams = []
+    for word in normalized.split():
+        if len(word) < lo:
+            grams.append(word)
+            continue
+        for n in range(lo, min(hi, len(word)) + 1):
+            grams.extend(word[i:i + n] for i in range(len(word) - n + 1))
+    return grams
+
+
+class LexicalRetriever(Retriever):
+    """
+    질문/답변 문자 n-gram BM25 검색 (짧은 키워드 질문용, 임베딩/Gemini 없이 동작).
+
+    - 순위: 질문 필드 가중 BM25 (답변 n-gram은 answer_weight 비율로 반영)
+    - QAPair.score: 질의 n-gram 중 매칭 질문에 포함된 비율 (IDF 가중, 0~1) → 단축 판단(confident)과 순위에만 사용
+      (코사인과 다른 척도라 가드에 쓰지 않음 - fuse_lexical은 가드에 벡터 점수를 넘기고, 어휘 결과에만 있는 후보는 0.0)
+    - confident(): 두 어절 이상이 매칭 질문에 걸리고, 점수가 높고 2위와 BM25 격차가 충분하면
+      임베딩/Gemini 단계를 생략해도 되는 매칭으로 판단 (단일 키워드는 커버리지 1.0이어도 단축하지 않음)
+    """
+
+    def __init__(
+        self,
+        pairs: Sequence[QAPair],
+        ngram_range: Tuple[int, int] = (2, 3),
+        k1: float = 1.2,
+        b: float = 0.75,
+        answer_weight: float = 0.3,
+        shortcut_score: float = 0.9,
+        shortcut_margin: float = 1.3,
+        shortcut_min_words: int = 2,
+        source: Optional[str] = None,
+        postings: Optional[Dict[str, List[Tuple[int, int, int]]]] = None,
+    ):
+        """
+        Args:
+            shortcut_score: 단축 응답에 필요한 최소 점수 (질의 n-gram 커버리지)
+            shortcut_margin: 1위 BM25가 2위의 몇 배 이상이어야 단축 응답하는지 (모호한 키워드 방지)
+            shortcut_min_words: 단축 응답에 필요한 최소 매칭 어절 수 ("요금", "고객센터" 같은 단일 키워드 제외)
+            postings: 저장된 역색인 (없으면 pairs에서 구축)
+        """
+        self.pairs = [QAPair(question=p.question, answer=p.answer, id=p.id) for p in pairs]
+        self.ngram_range = tuple(ngram_range)
+        self.k1 = k1
+        self.b = b
+        self.answer_weight = answer_weight
+        self.shortcut_score = shortcut_score
+        self.shortcut_margin = shortcut_margin
+        self.shortcut_min_words = shortcut_min_words
+        self.source = source  # 원본 컬렉션(버전) 이름 - alias 전환 시 재구축 판단용
+        self.postings = postings if postings is not None else self._build_postings()
+
+        # 필드 가중 문서 길이 / 질문 n-gram 집합 (커버리지 계산용)
+        lengths = [0.0] * len(self.pairs)
+        self._question_grams: List[set] = [set() for _ in self.pairs]
+        for gram, entries in self.postings.items():
+            for doc, tf_q, tf_a in entries:
+                lengths[doc] += tf_q + self.answer_weight * tf_a
+                if tf_q:
+                    self._question_grams[doc].add(gram)
+        self._doc_len = lengths
+        self._avg_len = (sum(lengths) / len(lengths)) if lengths else 1.0
+        n = len(self.pairs)
+        self._idf = {g: math.log(1 + (n - len(e) + 0.5) / (len(e) + 0.5)) for g, e in self.postings.items()}
+        self._unknown_idf = math.log(1 + (n + 0.5) / 0.5)  # 색인에 없는 n-gram (커버리지 분모에 포함)
+
+    def _build_postings(self) -> Dict[str, List[Tuple[int, int, int]]]:
+        postings: Dict[str, List[Tuple[int, int, int]]] = defaultdict(list)
+        for doc, pair in enumerate(self.pairs):
+            tf_q = Counter(tokenize(pair.question, self.ngram_range))
+            tf_a = Counter(tokenize(pair.answer, self.ngram_range))
+            for gram in tf_q.keys() | tf_a.keys():
+                postings[gram].append((doc, tf_q.get(gram, 0), tf_a.get(gram, 0)))
+        return dict(postings)
+
+    def __len__(self) -> int:
+        return len(self.pairs)
+
+    def memory_bytes(self) -> int:
+        """메모리 사용량 추정 (posting 튜플 ~72B, n-gram 키/idf ~160B, 질문/답변 텍스트)."""
+        entries = sum(len(e) for e in self.postings.values())
+        texts = sum(len(p.question.encode()) + len(p.answer.encode()) for p in self.pairs)
+        return entries * 72 + len(self.postings) * 160 + texts
+
+    @classmethod
+    def from_qdrant(cls, client: QdrantClient, collection: str, page_size: int = 256, **kwargs) -> "LexicalRetriever":
+        """
+        Qdrant 컬렉션 payload(question/answer)를 scroll하여 색인 생성 (벡터는 내려받지 않음).
+        paraphrase 형제 포인트는 같은 QA의 중복 문서가 되므로 제외 (BM25 1·2위 격차 판단 왜곡 방지).
+        """
+        pairs, offset = [], None
+        while True:
+            points, offset = client.scroll(
+                collection_name=collection,
+                limit=page_size,
+                offset=offset,
+                with_payload=["question", "answer", "paraphrase"],
+                with_vectors=False,
+            )
+            for p in points:
+                payload = p.payload or {}
+                if payload.get("paraphrase"):
+                    continue
+                pairs.append(QAPair(question=payload.get("question", ""), answer=payload.get("answer", ""), id=p.id))
+            if offset is None:
+                break
+        return cls(pairs, **kwargs)
+
+    def save(self, path: str):
+        """QA 목록 + 역색인을 JSON으로 저장 (인제스트 시 생성 → 서버 기동 시 로드)."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        data = {
+            "source": self.source,
+            "ngram_range": list(self.ngram_range),
+            "pairs": [[p.question, p.answer, p.id] for p in self.pairs],
+            "postings": self.postings,
+        }
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str, **kwargs) -> "LexicalRetriever":
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(
+            [QAPair(question=row[0], answer=row[1], id=row[2] if len(row) > 2 else None) for row in data["pairs"]],
+            ngram_range=tuple(data.get("ngram_range", (2, 3))),
+            source=data.get("source"),
+            postings={g: [tuple(e) for e in entries] for g, entries in data["postings"].items()},
+            **kwargs,
+        )
+
+    def _rank(self, query: str, top_k: int) -> List[Tuple[int, float, float]]:
+        """[(doc, bm25, coverage)] BM25 내림차순."""
+        grams = set(tokenize(query, self.ngram_range))
+        if not grams or not self.pairs:
+            return []
+
+        scores: Dict[int, float] = defaultdict(float)
+        for gram in grams:
+            idf = self._idf.get(gram)
+            if idf is None:
+                continue
+            for doc, tf_q, tf_a in self.postings[gram]:
+                tf = tf_q + self.answer_weight * tf_a
+                norm = self.k1 * (1 - self.b + self.b * self._doc_len[doc] / self._avg_len)
+                scores[doc] += idf * tf * (self.k1 + 1) / (tf + norm)
+
+        total_idf = sum(self._idf.get(g, self._unknown_idf) for g in grams)
+        ranked = sorted(scores.items(), key=lambda x: x[1], reverse=True)[:top_k]
+        results = []
+        for doc, bm25 in ranked:
+            covered = sum(self._idf[g] for g in grams & self._question_grams[doc])
+            results.append((doc, bm25, covered / total_idf))
+        return results
+
+    def _pair(self, doc: int, score: float) -> QAPair:
+        pair = self.pairs[doc]
+        return QAPair(question=pair.question, answer=pair.answer, score=score, id=pair.id)
+
+    def search(self, query: str, top_k: int = 3) -> List[QAPair]:
+        return [
+            self._pair(doc, coverage) for doc, _, coverage in self._rank(query, top_k)
+        ]
+
+    def confident(self, query: str, top_k: int = 3) -> Tuple[List[QAPair], bool]:
+        """
+        검색 + 단축 응답 가능 여부.
+
+        Returns:
+            (결과 목록, 1위가 충분히 확실한 매칭인지)
+        """
+        ranked = self._rank(query, max(top_k, 2))
+        pairs = [
+            self._pair(doc, coverage) for doc, _, coverage in ranked[:top_k]
+        ]
+        if not ranked or ranked[0][2] < self.shortcut_score:
+            return pairs, False
+        if len(ranked) > 1 and ranked[0][1] < ranked[1][1] * self.shortcut_margin:
+            return pairs, False
+        if self._matched_words(query, ranked[0][0]) < self.shortcut_min_words:
+            return pairs, False
+        return pairs, True
+
+    def _matched_words(self, query: str, doc: int) -> int:
+        """질의 어절 중 n-gram이 하나라도 doc 질문에 들어 있는 어절 수."""
+        words = _NON_WORD.sub(" ", unicodedata.normalize("NFC", query or "").lower()).split()
+        grams = self._question_grams[doc]
+        return sum(1 for w in words if grams.intersection(tokenize(w, self.ngram_range)))
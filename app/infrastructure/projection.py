@@ -0,0 +1,200 @@
+"""PCA dimension reduction - reduced first-stage collection for full-precision rescoring."""
+import os
+from typing import List, Optional
+import numpy as np
+from qdrant_client import QdrantClient
+from qdrant_client.http import models
+from app.infrastructure.qdrant_admin import (
+    drop_reduced_collections, reduced_collection_name, vector_params, wait_for_points,
+)
+
+
+class PcaProjection:
+    """
+    D차원 임베딩 → d차원 (평균 제거 후 상위 주성분 투영 + L2 정규화).
+
+    ingest 시 원본 컬렉션 벡터로 학습해 .npz로 저장하고, 서빙은 같은 파일로 질의를 투영한다.
+    source는 학습에 쓴 원본 컬렉션(버전) 이름 - 축소 컬렉션 이름과 alias 전환 시 유효성 판단에 사용.
+    points는 축소 컬렉션을 만들 때의 원본 포인트 수 - 같은 이름으로 재인제스트된 경우를 판단 (projection_matches).
+    """
+
+    def __init__(
+        self,
+        mean: np.ndarray,
+        components: np.ndarray,
+        source: str,
+        explained: float = 0.0,
+        points: Optional[int] = None,
+    ):
+        self.mean = np.asarray(mean, dtype=np.float32)
+        self.components = np.asarray(components, dtype=np.float32)  # (d, D)
+        self.source = source
+        self.explained = float(explained)  # 유지한 주성분의 설명 분산 비율
+        self.points = points
+
+    @classmethod
+    def fit(
+        cls,
+        vectors: np.ndarray,
+        dim: int,
+        source: str,
+        max_samples: int = 50000,
+        seed: int = 0,
+    ) -> "PcaProjection":
+        """
+        공분산(D×D) 고유분해로 상위 dim개 주성분 학습.
+
+        포인트 수가 많으면 max_samples개만 샘플링 (D=768이면 공분산 계산이 지배적).
+        dim은 포인트 수/원본 차원을 넘지 않도록 줄인다.
+        """
+        x = np.asarray(vectors, dtype=np.float32)
+        if x.ndim != 2 or not len(x):
+            raise ValueError("PCA 학습용 벡터가 비어 있습니다.")
+        if len(x) > max_samples:
+            x = x[np.random.default_rng(seed).choice(len(x), size=max_samples, replace=False)]
+        dim = max(1, min(dim, x.shape[0], x.shape[1]))
+        mean = x.mean(axis=0)
+        centered = (x - mean).astype(np.float64)
+        cov = centered.T @ centered / max(len(x) - 1, 1)
+        eigvals, eigvecs = np.linalg.eigh(cov)  # 오름차순
+        order = np.argsort(eigvals)[::-1][:dim]
+        total = float(eigvals.clip(min=0).sum())
+        explained = float(eigvals[order].clip(min=0).sum()) / total if total > 0 else 1.0
+        return cls(mean, eigvecs[:, order].T, source=source, explained=explained)
+
+    @property
+    def dim(self) -> int:
+        return self.components.shape[0]
+
+    @property
+    def input_dim(self) -> int:
+        return self.components.shape[1]
+
+    @property
+    def collection(self) -> str:
+        """축소 벡터를 담은 Qdrant 컬렉션 이름."""
+        return reduced_collection_name(self.source, self.dim)
+
+    def apply(self, vectors) -> np.ndarray:
+        """(N, D) → (N, d) 정규화 float32 (축소 공간 코사인 = 1차 검색 점수)."""
+        x = np.asarray(vectors, dtype=np.float32).reshape(-1, self.input_dim)
+        y = (x - self.mean) @ self.components.T
+        return y / np.maximum(np.linalg.norm(y, axis=1, keepdims=True), 1e-12)
+
+    def memory_bytes(self) -> int:
+        return self.mean.nbytes + self.components.nbytes
+
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        np.savez(
+            path,
+            mean=self.mean,
+            components=self.components,
+            source=np.array(self.source),
+            explained=np.array(self.explained),
+            points=np.array(-1 if self.points is None else self.points),
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "PcaProjection":
+        data = np.load(path, allow_pickle=False)
+        points = int(data["points"]) if "points" in data.files else -1  # 이전 형식 파일은 포인트 수 없음
+        return cls(
+            data["mean"], data["components"], source=str(data["source"]), explained=float(data["explained"]),
+            points=points if points >= 0 else None,
+        )
+
+
+def projection_matches(client: QdrantClient, projection: PcaProjection, collection: str) -> bool:
+    """
+    투영이 현재 데이터와 맞는지: 원본 컬렉션과 축소 컬렉션의 포인트 수가 학습 당시(points)와 같을 때만 True.
+
+    같은 컬렉션 이름으로 재인제스트되면 source는 그대로이므로 이름만으로는 판단할 수 없다.
+    포인트 수를 모르는 이전 형식 파일, 축소 컬렉션이 없는 경우는 False (원본 벡터 검색).
+    """
+    if projection.points is None or not client.collection_exists(projection.collection):
+        return False
+    return (
+        client.count(collection, exact=True).count == projection.points
+        and client.count(projection.collection, exact=True).count == projection.points
+    )
+
+
+def drop_projection(client: QdrantClient, source: str, path: str) -> List[str]:
+    """
+    원본 컬렉션의 축소 컬렉션과 투영 파일 삭제 (제자리 재인제스트 - 축소 벡터가 원본과 어긋나지 않도록).
+    투영 파일은 source가 같을 때만 지움 (다른 컬렉션용 파일은 유지).
+    """
+    removed = drop_reduced_collections(client, source)
+    if os.path.exists(path):
+        try:
+            stale = PcaProjection.load(path).source == source
+        except Exception:
+            stale = True
+        if stale:
+            os.remove(path)
+            removed.append(path)
+    return removed
+
+
+def build_reduced_collection(
+    client: QdrantClient,
+    source: str,
+    dim: int,
+    path: str,
+    m: int = 16,
+    ef_construct: int = 100,
+    page_size: int = 256,
+    batch_size: int = 512,
+) -> PcaProjection:
+    """
+    원본 컬렉션 전체로 PCA 학습 → 축소 컬렉션({source}_pca{dim}) 재생성 → 투영 파일 저장.
+
+    축소 컬렉션은 같은 id/payload에 d차원 벡터만 담아 RAM에 상주시키고 (양자화 없음),
+    원본 컬렉션은 재채점용으로만 읽으므로 QDRANT_ON_DISK=1과 함께 쓰면 RAM 사용량이 d/D 수준으로 줄어든다.
+    """
+    ids: List = []
+    payloads: List[dict] = []
+    vectors: List = []
+    offset = None
+    while True:
+        points, offset = client.scroll(
+            collection_name=source,
+            limit=page_size,
+            offset=offset,
+            with_payload=True,
+            with_vectors=True,
+        )
+        for p in points:
+            ids.append(p.id)
+            payloads.append(p.payload or {})
+            vectors.append(p.vector)
+        if offset is None:
+            break
+
+    projection = PcaProjection.fit(np.asarray(vectors, dtype=np.float32), dim, source=source)
+    projection.points = len(ids)
+    reduced = projection.apply(vectors)
+    name = projection.collection
+    if client.collection_exists(name):
+        client.delete_collection(name)
+    client.create_collection(
+        collection_name=name,
+        vectors_config=vector_params(projection.dim, m=m, ef_construct=ef_construct),
+        optimizers_config=models.OptimizersConfigDiff(indexing_threshold=10000),
+    )
+    for start in range(0, len(ids), batch_size):
+        client.upsert(
+            collection_name=name,
+            points=models.Batch(
+                ids=ids[start:start + batch_size],
+                vectors=reduced[start:start + batch_size].tolist(),
+                payloads=payloads[start:start + batch_size],
+            ),
+            wait=False,
+        )
+    if not wait_for_points(client, name, expected=len(ids)):
+        raise RuntimeError(f"축소 컬렉션 '{name}' 인덱싱이 제한 시간 내 완료되지 않았습니다.")
+    drop_reduced_collections(client, source, keep=name)  # 다른 차원으로 만든 이전 축소 컬렉션
+    projection.save(path)
+    return projection
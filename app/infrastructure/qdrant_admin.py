@@ -0,0 +1,266 @@
+"""Qdrant collection administration - vector/quantization config and blue/green reindexing via aliases."""
+import os
+import re
+import time
+import threading
+from typing import Callable, List, Optional, Tuple
+from qdrant_client import QdrantClient
+from qdrant_client.http import models
+
+
+QUANTIZATION_KINDS = ("none", "scalar", "product")
+
+
+def quantization_config(kind: str = "none", compression: str = "x16", always_ram: bool = True):
+    """
+    양자화 설정.
+
+    - scalar: float32 → int8 (메모리 1/4, 재현율 손실 작음)
+    - product: 서브벡터 코드북 (compression 배 압축, 손실 큼 → rescore 권장)
+    - always_ram: 양자화 벡터는 항상 RAM에 유지 (원본은 on_disk로 내려도 검색 속도 유지)
+    """
+    kind = (kind or "none").lower()
+    if kind == "none":
+        return None
+    if kind == "scalar":
+        return models.ScalarQuantization(
+            scalar=models.ScalarQuantizationConfig(type=models.ScalarType.INT8, quantile=0.99, always_ram=always_ram)
+        )
+    if kind == "product":
+        return models.ProductQuantization(
+            product=models.ProductQuantizationConfig(
+                compression=models.CompressionRatio(compression.lower()), always_ram=always_ram
+            )
+        )
+    raise ValueError(f"지원하지 않는 양자화 방식: {kind} (가능: {', '.join(QUANTIZATION_KINDS)})")
+
+
+def vector_params(
+    size: int,
+    quantization: str = "none",
+    on_disk: bool = False,
+    m: int = 16,
+    ef_construct: int = 100,
+    compression: str = "x16",
+) -> models.VectorParams:
+    """
+    컬렉션 벡터 설정 (HNSW + 양자화 + 원본 저장 위치).
+
+    Args:
+        on_disk: 원본 float 벡터를 디스크(mmap)에 저장 - 양자화와 함께 쓰면 RAM 사용량을 크게 줄임
+    """
+    return models.VectorParams(
+        size=size,
+        distance=models.Distance.COSINE,
+        hnsw_config=models.HnswConfigDiff(
+            m=m,  # 각 노드 연결 수 (16 = balanced)
+            ef_construct=ef_construct,  # 색인 구축 탐색 깊이
+            full_scan_threshold=10000,
+        ),
+        quantization_config=quantization_config(quantization, compression=compression),
+        on_disk=on_disk or None,
+    )
+
+
+def vector_params_from_env(size: int) -> models.VectorParams:
+    """QDRANT_QUANTIZATION / QDRANT_PQ_COMPRESSION / QDRANT_ON_DISK / HNSW_M / HNSW_EF_CONSTRUCT 기반 설정."""
+    return vector_params(
+        size,
+        quantization=os.getenv("QDRANT_QUANTIZATION", "none"),
+        on_disk=os.getenv("QDRANT_ON_DISK", "0") == "1",
+        m=int(os.getenv("HNSW_M", "16")),
+        ef_construct=int(os.getenv("HNSW_EF_CONSTRUCT", "100")),
+        compression=os.getenv("QDRANT_PQ_COMPRESSION", "x16"),
+    )
+
+
+def versioned_name(alias: str, version: int) -> str:
+    """alias → '{alias}_v{version}' (예: qa_collection_v3)."""
+    return f"{alias}_v{version}"
+
+
+def reduced_collection_name(collection: str, dim: int) -> str:
+    """원본 컬렉션 → PCA 축소 벡터 컬렉션 이름 (예: qa_collection_v3_pca128)."""
+    return f"{collection}_pca{dim}"
+
+
+def drop_reduced_collections(client: QdrantClient, collection: str, keep: Optional[str] = None) -> List[str]:
+    """원본 컬렉션에 딸린 축소 컬렉션 삭제 (keep 제외)."""
+    pattern = re.compile(rf"^{re.escape(collection)}_pca\d+$")
+    removed = []
+    for c in client.get_collections().collections:
+        if pattern.match(c.name) and c.name != keep:
+            client.delete_collection(c.name)
+            removed.append(c.name)
+    return removed
+
+
+def list_versions(client: QdrantClient, alias: str) -> List[Tuple[int, str]]:
+    """alias에 속한 버전 컬렉션 목록 [(version, name)] (버전 오름차순)."""
+    pattern = re.compile(rf"^{re.escape(alias)}_v(\d+)$")
+    versions = []
+    for c in client.get_collections().collections:
+        m = pattern.match(c.name)
+        if m:
+            versions.append((int(m.group(1)), c.name))
+    return sorted(versions)
+
+
+def next_version_name(client: QdrantClient, alias: str) -> str:
+    versions = list_versions(client, alias)
+    return versioned_name(alias, versions[-1][0] + 1 if versions else 1)
+
+
+def resolve_alias(client: QdrantClient, alias: str) -> Optional[str]:
+    """alias가 가리키는 실제 컬렉션 이름 (alias가 아니면 None)."""
+    for a in client.get_aliases().aliases:
+        if a.alias_name == alias:
+            return a.collection_name
+    return None
+
+
+def swap_alias(client: QdrantClient, alias: str, collection: str) -> Optional[str]:
+    """
+    alias를 새 컬렉션으로 원자적으로 전환 (삭제+생성을 한 요청으로 처리).
+
+    alias와 같은 이름의 일반 컬렉션이 있으면(최초 전환) alias를 만들 수 없으므로
+    해당 컬렉션을 삭제한 뒤 alias를 생성한다 (최초 1회만 짧은 공백 발생).
+
+    Returns:
+        이전에 alias가 가리키던 컬렉션 이름
+    """
+    previous = resolve_alias(client, alias)
+    if previous is None and any(c.name == alias for c in client.get_collections().collections):
+        print(f"[ALIAS] '{alias}'는 일반 컬렉션 → 삭제 후 alias로 전환 (최초 1회)")
+        client.delete_collection(alias)
+
+    operations = []
+    if previous is not None:
+        operations.append(models.DeleteAliasOperation(delete_alias=models.DeleteAlias(alias_name=alias)))
+    operations.append(
+        models.CreateAliasOperation(create_alias=models.CreateAlias(collection_name=collection, alias_name=alias))
+    )
+    client.update_collection_aliases(change_aliases_operations=operations)
+    print(f"[ALIAS] {alias}: {previous} → {collection}")
+    return previous
+
+
+def warm_up(client: QdrantClient, collection: str, n_queries: int = 32, top_k: int = 5) -> int:
+    """
+    저장된 벡터로 검색을 몇 번 실행해 인덱스/페이지를 메모리에 올림 (alias 전환 전 워밍업).
+
+    Returns:
+        실행한 쿼리 수
+    """
+    points, _ = client.scroll(collection_name=collection, limit=n_queries, with_payload=False, with_vectors=True)
+    for p in points:
+        client.search(collection_name=collection, query_vector=p.vector, limit=top_k)
+    return len(points)
+
+
+def wait_for_points(client: QdrantClient, collection: str, expected: int, timeout: float = 300.0) -> bool:
+    """wait=False 업서트가 모두 반영될 때까지 대기 (포인트 수 + 컬렉션 상태 green)."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        count = client.count(collection_name=collection, exact=True).count
+        status = client.get_collection(collection).status
+        if count >= expected and status == models.CollectionStatus.GREEN:
+            return True
+        time.sleep(1.0)
+    return False
+
+
+def gc_versions(client: QdrantClient, alias: str, keep: int = 2) -> List[str]:
+    """
+    최근 keep개 버전만 남기고 삭제 (alias가 가리키는 버전은 항상 유지).
+
+    Returns:
+        삭제한 컬렉션 이름 목록
+    """
+    current = resolve_alias(client, alias)
+    versions = list_versions(client, alias)
+    keep_names = {name for _, name in versions[-keep:]} if keep > 0 else set()
+    removed = []
+    for _, name in versions:
+        if name in keep_names or name == current:
+            continue
+        client.delete_collection(name)
+        removed.append(name)
+        removed.extend(drop_reduced_collections(client, name))
+    if removed:
+        print(f"[GC] 이전 버전 삭제: {removed}")
+    return removed
+
+
+class CollectionVersionWatcher:
+    """
+    서빙 측 alias 감시: 주기적으로 alias → 컬렉션을 확인하고, 바뀌면 등록된 콜백 호출.
+
+    검색 자체는 alias 이름으로 요청하므로 Qdrant가 원자적으로 새 버전을 가리키며,
+    이 감시자는 이전 버전에 묶인 캐시(로컬 인덱스 등)를 재시작 없이 비우는 용도.
+    """
+
+    def __init__(self, client_factory: Callable[[], QdrantClient], alias: str, interval: float = 30.0):
+        self.client_factory = client_factory
+        self.alias = alias
+        self.interval = interval
+        self._current: Optional[str] = None
+        self._callbacks: List[Callable[[Optional[str], str], None]] = []
+        self._tick_callbacks: List[Callable[[], None]] = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def on_switch(self, callback: Callable[[Optional[str], str], None]):
+        """callback(old_collection, new_collection)"""
+        self._callbacks.append(callback)
+
+    def on_tick(self, callback: Callable[[], None]):
+        """감시 주기마다 alias 확인 뒤 호출 (alias 전환 없이 바뀌는 리소스의 유효성 재확인용)."""
+        self._tick_callbacks.append(callback)
+
+    def current(self) -> Optional[str]:
+        """마지막으로 확인한 실제 컬렉션 이름 (미확인 시 즉시 확인)."""
+        if self._current is None:
+            self.check()
+        return self._current
+
+    def check(self) -> bool:
+        """alias 재확인. 전환이 감지되면 콜백 호출 후 True."""
+        try:
+            resolved = resolve_alias(self.client_factory(), self.alias)
+        except Exception as e:
+            print(f"[ALIAS] 확인 실패: {e}")
+            return False
+        if resolved is None or resolved == self._current:
+            return False
+
+        previous, self._current = self._current, resolved
+        if previous is None:
+            return False  # 최초 확인은 전환이 아님
+        print(f"[ALIAS] 컬렉션 전환 감지: {previous} → {resolved}")
+        for cb in self._callbacks:
+            try:
+                cb(previous, resolved)
+            except Exception as e:
+                print(f"[ALIAS] 전환 콜백 실패: {e}")
+        return True
+
+    def start(self):
+        """백그라운드 감시 시작 (워커 프로세스에서 호출 - fork 이전 스레드는 복제되지 않음)."""
+        if self._thread is not None:
+            return
+
+        def loop():
+            while not self._stop.wait(self.interval):
+                self.check()
+                for cb in self._tick_callbacks:
+                    try:
+                        cb()
+                    except Exception as e:
+                        print(f"[ALIAS] 주기 콜백 실패: {e}")
+
+        self._thread = threading.Thread(target=loop, name="alias-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
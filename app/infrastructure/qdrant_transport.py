@@ -0,0 +1,218 @@
+"""Qdrant transport - REST/gRPC client construction, connection pooling/keep-alive and retries with jitter."""
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass, replace
+from typing import Callable, Optional
+import httpx
+from qdrant_client import QdrantClient
+from qdrant_client.http.exceptions import ResponseHandlingException, UnexpectedResponse
+
+# 같은 요청을 다시 보내도 결과가 같은 호출만 재시도 (upsert/delete 등 쓰기는 호출자가 판단)
+IDEMPOTENT_METHODS = frozenset({
+    "search", "search_batch", "retrieve", "scroll", "count",
+    "get_collection", "get_collections", "collection_exists", "get_aliases",
+})
+RETRYABLE_STATUS = frozenset({429, 502, 503, 504})
+
+
+@dataclass
+class QdrantTransportConfig:
+    """
+    Qdrant 연결 설정.
+
+    - prefer_grpc: 검색/조회를 gRPC(HTTP/2, protobuf)로 - 768차원 float 벡터를 JSON 대신 바이너리로 전송
+    - pool_size/keepalive: REST 연결 풀 (keepalive = 재사용할 유휴 연결 수, 0이면 요청마다 새 연결)
+    - http2: REST도 HTTP/2 단일 연결 다중화 (h2 패키지 필요)
+    - grpc_keepalive_ms: 유휴 gRPC 채널 ping 주기 (클라우드 LB가 유휴 연결을 끊는 것 방지)
+    - retries/backoff_*: 일시적 오류(연결 실패, 타임아웃, 429/5xx, UNAVAILABLE) 재시도 (full jitter 지수 백오프)
+    """
+    url: str = "http://localhost:6333"
+    api_key: Optional[str] = None
+    prefer_grpc: bool = False
+    grpc_port: int = 6334
+    timeout: int = 10
+    pool_size: int = 16
+    keepalive: int = 8
+    keepalive_expiry: float = 30.0
+    http2: bool = False
+    grpc_keepalive_ms: int = 30000
+    retries: int = 2
+    backoff_base: float = 0.05
+    backoff_max: float = 0.5
+
+    @classmethod
+    def from_env(cls, **overrides) -> "QdrantTransportConfig":
+        """QDRANT_* 환경변수 기반 설정 (overrides: 환경변수 대신 쓸 값, 예: 스크립트의 --url)."""
+        config = cls(
+            url=os.getenv("QDRANT_URL", "http://localhost:6333"),
+            api_key=os.getenv("QDRANT_API_KEY") or None,
+            prefer_grpc=os.getenv("QDRANT_PREFER_GRPC", "0") == "1",
+            grpc_port=int(os.getenv("QDRANT_GRPC_PORT", "6334")),
+            timeout=int(os.getenv("QDRANT_TIMEOUT", "10")),
+            pool_size=int(os.getenv("QDRANT_POOL_SIZE", "16")),
+            keepalive=int(os.getenv("QDRANT_KEEPALIVE", "8")),
+            keepalive_expiry=float(os.getenv("QDRANT_KEEPALIVE_EXPIRY", "30")),
+            http2=os.getenv("QDRANT_HTTP2", "0") == "1",
+            grpc_keepalive_ms=int(os.getenv("QDRANT_GRPC_KEEPALIVE_MS", "30000")),
+            retries=int(os.getenv("QDRANT_RETRIES", "2")),
+            backoff_base=float(os.getenv("QDRANT_BACKOFF_BASE_MS", "50")) / 1000.0,
+            backoff_max=float(os.getenv("QDRANT_BACKOFF_MAX_MS", "500")) / 1000.0,
+        )
+        return replace(config, **overrides)
+
+    @property
+    def transport(self) -> str:
+        if self.prefer_grpc:
+            return "grpc"
+        return "rest+http2" if self.http2 else "rest"
+
+
+def build_client(config: QdrantTransportConfig) -> QdrantClient:
+    """설정대로 QdrantClient 생성 (연결 풀 + keep-alive, gRPC 채널 옵션)."""
+    http2 = config.http2
+    if http2:
+        try:
+            import h2  # noqa: F401 - httpx HTTP/2 지원 여부 확인
+        except ImportError:
+            print("[Qdrant] h2 패키지가 없어 REST HTTP/1.1 사용 (pip install 'httpx[http2]')")
+            http2 = False
+    return QdrantClient(
+        url=config.url,
+        api_key=config.api_key,
+        prefer_grpc=config.prefer_grpc,
+        grpc_port=config.grpc_port,
+        timeout=config.timeout,
+        limits=httpx.Limits(
+            max_connections=config.pool_size,
+            max_keepalive_connections=config.keepalive,
+            keepalive_expiry=config.keepalive_expiry,
+        ),
+        http2=http2,
+        grpc_options={
+            "grpc.keepalive_time_ms": config.grpc_keepalive_ms,
+            "grpc.keepalive_timeout_ms": 10000,
+            "grpc.keepalive_permit_without_calls": 1,
+            "grpc.http2.max_pings_without_data": 0,
+        },
+    )
+
+
+def is_transient(error: BaseException) -> bool:
+    """재시도할 만한 일시적 오류인지 (연결/타임아웃, 429·5xx, gRPC UNAVAILABLE 등)."""
+    if isinstance(error, (httpx.TransportError, ResponseHandlingException, ConnectionError, TimeoutError)):
+        return True
+    if isinstance(error, UnexpectedResponse):
+        return error.status_code in RETRYABLE_STATUS
+    try:
+        import grpc
+    except ImportError:
+        return False
+    if isinstance(error, grpc.RpcError) and hasattr(error, "code"):
+        return error.code() in (
+            grpc.StatusCode.UNAVAILABLE, grpc.StatusCode.DEADLINE_EXCEEDED, grpc.StatusCode.RESOURCE_EXHAUSTED,
+        )
+    return False
+
+
+class RetryingQdrantClient:
+    """
+    QdrantClient 프록시: 조회성 호출(IDEMPOTENT_METHODS)만 일시적 오류 시 재시도, 나머지는 그대로 위임.
+
+    백오프는 full jitter (0 ~ min(max, base × 2^attempt) 균등 분포) - 여러 워커가
+    같은 순간 실패해도 재시도가 한꺼번에 몰리지 않는다.
+
+    budget: 현재 호출의 남은 예산(초)을 돌려주는 함수 (None = 예산 없음, 예: 요청 deadline).
+    백오프 후 남은 예산이 없으면 재시도하지 않고 바로 실패 → 호출자가 fallback으로 전환.
+    재시도 로그는 log_interval초에 한 번만 출력 (장애 중 로그 폭주 방지, 전체 수는 stats()).
+    """
+
+    def __init__(
+        self,
+        client: QdrantClient,
+        retries: int = 2,
+        backoff_base: float = 0.05,
+        backoff_max: float = 0.5,
+        transport: str = "rest",
+        sleep: Callable[[float], None] = time.sleep,
+        budget: Optional[Callable[[], Optional[float]]] = None,
+        log_interval: float = 10.0,
+    ):
+        self._client = client
+        self.retries = max(0, retries)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.transport = transport
+        self._sleep = sleep
+        self._budget = budget
+        self.log_interval = log_interval
+        self._lock = threading.Lock()
+        self._last_log = float("-inf")
+        self._suppressed = 0
+        self.calls = 0
+        self.retried = 0
+        self.failures = 0
+        self.budget_exhausted = 0
+
+    @classmethod
+    def from_config(cls, config: QdrantTransportConfig, **kwargs) -> "RetryingQdrantClient":
+        return cls(
+            build_client(config),
+            retries=config.retries,
+            backoff_base=config.backoff_base,
+            backoff_max=config.backoff_max,
+            transport=config.transport,
+            **kwargs,
+        )
+
+    def backoff(self, attempt: int) -> float:
+        return random.uniform(0.0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._client, name)
+        if name not in IDEMPOTENT_METHODS or not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            with self._lock:
+                self.calls += 1
+            for attempt in range(self.retries + 1):
+                try:
+                    return attr(*args, **kwargs)
+                except Exception as e:
+                    if attempt >= self.retries or not is_transient(e):
+                        with self._lock:
+                            self.failures += 1
+                        raise
+                    delay = self.backoff(attempt)
+                    remaining = self._budget() if self._budget is not None else None
+                    if remaining is not None and remaining <= delay:
+                        with self._lock:
+                            self.failures += 1
+                            self.budget_exhausted += 1
+                        raise
+                    with self._lock:
+                        self.retried += 1
+                        now = time.monotonic()
+                        log = now - self._last_log >= self.log_interval
+                        if log:
+                            self._last_log, suppressed, self._suppressed = now, self._suppressed, 0
+                        else:
+                            self._suppressed += 1
+                    if log:
+                        extra = f", 이전 {suppressed}건 생략" if suppressed else ""
+                        print(f"[Qdrant] {name} 일시적 오류 → {delay * 1000:.0f}ms 후 재시도 ({attempt + 1}/{self.retries}{extra}): {type(e).__name__}")
+                    self._sleep(delay)
+
+        return call
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "transport": self.transport,
+                "calls": self.calls,
+                "retried": self.retried,
+                "failures": self.failures,
+                "budget_exhausted": self.budget_exhausted,
+            }
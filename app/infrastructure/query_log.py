@@ -0,0 +1,328 @@
+"""
+Query log store - hourly-partitioned, dictionary-encoded columnar binary files.
+
+레이아웃 (QUERY_LOG_PATH 디렉터리):
+    dt=2026-10-19/hour=13/<writer>.rows          고정 길이 레코드 (ROW_DTYPE, append-only)
+    dt=2026-10-19/hour=13/<writer>.strings       문자열 사전 (JSON 문자열 한 줄 = id 순서)
+    dt=2026-10-19/hour=13/<writer>.meta.json     스키마 (버전, 단계 이름, dtype)
+
+writer = 호스트-pid-시작시각 → gunicorn 워커별 파일이라 프로세스 간 잠금이 필요 없다.
+문자열 사전 줄을 먼저 기록한 뒤 레코드를 쓰므로, 레코드가 참조하는 id는 항상 사전에 존재한다.
+"""
+import calendar
+import glob
+import json
+import os
+import socket
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Sequence
+import numpy as np
+from app.infrastructure.embedding_cache import normalize_text
+
+SCHEMA_VERSION = 2
+STAGES = ("lexical", "rewrite", "search_original", "search_rewritten", "rerank", "total")
+CACHE_FLAGS = {"answer": 1, "rewrite": 2}
+
+ROW_DTYPE = np.dtype([
+    ("ts", "<u4"),
+    ("kb", "<u4"),  # 지식 베이스 id (사전 id, v1 파일은 빈 값)
+    ("query", "<u4"),  # 정규화 질의 (사전 id)
+    ("matched", "<u4"),
+    ("rewritten", "<u4"),
+    ("degradation", "<u4"),
+    ("strategy", "<u4"),
+    ("score", "<f4"),
+    ("verdict", "u1"),  # 1 = ok, 0 = fallback
+    ("cache", "u1"),  # CACHE_FLAGS 비트마스크
+    ("latency", "<f4", (len(STAGES),)),  # 단계별 ms (없으면 NaN)
+])
+STRING_COLUMNS = ("kb", "query", "matched", "rewritten", "degradation", "strategy")
+# 이전 스키마 (읽기 전용): 버전 → dtype
+_LEGACY_DTYPES = {1: np.dtype([(name, ROW_DTYPE.fields[name][0]) for name in ROW_DTYPE.names if name != "kb"])}
+
+
+def _partition(ts: float) -> str:
+    t = time.gmtime(ts)
+    return f"dt={time.strftime('%Y-%m-%d', t)}/hour={t.tm_hour:02d}"
+
+
+class QueryLogWriter:
+    """
+    질의 로그 컬럼형 sink (스레드 안전, 요청 경로에서 레코드당 두 번의 작은 append).
+
+    record 필드: ts, kb, query, score, matched_question, verdict, degradation, strategy,
+                 rewritten, cache_hits, timings
+    """
+
+    def __init__(self, root: str, writer_id: Optional[str] = None):
+        self.root = root
+        self.writer_id = writer_id or f"{socket.gethostname()}-{os.getpid()}-{int(time.time())}"
+        self._lock = threading.Lock()
+        self._partition: Optional[str] = None
+        self._rows = None
+        self._strings = None
+        self._ids: Dict[str, int] = {}
+
+    def _open(self, partition: str):
+        self.close()
+        directory = os.path.join(self.root, partition)
+        os.makedirs(directory, exist_ok=True)
+        base = os.path.join(directory, self.writer_id)
+        with open(f"{base}.meta.json", "w", encoding="utf-8") as f:
+            json.dump({"version": SCHEMA_VERSION, "stages": list(STAGES), "dtype": ROW_DTYPE.descr}, f)
+        self._strings = open(f"{base}.strings", "a", encoding="utf-8")
+        self._rows = open(f"{base}.rows", "ab")
+        self._ids = {}
+        self._partition = partition
+        self._intern("")  # id 0 = 빈 값
+
+    def _intern(self, text: Optional[str]) -> int:
+        text = text or ""
+        sid = self._ids.get(text)
+        if sid is None:
+            sid = len(self._ids)
+            self._ids[text] = sid
+            self._strings.write(json.dumps(text, ensure_ascii=False) + "\n")
+            self._strings.flush()
+        return sid
+
+    def write(self, record: dict):
+        ts = record.get("ts") or time.time()
+        timings = record.get("timings") or {}
+        with self._lock:
+            partition = _partition(ts)
+            if partition != self._partition:
+                self._open(partition)
+            row = np.zeros(1, dtype=ROW_DTYPE)
+            row["ts"] = int(ts)
+            row["kb"] = self._intern(record.get("kb"))
+            row["query"] = self._intern(normalize_text(record.get("query", "")))
+            row["matched"] = self._intern(record.get("matched_question"))
+            row["rewritten"] = self._intern(record.get("rewritten"))
+            row["degradation"] = self._intern(record.get("degradation", "full"))
+            row["strategy"] = self._intern(record.get("strategy"))
+            row["score"] = record.get("score") or 0.0
+            row["verdict"] = record.get("verdict") == "ok"
+            row["cache"] = sum(CACHE_FLAGS.get(c, 0) for c in set(record.get("cache_hits") or ()))
+            row["latency"] = [timings.get(stage, np.nan) for stage in STAGES]
+            self._rows.write(row.tobytes())
+            self._rows.flush()
+
+    def close(self):
+        for f in (self._rows, self._strings):
+            if f is not None:
+                f.close()
+        self._rows = self._strings = None
+        self._partition = None
+
+
+@dataclass
+class QueryLogColumns:
+    """
+    로그 전체를 컬럼 배열로 적재한 결과 (문자열 컬럼은 전역 사전 id).
+
+    집계는 모두 numpy 벡터 연산 - 수백만 행도 수 초 내.
+    """
+    rows: np.ndarray  # ROW_DTYPE (문자열 id는 strings 기준으로 재매핑됨)
+    strings: List[str]
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def column(self, name: str) -> List[str]:
+        return [self.strings[i] for i in self.rows[name]]
+
+    def stage(self, name: str) -> np.ndarray:
+        return self.rows["latency"][:, STAGES.index(name)]
+
+    def top_queries(self, n: int = 20) -> List[dict]:
+        """빈도 상위 질의 + 질의별 fallback 비율 / 지연 / 캐시 hit 비율."""
+        if not len(self.rows):
+            return []
+        qid = self.rows["query"]
+        counts = np.bincount(qid, minlength=len(self.strings))
+        counts[0] = 0  # 빈 질의 제외
+        top = np.argsort(-counts, kind="stable")[:n]
+        total = self.stage("total")
+        result = []
+        for sid in top:
+            if counts[sid] == 0:
+                break
+            mask = qid == sid
+            lat = total[mask]
+            result.append({
+                "query": self.strings[sid],
+                "count": int(counts[sid]),
+                "fallback_rate": float(1.0 - self.rows["verdict"][mask].mean()),
+                "p50_ms": _nanpercentile(lat, 50),
+                "p95_ms": _nanpercentile(lat, 95),
+                "cache_hit_rate": float(((self.rows["cache"][mask] & CACHE_FLAGS["answer"]) > 0).mean()),
+            })
+        return result
+
+    def latency_percentiles(self, percentiles: Sequence[float] = (50, 95, 99)) -> Dict[str, Dict[str, Optional[float]]]:
+        """단계별 지연 백분위 (해당 단계가 실행된 요청 기준)."""
+        result = {}
+        for stage in STAGES:
+            values = self.stage(stage)
+            result[stage] = {"n": int(np.count_nonzero(~np.isnan(values)))}
+            result[stage].update({f"p{int(p)}": _nanpercentile(values, p) for p in percentiles})
+        return result
+
+    def rates(self) -> dict:
+        """fallback 비율, 강등 단계/응답 경로 분포, 캐시 hit 비율."""
+        n = len(self.rows)
+        if not n:
+            return {"requests": 0}
+        return {
+            "requests": n,
+            "fallback_rate": float(1.0 - self.rows["verdict"].mean()),
+            "degradation": _value_counts(self.rows["degradation"], self.strings),
+            "strategy": _value_counts(self.rows["strategy"], self.strings),
+            "answer_cache_hit_rate": float(((self.rows["cache"] & CACHE_FLAGS["answer"]) > 0).mean()),
+            "rewrite_cache_hit_rate": float(((self.rows["cache"] & CACHE_FLAGS["rewrite"]) > 0).mean()),
+        }
+
+    def cache_opportunity(self, ttl: Optional[float] = None, top: int = 10) -> dict:
+        """
+        답변 캐시 기회 추정: 같은 정규화 질의가 ttl초 이내에 다시 들어왔는데 캐시 hit가 아니었던 요청.
+
+        saved_ms는 그 요청들의 전체 지연 합 (캐시 hit 시 거의 0ms가 된다고 가정한 상한 추정치).
+        """
+        rows = self.rows
+        if not len(rows):
+            return {"repeat_requests": 0, "repeat_rate": 0.0, "saved_ms": 0.0, "queries": []}
+        order = np.lexsort((rows["ts"], rows["query"]))
+        qid = rows["query"][order]
+        ts = rows["ts"][order].astype(np.int64)
+        repeat = np.zeros(len(order), dtype=bool)
+        repeat[1:] = qid[1:] == qid[:-1]
+        if ttl is not None:
+            repeat[1:] &= (ts[1:] - ts[:-1]) <= ttl
+        missed = repeat & ((rows["cache"][order] & CACHE_FLAGS["answer"]) == 0)
+        latency = np.nan_to_num(rows["latency"][order, STAGES.index("total")])
+
+        saved_by_query = np.bincount(qid[missed], weights=latency[missed], minlength=len(self.strings))
+        hits_by_query = np.bincount(qid[missed], minlength=len(self.strings))
+        best = np.argsort(-saved_by_query, kind="stable")[:top]
+        return {
+            "repeat_requests": int(missed.sum()),
+            "repeat_rate": float(missed.mean()),
+            "saved_ms": float(latency[missed].sum()),
+            "queries": [
+                {"query": self.strings[i], "repeats": int(hits_by_query[i]), "saved_ms": float(saved_by_query[i])}
+                for i in best if hits_by_query[i] > 0
+            ],
+        }
+
+    def records(self) -> Iterator[dict]:
+        """JSONL 로그와 같은 형태의 dict (paraphrase 추출/재생 등 기존 소비자용)."""
+        for row in self.rows:
+            yield {
+                "ts": int(row["ts"]),
+                "kb": self.strings[row["kb"]] or None,
+                "query": self.strings[row["query"]],
+                "score": float(row["score"]),
+                "matched_question": self.strings[row["matched"]],
+                "verdict": "ok" if row["verdict"] else "fallback",
+                "degradation": self.strings[row["degradation"]],
+                "strategy": self.strings[row["strategy"]],
+                "rewritten": self.strings[row["rewritten"]] or None,
+                "cache_hits": [name for name, bit in CACHE_FLAGS.items() if row["cache"] & bit],
+                "timings": {s: float(v) for s, v in zip(STAGES, row["latency"]) if not np.isnan(v)},
+            }
+
+
+def _nanpercentile(values: np.ndarray, q: float) -> Optional[float]:
+    values = values[~np.isnan(values)]
+    return round(float(np.percentile(values, q)), 2) if len(values) else None
+
+
+def _value_counts(ids: np.ndarray, strings: List[str]) -> Dict[str, int]:
+    uniq, counts = np.unique(ids, return_counts=True)
+    return {strings[i] or "-": int(c) for i, c in zip(uniq, counts)}
+
+
+def _hour_of(path: str) -> Optional[int]:
+    """partition 경로(dt=YYYY-MM-DD/hour=HH, UTC) → 시작 UNIX 시각."""
+    parts = {p.split("=", 1)[0]: p.split("=", 1)[1] for p in path.split(os.sep) if "=" in p}
+    try:
+        return calendar.timegm(time.strptime(f"{parts['dt']} {parts['hour']}", "%Y-%m-%d %H"))
+    except (KeyError, ValueError):
+        return None
+
+
+def _read_rows(path: str, dtype: np.dtype) -> np.ndarray:
+    raw = np.fromfile(path, dtype=np.uint8) if os.path.exists(path) else np.empty(0, np.uint8)
+    usable = len(raw) - len(raw) % dtype.itemsize  # 기록 중단된 마지막 레코드 제외
+    rows = raw[:usable].view(dtype)
+    if dtype == ROW_DTYPE:
+        return rows.copy()
+    upgraded = np.zeros(len(rows), dtype=ROW_DTYPE)  # 이전 스키마 → 현재 스키마 (없는 컬럼은 0 = 빈 값)
+    for name in dtype.names:
+        upgraded[name] = rows[name]
+    return upgraded
+
+
+def load_columns(
+    root: str,
+    since: Optional[float] = None,
+    until: Optional[float] = None,
+    kbs: Optional[Sequence[str]] = None,
+) -> QueryLogColumns:
+    """
+    partition을 시간 범위로 골라 컬럼 배열로 적재 (파일별 문자열 사전 → 전역 사전으로 재매핑).
+
+    Args:
+        since/until: UNIX 시각 범위 (partition 단위로 거른 뒤 행 단위로 다시 거름)
+        kbs: 이 KB id들의 행만 (""는 KB 구분 이전 기록)
+    """
+    table: Dict[str, int] = {"": 0}
+    chunks = []
+    for meta_path in sorted(glob.glob(os.path.join(root, "dt=*", "hour=*", "*.meta.json"))):
+        start = _hour_of(meta_path)
+        if start is not None and ((since is not None and start + 3600 <= since) or (until is not None and start > until)):
+            continue
+        base = meta_path[: -len(".meta.json")]
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+        dtype = ROW_DTYPE if meta.get("version") == SCHEMA_VERSION else _LEGACY_DTYPES.get(meta.get("version"))
+        if dtype is None:
+            print(f"[QueryLog] 지원하지 않는 스키마 버전 건너뜀: {meta_path}")
+            continue
+        rows = _read_rows(f"{base}.rows", dtype)
+        if not len(rows):
+            continue
+        with open(f"{base}.strings", encoding="utf-8") as f:
+            strings = [json.loads(line) for line in f if line.strip()]
+        lut = np.fromiter((table.setdefault(s, len(table)) for s in strings), dtype=np.uint32, count=len(strings))
+        for name in STRING_COLUMNS:
+            rows[name] = lut[rows[name]]
+        chunks.append(rows)
+
+    rows = np.concatenate(chunks) if chunks else np.empty(0, dtype=ROW_DTYPE)
+    if since is not None:
+        rows = rows[rows["ts"] >= since]
+    if until is not None:
+        rows = rows[rows["ts"] <= until]
+    if kbs is not None:
+        rows = rows[np.isin(rows["kb"], [table[k] for k in kbs if k in table])]
+    strings = [""] * len(table)
+    for text, sid in table.items():
+        strings[sid] = text
+    return QueryLogColumns(rows=rows, strings=strings)
+
+
+def iter_query_log(path: str) -> Iterator[dict]:
+    """질의 로그 레코드 순회: 디렉터리면 컬럼형 저장소, 파일이면 JSONL (이전 형식)."""
+    if os.path.isdir(path):
+        yield from load_columns(path).records()
+        return
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
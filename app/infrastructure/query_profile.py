@@ -0,0 +1,107 @@
+"""Query profiling - one precompiled classification pass shared by ensemble weighting, the guard and caches."""
+import json
+import re
+from typing import Dict, Optional, Sequence
+from app.domain.entities import QueryProfile
+from app.infrastructure.embedding_cache import normalize_text
+
+_INFORMAL = [
+    "뭐야", "뭐임", "뭐예요", "얼마야", r"있어\?", r"해\?", "필요해", "지원해", "알려줘", "설명해줘",
+    "가르쳐줘", "말해줘", "뭐하는", "무슨", "어떤", "이거",
+]
+
+# 사용처별 분류 표지 (정규식 조각) - query_rules.json의 "profile.markers"로 교체 가능
+# Ensemble 가중치와 가드 임계값은 원래 서로 다른 표지를 써 왔으므로 합치지 않고 따로 유지
+DEFAULT_MARKERS: Dict[str, Dict[str, Sequence[str]]] = {
+    "ensemble": {
+        # 정형 질문 (존댓말, 의문사) → 원본 신뢰
+        "formal": ["무엇인가요", "어떻게", "어떤.{1,5}인가요", "얼마인가요", "누구", "언제", "어디", "입니까"],
+        # 구어체/반말 → Gemini 신뢰
+        "informal": _INFORMAL + ["그거", "프로젝트"],
+    },
+    "guard": {
+        # 의문사 있는 정식 질문 → 기본 임계값
+        "formal": ["무엇인가요", "어떻게", "얼마인가요", "누구", "언제", "어디", "왜"],
+        # 구어체/반말 → 관대한 임계값
+        "informal": _INFORMAL,
+    },
+}
+
+
+def load_query_rules(path: str) -> dict:
+    """
+    질의 규칙 설정 (JSON) 로드.
+
+    형식: {"profile": {...}, "weights": [...], "thresholds": [...]}
+    - profile: QueryProfiler.from_config 인자
+    - weights: Ensemble 변형 가중치 규칙 (app.application.fusion.weight_rules_from_config)
+    - thresholds: 동적 임계값 규칙 (app.infrastructure.guards.threshold_rules_from_config)
+    """
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+class QueryProfiler:
+    """
+    질의를 한 번만 분류해 QueryProfile 생성.
+
+    - 사용처("ensemble", "guard")별 분류 표지를 생성 시 하나의 정규식으로 미리 컴파일 (요청마다 재컴파일 없음)
+    - query_type(사용처): type_order 순서로 처음 표지가 있는 분류, 없으면 길이로 "keyword" / "default"
+    - length_class: 앞뒤 공백을 뺀 길이 short_max_len자 미만 "short", keyword_max_words어절 이하 "keyword", 그 외 "normal"
+
+    markers가 {분류: [표지]} 형태(사용처 구분 없음)면 모든 사용처에 같은 표지를 적용.
+    """
+
+    def __init__(
+        self,
+        markers: Optional[Dict[str, Dict[str, Sequence[str]]]] = None,
+        short_max_len: int = 5,
+        keyword_max_words: int = 3,
+        type_order: Sequence[str] = ("formal", "informal"),
+    ):
+        self.short_max_len = short_max_len
+        self.keyword_max_words = keyword_max_words
+        self.type_order = tuple(type_order)
+        markers = markers or DEFAULT_MARKERS
+        if not all(isinstance(v, dict) for v in markers.values()):
+            markers = {consumer: markers for consumer in DEFAULT_MARKERS}
+        self._patterns = {
+            consumer: {
+                name: re.compile("|".join(f"(?:{p})" for p in patterns), flags=re.IGNORECASE)
+                for name, patterns in categories.items()
+                if patterns
+            }
+            for consumer, categories in markers.items()
+        }
+
+    @classmethod
+    def from_config(cls, config: Optional[dict]) -> "QueryProfiler":
+        config = config or {}
+        return cls(
+            markers=config.get("markers"),
+            short_max_len=config.get("short_max_len", 5),
+            keyword_max_words=config.get("keyword_max_words", 3),
+            type_order=config.get("type_order", ("formal", "informal")),
+        )
+
+    def profile(self, query: str) -> QueryProfile:
+        text = query.strip()
+        markers = {}
+        for consumer, patterns in self._patterns.items():
+            found = {name: tuple(m.group(0) for m in pattern.finditer(text)) for name, pattern in patterns.items()}
+            markers[consumer] = {name: hits for name, hits in found.items() if hits}
+
+        if len(text) < self.short_max_len:
+            length_class = "short"
+        elif len(text.split()) <= self.keyword_max_words:
+            length_class = "keyword"
+        else:
+            length_class = "normal"
+
+        return QueryProfile(
+            text=query,
+            normalized=normalize_text(query),
+            length_class=length_class,
+            markers=markers,
+            type_order=self.type_order,
+        )
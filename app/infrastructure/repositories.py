@@ -1,45 +1,327 @@
 """Infrastructure repositories - concrete implementations."""
-from typing import List, Optional
+import json
+from typing import List, Optional, Sequence
+import numpy as np
 from sentence_transformers import SentenceTransformer
 from qdrant_client import QdrantClient
+from qdrant_client.http import models
 from app.domain.entities import QAPair
 from app.domain.repositories import Retriever, Embedder
+from app.infrastructure.embedding_cache import SQLiteEmbeddingCache
+from app.infrastructure.projection import PcaProjection
+
+
+def max_pool(pairs: List[QAPair], top_k: int) -> List[QAPair]:
+    """
+    점수 내림차순 결과에서 QA별 최고 점수 하나만 남김 (id, 없으면 질문 문자열 기준).
+    paraphrase 형제 포인트는 같은 qa_id/question payload를 공유하므로 QA 단위로 max-pooling 된다.
+    """
+    pooled, seen = [], set()
+    for pair in pairs:
+        key = pair.id if pair.id is not None else pair.question
+        if key in seen:
+            continue
+        seen.add(key)
+        pooled.append(pair)
+        if len(pooled) >= top_k:
+            break
+    return pooled
 
 
 class QdrantRetriever(Retriever):
     """Qdrant 기반 벡터 검색 구현체."""
     
-    def __init__(self, client: QdrantClient, embedder: Embedder, collection: str):
+    def __init__(
+        self,
+        client: QdrantClient,
+        embedder: Embedder,
+        collection: str,
+        hnsw_ef: Optional[int] = None,
+        exact: bool = False,
+        rescore: Optional[bool] = None,
+        oversampling: Optional[float] = None,
+        payload_fields: Sequence[str] = ("question", "answer", "qa_id"),
+        fanout: int = 1,
+    ):
+        """
+        Args:
+            hnsw_ef: 검색 시 HNSW 탐색 깊이 (None = 서버 기본값, 클수록 재현율↑ 지연↑)
+            exact: True면 인덱스 없이 전수 검색 (재현율 기준선용)
+            rescore: 양자화 컬렉션에서 원본 벡터로 재채점 여부 (None = 서버 기본값)
+            oversampling: 양자화 검색 후보 배수 (예: 2.0 → top_k×2 후보를 재채점)
+            payload_fields: 가져올 payload 필드 (불필요한 필드 전송 생략)
+            fanout: paraphrase 형제 포인트 대비 후보 배수 (top_k × fanout개를 받아 QA별 max-pooling)
+        """
         self.client = client
         self.embedder = embedder
         self.collection = collection
+        self.payload_fields = list(payload_fields)
+        self.search_params = self.build_search_params(hnsw_ef, exact, rescore, oversampling)
+        self.fanout = max(1, fanout)
     
-    def search(self, query: str, top_k: int = 3) -> List[QAPair]:
-        """쿼리에 대한 상위 K개 QA 쌍 검색."""
-        qv = self.embedder.embed([query])[0]
-        results = self.client.search(
-            collection_name=self.collection,
-            query_vector=qv,
-            limit=top_k,
-        )
-        
+    @staticmethod
+    def build_search_params(
+        hnsw_ef: Optional[int] = None,
+        exact: bool = False,
+        rescore: Optional[bool] = None,
+        oversampling: Optional[float] = None,
+    ) -> Optional[models.SearchParams]:
+        """검색 파라미터 (모두 기본값이면 None → 서버 기본 설정 사용)."""
+        quantization = None
+        if rescore is not None or oversampling is not None:
+            quantization = models.QuantizationSearchParams(rescore=rescore, oversampling=oversampling)
+        if hnsw_ef is None and not exact and quantization is None:
+            return None
+        return models.SearchParams(hnsw_ef=hnsw_ef, exact=exact, quantization=quantization)
+    
+    def _to_pairs(self, results, top_k: int) -> List[QAPair]:
         pairs = []
         for r in results:
             payload = r.payload or {}
             pairs.append(QAPair(
                 question=payload.get("question", ""),
                 answer=payload.get("answer", ""),
-                score=float(r.score)
+                score=float(r.score),
+                id=payload.get("qa_id", r.id),  # paraphrase 형제 포인트는 표준 질문 포인트 id로 묶음
             ))
-        return pairs
+        return max_pool(pairs, top_k)
+    
+    def search(self, query: str, top_k: int = 3, search_params: Optional[models.SearchParams] = None) -> List[QAPair]:
+        """
+        쿼리에 대한 상위 K개 QA 쌍 검색.
+
+        Args:
+            search_params: 요청 단위로 기본 검색 파라미터를 덮어쓸 때 사용
+        """
+        qv = self.embedder.embed([query])[0]
+        results = self.client.search(
+            collection_name=self.collection,
+            query_vector=qv,
+            limit=top_k * self.fanout,
+            search_params=search_params or self.search_params,
+            with_payload=self.payload_fields,
+        )
+        return self._to_pairs(results, top_k)
+    
+    def search_batch(self, queries: List[str], top_k: int = 3) -> List[List[QAPair]]:
+        """여러 쿼리를 한 번의 배치 임베딩 + 한 번의 Qdrant 배치 검색 요청으로 처리."""
+        if not queries:
+            return []
+        vectors = self.embedder.embed(list(queries))
+        requests = [
+            models.SearchRequest(
+                vector=list(qv),
+                limit=top_k * self.fanout,
+                params=self.search_params,
+                with_payload=self.payload_fields,
+            )
+            for qv in vectors
+        ]
+        batches = self.client.search_batch(collection_name=self.collection, requests=requests)
+        return [self._to_pairs(results, top_k) for results in batches]
+
+
+class ProjectedQdrantRetriever(QdrantRetriever):
+    """
+    PCA 축소 벡터 1차 검색 + 원본 벡터 재채점.
+
+    축소 컬렉션(d차원, RAM 상주)에서 top_k × fanout × candidates개 후보를 찾은 뒤,
+    후보의 원본 벡터만 원본 컬렉션에서 가져와 원본 질의 벡터와의 코사인으로 다시 정렬한다.
+    반환 점수는 원본 벡터 코사인이므로 임계값/가드는 기존 값을 그대로 사용.
+    """
+
+    def __init__(
+        self,
+        client: QdrantClient,
+        embedder: Embedder,
+        collection: str,
+        projection: PcaProjection,
+        candidates: int = 4,
+        **kwargs,
+    ):
+        """
+        Args:
+            collection: 재채점용 원본 컬렉션 (alias 가능)
+            projection: ingest 시 학습한 PCA 투영 (projection.collection = 축소 컬렉션)
+            candidates: 재채점 후보 배수 (클수록 재현율↑, 원본 벡터 조회량↑)
+        """
+        super().__init__(client, embedder, collection, **kwargs)
+        self.projection = projection
+        self.candidates = max(1, candidates)
+
+    def search(self, query: str, top_k: int = 3, search_params: Optional[models.SearchParams] = None) -> List[QAPair]:
+        return self.search_vectors(self.embedder.embed([query]), top_k, search_params)[0]
+
+    def search_batch(self, queries: List[str], top_k: int = 3) -> List[List[QAPair]]:
+        if not queries:
+            return []
+        return self.search_vectors(self.embedder.embed(list(queries)), top_k)
+
+    def search_vectors(
+        self,
+        vectors,
+        top_k: int = 3,
+        search_params: Optional[models.SearchParams] = None,
+    ) -> List[List[QAPair]]:
+        """정규화된 원본 질의 벡터 (Q, D) → 축소 배치 검색 1회 + 원본 벡터 조회 1회."""
+        full = np.asarray(vectors, dtype=np.float32)
+        limit = top_k * self.fanout
+        requests = [
+            models.SearchRequest(
+                vector=rv.tolist(),
+                limit=limit * self.candidates,
+                params=search_params or self.search_params,
+                with_payload=self.payload_fields,
+            )
+            for rv in self.projection.apply(full)
+        ]
+        batches = self.client.search_batch(collection_name=self.projection.collection, requests=requests)
+        return [self._to_pairs(results, top_k) for results in self._rescore(full, batches, limit)]
+
+    def _rescore(self, queries: np.ndarray, batches, limit: int) -> List[List[models.ScoredPoint]]:
+        ids = list({r.id for results in batches for r in results})
+        if not ids:
+            return [[] for _ in batches]
+        points = self.client.retrieve(collection_name=self.collection, ids=ids, with_payload=False, with_vectors=True)
+        originals = {p.id: p.vector for p in points}
+
+        rescored = []
+        for qv, results in zip(queries, batches):
+            # 원본 컬렉션에 없는 후보(전환 중 버전 불일치)는 점수 척도가 달라 제외
+            kept = [r for r in results if r.id in originals]
+            if not kept:
+                rescored.append([])
+                continue
+            scores = np.asarray([originals[r.id] for r in kept], dtype=np.float32) @ qv
+            order = np.argsort(-scores)[:limit]
+            rescored.append([
+                models.ScoredPoint(id=kept[i].id, version=kept[i].version, score=float(scores[i]), payload=kept[i].payload)
+                for i in order
+            ])
+        return rescored
+
+
+class LocalIndexRetriever(Retriever):
+    """
+    메모리 내 벡터 인덱스 (Qdrant 장애/지연 시 fallback).
+
+    Qdrant 컬렉션 전체를 (N, D) 정규화 행렬로 들고 있다가 내적(=코사인)으로 Top-K 검색.
+    파일(.npz)로 저장해두면 Qdrant 없이도 기동 직후부터 사용할 수 있다.
+    """
+    
+    def __init__(self, embedder: Embedder, vectors: np.ndarray, pairs: List[QAPair], source: Optional[str] = None):
+        self.embedder = embedder
+        self.vectors = np.asarray(vectors, dtype=np.float32)
+        self.pairs = pairs
+        self.source = source  # 원본 컬렉션(버전) 이름 - alias 전환 시 캐시 무효화 판단용
+    
+    @classmethod
+    def from_qdrant(
+        cls,
+        client: QdrantClient,
+        collection: str,
+        embedder: Embedder,
+        page_size: int = 256,
+        source: Optional[str] = None,
+    ) -> "LocalIndexRetriever":
+        """Qdrant 컬렉션 전체를 scroll하여 로컬 인덱스 생성."""
+        vectors, pairs = [], []
+        offset = None
+        while True:
+            points, offset = client.scroll(
+                collection_name=collection,
+                limit=page_size,
+                offset=offset,
+                with_payload=True,
+                with_vectors=True,
+            )
+            for p in points:
+                payload = p.payload or {}
+                vectors.append(p.vector)
+                pairs.append(QAPair(
+                    question=payload.get("question", ""),
+                    answer=payload.get("answer", ""),
+                    id=payload.get("qa_id", p.id),
+                ))
+            if offset is None:
+                break
+        matrix = np.asarray(vectors, dtype=np.float32).reshape(len(vectors), -1)
+        return cls(embedder, matrix, pairs, source=source or collection)
+    
+    @classmethod
+    def load(cls, path: str, embedder: Embedder) -> "LocalIndexRetriever":
+        """save()로 저장한 .npz 파일에서 로드."""
+        data = np.load(path, allow_pickle=False)
+        rows = json.loads(str(data["pairs"]))
+        pairs = [QAPair(question=r["question"], answer=r["answer"], id=r.get("id")) for r in rows]
+        source = str(data["source"]) if "source" in data.files else None
+        return cls(embedder, data["vectors"], pairs, source=source or None)
+    
+    def save(self, path: str):
+        """벡터 행렬 + QA 페이로드를 .npz로 저장."""
+        rows = [{"question": p.question, "answer": p.answer, "id": p.id} for p in self.pairs]
+        np.savez(
+            path,
+            vectors=self.vectors,
+            pairs=np.array(json.dumps(rows, ensure_ascii=False)),
+            source=np.array(self.source or ""),
+        )
+    
+    def __len__(self) -> int:
+        return len(self.pairs)
+    
+    def memory_bytes(self) -> int:
+        """메모리 사용량 추정 (벡터 행렬 + 질문/답변 텍스트)."""
+        return self.vectors.nbytes + sum(len(p.question.encode()) + len(p.answer.encode()) for p in self.pairs)
+    
+    def search(self, query: str, top_k: int = 3) -> List[QAPair]:
+        """쿼리에 대한 상위 K개 QA 쌍 검색 (전수 내적)."""
+        return self.search_batch([query], top_k=top_k)[0]
+    
+    def search_batch(self, queries: List[str], top_k: int = 3) -> List[List[QAPair]]:
+        """배치 임베딩 후 (Q, D) @ (D, N) 한 번의 행렬곱으로 전체 점수 계산."""
+        if not self.pairs or not queries:
+            return [[] for _ in queries]
+        qv = np.asarray(self.embedder.embed(list(queries)), dtype=np.float32)
+        all_scores = qv @ self.vectors.T
+        return [self._top(scores, top_k) for scores in all_scores]
+    
+    def _top(self, scores: np.ndarray, top_k: int) -> List[QAPair]:
+        # paraphrase 형제 포인트가 상위를 채울 수 있으므로 QA top_k개가 모일 때까지 후보를 넓힘
+        k = min(top_k * 4, len(scores))
+        while True:
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            pooled = max_pool(
+                [
+                    QAPair(
+                        question=self.pairs[i].question,
+                        answer=self.pairs[i].answer,
+                        score=float(scores[i]),
+                        id=self.pairs[i].id,
+                    )
+                    for i in top
+                ],
+                top_k,
+            )
+            if len(pooled) >= top_k or k == len(scores):
+                return pooled
+            k = min(k * 2, len(scores))
 
 
 class SentenceTransformerEmbedder(Embedder):
     """SentenceTransformer 기반 임베딩 구현체."""
     
-    def __init__(self, model_name: str = "snunlp/KR-SBERT-V40K-klueNLI-augSTS"):
+    def __init__(
+        self,
+        model_name: str = "snunlp/KR-SBERT-V40K-klueNLI-augSTS",
+        cache: Optional[SQLiteEmbeddingCache] = None,
+        batch_size: int = 1,
+    ):
         self._model: Optional[SentenceTransformer] = None
         self.model_name = model_name
+        self.cache = cache  # 영구 임베딩 캐시 (ingest와 공유, 캐시 hit 시 forward pass 생략)
+        self.batch_size = batch_size  # API 워커는 1 (메모리 절약), 임베딩 서버는 배치 크기만큼
     
     @property
     def model(self) -> SentenceTransformer:
@@ -53,16 +335,29 @@ class SentenceTransformerEmbedder(Embedder):
             )
         return self._model
     
-    def embed(self, texts: List[str]) -> List[List[float]]:
-        """텍스트를 벡터로 임베딩."""
-        # 메모리 절약: batch_size를 1로 줄임 (Render Free 플랜 대응)
-        vecs = self.model.encode(
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        # 메모리 절약: 기본 batch_size 1 (Render Free 플랜 대응)
+        return self.model.encode(
             texts,
-            batch_size=1,  # 64 → 1 (메모리 절약)
+            batch_size=self.batch_size,
             convert_to_numpy=True,
             normalize_embeddings=True,
             show_progress_bar=False,  # 로그 줄이기
         )
-        return vecs.tolist()
+    
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        """텍스트를 벡터로 임베딩 (캐시 조회 → miss만 모델 실행 → 캐시 저장)."""
+        if self.cache is None:
+            return self._encode(texts).tolist()
+        
+        cached = self.cache.get_many(self.model_name, texts)
+        missing = [i for i, v in enumerate(cached) if v is None]
+        if missing:
+            miss_texts = [texts[i] for i in missing]
+            vecs = self._encode(miss_texts)
+            self.cache.put_many(self.model_name, miss_texts, vecs)
+            for i, vec in zip(missing, vecs):
+                cached[i] = vec
+        return [v.tolist() for v in cached]
 
 
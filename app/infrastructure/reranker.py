@@ -0,0 +1,87 @@
+"""Cross-encoder reranker (CPU) with an in-memory (query, question) score cache."""
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+from sentence_transformers import CrossEncoder
+from app.domain.entities import QAPair
+from app.domain.repositories import Reranker
+from app.infrastructure.embedding_cache import normalize_text
+
+
+class CrossEncoderReranker(Reranker):
+    """
+    소형 한국어 cross-encoder로 (질문, 후보 질문) 쌍 점수 계산.
+
+    - 캐시에 없는 쌍만 모아 한 번의 배치 forward pass로 계산
+    - (정규화 질의, 후보 질문) → 점수 LRU 캐시 (같은 질의 반복 시 모델 호출 없음)
+    - 조건부 실행(1·2위 격차)과 지연 상한은 QASearchUseCase에서 처리
+    """
+
+    def __init__(
+        self,
+        model_name: str = "bongsoo/albert-small-kor-cross-encoder-v1",
+        cache_size: int = 4096,
+        max_length: int = 128,
+    ):
+        self.model_name = model_name
+        self.cache_size = cache_size
+        self.max_length = max_length
+        self._model: Optional[CrossEncoder] = None
+        self._model_lock = threading.Lock()
+        self._cache: "OrderedDict[Tuple[str, str], float]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.calls = 0
+        self.pairs_scored = 0
+        self.cache_hits = 0
+        self.forward_ms_total = 0.0
+
+    @property
+    def model(self) -> CrossEncoder:
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    os.environ["TOKENIZERS_PARALLELISM"] = "false"
+                    self._model = CrossEncoder(self.model_name, max_length=self.max_length, device="cpu")
+        return self._model
+
+    def score(self, query: str, candidates: List[QAPair]) -> List[float]:
+        key_query = normalize_text(query)
+        keys = [(key_query, c.question) for c in candidates]
+        scores: List[Optional[float]] = []
+        with self._cache_lock:
+            for key in keys:
+                value = self._cache.get(key)
+                if value is not None:
+                    self._cache.move_to_end(key)
+                scores.append(value)
+            missing = [i for i, s in enumerate(scores) if s is None]
+            self.calls += 1  # 카운터는 요청 스레드 여럿이 갱신하므로 캐시 lock 안에서
+            self.cache_hits += len(keys) - len(missing)
+
+        if missing:
+            t0 = time.perf_counter()
+            pairs = [(query, candidates[i].question) for i in missing]
+            predicted = self.model.predict(pairs, batch_size=len(pairs), show_progress_bar=False)
+            forward_ms = (time.perf_counter() - t0) * 1000
+            with self._cache_lock:
+                self.forward_ms_total += forward_ms
+                self.pairs_scored += len(pairs)
+                for i, value in zip(missing, predicted):
+                    scores[i] = float(value)
+                    self._cache[keys[i]] = float(value)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return scores
+
+    def stats(self) -> dict:
+        with self._cache_lock:
+            return {
+                "model": self.model_name,
+                "calls": self.calls,
+                "pairs_scored": self.pairs_scored,
+                "cache_hits": self.cache_hits,
+                "cache_entries": len(self._cache),
+                "forward_ms_total": round(self.forward_ms_total, 1),
+            }
@@ -1,8 +1,12 @@
-import os, json, time, sys
+import os, json, time, sys, threading, queue
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import List, Optional
-from fastapi import FastAPI, HTTPException
+from typing import List, Optional, Union
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
 from qdrant_client import QdrantClient
 from dotenv import load_dotenv
@@ -18,8 +22,31 @@ if _pythonpath and _pythonpath not in sys.path:
     sys.path.insert(0, _pythonpath)
 
 from app.application.use_cases import QASearchUseCase
-from app.infrastructure.repositories import QdrantRetriever, SentenceTransformerEmbedder
-from app.infrastructure.guards import HallucinationGuard
+from app.application.deadline import Deadline, remaining_budget
+from app.application.fusion import FusionEngine, weight_rules_from_config
+from app.application.prewarm import Prewarmer, load_dataset_questions, merge_queries, top_logged_queries
+from app.application.rewrite_scheduler import BATCH, RewriteScheduler, ScheduledRewriter, rewrite_priority
+from app.infrastructure.repositories import (
+    LocalIndexRetriever, ProjectedQdrantRetriever, QdrantRetriever, SentenceTransformerEmbedder,
+)
+from app.infrastructure.projection import PcaProjection, projection_matches
+from app.infrastructure.guards import HallucinationGuard, threshold_rules_from_config
+from app.infrastructure.embedding_cache import open_default_cache
+from app.infrastructure.qdrant_admin import CollectionVersionWatcher
+from app.infrastructure.qdrant_transport import QdrantTransportConfig, RetryingQdrantClient
+from app.infrastructure.knowledge_base import (
+    KnowledgeBaseConfig,
+    KnowledgeBaseRegistry,
+    UnknownKnowledgeBase,
+    load_kb_configs,
+)
+from app.infrastructure.lexical import LexicalRetriever
+from app.infrastructure.memory_cache import TTLCache
+from app.infrastructure.query_log import QueryLogWriter
+from app.infrastructure.query_profile import QueryProfiler, load_query_rules
+from app.infrastructure.reranker import CrossEncoderReranker
+from app.infrastructure.admission import AdmissionController, AdmissionControlledEmbedder, AdmissionRejected
+from app.infrastructure.embedding_server import RemoteEmbedder
 
 # ====== 설정 로드 ======
 load_dotenv()
@@ -27,11 +54,76 @@ QDRANT_URL = os.getenv("QDRANT_URL", "http://localhost:6333")
 QDRANT_API_KEY = os.getenv("QDRANT_API_KEY")  # Qdrant Cloud용
 QDRANT_COLLECTION = os.getenv("QDRANT_COLLECTION", "qa_collection")
 EMBED_MODEL = os.getenv("EMBED_MODEL", "snunlp/KR-SBERT-V40K-klueNLI-augSTS")
+EMBED_SERVER_SOCKET = os.getenv("EMBED_SERVER_SOCKET", "")  # 설정 시 임베딩 서버 사용 (API 워커는 모델 미로드)
+EMBED_SERVER_TIMEOUT = float(os.getenv("EMBED_SERVER_TIMEOUT", "5"))
 SIM_THRESHOLD = float(os.getenv("SIM_THRESHOLD", "0.75"))
 TOP_K = int(os.getenv("TOP_K", "3"))
+REQUEST_DEADLINE_MS = float(os.getenv("REQUEST_DEADLINE_MS", "800"))  # 요청 지연 예산 (0 = 제한 없음)
+LOCAL_INDEX_PATH = os.getenv("LOCAL_INDEX_PATH", "data/local_index.npz")  # Qdrant fallback용 로컬 인덱스
+QDRANT_HNSW_EF = int(os.getenv("QDRANT_HNSW_EF", "0")) or None  # 검색 시 HNSW ef (0 = 서버 기본값)
+QDRANT_EXACT = os.getenv("QDRANT_EXACT", "0") == "1"  # 전수 검색 (디버깅/기준선용)
+QDRANT_RESCORE = {"1": True, "0": False}.get(os.getenv("QDRANT_RESCORE", ""))  # 양자화 재채점 (미설정 = 서버 기본값)
+QDRANT_OVERSAMPLING = float(os.getenv("QDRANT_OVERSAMPLING", "0")) or None  # 양자화 후보 배수
+PCA_PATH = os.getenv("PCA_PATH", "data/pca_projection.npz")  # ingest --pca-dim으로 생성 (있으면 축소 벡터 1차 검색)
+PCA_SEARCH = os.getenv("PCA_SEARCH", "1") == "1"  # 0 = 투영 파일이 있어도 원본 벡터로 검색
+PCA_CANDIDATES = int(os.getenv("PCA_CANDIDATES", "4"))  # 원본 벡터 재채점 후보 배수
+LEXICAL_ENABLED = os.getenv("LEXICAL_ENABLED", "1") == "1"  # n-gram BM25 하이브리드 검색
+LEXICAL_INDEX_PATH = os.getenv("LEXICAL_INDEX_PATH", "data/lexical_index.json")  # ingest 시 생성
+LEXICAL_SHORTCUT_SCORE = float(os.getenv("LEXICAL_SHORTCUT_SCORE", "0.9"))  # 단축 응답 최소 키워드 커버리지
+LEXICAL_SHORTCUT_MARGIN = float(os.getenv("LEXICAL_SHORTCUT_MARGIN", "1.3"))  # 1위/2위 BM25 최소 배수
+LEXICAL_SHORTCUT_MIN_WORDS = int(os.getenv("LEXICAL_SHORTCUT_MIN_WORDS", "2"))  # 단축 응답 최소 매칭 어절 수
+PARAPHRASE_FANOUT = int(os.getenv("PARAPHRASE_FANOUT", "4"))  # paraphrase 형제 포인트 대비 후보 배수
+REWRITE_SKIP_SCORE = float(os.getenv("REWRITE_SKIP_SCORE", "0.85")) or None  # 원본 검색이 이 점수 이상이면 Gemini 생략 (0 = 항상 rewrite)
+RERANK_ENABLED = os.getenv("RERANK_ENABLED", "0") == "1"  # 근소한 차이 후보만 cross-encoder 재정렬
+RERANK_MODEL = os.getenv("RERANK_MODEL", "bongsoo/albert-small-kor-cross-encoder-v1")
+RERANK_MARGIN = float(os.getenv("RERANK_MARGIN", "0.05"))  # 1·2위 점수 차가 이 값 미만일 때만 실행
+RERANK_TIMEOUT_MS = float(os.getenv("RERANK_TIMEOUT_MS", "150"))  # 초과 시 Ensemble 순서 유지
+RERANK_CACHE_SIZE = int(os.getenv("RERANK_CACHE_SIZE", "4096"))
+QUERY_RULES_PATH = os.getenv("QUERY_RULES_PATH", "query_rules.json")  # 질의 분류 표지 + 가중치/임계값 규칙 (없으면 기본 규칙)
+QUERY_LOG_PATH = os.getenv("QUERY_LOG_PATH", "logs/queries")  # 디렉터리 = 시간별 컬럼형 저장소, *.jsonl = 이전 텍스트 형식
+REWRITE_CACHE_SIZE = int(os.getenv("REWRITE_CACHE_SIZE", "2048"))  # Gemini rewrite 결과 캐시 (0 = 비활성)
+REWRITE_CACHE_TTL = float(os.getenv("REWRITE_CACHE_TTL", "86400")) or None  # 초 (0 = 만료 없음)
+ANSWER_CACHE_SIZE = int(os.getenv("ANSWER_CACHE_SIZE", "1024"))  # 최종 답변 캐시 (0 = 비활성)
+ANSWER_CACHE_TTL = float(os.getenv("ANSWER_CACHE_TTL", "3600")) or None
+PREWARM_ENABLED = os.getenv("PREWARM_ENABLED", "1") == "1"  # 기동 시 캐시 프리워밍 (완료 전 /readyz = 503)
+PREWARM_TOP_N = int(os.getenv("PREWARM_TOP_N", "50"))  # 질의 로그 상위 N개
+PREWARM_QUESTIONS_PATH = os.getenv("PREWARM_QUESTIONS_PATH", "data/prewarm_questions.json")  # 인제스트가 저장한 데이터셋 질문
+PREWARM_TIME_BUDGET = float(os.getenv("PREWARM_TIME_BUDGET", "60"))  # 초
+PREWARM_MAX_QUERIES = int(os.getenv("PREWARM_MAX_QUERIES", "100"))
+PREWARM_MAX_REWRITES = int(os.getenv("PREWARM_MAX_REWRITES", "20"))  # 프리워밍 중 Gemini 호출 상한 (무료 quota 보호)
+GEMINI_RPM = float(os.getenv("GEMINI_RPM", "15"))  # Gemini 분당 요청 quota (0 = 스케줄러 없이 직접 호출)
+GEMINI_TPM = float(os.getenv("GEMINI_TPM", "1000000"))  # 분당 토큰 quota (0 = 토큰 제한 없음)
+GEMINI_WORKERS = int(os.getenv("GEMINI_WORKERS", "4"))  # 동시 Gemini 호출 수
+# quota는 API 키 단위 → gunicorn 워커마다 버킷이 따로 있으므로 워커 수로 나눈 몫만 사용
+GEMINI_QUOTA_WORKERS = max(1, int(os.getenv("GEMINI_QUOTA_WORKERS", os.getenv("WEB_CONCURRENCY", "1"))))
+GEMINI_BATCH_RESERVE = float(os.getenv("GEMINI_BATCH_RESERVE", "0.2"))  # 배치/프리워밍이 남겨 둘 quota 비율 (대화형 요청용)
+GEMINI_QUEUE = int(os.getenv("GEMINI_QUEUE", "64"))  # 대화형 rewrite 대기열 상한 (초과 시 원본 질의)
+HEALTH_DEEP_TTL = float(os.getenv("HEALTH_DEEP_TTL", "10"))  # /healthz/deep 결과 캐시(초) - 프로브마다 모델/Qdrant를 호출하지 않음
+ALIAS_CHECK_INTERVAL = float(os.getenv("ALIAS_CHECK_INTERVAL", "30"))  # blue/green alias 전환 감지 주기(초)
+KB_CONFIG_PATH = os.getenv("KB_CONFIG_PATH", "knowledge_bases.json")  # 멀티 KB 설정 (없으면 QDRANT_COLLECTION 단일 KB)
+KB_DATA_DIR = os.getenv("KB_DATA_DIR", "data/kb")  # 기본 KB 이외 KB의 로컬/어휘 인덱스 파일 위치
+KB_MAX_LOADED = int(os.getenv("KB_MAX_LOADED", "0"))  # 동시에 메모리에 둘 KB 수 (0 = 제한 없음)
+KB_MEMORY_BUDGET_MB = float(os.getenv("KB_MEMORY_BUDGET_MB", "0"))  # KB별 인덱스/캐시 메모리 예산 (0 = 제한 없음)
+
+# Admission control (0 = CPU 코어 수 기준 자동 설정)
+_CPU_COUNT = os.cpu_count() or 1
+EMBED_MAX_CONCURRENCY = int(os.getenv("EMBED_MAX_CONCURRENCY", "0")) or _CPU_COUNT
+ASK_MAX_CONCURRENCY = int(os.getenv("ASK_MAX_CONCURRENCY", "0")) or _CPU_COUNT * 4  # Gemini I/O 대기 포함
+ADMISSION_MAX_QUEUE = int(os.getenv("ADMISSION_MAX_QUEUE", "0")) or _CPU_COUNT * 2
+ADMISSION_MAX_WAIT = float(os.getenv("ADMISSION_MAX_WAIT", "0.5"))  # 대기열 최대 대기 시간(초)
+ADMISSION_RETRY_AFTER = int(os.getenv("ADMISSION_RETRY_AFTER", "1"))  # Retry-After 헤더(초)
 
 # ====== FastAPI ======
-app = FastAPI(title="Vibe QA Bot API", version="1.0.0")
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    # 프리워밍은 백그라운드 스레드에서만 실행 → 워커 기동을 막지 않음 (완료 전 /readyz = 503)
+    if PREWARM_ENABLED:
+        get_prewarmer().start()
+    yield
+    if isinstance(_embedder, RemoteEmbedder):
+        _embedder.close()  # 연결별 공유 메모리 해제
+
+app = FastAPI(title="Vibe QA Bot API", version="1.0.0", lifespan=lifespan)
 
 # 프론트 도메인 허용 (필요 시 도메인 제한)
 app.add_middleware(
@@ -42,58 +134,432 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# ====== Admission control (CPU 포화 시 빠른 503 반환) ======
+_ask_admission = AdmissionController(
+    "ask",
+    max_concurrency=ASK_MAX_CONCURRENCY,
+    max_queue=ADMISSION_MAX_QUEUE,
+    max_wait=ADMISSION_MAX_WAIT,
+    retry_after=ADMISSION_RETRY_AFTER,
+)
+_embed_admission = AdmissionController(
+    "embed",
+    max_concurrency=EMBED_MAX_CONCURRENCY,
+    max_queue=ADMISSION_MAX_QUEUE,
+    max_wait=ADMISSION_MAX_WAIT,
+    retry_after=ADMISSION_RETRY_AFTER,
+)
+# /ask/stream 검색 실행 스레드 (동시 실행 수는 ask admission 슬롯이 제한)
+_stream_executor = ThreadPoolExecutor(max_workers=ASK_MAX_CONCURRENCY, thread_name_prefix="ask-stream")
+
+# 강등 단계별 카운터 (지연 예산 초과 빈도 추적)
+_degradation_counts: Counter = Counter()
+_rerank_stats = {"requests": 0, "attempted": 0, "timed_out": 0, "latency_ms_total": 0.0, "latency_ms_max": 0.0}
+_strategy_counts: Counter = Counter()  # ensemble / vector(Gemini 생략) / lexical(단축 응답) / cache(답변 캐시)
+_stream_counts: Counter = Counter()  # /ask/stream: requests / provisional(잠정 답변 전송) / changed(최종 답변으로 교체)
+_degradation_lock = threading.Lock()  # 위 요청 카운터(강등/전략/재정렬/스트림) 갱신·스냅샷용
+
+@app.exception_handler(AdmissionRejected)
+def admission_rejected_handler(request: Request, exc: AdmissionRejected):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": f"Server busy ({exc.reason}), retry later"},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
 # ====== 싱글톤 리소스 (클린 아키텍처 적용) ======
-_embedder: Optional[SentenceTransformerEmbedder] = None
-_retriever: Optional[QdrantRetriever] = None
-_use_case: Optional[QASearchUseCase] = None
-_qc: Optional[QdrantClient] = None
+_embedder: Optional[Union[SentenceTransformerEmbedder, RemoteEmbedder]] = None
+_local_index: Optional[LocalIndexRetriever] = None  # master 프리로드 (기본 KB 첫 로드 시 인계)
+_lexical_index: Optional[LexicalRetriever] = None
+_reranker: Optional[CrossEncoderReranker] = None
+_qc: Optional[RetryingQdrantClient] = None
+_prewarmer: Optional[Prewarmer] = None
+_rewrite_scheduler: Optional[RewriteScheduler] = None
+_query_log: Optional[QueryLogWriter] = None
 
 def get_qdrant() -> QdrantClient:
+    """
+    워커별 Qdrant 클라이언트 (QDRANT_API_KEY가 있으면 Qdrant Cloud).
+    전송 방식(REST/gRPC), 연결 풀/keep-alive, 타임아웃, 조회 재시도는 QDRANT_* 환경변수로 설정.
+    """
     global _qc
     if _qc is None:
-        if QDRANT_API_KEY:
-            # Qdrant Cloud 연결
-            _qc = QdrantClient(url=QDRANT_URL, api_key=QDRANT_API_KEY)
-        else:
-            # 로컬 Qdrant 연결
-            _qc = QdrantClient(url=QDRANT_URL)
+        config = QdrantTransportConfig.from_env(url=QDRANT_URL, api_key=QDRANT_API_KEY)
+        _qc = RetryingQdrantClient.from_config(config, budget=remaining_budget)  # 요청 deadline을 넘겨 재시도하지 않음
+        print(f"[Qdrant] {config.url} ({config.transport}, pool={config.pool_size}, keepalive={config.keepalive}, retries={config.retries})")
     return _qc
 
-def get_embedder() -> SentenceTransformerEmbedder:
+def get_embedder() -> Union[SentenceTransformerEmbedder, RemoteEmbedder]:
     global _embedder
     if _embedder is None:
-        _embedder = SentenceTransformerEmbedder(EMBED_MODEL)
+        if EMBED_SERVER_SOCKET:
+            _embedder = RemoteEmbedder(EMBED_SERVER_SOCKET, timeout=EMBED_SERVER_TIMEOUT)
+        else:
+            _embedder = SentenceTransformerEmbedder(EMBED_MODEL, cache=open_default_cache(read_only=True))  # 요청 경로는 조회만
     return _embedder
 
-def get_retriever() -> QdrantRetriever:
-    global _retriever
-    if _retriever is None:
-        _retriever = QdrantRetriever(
+def load_embedder():
+    """모델 로딩 (임베딩 서버 모드면 서버 연결 확인만)."""
+    embedder = get_embedder()
+    return embedder.ping() if isinstance(embedder, RemoteEmbedder) else embedder.model
+
+def get_rewrite_scheduler() -> Optional[RewriteScheduler]:
+    """
+    워커별 Gemini 호출 스케줄러 (워커 안의 모든 KB가 공유).
+
+    quota는 API 키 단위이므로 GEMINI_RPM/TPM을 워커 수(GEMINI_QUOTA_WORKERS, 기본 WEB_CONCURRENCY)로
+    나눈 몫만 사용 - 나누지 않으면 워커 N개가 합쳐 N배를 호출해 429를 받는다.
+    """
+    global _rewrite_scheduler
+    if GEMINI_RPM > 0 and _rewrite_scheduler is None:
+        _rewrite_scheduler = RewriteScheduler(
+            rpm=GEMINI_RPM / GEMINI_QUOTA_WORKERS,
+            tpm=(GEMINI_TPM / GEMINI_QUOTA_WORKERS) or None,
+            workers=GEMINI_WORKERS,
+            batch_reserve=GEMINI_BATCH_RESERVE,
+            max_queue=GEMINI_QUEUE,
+        )
+    return _rewrite_scheduler
+
+def get_reranker() -> Optional[CrossEncoderReranker]:
+    global _reranker
+    if RERANK_ENABLED and _reranker is None:
+        _reranker = CrossEncoderReranker(RERANK_MODEL, cache_size=RERANK_CACHE_SIZE)
+    return _reranker
+
+def _versioned_index(cached, current: Optional[str], path: str, load, build, label: str, fresh=None):
+    """
+    컬렉션 버전(source)에 묶인 로컬 인덱스 공통 로딩.
+    메모리/파일의 인덱스가 현재 alias 대상과 같으면 재사용, 아니면 Qdrant에서 재구축 후 파일로 캐시 (실패 시 None).
+    alias가 아니라 버전을 알 수 없으면(current=None) fresh(index)로 파일 인덱스가 현재 데이터와 맞는지 확인.
+    """
+    if cached is not None and (
+        cached.source == current if current is not None else fresh is None or fresh(cached)
+    ):
+        return cached
+    try:
+        index = load(path) if os.path.exists(path) else None
+        stale = index is not None and (
+            index.source != current if current is not None else fresh is not None and not fresh(index)
+        )
+        if index is None or stale:
+            index = build(current)
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            index.save(path)
+        print(f"[{label}] {len(index)}개 포인트 로드 ({index.source})")
+        return index
+    except Exception as e:
+        print(f"[{label}] 로드 실패 (비활성): {e}")
+        return None
+
+def _point_count_matches(index: LocalIndexRetriever, collection: str) -> bool:
+    """파일 인덱스 포인트 수 == 컬렉션 포인트 수 (Qdrant에 닿지 않으면 파일 인덱스 유지 - fallback 용도)."""
+    try:
+        count = get_qdrant().count(collection, exact=True).count
+    except Exception:
+        return True
+    if count != len(index):
+        print(f"[LocalIndex] 파일 인덱스가 오래됨 ({len(index)} != {count} points) → 재구축")
+    return count == len(index)
+
+class KnowledgeBaseResources:
+    """
+    KB 하나의 서빙 리소스: 컬렉션 검색기, 로컬/어휘 인덱스, alias 감시, rewrite/답변 캐시, UseCase.
+
+    임베딩 모델, Qdrant 클라이언트, 재정렬 모델, admission control은 모든 KB가 공유하므로
+    KB 수가 늘어도 늘어나는 메모리는 KB별 인덱스와 캐시뿐입니다.
+    """
+
+    def __init__(self, config: KnowledgeBaseConfig, local_index=None, lexical_index=None):
+        """local_index/lexical_index: master에서 프리로드된 인덱스 (기본 KB만)."""
+        self.config = config
+        self.embedder = AdmissionControlledEmbedder(get_embedder(), _embed_admission)
+        self.local_index_path = config.local_index_path or LOCAL_INDEX_PATH
+        self.lexical_index_path = config.lexical_index_path or LEXICAL_INDEX_PATH
+        self.pca_path = config.pca_path or PCA_PATH
+        self.projection: Optional[PcaProjection] = None
+        self.watcher = CollectionVersionWatcher(get_qdrant, config.collection, interval=ALIAS_CHECK_INTERVAL)
+        self.watcher.on_switch(self._on_collection_switch)
+        self.watcher.on_tick(self._check_projection)
+        self.local_index: Optional[LocalIndexRetriever] = local_index
+        self.lexical_index: Optional[LexicalRetriever] = lexical_index
+        self.use_case = self._build_use_case()
+        self.watcher.start()  # 워커 프로세스에서 alias 감시 시작
+
+    def load_local_index(self) -> Optional[LocalIndexRetriever]:
+        """Qdrant fallback용 로컬 벡터 인덱스."""
+        collection, embedder = self.config.collection, self.embedder
+        self.local_index = _versioned_index(
+            self.local_index,
+            self.watcher.current(),  # alias가 아니거나 Qdrant 불가 시 None
+            self.local_index_path,
+            lambda path: LocalIndexRetriever.load(path, embedder),
+            lambda source: LocalIndexRetriever.from_qdrant(get_qdrant(), collection, embedder, source=source),
+            f"LocalIndex:{self.config.id}",
+            fresh=lambda index: _point_count_matches(index, collection),
+        )
+        return self.local_index
+
+    def load_lexical_index(self) -> Optional[LexicalRetriever]:
+        """짧은 키워드 질문용 n-gram BM25 인덱스 (인제스트 시 생성된 파일 우선)."""
+        if not LEXICAL_ENABLED:
+            return None
+        collection = self.config.collection
+        options = dict(
+            shortcut_score=LEXICAL_SHORTCUT_SCORE,
+            shortcut_margin=LEXICAL_SHORTCUT_MARGIN,
+            shortcut_min_words=LEXICAL_SHORTCUT_MIN_WORDS,
+        )
+        self.lexical_index = _versioned_index(
+            self.lexical_index,
+            self.watcher.current(),
+            self.lexical_index_path,
+            lambda path: LexicalRetriever.load(path, **options),
+            lambda source: LexicalRetriever.from_qdrant(get_qdrant(), collection, source=source, **options),
+            f"Lexical:{self.config.id}",
+        )
+        return self.lexical_index
+
+    def load_projection(self) -> Optional[PcaProjection]:
+        """
+        축소 벡터 1차 검색용 PCA 투영 (현재 컬렉션 버전으로 학습했고 포인트 수가 그대로인 파일만 사용).
+        제자리 재인제스트는 컬렉션 이름이 같으므로 포인트 수(projection_matches)로 판단.
+        """
+        if not PCA_SEARCH or not os.path.exists(self.pca_path):
+            return None
+        label = f"PCA:{self.config.id}"
+        try:
+            projection = PcaProjection.load(self.pca_path)
+        except Exception as e:
+            print(f"[{label}] 로드 실패 (원본 벡터 검색): {e}")
+            return None
+        current = self.watcher.current() or self.config.collection
+        if projection.source != current:
+            print(f"[{label}] 투영({projection.source})이 현재 컬렉션({current})과 달라 원본 벡터 검색")
+            return None
+        try:
+            fresh = projection_matches(get_qdrant(), projection, self.config.collection)
+        except Exception as e:
+            print(f"[{label}] 포인트 수 확인 실패 (원본 벡터 검색): {e}")
+            return None
+        if not fresh:
+            print(f"[{label}] 투영이 현재 데이터와 맞지 않음 (재인제스트/축소 컬렉션 없음) → 원본 벡터 검색")
+            return None
+        print(f"[{label}] {projection.input_dim}→{projection.dim}차원 1차 검색 ({projection.collection}, 재채점 ×{PCA_CANDIDATES})")
+        return projection
+
+    def _build_retriever(self) -> QdrantRetriever:
+        options = dict(
             client=get_qdrant(),
-            embedder=get_embedder(),
-            collection=QDRANT_COLLECTION
+            embedder=self.embedder,
+            collection=self.config.collection,
+            hnsw_ef=QDRANT_HNSW_EF,
+            exact=QDRANT_EXACT,
+            rescore=QDRANT_RESCORE,
+            oversampling=QDRANT_OVERSAMPLING,
+            fanout=PARAPHRASE_FANOUT,
         )
-    return _retriever
+        self.projection = self.load_projection()
+        if self.projection is not None:
+            return ProjectedQdrantRetriever(projection=self.projection, candidates=PCA_CANDIDATES, **options)
+        return QdrantRetriever(**options)
 
-def get_use_case() -> QASearchUseCase:
-    global _use_case
-    if _use_case is None:
-        from app.application.gemini_rewriter import GeminiQueryRewriter
+    def _build_use_case(self) -> QASearchUseCase:
+        from app.application.gemini_rewriter import CachedRewriter, GeminiQueryRewriter
         
-        guard = HallucinationGuard(threshold=SIM_THRESHOLD)
-        rewriter = GeminiQueryRewriter()  # Gemini API 연결
+        rules_path = self.config.query_rules_path or QUERY_RULES_PATH
+        rules = load_query_rules(rules_path) if os.path.exists(rules_path) else {}
+        profiler = QueryProfiler.from_config(rules.get("profile"))
+        guard = HallucinationGuard(
+            threshold=self.config.threshold if self.config.threshold is not None else SIM_THRESHOLD,
+            profiler=profiler,  # use case와 같은 분류기 공유 (요청당 한 번 분류)
+            threshold_rules=threshold_rules_from_config(rules.get("thresholds")),
+        )
+        rewriter = GeminiQueryRewriter(  # Gemini API 연결 (KB별 표준 질문/프롬프트)
+            standard_questions=self.config.standard_questions,
+            system_prompt=self.config.load_prompt(),
+            service_name=self.config.name,
+        )
+        scheduler = get_rewrite_scheduler()
+        if scheduler is not None:
+            rewriter = ScheduledRewriter(rewriter, scheduler)  # quota 토큰 버킷 + 대화형 우선 + 중복 병합
+        if REWRITE_CACHE_SIZE > 0:
+            rewriter = CachedRewriter(rewriter, TTLCache(REWRITE_CACHE_SIZE, ttl=REWRITE_CACHE_TTL))
         
-        _use_case = QASearchUseCase(
-            retriever=get_retriever(),
+        return QASearchUseCase(
+            retriever=self._build_retriever(),  # PCA 투영이 있으면 축소 벡터 1차 검색 + 원본 재채점
             guard=guard,
             top_k=TOP_K,
-            rewriter=rewriter  # Gemini Rewriter 주입
+            rewriter=rewriter,  # Gemini Rewriter 주입
+            fallback_retriever=self.load_local_index(),  # Qdrant 지연 시 로컬 인덱스
+            lexical_retriever=self.load_lexical_index(),  # 키워드 매칭 (RRF 결합 + 단축 응답)
+            rewrite_skip_score=REWRITE_SKIP_SCORE,  # paraphrase 매칭이 확실하면 Gemini 생략
+            reranker=get_reranker(),  # 근소한 차이일 때만 cross-encoder 재정렬
+            rerank_margin=RERANK_MARGIN,
+            rerank_timeout=RERANK_TIMEOUT_MS / 1000.0,
+            fusion=FusionEngine(weight_rules_from_config(rules.get("weights"))),
+            answer_cache=TTLCache(ANSWER_CACHE_SIZE, ttl=ANSWER_CACHE_TTL) if ANSWER_CACHE_SIZE > 0 else None,
+        )
+
+    def _on_collection_switch(self, old: Optional[str], new: str):
+        """alias 전환: 이전 버전 기반 로컬/어휘 인덱스·PCA 투영을 버리고 새 버전으로 재구축."""
+        self.local_index = None
+        self.lexical_index = None
+        self.use_case.retriever = self._build_retriever()
+        self.use_case.fallback_retriever = self.load_local_index()
+        self.use_case.lexical_retriever = self.load_lexical_index()
+        if self.use_case.answer_cache is not None:
+            self.use_case.answer_cache.clear()  # 이전 버전 데이터로 만든 답변 폐기
+
+    def _check_projection(self):
+        """제자리 재인제스트로 투영이 오래되면 원본 벡터 검색기로 교체 (alias 전환이 없어 on_switch로는 감지 불가)."""
+        projection = self.projection
+        if projection is None or projection_matches(get_qdrant(), projection, self.config.collection):
+            return
+        print(f"[PCA:{self.config.id}] 투영이 현재 데이터와 맞지 않음 → 검색기 재구성")
+        self.use_case.retriever = self._build_retriever()
+
+    def memory_bytes(self) -> int:
+        """KB별 메모리 추정치 (로컬/어휘 인덱스 + 캐시 항목 수 × 항목당 추정 크기)."""
+        indexes = (self.local_index, self.lexical_index, self.projection)
+        total = sum(index.memory_bytes() for index in indexes if index is not None)
+        rewrite_cache = getattr(self.use_case.rewriter, "cache", None)
+        total += len(rewrite_cache or ()) * 256
+        total += len(self.use_case.answer_cache or ()) * 2048
+        return total
+
+    def close(self):
+        """LRU 제거 시 정리 (alias 감시 중단, 캐시 비움)."""
+        self.watcher.stop()
+        if self.use_case.answer_cache is not None:
+            self.use_case.answer_cache.clear()
+
+    def stats(self) -> dict:
+        rewrite_cache = getattr(self.use_case.rewriter, "cache", None)
+        return {
+            "collection": self.config.collection,
+            "memory_bytes": self.memory_bytes(),
+            "local_index": len(self.local_index) if self.local_index is not None else None,
+            "lexical_index": len(self.lexical_index) if self.lexical_index is not None else None,
+            "pca_dim": self.projection.dim if self.projection is not None else None,
+            "rewrite_cache": rewrite_cache.stats() if rewrite_cache is not None else None,
+            "answer_cache": self.use_case.answer_cache.stats() if self.use_case.answer_cache else None,
+        }
+
+def _load_knowledge_base(config: KnowledgeBaseConfig) -> KnowledgeBaseResources:
+    global _local_index, _lexical_index
+    if config.id != _kb_registry.default:
+        return KnowledgeBaseResources(config)
+    # 기본 KB: master에서 프리로드한 인덱스 사용 (이후에는 KB 리소스가 소유)
+    preloaded = (_local_index, _lexical_index)
+    _local_index = _lexical_index = None
+    return KnowledgeBaseResources(config, *preloaded)
+
+_kb_configs, _default_kb = load_kb_configs(KB_CONFIG_PATH, QDRANT_COLLECTION, data_dir=KB_DATA_DIR)
+_kb_registry: KnowledgeBaseRegistry[KnowledgeBaseResources] = KnowledgeBaseRegistry(
+    _kb_configs,
+    _load_knowledge_base,
+    default=_default_kb,
+    max_loaded=KB_MAX_LOADED,
+    memory_budget=int(KB_MEMORY_BUDGET_MB * 1024 * 1024),
+    sizeof=lambda kb: kb.memory_bytes(),
+    on_evict=lambda _, kb: kb.close(),
+    pinned=(_default_kb,),  # 기본 KB는 제거하지 않음 (프리워밍 대상)
+)
+
+def get_knowledge_base(kb_id: Optional[str] = None) -> KnowledgeBaseResources:
+    """KB 리소스 (첫 요청 시 로드, 예산 초과 시 LRU 제거) - 설정에 없으면 UnknownKnowledgeBase."""
+    return _kb_registry.get(kb_id)
+
+def get_use_case(kb_id: Optional[str] = None) -> QASearchUseCase:
+    return get_knowledge_base(kb_id).use_case
+
+def _prewarm_queries() -> List[str]:
+    """
+    프리워밍 질의 (기본 KB): 로그 상위 N개 + 표준 질문 + 데이터셋 질문.
+
+    데이터셋 질문은 인제스트가 저장한 JSON(PREWARM_QUESTIONS_PATH)에서 읽음 - 서버에는 pandas/openpyxl이 없으므로
+    엑셀을 직접 파싱하지 않음. 파일이 없으면 이미 로드된 어휘 인덱스의 질문 사용.
+    """
+    from app.application.gemini_rewriter import GeminiQueryRewriter
+    
+    dataset: List[str] = []
+    try:
+        dataset = load_dataset_questions(PREWARM_QUESTIONS_PATH)
+    except Exception as e:
+        print(f"[Prewarm] 데이터셋 질문 로드 실패: {e}")
+    if not dataset:
+        lexical = get_use_case().lexical_retriever
+        dataset = [pair.question for pair in lexical.pairs] if lexical is not None else []
+    return merge_queries(
+        top_logged_queries(QUERY_LOG_PATH, PREWARM_TOP_N, kbs=[_default_kb, ""]),
+        _kb_configs[_default_kb].standard_questions or GeminiQueryRewriter.STANDARD_QUESTIONS,
+        dataset,
     )
-    return _use_case
+
+def get_prewarmer() -> Prewarmer:
+    """워커별 프리워밍 (모델 로딩 → Qdrant 커넥션 → 질의 재생으로 임베딩/rewrite/답변 캐시 채움)."""
+    global _prewarmer
+    if _prewarmer is None:
+        def rewrite_calls() -> int:
+            rewriter = get_use_case().rewriter
+            return getattr(rewriter, "calls", 0)
+        
+        def prewarm_search(query: str, deadline: Optional[Deadline]):
+            with rewrite_priority(BATCH):  # 대화형 요청이 quota/대기열을 먼저 사용
+                return get_use_case().search(query, deadline=deadline)  # 남은 프리워밍 예산
+        
+        _prewarmer = Prewarmer(
+            search=prewarm_search,  # 질의마다 남은 PREWARM_TIME_BUDGET을 deadline으로 전달
+            queries=_prewarm_queries,
+            time_budget=PREWARM_TIME_BUDGET,
+            max_queries=PREWARM_MAX_QUERIES,
+            max_rewrites=PREWARM_MAX_REWRITES,
+            rewrite_calls=rewrite_calls,
+            setup=[
+                load_embedder,
+                lambda: get_qdrant().get_collections(),
+                get_use_case,
+            ],
+        )
+    return _prewarmer
+
+def preload_resources():
+    """
+    fork 전 공유 리소스 프리로드 (gunicorn preload_app 모드).
+
+    master에서 모델 가중치를 읽어두면 워커들이 fork 시점의 페이지를 copy-on-write로 물려받습니다.
+    master에서는 추론(encode)을 실행하지 않습니다: OpenMP 스레드 풀이 fork 전에
+    초기화되면 자식 프로세스에서 교착될 수 있기 때문입니다.
+    """
+    global _local_index, _lexical_index
+    if not EMBED_SERVER_SOCKET:  # 서버 모드: master에서 소켓 연결을 만들지 않음 (fork 후 공유 방지)
+        _ = get_embedder().model
+    if get_reranker() is not None:
+        _ = get_reranker().model
+    # master에서는 Qdrant 연결을 만들지 않음 (fork 후 연결 공유 방지) → 버전 확인은 워커에서
+    # 기본 KB 인덱스만 프리로드 (다른 KB는 첫 요청 시 워커에서 로드)
+    config = _kb_configs[_default_kb]
+    local_path = config.local_index_path or LOCAL_INDEX_PATH
+    lexical_path = config.lexical_index_path or LEXICAL_INDEX_PATH
+    try:
+        if os.path.exists(local_path):
+            embedder = AdmissionControlledEmbedder(get_embedder(), _embed_admission)
+            _local_index = LocalIndexRetriever.load(local_path, embedder)
+        if LEXICAL_ENABLED and os.path.exists(lexical_path):
+            _lexical_index = LexicalRetriever.load(
+                lexical_path,
+                shortcut_score=LEXICAL_SHORTCUT_SCORE,
+                shortcut_margin=LEXICAL_SHORTCUT_MARGIN,
+                shortcut_min_words=LEXICAL_SHORTCUT_MIN_WORDS,
+            )
+    except Exception as e:
+        print(f"[Preload] 로컬 인덱스 프리로드 실패: {e}")
 
 # ====== 스키마 ======
 class AskReq(BaseModel):
     query: str
+    kb_id: Optional[str] = None  # 지식 베이스 id (없으면 기본 KB)
 
 class TopKItem(BaseModel):
     question: str
@@ -105,12 +571,24 @@ class AskRes(BaseModel):
     matched_question: str
     sources: List[str] = []  # 프론트엔드 계약에 맞춤
     topk: List[TopKItem] = []
+    degradation: str = "full"  # 지연 예산 초과 시 강등 단계 (full / no_rewrite / local_index)
 
 # ====== 유틸 ======
+def get_query_log() -> Optional[QueryLogWriter]:
+    """워커별 컬럼형 질의 로그 writer (QUERY_LOG_PATH가 *.jsonl이면 None → 텍스트 로그)."""
+    global _query_log
+    if _query_log is None and not QUERY_LOG_PATH.endswith(".jsonl"):
+        _query_log = QueryLogWriter(QUERY_LOG_PATH)
+    return _query_log
+
 def write_log(record: dict):
     try:
-        os.makedirs("logs", exist_ok=True)
-        with open("logs/queries.jsonl", "a", encoding="utf-8") as f:
+        writer = get_query_log()
+        if writer is not None:
+            writer.write(record)
+            return
+        os.makedirs(os.path.dirname(QUERY_LOG_PATH) or ".", exist_ok=True)
+        with open(QUERY_LOG_PATH, "a", encoding="utf-8") as f:
             f.write(json.dumps(record, ensure_ascii=False) + "\n")
     except Exception:
         pass
@@ -122,45 +600,251 @@ def healthz():
     # 기본 헬스체크 (서버가 작동하는지만 확인)
     return {"status": "ok"}
 
-@app.get("/healthz/deep")
-def healthz_deep():
-    # 심화 헬스체크 (모델/DB 연결 확인)
+@app.get("/readyz")
+def readyz():
+    # 준비 상태: 프리워밍 완료 전에는 503 (배포 시 트래픽 전환 기준)
+    if not PREWARM_ENABLED:
+        return {"status": "ready"}
+    prewarmer = get_prewarmer()
+    if not prewarmer.ready:
+        return JSONResponse(status_code=503, content={"status": "warming", "prewarm": prewarmer.stats()})
+    return {"status": "ready", "prewarm": prewarmer.stats()}
+
+@app.get("/kb")
+def list_knowledge_bases():
+    # 설정된 지식 베이스 목록과 로드 상태
+    loaded = set(_kb_registry.loaded())
+    return {
+        "default": _kb_registry.default,
+        "knowledge_bases": [
+            {"id": kb_id, "name": config.name, "collection": config.collection, "loaded": kb_id in loaded}
+            for kb_id, config in _kb_configs.items()
+        ],
+    }
+
+_deep_health = {"checked_at": 0.0, "result": None}
+_deep_health_lock = threading.Lock()
+
+def _check_deep_health() -> dict:
+    started = time.perf_counter()
     try:
-        _ = get_embedder().embed(["ping"])
-        _ = get_qdrant().get_collections()
-        return {"status": "ok", "embedder": "ok", "qdrant": "ok"}
+        embedder = get_embedder()
+        if isinstance(embedder, RemoteEmbedder):
+            embedder.ping()  # 서버 모드: 연결만 확인 (추론은 임베딩 서버 몫)
+        else:
+            embedder.embed(["ping"])
+        get_qdrant().get_collections()
+        result = {"status": "ok", "embedder": "ok", "qdrant": "ok"}
     except Exception as e:
-        return {"status": "error", "message": str(e)}, 503
+        result = {"status": "error", "message": str(e)}
+    result["check_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return result
+
+@app.get("/healthz/deep")
+def healthz_deep():
+    # 심화 헬스체크 (모델/DB 연결 확인) - HEALTH_DEEP_TTL초 동안 결과 재사용, 동시 프로브는 한 번만 확인
+    with _deep_health_lock:
+        age = time.monotonic() - _deep_health["checked_at"]
+        if _deep_health["result"] is None or age >= HEALTH_DEEP_TTL:
+            _deep_health["result"] = _check_deep_health()
+            _deep_health["checked_at"] = time.monotonic()
+            age = 0.0
+        result = {**_deep_health["result"], "cached": age > 0, "age_s": round(age, 1)}
+    if result["status"] != "ok":
+        return JSONResponse(status_code=503, content=result)
+    return result
+
+def _rerank_metrics() -> dict:
+    """재정렬 실행 비율과 추가 지연 (재정렬이 실행된 요청 기준)."""
+    with _degradation_lock:
+        stats = dict(_rerank_stats)
+    attempted = stats["attempted"]
+    return {
+        "enabled": RERANK_ENABLED,
+        "requests": stats["requests"],
+        "reranked": attempted - stats["timed_out"],
+        "timed_out": stats["timed_out"],
+        "rate": attempted / stats["requests"] if stats["requests"] else 0.0,
+        "added_latency_ms_avg": stats["latency_ms_total"] / attempted if attempted else 0.0,
+        "added_latency_ms_max": stats["latency_ms_max"],
+        "model": _reranker.stats() if _reranker else None,
+    }
+
+@app.get("/metrics")
+def metrics():
+    # 대기열 깊이 / 거절 카운터 등 런타임 메트릭
+    with _degradation_lock:  # 요청 스레드가 갱신 중인 카운터의 일관된 스냅샷
+        counts = {
+            "degradation": dict(_degradation_counts),
+            "strategy": dict(_strategy_counts),
+            "stream": dict(_stream_counts),
+        }
+    return {
+        "admission": {
+            "ask": _ask_admission.stats(),
+            "embed": _embed_admission.stats(),
+        },
+        **counts,
+        "rerank": _rerank_metrics(),
+        "embed_cache": _embedder.cache.stats() if _embedder and _embedder.cache else None,
+        "embed_server": _embedder.stats() if isinstance(_embedder, RemoteEmbedder) else None,
+        "qdrant": _qc.stats() if _qc is not None else None,
+        "gemini": _rewrite_scheduler.stats() if _rewrite_scheduler else None,
+        "knowledge_bases": {
+            **_kb_registry.stats(),
+            "resources": {kb_id: kb.stats() for kb_id in _kb_registry.loaded() if (kb := _kb_registry.peek(kb_id))},
+        },
+        "prewarm": _prewarmer.stats() if _prewarmer else None,
+    }
 
 # startup 이벤트 제거: 모델 로딩이 느려서 worker timeout 발생 방지
 # 모델은 첫 요청 시 lazy loading으로 로드됨
 
-@app.post("/ask", response_model=AskRes)
-def ask(req: AskReq):
-    q = req.query.strip()
-    if not q:
-        raise HTTPException(status_code=400, detail="Empty query")
-
+def _resolve_kb(kb_id: Optional[str]) -> str:
     try:
-        # UseCase를 통한 검색 (클린 아키텍처 적용)
-        use_case = get_use_case()
-        result = use_case.search(q)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Search failed: {e}")
+        return _kb_registry.resolve(kb_id)
+    except UnknownKnowledgeBase:
+        raise HTTPException(status_code=404, detail=f"Unknown knowledge base: {kb_id}")
+
+def _record(kb_id: str, q: str, result):
+    """강등/전략/재정렬 카운터 + 질의 로그."""
+    with _degradation_lock:
+        _degradation_counts[result.degradation] += 1
+        _strategy_counts[result.strategy] += 1
+        _rerank_stats["requests"] += 1
+        if "rerank" in result.timings:
+            _rerank_stats["attempted"] += 1
+            _rerank_stats["timed_out"] += "no_rerank" in result.degradation
+            _rerank_stats["latency_ms_total"] += result.timings["rerank"]
+            _rerank_stats["latency_ms_max"] = max(_rerank_stats["latency_ms_max"], result.timings["rerank"])
 
     # 로깅
     write_log({
         "ts": int(time.time()),
+        "kb": kb_id,
         "query": q,
         "score": result.score,
         "matched_question": result.matched_question,
         "verdict": "ok" if result.is_valid else "fallback",
+        "degradation": result.degradation,
+        "strategy": result.strategy,
+        "rewritten": result.rewritten,
+        "cache_hits": result.cache_hits,
+        "timings": {k: round(v, 2) for k, v in result.timings.items()},
     })
 
+def _to_response(result) -> AskRes:
     return AskRes(
         answer=result.answer,
         score=result.score,
         matched_question=result.matched_question,
         sources=result.sources,
-        topk=[]  # 필요시 UseCase에서 topk도 반환하도록 확장 가능
+        topk=[],  # 필요시 UseCase에서 topk도 반환하도록 확장 가능
+        degradation=result.degradation,
+    )
+
+@app.post("/ask", response_model=AskRes)
+def ask(req: AskReq):
+    q = req.query.strip()
+    if not q:
+        raise HTTPException(status_code=400, detail="Empty query")
+    kb_id = _resolve_kb(req.kb_id)
+
+    try:
+        # UseCase를 통한 검색 (클린 아키텍처 적용, KB 리소스는 첫 요청 시 로드)
+        use_case = get_use_case(kb_id)
+        with _ask_admission.slot():
+            result = use_case.search(q, deadline=Deadline.from_ms(REQUEST_DEADLINE_MS))
+    except AdmissionRejected:
+        raise  # 503 + Retry-After (admission_rejected_handler)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Search failed: {e}")
+
+    _record(kb_id, q, result)
+    return _to_response(result)
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+def _stream_events(events: "queue.Queue", kb_id: str, q: str):
+    """검색 스레드가 넣는 (종류, 값)을 SSE 이벤트로 변환 (provisional → final → timings)."""
+    provisional = None
+    while True:
+        kind, value = events.get()
+        if kind == "provisional":
+            provisional = value
+            with _degradation_lock:
+                _stream_counts["provisional"] += 1
+            yield _sse("provisional", _to_response(value).model_dump())
+            continue
+        if kind == "error":
+            yield _sse("error", {"detail": f"Search failed: {value}"})
+            return
+
+        result = value
+        _record(kb_id, q, result)
+        changed = provisional is not None and (
+            (result.answer, result.matched_question) != (provisional.answer, provisional.matched_question)
+        )
+        with _degradation_lock:
+            _stream_counts["changed"] += changed
+        if provisional is None or changed:
+            yield _sse("final", {**_to_response(result).model_dump(), "changed": changed})
+        first = provisional.timings["provisional"] if provisional is not None else result.timings.get("total", 0.0)
+        yield _sse("timings", {
+            "timings": {k: round(v, 2) for k, v in result.timings.items()},
+            "first_answer_ms": round(first, 2),
+            "strategy": result.strategy,
+            "degradation": result.degradation,
+        })
+        return
+
+@app.post("/ask/stream")
+def ask_stream(req: AskReq):
+    """
+    /ask의 SSE 스트리밍 버전 (text/event-stream, 이벤트 data는 JSON).
+
+    - provisional: 원본 질문 검색이 가드를 통과하면 Gemini rewrite를 기다리지 않고 먼저 전송 (AskRes 형식)
+    - final: 잠정 답변이 없었거나 rewrite 기반 Ensemble이 답을 바꾼 경우에만 전송 (AskRes + changed)
+      (답변 캐시 hit/어휘 단축 응답은 바로 final)
+    - timings: 단계별 소요 시간, 첫 답변까지 시간, strategy/degradation (항상 마지막)
+    - error: 검색 실패
+    """
+    q = req.query.strip()
+    if not q:
+        raise HTTPException(status_code=400, detail="Empty query")
+    kb_id = _resolve_kb(req.kb_id)
+    try:
+        use_case = get_use_case(kb_id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Search failed: {e}")
+
+    # 응답 시작 전에 슬롯을 잡아야 거절 시 503 + Retry-After를 보낼 수 있음 (반환은 검색 스레드에서)
+    _ask_admission.acquire()
+    with _degradation_lock:
+        _stream_counts["requests"] += 1
+    events: "queue.Queue" = queue.Queue()
+
+    def run():
+        try:
+            result = use_case.search(
+                q,
+                deadline=Deadline.from_ms(REQUEST_DEADLINE_MS),
+                on_provisional=lambda r: events.put(("provisional", r)),
+            )
+            events.put(("result", result))
+        except Exception as e:
+            events.put(("error", e))
+        finally:
+            _ask_admission.release()
+
+    try:
+        _stream_executor.submit(run)
+    except Exception:
+        _ask_admission.release()
+        raise
+    return StreamingResponse(
+        _stream_events(events, kb_id, q),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},  # 프록시 버퍼링 방지
     )
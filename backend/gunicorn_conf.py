@@ -0,0 +1,106 @@
+"""
+Gunicorn 설정 (Render 배포용)
+
+PRELOAD_MODEL=1 이면 master 프로세스에서 임베딩 모델(및 로컬 인덱스)을 먼저 로드한 뒤
+fork 합니다. 워커는 fork 시점의 모델 가중치 페이지를 copy-on-write로 물려받지만,
+실제 메모리 절감 폭은 측정되지 않았으므로 기본값과 render.yaml 모두 0입니다
+(켜기 전에 scripts/bench_workers.py로 on/off PSS를 비교해 README에 기록).
+
+EMBED_SERVER_SOCKET과 EMBED_SERVER_PROCESSES(>0)가 지정되면 master가 임베딩 서버를 함께 기동하고
+준비될 때까지 기다린 뒤 워커를 띄웁니다 (워커는 모델 없이 RemoteEmbedder 사용).
+
+실행:
+    gunicorn backend.app:app -c backend/gunicorn_conf.py
+"""
+import gc
+import os
+import subprocess
+import sys
+import time
+
+# ====== 서버 설정 ======
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+worker_class = "uvicorn.workers.UvicornWorker"
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+
+# ====== 프리로드 (fork 전 모델 로딩) ======
+preload_app = os.getenv("PRELOAD_MODEL", "0").lower() in ("1", "true", "yes")
+
+
+# ====== 임베딩 서버 (선택, 단일 서비스 배포용) ======
+embed_server_socket = os.getenv("EMBED_SERVER_SOCKET", "")
+embed_server_processes = int(os.getenv("EMBED_SERVER_PROCESSES", "0")) if embed_server_socket else 0
+_embed_server = None
+
+
+def _torch_threads_per_worker() -> int:
+    """
+    워커당 torch intra-op 스레드 수.
+
+    TORCH_NUM_THREADS가 지정되면 그대로 사용하고,
+    아니면 CPU 코어를 워커 수로 나눠 oversubscription을 방지합니다.
+    """
+    explicit = os.getenv("TORCH_NUM_THREADS")
+    if explicit:
+        return max(1, int(explicit))
+    return max(1, (os.cpu_count() or 1) // max(1, workers))
+
+
+def on_starting(server):
+    """임베딩 서버 기동 후 ping이 성공할 때까지 대기 (모델 로딩 포함)."""
+    global _embed_server
+    if not embed_server_processes:
+        return
+
+    from app.infrastructure.embedding_server import RemoteEmbedder
+
+    _embed_server = subprocess.Popen([
+        sys.executable, "-m", "app.infrastructure.embedding_server",
+        "--socket", embed_server_socket,
+        "--processes", str(embed_server_processes),
+    ])
+    deadline = time.monotonic() + float(os.getenv("EMBED_SERVER_START_TIMEOUT", "180"))
+    client = RemoteEmbedder(embed_server_socket, timeout=1.0)
+    while time.monotonic() < deadline and _embed_server.poll() is None:
+        try:
+            info = client.ping()
+            server.log.info("[EmbedServer] 준비 완료 (pid=%s, dim=%s)", info["pid"], info["dim"])
+            break
+        except (OSError, ConnectionError, ValueError):
+            time.sleep(1.0)
+    else:
+        server.log.warning("[EmbedServer] 준비 확인 실패 - 워커는 요청 시 재연결을 시도합니다")
+    client.close()  # fork 전에 연결/공유 메모리 정리
+
+
+def on_exit(server):
+    if _embed_server is not None and _embed_server.poll() is None:
+        _embed_server.terminate()
+        _embed_server.wait(timeout=10)
+
+
+def when_ready(server):
+    """master 준비 완료 시점 (preload_app이면 앱 import 이후, fork 이전)."""
+    if not preload_app:
+        return
+
+    from backend.app import preload_resources
+
+    preload_resources()
+    # 프리로드된 객체를 GC 추적 대상에서 제외 (워커의 GC 순회가 이 페이지들을 건드리지 않도록)
+    gc.freeze()
+    server.log.info("[Preload] 모델 프리로드 완료 (workers=%s)", workers)
+
+
+def post_fork(server, worker):
+    """워커 fork 직후: torch 스레드 수 설정."""
+    threads = _torch_threads_per_worker()
+    os.environ["OMP_NUM_THREADS"] = str(threads)
+    try:
+        import torch
+
+        torch.set_num_threads(threads)
+    except Exception as e:
+        server.log.warning("[Preload] torch 스레드 설정 실패: %s", e)
+    server.log.info("[Preload] worker %s: torch threads=%s", worker.pid, threads)
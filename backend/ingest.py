@@ -1,7 +1,17 @@
 # backend/ingest.py
 import re
+import csv
+import sys
+import json
+import time
+import random
 import hashlib
-from typing import List
+import argparse
+import threading
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional
 import pandas as pd
 import numpy as np
 from sentence_transformers import SentenceTransformer
@@ -9,10 +19,32 @@ from qdrant_client import QdrantClient
 from qdrant_client.http import models
 import os
 
+# app 패키지 경로 추가 (임베딩 캐시를 서빙과 공유)
+_project_root = Path(__file__).parent.parent.absolute()
+if str(_project_root) not in sys.path:
+    sys.path.insert(0, str(_project_root))
+
+from app.infrastructure.embedding_cache import SQLiteEmbeddingCache, open_default_cache
+from app.application.paraphrases import collect_paraphrases
+from app.application.prewarm import save_dataset_questions
+from app.infrastructure.lexical import LexicalRetriever
+from app.infrastructure.repositories import LocalIndexRetriever
+from app.infrastructure.projection import build_reduced_collection, drop_projection
+from app.infrastructure.qdrant_transport import QdrantTransportConfig, RetryingQdrantClient
+from app.infrastructure.qdrant_admin import (
+    gc_versions, next_version_name, resolve_alias, swap_alias, vector_params_from_env, wait_for_points, warm_up,
+)
+
 QDRANT_URL = os.getenv("QDRANT_URL", "http://localhost:6333")
 COLLECTION = os.getenv("QDRANT_COLLECTION", "qa_collection")
 EMBED_MODEL = os.getenv("EMBED_MODEL", "snunlp/KR-SBERT-V40K-klueNLI-augSTS")
 EMBED_DIM = int(os.getenv("EMBED_DIM", 768))  # ko-SBERT 계열 보통 768
+LEXICAL_INDEX_PATH = os.getenv("LEXICAL_INDEX_PATH", "data/lexical_index.json")  # 서버와 같은 경로
+LOCAL_INDEX_PATH = os.getenv("LOCAL_INDEX_PATH", "data/local_index.npz")  # 서버의 Qdrant fallback 인덱스
+PREWARM_QUESTIONS_PATH = os.getenv("PREWARM_QUESTIONS_PATH", "data/prewarm_questions.json")  # 서버 프리워밍 질문
+EMBED_WORKERS = int(os.getenv("EMBED_WORKERS", "1"))  # 병렬 임베딩 프로세스 수 (1 = 단일 프로세스)
+PCA_DIM = int(os.getenv("PCA_DIM", "0"))  # PCA 축소 차원 (0 = 축소 컬렉션 미생성)
+PCA_PATH = os.getenv("PCA_PATH", "data/pca_projection.npz")  # 서버와 같은 경로
 
 # ---------- 1) 파싱 & 클린업 ----------
 
@@ -55,6 +87,82 @@ def parse_qa_from_excel(path: str, text_col: str = "Unnamed: 2") -> pd.DataFrame
     
     return qa_df
 
+# ---------- 1-1) 스트리밍 리더 (대용량 입력: 메모리 사용량이 입력 크기와 무관) ----------
+
+def _iter_pairs_from_cells(cells: Iterable) -> Iterator[dict]:
+    """'Q. ...' / 'A. ...' 셀 스트림 → QA dict 스트림 (parse_qa_from_excel과 동일 규칙)."""
+    pending_q = None
+    for cell in cells:
+        raw = "" if cell is None else str(cell)
+        if raw.startswith("Q."):
+            pending_q = _clean_text(raw)
+        elif raw.startswith("A.") and pending_q:
+            ans = _clean_text(raw)
+            if ans:
+                yield {"question": pending_q, "answer": ans}
+            pending_q = None
+
+def iter_qa_from_excel(path: str, text_col: int = 2) -> Iterator[dict]:
+    """
+    openpyxl read-only 모드로 행 단위 순회 (워크북 전체를 DataFrame으로 올리지 않음).
+    text_col: Q/A 텍스트가 있는 열 인덱스 (기본 2 = pandas의 'Unnamed: 2'), 첫 행은 헤더로 건너뜀.
+    """
+    from openpyxl import load_workbook
+
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = wb.active.iter_rows(min_row=2, values_only=True)
+        cells = (row[text_col] if len(row) > text_col else None for row in rows)
+        yield from _iter_pairs_from_cells(cells)
+    finally:
+        wb.close()
+
+def iter_qa_from_csv(path: str) -> Iterator[dict]:
+    """question,answer 헤더를 가진 CSV."""
+    with open(path, encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            yield {"question": _clean_text(row.get("question", "")), "answer": _clean_text(row.get("answer", ""))}
+
+def iter_qa_from_jsonl(path: str) -> Iterator[dict]:
+    """한 줄에 {"question": ..., "answer": ...} 하나."""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            yield {"question": _clean_text(row.get("question", "")), "answer": _clean_text(row.get("answer", ""))}
+
+def iter_qa(path: str) -> Iterator[dict]:
+    """확장자별 리더 선택 + 빈 값/중복 질문 제거 (중복 판정은 point id만 보관)."""
+    suffix = Path(path).suffix.lower()
+    if suffix in (".xlsx", ".xlsm"):
+        source = iter_qa_from_excel(path)
+    elif suffix == ".csv":
+        source = iter_qa_from_csv(path)
+    elif suffix in (".jsonl", ".ndjson"):
+        source = iter_qa_from_jsonl(path)
+    else:
+        raise ValueError(f"지원하지 않는 입력 형식입니다: {path} (xlsx/csv/jsonl)")
+
+    seen = set()
+    for row in source:
+        if not row["question"] or not row["answer"]:
+            continue
+        pid = make_id(row["question"])
+        if pid in seen:
+            continue
+        seen.add(pid)
+        yield row
+
+def chunked(iterable: Iterable, size: int) -> Iterator[list]:
+    """고정 크기 청크로 나누기."""
+    it = iter(iterable)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
 # ---------- 2) 임베딩 ----------
 
 _model = None
@@ -66,84 +174,499 @@ def get_model() -> SentenceTransformer:
         _model = SentenceTransformer(EMBED_MODEL)
     return _model
 
-def embed_batch(texts: List[str], batch_size: int = 64) -> np.ndarray:
+_cache: Optional[SQLiteEmbeddingCache] = None
+_cache_opened = False
+
+def get_cache() -> Optional[SQLiteEmbeddingCache]:
+    # EMBED_CACHE_PATH (서빙과 같은 파일) - 빈 값이면 비활성
+    global _cache, _cache_opened
+    if not _cache_opened:
+        _cache = open_default_cache()
+        _cache_opened = True
+    return _cache
+
+# ---------- 2-1) 멀티 프로세스 병렬 임베딩 ----------
+
+_pool = None
+_embed_stats = {"texts": 0, "seconds": 0.0}
+
+def get_pool(workers: int):
+    """sentence-transformers 멀티 프로세스 풀 (CPU 워커 N개, 워커당 torch 스레드 = 코어 / N)."""
+    global _pool
+    if _pool is None:
+        threads = max(1, (os.cpu_count() or 1) // workers)
+        # spawn된 워커는 시작 시점의 환경변수로 스레드 수를 정함 → oversubscription 방지
+        prev = os.environ.get("OMP_NUM_THREADS")
+        os.environ["OMP_NUM_THREADS"] = str(threads)
+        try:
+            _pool = get_model().start_multi_process_pool(target_devices=["cpu"] * workers)
+        finally:
+            if prev is None:
+                os.environ.pop("OMP_NUM_THREADS", None)
+            else:
+                os.environ["OMP_NUM_THREADS"] = prev
+        print(f"[EMBED] 병렬 풀 시작: workers={workers}, threads/worker={threads}")
+    return _pool
+
+def stop_pool():
+    global _pool
+    if _pool is not None:
+        get_model().stop_multi_process_pool(_pool)
+        _pool = None
+
+def _encode(texts: List[str], batch_size: int) -> np.ndarray:
+    """
+    길이순 정렬(버킷팅)으로 배치 내 패딩을 최소화한 뒤 인코딩하고, 원래 순서로 되돌림.
+    EMBED_WORKERS > 1이고 입력이 충분히 크면 멀티 프로세스 풀 사용 (청크 순서 보존 → 결과 결정적).
+    """
     model = get_model()
-    # normalize_embeddings=True -> 코사인 거리 계산 시 안정적
-    # return (N, D) ndarray
-    return model.encode(
-        texts,
-        batch_size=batch_size,
-        convert_to_numpy=True,
-        normalize_embeddings=True
-    )
+    t0 = time.perf_counter()
+    order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+    sorted_texts = [texts[i] for i in order]
+
+    if EMBED_WORKERS > 1 and len(texts) >= EMBED_WORKERS * batch_size:
+        vecs = model.encode_multi_process(
+            sorted_texts,
+            get_pool(EMBED_WORKERS),
+            batch_size=batch_size,
+            chunk_size=max(batch_size, -(-len(texts) // (EMBED_WORKERS * 4))),
+            normalize_embeddings=True,
+        )
+    else:
+        # normalize_embeddings=True -> 코사인 거리 계산 시 안정적
+        # return (N, D) ndarray
+        vecs = model.encode(
+            sorted_texts,
+            batch_size=batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=True
+        )
+
+    out = np.empty_like(vecs)
+    out[order] = vecs
+    _embed_stats["texts"] += len(texts)
+    _embed_stats["seconds"] += time.perf_counter() - t0
+    return out
+
+def report_embed_throughput():
+    """누적 임베딩 처리량 출력 (ingest 작업 규모 산정용)."""
+    n, sec = _embed_stats["texts"], _embed_stats["seconds"]
+    if n:
+        print(f"[EMBED] {n} texts in {sec:.1f}s → {n / sec if sec else 0:.1f} texts/sec (workers={EMBED_WORKERS})")
+
+def embed_batch(texts: List[str], batch_size: int = 64) -> np.ndarray:
+    cache = get_cache()
+    if cache is None or not texts:
+        return _encode(texts, batch_size)
+
+    # 캐시 hit은 조회만, miss만 모델 실행 (모두 hit이면 모델 로딩도 생략)
+    cached = cache.get_many(EMBED_MODEL, texts)
+    missing = [i for i, v in enumerate(cached) if v is None]
+    if missing:
+        miss_texts = [texts[i] for i in missing]
+        vecs = _encode(miss_texts, batch_size)
+        cache.put_many(EMBED_MODEL, miss_texts, vecs)
+        for i, vec in zip(missing, vecs):
+            cached[i] = vec
+    return np.vstack(cached).astype(np.float32)
 
 # ---------- 3) Qdrant 업서트 ----------
 
+def connect_qdrant() -> QdrantClient:
+    """서버와 같은 전송 설정 (QDRANT_PREFER_GRPC, 연결 풀, 조회 재시도)."""
+    return RetryingQdrantClient.from_config(QdrantTransportConfig.from_env(url=QDRANT_URL))
+
 def ensure_collection(client: QdrantClient, name: str, size: int):
     try:
         client.get_collection(name)
         print(f"[SKIP] collection '{name}' already exists")
     except Exception:
-        # HNSW 최적화 파라미터 적용
+        # HNSW + 양자화 설정 (QDRANT_QUANTIZATION, QDRANT_ON_DISK, HNSW_M, HNSW_EF_CONSTRUCT)
+        params = vector_params_from_env(size)
         client.create_collection(
             collection_name=name,
-            vectors_config=models.VectorParams(
-                size=size,
-                distance=models.Distance.COSINE,
-                hnsw_config=models.HnswConfigDiff(
-                    m=16,  # 각 노드 연결 수 (16 = balanced)
-                    ef_construct=100,  # 색인 구축 탐색 깊이
-                    full_scan_threshold=10000,
-                )
-            ),
+            vectors_config=params,
             optimizers_config=models.OptimizersConfigDiff(
                 indexing_threshold=10000,
             )
         )
-        print(f"[OK] created collection '{name}' with HNSW optimization")
+        quant = type(params.quantization_config).__name__ if params.quantization_config else "none"
+        print(f"[OK] created collection '{name}' (m={params.hnsw_config.m}, quantization={quant}, on_disk={bool(params.on_disk)})")
 
 def make_id(s: str) -> int:
     # 질문 해시를 id로 사용 (idempotent upsert)
     h = hashlib.sha1(s.encode("utf-8")).hexdigest()[:16]
     return int(h, 16)  # Qdrant는 int id 허용
 
+def content_hash(question: str, answer: str, model_name: str = EMBED_MODEL) -> str:
+    # 질문 + 답변 + 모델명 해시 (하나라도 바뀌면 재임베딩 대상)
+    raw = "\x1f".join([question, answer, model_name])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+def expand_paraphrases(rows: Iterable[dict], paraphrases: Optional[Dict[str, List[str]]] = None) -> Iterator[dict]:
+    """
+    QA 행 → 포인트 행 (표준 질문 1개 + paraphrase 형제 포인트 N개).
+
+    형제 포인트는 같은 question/answer payload와 qa_id(표준 질문 포인트 id)를 공유하고,
+    임베딩 대상 텍스트(text)만 paraphrase로 바뀐다 → 검색 시 question 기준으로 최대 점수 pooling.
+    """
+    paraphrases = paraphrases or {}
+    for row in rows:
+        qa_id = make_id(row["question"])
+        yield {**row, "id": qa_id, "qa_id": qa_id, "text": row["question"]}
+        for text in paraphrases.get(row["question"], []):
+            yield {
+                **row,
+                "id": make_id(f"{row['question']}\x1f{text}"),
+                "qa_id": qa_id,
+                "text": text,
+                "paraphrase": text,
+                "content_hash": content_hash(f"{row['question']}\x1f{text}", row["answer"]),
+            }
+
+def build_points(vectors: np.ndarray, rows: List[dict]) -> List[models.PointStruct]:
+    points = []
+    for vec, row in zip(vectors, rows):
+        qa_id = row.get("qa_id") or make_id(row["question"])
+        payload = {
+            "question": row["question"],
+            "answer": row["answer"],
+            "qa_id": qa_id,
+            "content_hash": row.get("content_hash") or content_hash(row["question"], row["answer"]),
+        }
+        if row.get("paraphrase"):
+            payload["paraphrase"] = row["paraphrase"]
+        points.append(models.PointStruct(id=row.get("id") or qa_id, vector=vec.tolist(), payload=payload))
+    return points
+
 def upsert_qa(
     client: QdrantClient,
     name: str,
     vectors: np.ndarray,
     rows: List[dict],
 ):
-    points = []
-    for vec, row in zip(vectors, rows):
-        points.append(
-            models.PointStruct(
-                id=make_id(row["question"]),
-                vector=vec.tolist(),
-                payload={"question": row["question"], "answer": row["answer"]},
-            )
+    client.upsert(collection_name=name, points=build_points(vectors, rows))
+
+class BatchUploader:
+    """
+    병렬 배치 업서트 (wait=False + 재시도).
+
+    제출 대기 중인 배치 수를 workers * 2로 제한해, 임베딩이 업로드보다 빨라도 메모리가 늘지 않음.
+    """
+
+    def __init__(self, client: QdrantClient, name: str, workers: int = 4, retries: int = 3):
+        self.client = client
+        self.name = name
+        self.retries = retries
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="upsert")
+        self._slots = threading.BoundedSemaphore(workers * 2)
+        self._futures = []
+
+    def _upsert(self, points: List[models.PointStruct]):
+        try:
+            for attempt in range(self.retries + 1):
+                try:
+                    self.client.upsert(collection_name=self.name, points=points, wait=False)
+                    return
+                except Exception as e:
+                    if attempt == self.retries:
+                        raise
+                    delay = (2 ** attempt) * 0.5 + random.uniform(0, 0.5)
+                    print(f"[RETRY] upsert 실패 ({e}), {delay:.1f}s 후 재시도 ({attempt + 1}/{self.retries})")
+                    time.sleep(delay)
+        finally:
+            self._slots.release()
+
+    def submit(self, points: List[models.PointStruct]):
+        self._slots.acquire()
+        self._futures = [f for f in self._futures if not f.done() or f.exception()]
+        self._futures.append(self._pool.submit(self._upsert, points))
+
+    def close(self):
+        """모든 배치 완료 대기 (실패한 배치가 있으면 예외 전파)."""
+        self._pool.shutdown(wait=True)
+        for f in self._futures:
+            f.result()
+
+# ---------- 3-1) 스트리밍 + 증분 인제스트 (content hash 비교) ----------
+
+def fetch_point_hashes(client: QdrantClient, name: str, page_size: int = 1000) -> Dict[int, Optional[str]]:
+    """컬렉션의 {point id: content_hash} (벡터 없이 payload 일부만 scroll)."""
+    hashes: Dict[int, Optional[str]] = {}
+    offset = None
+    while True:
+        points, offset = client.scroll(
+            collection_name=name,
+            limit=page_size,
+            offset=offset,
+            with_payload=["content_hash"],
+            with_vectors=False,
         )
-    client.upsert(collection_name=name, points=points)
+        for p in points:
+            hashes[p.id] = (p.payload or {}).get("content_hash")
+        if offset is None:
+            break
+    return hashes
+
+def ingest_stream(
+    client: QdrantClient,
+    name: str,
+    rows: Iterable[dict],
+    chunk_size: int = 256,
+    upsert_workers: int = 4,
+    incremental: bool = False,
+    paraphrases: Optional[Dict[str, List[str]]] = None,
+) -> Dict[str, int]:
+    """
+    QA 스트림을 고정 크기 청크로 임베딩 → 병렬 배치 업서트.
+
+    incremental=True면 content hash가 같은 포인트는 건너뛰고, 입력에 없는 기존 포인트는 삭제.
+    paraphrases가 있으면 QA마다 paraphrase 형제 포인트를 함께 색인 (집계는 포인트 단위).
+    최대 메모리는 청크 크기와 업로드 대기 배치 수로 제한됨 (id/hash 집합만 입력 크기에 비례).
+    """
+    existing = fetch_point_hashes(client, name) if incremental else {}
+    seen = set()
+    summary = {"added": 0, "updated": 0, "unchanged": 0, "deleted": 0}
+    uploader = BatchUploader(client, name, workers=upsert_workers)
+
+    try:
+        for chunk in chunked(expand_paraphrases(rows, paraphrases), chunk_size):
+            todo = []
+            for row in chunk:
+                row.setdefault("content_hash", content_hash(row["question"], row["answer"]))
+                pid = row["id"]
+                seen.add(pid)
+                if pid in existing:
+                    if existing[pid] == row["content_hash"]:
+                        summary["unchanged"] += 1
+                        continue
+                    summary["updated"] += 1
+                else:
+                    summary["added"] += 1
+                todo.append(row)
+
+            if not todo:
+                # 변경분이 없으면 모델 로딩/임베딩 자체를 건너뜀
+                continue
+            vectors = embed_batch([r["text"] for r in todo])
+            if vectors.shape[1] != EMBED_DIM:
+                raise ValueError(f"임베딩 차원({vectors.shape[1]})과 EMBED_DIM({EMBED_DIM})이 다릅니다. .env를 수정하세요.")
+            uploader.submit(build_points(vectors, todo))
+    finally:
+        uploader.close()
+
+    if incremental:
+        stale = [pid for pid in existing if pid not in seen]
+        for ids in chunked(stale, 1000):
+            client.delete(collection_name=name, points_selector=models.PointIdsList(points=ids))
+        summary["deleted"] = len(stale)
+
+    return summary
+
+def ingest_incremental(client: QdrantClient, name: str, rows: List[dict]) -> Dict[str, int]:
+    """변경된 QA만 임베딩/업서트하고, 엑셀에서 사라진 포인트는 삭제."""
+    return ingest_stream(client, name, rows, incremental=True)
+
+def write_lexical_index(client: QdrantClient, name: str, source: Optional[str] = None):
+    """
+    컬렉션 payload로 n-gram BM25 역색인을 만들어 LEXICAL_INDEX_PATH에 저장 (서버 기동 시 로드).
+    같은 QA 목록(paraphrase 제외)의 질문은 PREWARM_QUESTIONS_PATH에 저장 (서버 프리워밍용).
+    """
+    index = LexicalRetriever.from_qdrant(client, name, source=source)
+    index.save(LEXICAL_INDEX_PATH)
+    print(f"[LEXICAL] {len(index)} docs, {len(index.postings)} n-grams → {LEXICAL_INDEX_PATH}")
+    save_dataset_questions(PREWARM_QUESTIONS_PATH, [p.question for p in index.pairs], source=source)
+    print(f"[PREWARM] {len(index)} questions → {PREWARM_QUESTIONS_PATH}")
+
+def write_local_index(client: QdrantClient, name: str, source: Optional[str] = None):
+    """Qdrant fallback용 로컬 벡터 인덱스를 새 데이터로 다시 저장 (이전 인제스트의 답변이 남지 않도록)."""
+    index = LocalIndexRetriever.from_qdrant(client, name, embedder=None, source=source)
+    os.makedirs(os.path.dirname(LOCAL_INDEX_PATH) or ".", exist_ok=True)
+    index.save(LOCAL_INDEX_PATH)
+    print(f"[LOCAL] {len(index)} points → {LOCAL_INDEX_PATH}")
+
+def write_projection(client: QdrantClient, source: str, dim: int, path: str = PCA_PATH):
+    """원본 컬렉션 벡터로 PCA 학습 → 축소 컬렉션 + 투영 파일 (서빙 1차 검색용, dim=0이면 생략)."""
+    if not dim:
+        return
+    t0 = time.perf_counter()
+    projection = build_reduced_collection(
+        client, source, dim, path,
+        m=int(os.getenv("HNSW_M", "16")), ef_construct=int(os.getenv("HNSW_EF_CONSTRUCT", "100")),
+    )
+    print(
+        f"[PCA] {source} → {projection.collection} ({projection.input_dim}→{projection.dim}d, "
+        f"설명 분산 {projection.explained:.1%}, {time.perf_counter() - t0:.1f}s) → {path}"
+    )
+
+def discard_projection(client: QdrantClient, source: str, dim: int, path: str = PCA_PATH):
+    """
+    제자리(비 blue/green) 인제스트: 이전 축소 컬렉션과 투영 파일 삭제 → 서빙은 원본 벡터 검색.
+
+    같은 컬렉션 이름에서 축소 컬렉션을 다시 만들면 실행 중인 워커가 이전 투영으로 질의를 줄이거나
+    재생성 중 사라진 컬렉션을 검색하게 되므로, PCA 1차 검색은 새 버전을 만드는 --blue-green에서만 생성.
+    """
+    removed = drop_projection(client, source, path)
+    if removed:
+        print(f"[PCA] 제자리 인제스트 → 이전 축소 벡터 삭제: {', '.join(removed)}")
+    if dim:
+        print("[PCA] --pca-dim은 --blue-green에서만 적용됩니다 (이번 인제스트는 축소 컬렉션 생략)")
 
 # ---------- 4) 엔트리 포인트 ----------
 
-def main():
+def main(argv: Optional[List[str]] = None):
+    global EMBED_WORKERS
+    parser = argparse.ArgumentParser(description="Q&A.xlsx → Qdrant 인제스트")
+    parser.add_argument("--path", default="Q&A.xlsx", help="Q&A 엑셀 경로")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="content hash 비교로 신규/변경분만 임베딩·업서트하고 삭제된 질문은 컬렉션에서 제거",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="스트리밍 파이프라인 (xlsx read-only 행 순회, csv/jsonl 지원, 청크 임베딩 + 병렬 배치 업서트)",
+    )
+    parser.add_argument("--chunk-size", type=int, default=256, help="임베딩/업서트 청크 크기")
+    parser.add_argument("--upsert-workers", type=int, default=4, help="병렬 업서트 워커 수")
+    parser.add_argument(
+        "--embed-workers",
+        type=int,
+        default=EMBED_WORKERS,
+        help="병렬 임베딩 프로세스 수 (기본: EMBED_WORKERS 환경변수, 1 = 단일 프로세스)",
+    )
+    parser.add_argument(
+        "--blue-green",
+        action="store_true",
+        help="새 버전 컬렉션({collection}_v{n})을 구축·워밍업한 뒤 QDRANT_COLLECTION alias를 원자적으로 전환",
+    )
+    parser.add_argument("--keep-versions", type=int, default=2, help="blue/green 전환 후 남길 버전 수 (롤백용)")
+    parser.add_argument(
+        "--paraphrases",
+        default="paraphrases.json",
+        help="큐레이션 paraphrase JSON ({표준 질문: [paraphrase, ...]}) - Gemini Few-shot 예시와 함께 형제 벡터로 색인",
+    )
+    parser.add_argument("--no-paraphrases", action="store_true", help="표준 질문 벡터만 색인 (paraphrase 비활성)")
+    parser.add_argument("--from-logs", default=None, help="질의 로그(logs/queries 디렉터리 또는 jsonl)에서 고득점 매칭 질의를 paraphrase로 추가")
+    parser.add_argument("--log-min-score", type=float, default=0.85, help="--from-logs 최소 매칭 점수")
+    parser.add_argument(
+        "--pca-dim",
+        type=int,
+        default=PCA_DIM,
+        help="PCA 축소 차원 (예: 128, 256) - --blue-green에서 축소 컬렉션({collection}_pca{dim})과 투영 파일을 함께 생성 (0 = 생략)",
+    )
+    parser.add_argument("--pca-path", default=PCA_PATH, help="PCA 투영 파일 경로 (서버 PCA_PATH와 동일해야 함)")
+    args = parser.parse_args(argv or [])
+
+    EMBED_WORKERS = max(1, args.embed_workers)
+    try:
+        _run(args)
+    finally:
+        stop_pool()
+        report_embed_throughput()
+
+def ingest_blue_green(args):
+    """
+    무중단 재색인: 서빙 중인 컬렉션은 그대로 두고 새 버전을 백그라운드로 구축한 뒤 alias 전환.
+
+    1) {COLLECTION}_v{n+1} 생성 + 전체 인제스트 (임베딩 캐시로 변경 없는 텍스트는 재계산 없음)
+    2) 모든 업서트 반영 대기 → 워밍업 검색
+    3) alias 원자적 전환 → 오래된 버전 GC
+    """
+    t0 = time.perf_counter()
+    qc = connect_qdrant()
+    target = next_version_name(qc, COLLECTION)
+    ensure_collection(qc, target, size=EMBED_DIM)
+
+    rows = iter_qa(args.path) if args.stream else parse_qa_from_excel(args.path, text_col="Unnamed: 2").to_dict(orient="records")
+    summary = ingest_stream(
+        qc, target, rows,
+        chunk_size=args.chunk_size, upsert_workers=args.upsert_workers, paraphrases=args.paraphrase_map,
+    )
+
+    if not wait_for_points(qc, target, expected=summary["added"]):
+        raise RuntimeError(f"'{target}' 인덱싱이 제한 시간 내 완료되지 않아 alias 전환을 중단합니다.")
+    n = warm_up(qc, target)
+    print(f"[WARMUP] {target}: {n} queries")
+    write_lexical_index(qc, target, source=target)
+    write_local_index(qc, target, source=target)
+    write_projection(qc, target, args.pca_dim, args.pca_path)
+
+    previous = swap_alias(qc, COLLECTION, target)
+    gc_versions(qc, COLLECTION, keep=args.keep_versions)
+    print(
+        f"[BLUE-GREEN] {COLLECTION}: {previous} → {target} "
+        f"({summary['added']} points, {time.perf_counter() - t0:.1f}s)"
+    )
+
+def load_paraphrases(args) -> Dict[str, List[str]]:
+    if args.no_paraphrases:
+        return {}
+    paraphrases = collect_paraphrases(
+        curated_path=args.paraphrases, log_path=args.from_logs, log_min_score=args.log_min_score
+    )
+    print(f"[PARAPHRASE] {sum(len(v) for v in paraphrases.values())} paraphrases for {len(paraphrases)} questions")
+    return paraphrases
+
+def _run(args):
+    args.paraphrase_map = load_paraphrases(args)
+    if args.blue_green:
+        ingest_blue_green(args)
+        return
+
+    if args.stream or args.incremental:
+        t0 = time.perf_counter()
+        qc = connect_qdrant()
+        ensure_collection(qc, COLLECTION, size=EMBED_DIM)
+        if args.stream:
+            rows = iter_qa(args.path)
+        else:
+            rows = parse_qa_from_excel(args.path, text_col="Unnamed: 2").to_dict(orient="records")
+        summary = ingest_stream(
+            qc,
+            COLLECTION,
+            rows,
+            chunk_size=args.chunk_size,
+            upsert_workers=args.upsert_workers,
+            incremental=args.incremental,
+            paraphrases=args.paraphrase_map,
+        )
+        print(
+            f"[{'INCREMENTAL' if args.incremental else 'STREAM'}] added={summary['added']} updated={summary['updated']} "
+            f"unchanged={summary['unchanged']} deleted={summary['deleted']} "
+            f"({time.perf_counter() - t0:.1f}s) → {COLLECTION}"
+        )
+        wait_for_points(qc, COLLECTION, expected=summary["added"] + summary["updated"] + summary["unchanged"])
+        source = resolve_alias(qc, COLLECTION)
+        write_lexical_index(qc, COLLECTION, source=source)
+        write_local_index(qc, COLLECTION, source=source)
+        discard_projection(qc, source or COLLECTION, args.pca_dim, args.pca_path)
+        return
+
     # 1) 파싱
-    qa_df = parse_qa_from_excel("Q&A.xlsx", text_col="Unnamed: 2")
+    qa_df = parse_qa_from_excel(args.path, text_col="Unnamed: 2")
     print(f"[PARSE] {len(qa_df)} QA pairs")
     
-    # 2) 임베딩
-    vectors = embed_batch(qa_df["question"].tolist())
+    # 2) 임베딩 (표준 질문 + paraphrase 형제 포인트)
+    rows = list(expand_paraphrases(qa_df.to_dict(orient="records"), args.paraphrase_map))
+    vectors = embed_batch([r["text"] for r in rows])
     if vectors.shape[1] != EMBED_DIM:
         # 환경 변수/컬렉션 차원 불일치 체크
         raise ValueError(f"임베딩 차원({vectors.shape[1]})과 EMBED_DIM({EMBED_DIM})이 다릅니다. .env를 수정하세요.")
     
     # 3) Qdrant 업서트
-    qc = QdrantClient(url=QDRANT_URL)
+    qc = connect_qdrant()
     ensure_collection(qc, COLLECTION, size=EMBED_DIM)
-    upsert_qa(qc, COLLECTION, vectors, qa_df.to_dict(orient="records"))
-    print(f"[OK] upsert {len(qa_df)} points → {COLLECTION}")
+    upsert_qa(qc, COLLECTION, vectors, rows)
+    print(f"[OK] upsert {len(rows)} points ({len(qa_df)} QA) → {COLLECTION}")
+    wait_for_points(qc, COLLECTION, expected=len(rows))
+    source = resolve_alias(qc, COLLECTION)
+    write_lexical_index(qc, COLLECTION, source=source)
+    write_local_index(qc, COLLECTION, source=source)
+    discard_projection(qc, source or COLLECTION, args.pca_dim, args.pca_path)
 
 if __name__ == "__main__":
-    main()
+    main(sys.argv[1:])
 
 
@@ -0,0 +1,49 @@
+import threading
+import pytest
+from app.infrastructure.admission import AdmissionController, AdmissionRejected
+
+
+def test_admits_up_to_concurrency():
+    ctl = AdmissionController("t", max_concurrency=2, max_queue=0, max_wait=0.01)
+    ctl.acquire()
+    ctl.acquire()
+    assert ctl.stats()["in_flight"] == 2
+    ctl.release()
+    ctl.release()
+    assert ctl.stats()["in_flight"] == 0
+
+
+def test_rejects_when_queue_full():
+    ctl = AdmissionController("t", max_concurrency=1, max_queue=0, max_wait=1.0, retry_after=3)
+    ctl.acquire()
+    with pytest.raises(AdmissionRejected) as exc:
+        ctl.acquire()
+    assert exc.value.retry_after == 3
+    assert ctl.stats()["rejected_queue_full"] == 1
+
+
+def test_rejects_after_max_wait():
+    ctl = AdmissionController("t", max_concurrency=1, max_queue=1, max_wait=0.05)
+    ctl.acquire()
+    with pytest.raises(AdmissionRejected):
+        ctl.acquire()
+    stats = ctl.stats()
+    assert stats["rejected_timeout"] == 1
+    assert stats["queue_depth"] == 0
+
+
+def test_waiter_admitted_on_release():
+    ctl = AdmissionController("t", max_concurrency=1, max_queue=1, max_wait=2.0)
+    ctl.acquire()
+    admitted = threading.Event()
+
+    def waiter():
+        with ctl.slot():
+            admitted.set()
+
+    t = threading.Thread(target=waiter)
+    t.start()
+    ctl.release()
+    t.join(timeout=2)
+    assert admitted.is_set()
+    assert ctl.stats()["admitted"] == 2
@@ -0,0 +1,56 @@
+import numpy as np
+from app.infrastructure.embedding_cache import SQLiteEmbeddingCache, cache_key
+
+MODEL = "test-model"
+
+
+def test_roundtrip_and_normalized_key(tmp_path):
+    cache = SQLiteEmbeddingCache(str(tmp_path / "cache.sqlite"))
+    cache.put_many(MODEL, ["요금 얼마야?"], [np.array([0.1, 0.2, 0.3])])
+    hit, miss = cache.get_many(MODEL, ["  요금   얼마야? ", "다른 질문"])
+    assert np.allclose(hit, [0.1, 0.2, 0.3])
+    assert miss is None
+    assert cache_key(MODEL, "a") != cache_key("other-model", "a")
+
+
+def test_lru_eviction(tmp_path):
+    cache = SQLiteEmbeddingCache(str(tmp_path / "cache.sqlite"), max_entries=2)
+    cache.put_many(MODEL, ["a"], [[1.0]])
+    cache.put_many(MODEL, ["b"], [[2.0]])
+    cache.get_many(MODEL, ["a"])  # a를 최근 사용으로 갱신
+    cache.put_many(MODEL, ["c"], [[3.0]])
+    a, b, c = cache.get_many(MODEL, ["a", "b", "c"])
+    assert a is not None and c is not None
+    assert b is None
+
+
+def test_compact_drops_other_models(tmp_path):
+    cache = SQLiteEmbeddingCache(str(tmp_path / "cache.sqlite"))
+    cache.put_many(MODEL, ["a"], [[1.0]])
+    cache.put_many("old-model", ["a"], [[1.0]])
+    result = cache.compact(model_name=MODEL)
+    assert result["removed"] == 1
+    assert len(cache) == 1
+
+
+def test_read_only_cache_never_writes(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    writer = SQLiteEmbeddingCache(path)
+    writer.put_many(MODEL, ["a"], [[1.0]])
+    reader = SQLiteEmbeddingCache(path, read_only=True)
+    mtime = (tmp_path / "cache.sqlite").stat().st_mtime_ns
+    hit, miss = reader.get_many(MODEL, ["a", "b"])
+    reader.put_many(MODEL, ["b"], [[2.0]])  # 무시
+    assert hit is not None and miss is None
+    assert reader.evict() == 0 and len(writer) == 1
+    assert (tmp_path / "cache.sqlite").stat().st_mtime_ns == mtime
+    assert SQLiteEmbeddingCache(path, read_only=True).get_many(MODEL, ["b"]) == [None]
+
+
+def test_running_count_skips_eviction_until_over_limit(tmp_path):
+    cache = SQLiteEmbeddingCache(str(tmp_path / "cache.sqlite"), max_entries=3)
+    cache.put_many(MODEL, ["a", "b"], [[1.0], [2.0]])
+    cache.put_many(MODEL, ["a"], [[1.0]])  # 기존 항목 → 카운트 증가 없음
+    assert cache._count == 2
+    cache.put_many(MODEL, ["c", "d"], [[3.0], [4.0]])
+    assert cache._count == 3 and len(cache) == 3
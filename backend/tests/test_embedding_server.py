@@ -0,0 +1,92 @@
+import threading
+import pytest
+from app.domain.repositories import Embedder
+from app.infrastructure.embedding_server import EmbeddingServer, EmbeddingServerError, RemoteEmbedder, bind_listener
+
+
+class FakeEmbedder(Embedder):
+    """텍스트 길이 기반 결정적 벡터, 호출별 배치 크기 기록."""
+
+    def __init__(self, delay: float = 0.0):
+        self.batches = []
+        self.delay = delay
+
+    def embed(self, texts):
+        if "boom" in texts:
+            raise ValueError("bad input")
+        if self.delay:
+            threading.Event().wait(self.delay)
+        self.batches.append(len(texts))
+        return [[float(len(t)), float(i), 0.5, -1.0] for i, t in enumerate(texts)]
+
+
+@pytest.fixture
+def server(tmp_path):
+    def start(embedder, **kwargs):
+        path = str(tmp_path / "embed.sock")
+        srv = EmbeddingServer(embedder, **kwargs)
+        threading.Thread(target=srv.serve_forever, args=(bind_listener(path),), daemon=True).start()
+        started.append(srv)
+        return srv, path
+
+    started = []
+    yield start
+    for srv in started:
+        srv.shutdown()
+
+
+def test_round_trip_through_shared_memory(server):
+    srv, path = server(FakeEmbedder(), max_wait_ms=0)
+    client = RemoteEmbedder(path, capacity=4)
+    try:
+        assert client.ping()["dim"] == 4
+        assert client.embed(["가", "나다"]) == [[1.0, 0.0, 0.5, -1.0], [2.0, 1.0, 0.5, -1.0]]
+        assert client.stats()["inline"] == 0
+
+        # 공유 메모리(4행)보다 큰 요청은 소켓으로 전송
+        vectors = client.embed([str(i) for i in range(6)])
+        assert [v[1] for v in vectors] == [0.0, 1.0, 2.0, 3.0, 4.0, 5.0]
+        assert client.stats()["inline"] == 1
+    finally:
+        client.close()
+
+
+def test_concurrent_requests_are_batched(server):
+    embedder = FakeEmbedder(delay=0.05)
+    srv, path = server(embedder, max_batch=32, max_wait_ms=30)
+    client = RemoteEmbedder(path)
+    results = {}
+
+    def call(i):
+        results[i] = client.embed(["x" * (i + 1)])
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(8)]
+    try:
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert {i: v[0][0] for i, v in results.items()} == {i: float(i + 1) for i in range(8)}
+        assert len(embedder.batches) - 1 < 8  # warmup 제외, 8개 요청이 더 적은 forward pass로 처리
+        assert srv.stats()["max_batch"] > 1
+    finally:
+        client.close()
+
+
+def test_server_error_keeps_connection_usable(server):
+    _, path = server(FakeEmbedder(), max_wait_ms=0)
+    client = RemoteEmbedder(path)
+    try:
+        with pytest.raises(EmbeddingServerError):
+            client.embed(["boom"])
+        assert client.embed(["ok"])[0][0] == 2.0
+        assert client.stats()["reconnects"] == 0
+    finally:
+        client.close()
+
+
+def test_unreachable_server_raises_connection_error(tmp_path):
+    client = RemoteEmbedder(str(tmp_path / "missing.sock"), timeout=0.2)
+    with pytest.raises(ConnectionError):
+        client.embed(["요금"])
+    assert client.stats()["errors"] == 1
@@ -0,0 +1,54 @@
+from app.application.fusion import FusionEngine, WeightRule, normalize_brand, weight_rules_from_config
+from app.domain.entities import QAPair
+from app.infrastructure.query_profile import QueryProfiler
+
+profile = QueryProfiler().profile
+
+
+def test_normalize_brand():
+    assert normalize_brand("persoai 요금 알려줘") == "Perso.ai 요금 알려줘"
+    assert normalize_brand("perso ai 뭐야") == "Perso.ai 뭐야"
+    assert normalize_brand("퍼소가 뭐임") == "Perso.ai가 뭐임"
+    assert normalize_brand("Perso.ai는 어떤 서비스인가요?") == "Perso.ai는 어떤 서비스인가요?"
+
+
+def test_identical_variants_fold_weights():
+    engine = FusionEngine()
+    # 정형 질문: brand 변형이 원본과 같으므로 하나로 합침
+    variants = engine.variants(profile("Perso.ai는 어떤 서비스인가요?"), "Perso.ai는 어떤 서비스인가요?")
+    assert len(variants) == 1
+    assert abs(variants[0].weight - 1.0) < 1e-9
+
+    variants = engine.variants(profile("persoai 뭐야"), "Perso.ai는 어떤 서비스인가요?")
+    assert [v.name for v in variants] == ["original", "brand", "rewritten"]
+    assert abs(sum(v.weight for v in variants) - 1.0) < 1e-9
+
+
+def test_missing_rewrite_renormalizes():
+    engine = FusionEngine([WeightRule(name="default", weights={"original": 0.1, "brand": 0.1, "rewritten": 0.8})])
+    variants = engine.variants(profile("퍼소 요금"), None)
+    assert [v.weight for v in variants] == [0.5, 0.5]
+
+
+def test_fuse_merges_by_id():
+    engine = FusionEngine()
+    variants = engine.variants(profile("퍼소 뭐야"), "Perso.ai는 어떤 서비스인가요?")
+    weights = {v.name: v.weight for v in variants}
+    results = [
+        [QAPair("Perso.ai는 어떤 서비스인가요?", "A", score=0.3, id=1)],
+        [QAPair("Perso.ai는 어떤 서비스인가요?", "A", score=0.6, id=1), QAPair("요금제", "B", score=0.5, id=2)],
+        [QAPair("Perso.ai는 어떤 서비스인가요?", "A", score=1.0, id=1)],
+    ]
+    fused = engine.fuse(variants, results, top_k=3)
+    assert [p.id for p in fused] == [1, 2]
+    expected = 0.3 * weights["original"] + 0.6 * weights["brand"] + 1.0 * weights["rewritten"]
+    assert abs(fused[0].score - expected) < 1e-9
+
+
+def test_weight_rules_from_config():
+    engine = FusionEngine(weight_rules_from_config([
+        {"name": "short", "when": {"length": "short"}, "weights": {"original": 1.0}},
+        {"name": "default", "weights": {"original": 0.5, "rewritten": 0.5}},
+    ]))
+    assert engine.select_rule(profile("요금")).name == "short"
+    assert engine.select_rule(profile("요금제는 어떻게 되나요")).name == "default"
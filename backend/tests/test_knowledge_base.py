@@ -0,0 +1,79 @@
+import json
+import threading
+import time
+import pytest
+from app.application.gemini_rewriter import GeminiQueryRewriter
+from app.infrastructure.knowledge_base import KnowledgeBaseRegistry, UnknownKnowledgeBase, load_kb_configs
+
+
+def write_config(tmp_path, ids, default=None):
+    path = tmp_path / "knowledge_bases.json"
+    rows = [{"id": kb_id, "collection": f"{kb_id}_faq"} for kb_id in ids]
+    path.write_text(json.dumps({"default": default, "knowledge_bases": rows}), encoding="utf-8")
+    return str(path)
+
+
+def test_missing_config_falls_back_to_single_kb(tmp_path):
+    configs, default = load_kb_configs(str(tmp_path / "missing.json"), "qa_collection")
+    assert default == "default"
+    assert configs["default"].collection == "qa_collection"
+    assert configs["default"].local_index_path is None  # 기존 LOCAL_INDEX_PATH 사용
+
+
+def test_config_derives_per_kb_index_paths(tmp_path):
+    configs, default = load_kb_configs(write_config(tmp_path, ["perso", "acme"], default="perso"), "x", data_dir="data/kb")
+    assert default == "perso"
+    assert configs["perso"].local_index_path is None
+    assert configs["acme"].local_index_path == "data/kb/acme/local_index.npz"
+    with pytest.raises(ValueError):
+        load_kb_configs(write_config(tmp_path, ["perso"], default="acme"), "x")
+
+
+def registry(tmp_path, ids, **kwargs):
+    configs, default = load_kb_configs(write_config(tmp_path, ids, default=ids[0]), "x")
+    loads, evicted = [], []
+
+    def loader(config):
+        loads.append(config.id)
+        time.sleep(0.02)
+        return {"id": config.id, "bytes": 100}
+
+    reg = KnowledgeBaseRegistry(
+        configs, loader, default=default, sizeof=lambda r: r["bytes"],
+        on_evict=lambda kb_id, _: evicted.append(kb_id), **kwargs,
+    )
+    return reg, loads, evicted
+
+
+def test_lazy_load_once_under_concurrency(tmp_path):
+    reg, loads, _ = registry(tmp_path, ["a", "b"])
+    assert reg.loaded() == []
+    threads = [threading.Thread(target=reg.get, args=("b",)) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert loads == ["b"]
+    assert reg.get()["id"] == "a"  # kb_id 없음 → 기본 KB
+    with pytest.raises(UnknownKnowledgeBase):
+        reg.get("missing")
+
+
+def test_lru_eviction_by_count_and_memory(tmp_path):
+    reg, _, evicted = registry(tmp_path, ["a", "b", "c", "d"], max_loaded=3, pinned=("a",))
+    for kb_id in ["a", "b", "c"]:
+        reg.get(kb_id)
+    reg.get("b")  # b 최근 사용 → c가 LRU
+    reg.get("d")
+    assert evicted == ["c"] and reg.loaded() == ["a", "b", "d"]
+
+    reg, _, evicted = registry(tmp_path, ["a", "b", "c"], memory_budget=250, pinned=("a",))
+    for kb_id in ["a", "b", "c"]:
+        reg.get(kb_id)
+    assert evicted == ["b"] and reg.stats()["memory_bytes"] == 200
+
+
+def test_generic_prompt_lists_kb_questions():
+    prompt = GeminiQueryRewriter.build_generic_prompt("ACME", ["환불은 어떻게 하나요?", "배송은 얼마나 걸리나요?"])
+    assert "ACME" in prompt and "2. 배송은 얼마나 걸리나요?" in prompt and "[NO_MATCH]" in prompt
+    assert "Perso.ai" not in prompt
@@ -0,0 +1,76 @@
+from app.application.fusion import FusionEngine
+from app.application.use_cases import QASearchUseCase
+from app.domain.entities import QAPair
+from app.infrastructure.guards import HallucinationGuard
+from app.infrastructure.lexical import LexicalRetriever, tokenize
+from backend.tests.test_use_case import FakeRetriever, FakeRewriter
+
+PAIRS = [
+    QAPair("Perso.ai의 요금제는 어떻게 구성되어 있나요?", "무료, 크리에이터, 비즈니스 요금제가 있습니다."),
+    QAPair("Perso.ai 고객센터는 어떻게 문의하나요?", "웹사이트 하단의 문의하기 버튼을 이용하세요."),
+    QAPair("Perso.ai에서 지원하는 언어는 몇 개인가요?", "현재 30개 이상의 언어를 지원합니다."),
+]
+
+
+def test_tokenize_shares_ngrams_across_particles():
+    assert "요금" in tokenize("요금은?")
+    assert "요금" in tokenize("요금제")
+    assert tokenize("AI") == ["ai"]
+
+
+def test_confident_keyword_match_and_save_load(tmp_path):
+    path = str(tmp_path / "lexical.json")
+    LexicalRetriever(PAIRS, source="qa_v1").save(path)
+    index = LexicalRetriever.load(path)
+    assert index.source == "qa_v1"
+
+    hits, confident = index.confident("요금제 구성")
+    assert confident
+    assert hits[0].question == PAIRS[0].question
+    assert hits[0].score == 1.0
+
+    hits, confident = index.confident("요금")  # 단일 키워드는 커버리지 1.0이어도 단축하지 않음
+    assert hits[0].score == 1.0
+    assert not confident
+
+    _, confident = index.confident("넷플릭스 요금")  # 색인에 없는 키워드가 섞이면 단축하지 않음
+    assert not confident
+
+
+def test_lexical_shortcut_skips_embedding_and_rewrite():
+    retriever = FakeRetriever()
+    uc = QASearchUseCase(
+        retriever=retriever,
+        guard=HallucinationGuard(threshold=0.75),
+        top_k=3,
+        rewriter=FakeRewriter(delay=5.0),
+        lexical_retriever=LexicalRetriever(PAIRS),
+    )
+    result = uc.search("고객센터 문의")
+    assert result.is_valid
+    assert result.strategy == "lexical"
+    assert result.matched_question == PAIRS[1].question
+    assert retriever.queries == []
+
+
+def test_rrf_fuses_lexical_candidates_without_inflating_guard_score():
+    fused = FusionEngine().fuse_lexical(
+        [QAPair(PAIRS[0].question, PAIRS[0].answer, score=0.8)],
+        [QAPair(PAIRS[2].question, PAIRS[2].answer, score=1.0), QAPair(PAIRS[0].question, PAIRS[0].answer, score=1.0)],
+        top_k=3,
+    )
+    # 순서는 RRF(양쪽에 있는 후보 우선), 점수는 벡터 점수 - 어휘 결과에만 있으면 0.0
+    assert [(p.question, p.score) for p in fused] == [(PAIRS[0].question, 0.8), (PAIRS[2].question, 0.0)]
+
+    # 벡터 점수는 낮은데 키워드 커버리지만 높은 경우 → 가드를 통과시키지 않음
+    index = LexicalRetriever(PAIRS, shortcut_score=1.1)  # 단축 응답 비활성
+    uc = QASearchUseCase(
+        retriever=FakeRetriever(score=0.3),
+        guard=HallucinationGuard(threshold=0.75),
+        top_k=3,
+        rewriter=FakeRewriter(),
+        lexical_retriever=index,
+    )
+    result = uc.search("언어 지원")
+    assert result.strategy == "ensemble"
+    assert not result.is_valid
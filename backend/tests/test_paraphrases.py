@@ -0,0 +1,39 @@
+from app.application.gemini_rewriter import GeminiQueryRewriter
+from app.application.paraphrases import merge_paraphrases, paraphrases_from_logs
+from app.infrastructure.repositories import max_pool
+from app.domain.entities import QAPair
+
+QUESTION = "Perso.ai의 요금제는 어떻게 구성되어 있나요?"
+
+
+def test_few_shot_examples_map_to_standard_questions():
+    examples = GeminiQueryRewriter.few_shot_examples()
+    assert ("요금 얼마야?", QUESTION) in examples
+    assert all(dst in GeminiQueryRewriter.STANDARD_QUESTIONS for _, dst in examples)
+
+
+def test_merge_dedupes_and_drops_unknown_questions():
+    merged = merge_paraphrases(
+        [QUESTION],
+        {QUESTION: ["요금 얼마야?", QUESTION]},
+        {QUESTION: ["요금  얼마야?", "가격 알려줘"], "없는 질문": ["아무거나"]},
+    )
+    assert merged == {QUESTION: ["요금 얼마야?", "가격 알려줘"]}
+
+
+def test_paraphrases_from_logs(tmp_path):
+    path = tmp_path / "queries.jsonl"
+    path.write_text(
+        "\n".join([
+            '{"query": "가격 얼마", "score": 0.9, "matched_question": "%s", "verdict": "ok"}' % QUESTION,
+            '{"query": "넷플릭스 가격", "score": 0.5, "matched_question": "%s", "verdict": "ok"}' % QUESTION,
+            '{"query": "날씨", "score": 0.0, "matched_question": "", "verdict": "fallback"}',
+        ]),
+        encoding="utf-8",
+    )
+    assert paraphrases_from_logs(str(path), min_score=0.85) == {QUESTION: ["가격 얼마"]}
+
+
+def test_max_pool_keeps_best_sibling_per_question():
+    pairs = [QAPair("a", "A", 0.9), QAPair("a", "A", 0.8), QAPair("b", "B", 0.7), QAPair("c", "C", 0.6)]
+    assert [(p.question, p.score) for p in max_pool(pairs, 2)] == [("a", 0.9), ("b", 0.7)]
@@ -0,0 +1,112 @@
+import json
+import time
+from app.application.gemini_rewriter import CachedRewriter
+from app.application.prewarm import Prewarmer, load_dataset_questions, merge_queries, save_dataset_questions, top_logged_queries
+from app.infrastructure.guards import HallucinationGuard
+from app.application.use_cases import QASearchUseCase
+from app.infrastructure.memory_cache import TTLCache
+from backend.tests.test_use_case import QUESTION, FakeRetriever, FakeRewriter
+
+
+def test_top_logged_queries_and_merge(tmp_path):
+    path = tmp_path / "queries.jsonl"
+    queries = ["요금 얼마야", "요금  얼마야", "고객센터 어디야", "요금 얼마야"]
+    path.write_text("\n".join(json.dumps({"query": q}, ensure_ascii=False) for q in queries) + "\n{broken\n", encoding="utf-8")
+    top = top_logged_queries(str(path), top_n=1)
+    assert top == ["요금 얼마야"]
+    assert top_logged_queries(str(tmp_path / "missing.jsonl"), 5) == []
+    assert merge_queries(top, ["요금  얼마야", QUESTION]) == ["요금 얼마야", QUESTION]
+
+
+def test_dataset_questions_round_trip(tmp_path):
+    path = str(tmp_path / "data" / "prewarm_questions.json")
+    assert load_dataset_questions(path) == []
+    save_dataset_questions(path, [QUESTION, "요금 얼마야"], source="qa_v2")
+    assert load_dataset_questions(path) == [QUESTION, "요금 얼마야"]
+
+
+def test_ttl_cache_lru_and_expiry():
+    cache = TTLCache(max_entries=2, ttl=0.05)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)  # b 제거 (LRU)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    time.sleep(0.06)
+    assert cache.get("a") is None
+
+
+def test_cached_rewriter_skips_passthrough():
+    class Counting(FakeRewriter):
+        calls = 0
+
+        def rewrite(self, query):
+            Counting.calls += 1
+            return QUESTION if "뭐야" in query else query  # 오류 시 원본 반환과 같은 형태
+
+    rewriter = CachedRewriter(Counting(), TTLCache())
+    assert rewriter.rewrite("persoai 뭐야") == QUESTION
+    assert rewriter.rewrite("persoai  뭐야") == QUESTION
+    rewriter.rewrite("날씨")
+    rewriter.rewrite("날씨")
+    assert Counting.calls == 3
+    assert rewriter.calls == 3
+
+
+def test_answer_cache_reuses_full_results():
+    retriever = FakeRetriever(score=0.9)
+    uc = QASearchUseCase(
+        retriever=retriever,
+        guard=HallucinationGuard(threshold=0.75),
+        top_k=3,
+        rewriter=FakeRewriter(),
+        answer_cache=TTLCache(),
+    )
+    first = uc.search(QUESTION)
+    second = uc.search(f" {QUESTION} ")
+    assert second.strategy == "cache"
+    assert second.matched_question == first.matched_question
+    assert retriever.queries == [QUESTION]
+
+
+def test_prewarmer_respects_rewrite_quota():
+    calls = {"search": [], "rewrites": 0}
+
+    def search(query, deadline):
+        calls["search"].append(query)
+        calls["rewrites"] += 1
+
+    prewarmer = Prewarmer(
+        search=search,
+        queries=lambda: ["a", "b", "c", "d"],
+        max_rewrites=2,
+        rewrite_calls=lambda: calls["rewrites"],
+    ).start()
+    assert prewarmer.wait(5)
+    assert prewarmer.ready
+    assert calls["search"] == ["a", "b"]
+    assert prewarmer.stats()["stop_reason"] == "rewrite_quota"
+
+
+def test_prewarmer_ready_even_if_setup_fails():
+    def broken():
+        raise RuntimeError("no api key")
+
+    prewarmer = Prewarmer(search=lambda q, deadline: None, queries=lambda: ["a"], setup=[broken])
+    prewarmer.run()
+    assert prewarmer.ready
+    assert prewarmer.state == "failed"
+
+
+def test_prewarmer_passes_remaining_budget_as_deadline():
+    budgets = []
+
+    def search(query, deadline):
+        budgets.append(deadline.remaining())
+        time.sleep(deadline.remaining() + 0.01)  # 느린 질의도 deadline에서 멈춤
+
+    prewarmer = Prewarmer(search=search, queries=lambda: ["a", "b", "c"], time_budget=0.1)
+    prewarmer.run()
+    assert len(budgets) == 1 and 0 < budgets[0] <= 0.1
+    assert prewarmer.stats()["stop_reason"] == "time_budget"
@@ -0,0 +1,106 @@
+from pathlib import Path
+import numpy as np
+import pytest
+from qdrant_client import QdrantClient
+from qdrant_client.http import models
+from app.domain.repositories import Embedder
+from app.infrastructure.projection import PcaProjection, build_reduced_collection, drop_projection, projection_matches
+from app.infrastructure.qdrant_admin import gc_versions, swap_alias
+from app.infrastructure.repositories import ProjectedQdrantRetriever, QdrantRetriever
+
+DIM = 32
+
+
+def corpus(n=200, rank=6, seed=0):
+    """저차원 구조 + 작은 노이즈 (실제 문장 임베딩처럼 분산이 소수 방향에 몰린 분포)."""
+    rng = np.random.default_rng(seed)
+    x = rng.standard_normal((n, rank)) @ rng.standard_normal((rank, DIM)) + 0.05 * rng.standard_normal((n, DIM))
+    return (x / np.linalg.norm(x, axis=1, keepdims=True)).astype(np.float32)
+
+
+class VectorEmbedder(Embedder):
+    """질의 문자열 = 코퍼스 인덱스."""
+
+    def __init__(self, vectors):
+        self.vectors = vectors
+
+    def embed(self, texts):
+        return [self.vectors[int(t)].tolist() for t in texts]
+
+
+def populate(qc, name, vectors):
+    qc.create_collection(name, vectors_config=models.VectorParams(size=DIM, distance=models.Distance.COSINE))
+    qc.upsert(name, points=[
+        models.PointStruct(id=i, vector=v.tolist(), payload={"question": f"q{i}", "answer": f"a{i}", "qa_id": i})
+        for i, v in enumerate(vectors)
+    ])
+
+
+def test_fit_apply_roundtrip(tmp_path):
+    vectors = corpus()
+    projection = PcaProjection.fit(vectors, 8, source="qa_v1")
+    assert (projection.dim, projection.input_dim) == (8, DIM)
+    assert projection.explained > 0.95
+    reduced = projection.apply(vectors)
+    assert reduced.shape == (200, 8)
+    assert np.allclose(np.linalg.norm(reduced, axis=1), 1.0, atol=1e-5)
+
+    path = str(tmp_path / "pca.npz")
+    projection.save(path)
+    loaded = PcaProjection.load(path)
+    assert loaded.collection == "qa_v1_pca8" and loaded.explained == pytest.approx(projection.explained)
+    assert np.allclose(loaded.apply(vectors[:3]), reduced[:3])
+
+    assert PcaProjection.fit(vectors[:5], 64, source="x").dim == 5  # 포인트 수 이하로 축소
+
+
+def test_reduced_search_rescored_at_full_precision(tmp_path):
+    vectors = corpus()
+    qc = QdrantClient(location=":memory:")
+    populate(qc, "qa_v1", vectors)
+    swap_alias(qc, "qa", "qa_v1")
+    projection = build_reduced_collection(qc, "qa_v1", 8, str(tmp_path / "pca.npz"))
+    assert qc.count("qa_v1_pca8").count == 200
+
+    embedder = VectorEmbedder(vectors)
+    full = QdrantRetriever(qc, embedder, "qa", exact=True)
+    reduced = ProjectedQdrantRetriever(qc, embedder, "qa", projection=projection, candidates=4)
+    queries = [str(i) for i in range(0, 200, 10)]
+    for expected, got in zip(full.search_batch(queries, top_k=3), reduced.search_batch(queries, top_k=3)):
+        assert [p.id for p in got] == [p.id for p in expected]
+        assert [p.score for p in got] == pytest.approx([p.score for p in expected], abs=1e-4)  # 원본 코사인
+        assert got[0].answer.startswith("a")
+    assert reduced.search("7", top_k=1)[0].id == 7
+
+
+def test_rebuild_and_gc_drop_stale_reduced_collections(tmp_path):
+    vectors = corpus()
+    qc = QdrantClient(location=":memory:")
+    for version in (1, 2, 3):
+        populate(qc, f"qa_v{version}", vectors)
+        build_reduced_collection(qc, f"qa_v{version}", 8, str(tmp_path / "pca.npz"))
+        swap_alias(qc, "qa", f"qa_v{version}")
+    build_reduced_collection(qc, "qa_v3", 4, str(tmp_path / "pca.npz"))  # 차원 변경 → 이전 축소 컬렉션 삭제
+
+    assert gc_versions(qc, "qa", keep=2) == ["qa_v1", "qa_v1_pca8"]
+    names = sorted(c.name for c in qc.get_collections().collections)
+    assert names == ["qa_v2", "qa_v2_pca8", "qa_v3", "qa_v3_pca4"]
+
+
+def test_in_place_reingest_invalidates_projection(tmp_path):
+    vectors = corpus()
+    qc = QdrantClient(location=":memory:")
+    populate(qc, "qa", vectors)
+    path = str(tmp_path / "pca.npz")
+    build_reduced_collection(qc, "qa", 8, path)
+    projection = PcaProjection.load(path)
+    assert projection.points == 200
+    assert projection_matches(qc, projection, "qa")
+
+    # 같은 이름으로 QA 추가 → source는 같지만 축소 컬렉션에 새 포인트가 없음
+    qc.upsert("qa", points=[models.PointStruct(id=200, vector=vectors[0].tolist(), payload={"question": "new"})])
+    assert not projection_matches(qc, projection, "qa")
+
+    assert drop_projection(qc, "qa", path) == ["qa_pca8", path]
+    assert not qc.collection_exists("qa_pca8") and not Path(path).exists()
+    assert not projection_matches(qc, projection, "qa")
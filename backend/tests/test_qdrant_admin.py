@@ -0,0 +1,73 @@
+import pytest
+from qdrant_client import QdrantClient
+from qdrant_client.http import models
+from app.infrastructure.qdrant_admin import (
+    CollectionVersionWatcher,
+    gc_versions,
+    list_versions,
+    next_version_name,
+    swap_alias,
+    vector_params,
+)
+from app.infrastructure.repositories import QdrantRetriever
+
+ALIAS = "qa"
+
+
+def _create(qc, name, n):
+    qc.create_collection(name, vectors_config=models.VectorParams(size=4, distance=models.Distance.COSINE))
+    qc.upsert(name, points=[models.PointStruct(id=i, vector=[1.0, i, 0.0, 1.0]) for i in range(n)])
+
+
+def _build_next(qc, n):
+    name = next_version_name(qc, ALIAS)
+    _create(qc, name, n)
+    swap_alias(qc, ALIAS, name)
+    return name
+
+
+def test_swap_replaces_plain_collection_and_switches_atomically():
+    qc = QdrantClient(location=":memory:")
+    _create(qc, ALIAS, 3)  # 기존 일반 컬렉션
+    assert _build_next(qc, 4) == "qa_v1"
+    assert qc.count(ALIAS).count == 4
+    _build_next(qc, 5)
+    assert qc.count(ALIAS).count == 5
+
+
+def test_watcher_detects_switch():
+    qc = QdrantClient(location=":memory:")
+    _build_next(qc, 1)
+    watcher = CollectionVersionWatcher(lambda: qc, ALIAS)
+    switches = []
+    watcher.on_switch(lambda old, new: switches.append((old, new)))
+    assert watcher.current() == "qa_v1"
+    assert watcher.check() is False
+    _build_next(qc, 2)
+    assert watcher.check() is True
+    assert switches == [("qa_v1", "qa_v2")]
+
+
+def test_gc_keeps_recent_versions():
+    qc = QdrantClient(location=":memory:")
+    for n in range(1, 4):
+        _build_next(qc, n)
+    assert gc_versions(qc, ALIAS, keep=2) == ["qa_v1"]
+    assert [name for _, name in list_versions(qc, ALIAS)] == ["qa_v2", "qa_v3"]
+
+
+def test_vector_params_quantization():
+    scalar = vector_params(8, quantization="scalar", on_disk=True)
+    assert scalar.on_disk is True
+    assert scalar.quantization_config.scalar.always_ram is True
+    assert vector_params(8, quantization="product").quantization_config.product.compression.value == "x16"
+    assert vector_params(8).quantization_config is None
+    with pytest.raises(ValueError):
+        vector_params(8, quantization="binary4")
+
+
+def test_search_params_only_when_configured():
+    assert QdrantRetriever.build_search_params() is None
+    params = QdrantRetriever.build_search_params(hnsw_ef=128, rescore=True, oversampling=2.0)
+    assert params.hnsw_ef == 128
+    assert params.quantization.rescore is True and params.quantization.oversampling == 2.0
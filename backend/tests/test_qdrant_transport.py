@@ -0,0 +1,85 @@
+import httpx
+import pytest
+from qdrant_client.http.exceptions import UnexpectedResponse
+from app.application.deadline import Deadline, remaining_budget
+from app.infrastructure.qdrant_transport import QdrantTransportConfig, RetryingQdrantClient, build_client
+
+
+class FlakyClient:
+    """처음 failures번은 오류, 이후 성공."""
+
+    def __init__(self, failures, error):
+        self.failures = failures
+        self.error = error
+        self.calls = 0
+
+    def search(self, **kwargs):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise self.error
+        return ["ok"]
+
+    upsert = search
+
+
+def retrying(client, retries=2):
+    sleeps = []
+    return RetryingQdrantClient(client, retries=retries, backoff_base=0.05, backoff_max=0.08, sleep=sleeps.append), sleeps
+
+
+def test_transient_errors_are_retried_with_bounded_jitter():
+    flaky = FlakyClient(2, httpx.ConnectError("reset"))
+    qc, sleeps = retrying(flaky)
+    assert qc.search(collection_name="qa") == ["ok"]
+    assert flaky.calls == 3 and len(sleeps) == 2
+    assert 0 <= sleeps[0] <= 0.05 and 0 <= sleeps[1] <= 0.08
+    assert qc.stats() == {"transport": "rest", "calls": 1, "retried": 2, "failures": 0, "budget_exhausted": 0}
+
+
+def test_gives_up_after_retries_and_skips_permanent_errors():
+    qc, _ = retrying(FlakyClient(5, httpx.ReadTimeout("slow")))
+    with pytest.raises(httpx.ReadTimeout):
+        qc.search()
+    assert qc.stats()["failures"] == 1
+
+    not_found = UnexpectedResponse(404, "Not Found", b"", httpx.Headers())
+    flaky = FlakyClient(1, not_found)
+    qc, sleeps = retrying(flaky)
+    with pytest.raises(UnexpectedResponse):
+        qc.search()
+    assert flaky.calls == 1 and sleeps == []
+
+
+def test_retries_stop_when_deadline_budget_runs_out(capsys):
+    flaky = FlakyClient(5, httpx.ConnectError("reset"))
+    sleeps = []
+    qc = RetryingQdrantClient(flaky, retries=3, backoff_base=0.05, backoff_max=0.05, sleep=sleeps.append, budget=remaining_budget)
+    qc.backoff = lambda attempt: 0.05
+    with pytest.raises(httpx.ConnectError):
+        Deadline(0.01).bind(qc.search)()  # 백오프(50ms) > 남은 예산 → 재시도 없이 실패
+    assert flaky.calls == 1 and sleeps == []
+    assert qc.stats()["budget_exhausted"] == 1
+
+    flaky = FlakyClient(5, httpx.ConnectError("reset"))
+    qc = RetryingQdrantClient(flaky, retries=3, sleep=lambda _: None, budget=remaining_budget)
+    with pytest.raises(httpx.ConnectError):
+        qc.search()  # bind 밖(예산 없음) → 설정된 횟수만큼 재시도
+    assert flaky.calls == 4 and qc.stats()["budget_exhausted"] == 0
+    assert capsys.readouterr().out.count("재시도") == 1  # 재시도 로그는 log_interval당 한 번
+
+
+def test_writes_are_not_retried():
+    flaky = FlakyClient(1, httpx.ConnectError("reset"))
+    qc, _ = retrying(flaky)
+    with pytest.raises(httpx.ConnectError):
+        qc.upsert()
+    assert flaky.calls == 1
+
+
+def test_config_from_env(monkeypatch):
+    monkeypatch.setenv("QDRANT_PREFER_GRPC", "1")
+    monkeypatch.setenv("QDRANT_BACKOFF_BASE_MS", "20")
+    config = QdrantTransportConfig.from_env(url="http://qdrant:6333")
+    assert config.url == "http://qdrant:6333" and config.transport == "grpc"
+    assert config.backoff_base == pytest.approx(0.02)
+    assert build_client(config)._client._prefer_grpc
@@ -0,0 +1,104 @@
+import calendar
+import json
+import math
+import os
+import time
+import numpy as np
+from app.application.prewarm import top_logged_queries
+from app.infrastructure.query_log import _LEGACY_DTYPES, ROW_DTYPE, QueryLogWriter, iter_query_log, load_columns
+
+QUESTION = "Perso.ai의 요금제는 어떻게 구성되어 있나요?"
+HOUR = calendar.timegm(time.strptime("2026-10-19 13", "%Y-%m-%d %H"))
+
+
+def record(query, ts, total, verdict="ok", cache_hits=(), **extra):
+    return {
+        "ts": ts,
+        "query": query,
+        "score": 0.9 if verdict == "ok" else 0.1,
+        "matched_question": QUESTION if verdict == "ok" else "",
+        "verdict": verdict,
+        "degradation": "full",
+        "strategy": "cache" if "answer" in cache_hits else "vector",
+        "cache_hits": list(cache_hits),
+        "timings": {"search_original": total * 0.5, "total": total},
+        **extra,
+    }
+
+
+def write_sample(root):
+    writer = QueryLogWriter(str(root), writer_id="w1")
+    writer.write(record("요금 얼마야", HOUR + 10, 100.0, rewritten=QUESTION, cache_hits=["rewrite"]))
+    writer.write(record("요금  얼마야", HOUR + 20, 2.0, cache_hits=["answer"]))
+    writer.write(record("날씨 어때", HOUR + 30, 50.0, verdict="fallback"))
+    writer.write(record("요금 얼마야", HOUR + 3600 + 10, 80.0))  # 다음 시간 partition
+    writer.close()
+
+
+def test_writer_partitions_by_hour(tmp_path):
+    write_sample(tmp_path)
+    assert os.path.exists(tmp_path / "dt=2026-10-19" / "hour=13" / "w1.rows")
+    assert os.path.exists(tmp_path / "dt=2026-10-19" / "hour=14" / "w1.rows")
+    assert os.path.getsize(tmp_path / "dt=2026-10-19" / "hour=13" / "w1.rows") == 3 * ROW_DTYPE.itemsize
+
+
+def test_load_columns_aggregates(tmp_path):
+    write_sample(tmp_path)
+    columns = load_columns(str(tmp_path))
+    assert len(columns) == 4
+
+    top = columns.top_queries(1)[0]
+    assert (top["query"], top["count"], top["fallback_rate"]) == ("요금 얼마야", 3, 0.0)
+    assert math.isclose(top["cache_hit_rate"], 1 / 3)
+
+    latency = columns.latency_percentiles()
+    assert latency["total"]["n"] == 4 and latency["rewrite"]["n"] == 0
+    rates = columns.rates()
+    assert rates["fallback_rate"] == 0.25
+    assert rates["answer_cache_hit_rate"] == 0.25 and rates["rewrite_cache_hit_rate"] == 0.25
+    assert rates["strategy"] == {"cache": 1, "vector": 3}
+
+    # 같은 질의의 반복 중 캐시 hit가 아니었던 요청 (TTL 1시간 초과 반복은 제외)
+    assert columns.cache_opportunity(ttl=None)["repeat_requests"] == 1
+    assert columns.cache_opportunity(ttl=60)["repeat_requests"] == 0
+
+
+def test_load_columns_time_range(tmp_path):
+    write_sample(tmp_path)
+    assert len(load_columns(str(tmp_path), since=HOUR + 3600)) == 1
+    assert len(load_columns(str(tmp_path), until=HOUR + 25)) == 2
+
+
+def test_truncated_row_is_ignored(tmp_path):
+    write_sample(tmp_path)
+    with open(tmp_path / "dt=2026-10-19" / "hour=14" / "w1.rows", "ab") as f:
+        f.write(b"\x01\x02\x03")  # 기록 중 중단된 레코드
+    assert len(load_columns(str(tmp_path))) == 4
+
+
+def test_iter_query_log_reads_both_formats(tmp_path):
+    store = tmp_path / "queries"
+    write_sample(store)
+    records = list(iter_query_log(str(store)))
+    assert records[0]["rewritten"] == QUESTION and records[0]["cache_hits"] == ["rewrite"]
+    assert records[0]["timings"] == {"search_original": 50.0, "total": 100.0}
+    assert top_logged_queries(str(store), 1) == ["요금 얼마야"]
+
+    legacy = tmp_path / "queries.jsonl"
+    legacy.write_text(json.dumps({"query": "요금 얼마야"}, ensure_ascii=False) + "\n{broken\n", encoding="utf-8")
+    assert [r["query"] for r in iter_query_log(str(legacy))] == ["요금 얼마야"]
+
+
+def test_kb_filter_and_legacy_schema(tmp_path):
+    writer = QueryLogWriter(str(tmp_path), writer_id="w2")
+    writer.write(record("환불 방법", HOUR + 40, 10.0, kb="acme"))
+    writer.close()
+    # KB 구분 이전(v1) 파일
+    legacy = tmp_path / "dt=2026-10-19" / "hour=13" / "old"
+    np.zeros(1, dtype=_LEGACY_DTYPES[1]).tofile(f"{legacy}.rows")
+    (tmp_path / "dt=2026-10-19" / "hour=13" / "old.strings").write_text('""\n', encoding="utf-8")
+    (tmp_path / "dt=2026-10-19" / "hour=13" / "old.meta.json").write_text('{"version": 1}', encoding="utf-8")
+
+    assert len(load_columns(str(tmp_path))) == 2
+    assert load_columns(str(tmp_path), kbs=["acme"]).column("query") == ["환불 방법"]
+    assert len(load_columns(str(tmp_path), kbs=[""])) == 1
@@ -0,0 +1,99 @@
+import json
+import re
+from pathlib import Path
+from app.application.fusion import FusionEngine, weight_rules_from_config
+from app.infrastructure.guards import HallucinationGuard, threshold_rules_from_config
+from app.infrastructure.query_profile import QueryProfiler, load_query_rules
+
+RULES_PATH = Path(__file__).resolve().parents[2] / "query_rules.json"
+
+
+def test_profile_classification():
+    profiler = QueryProfiler()
+
+    p = profiler.profile("이거 뭐하는 프로젝트야")
+    assert p.query_type("ensemble") == "informal"
+    assert set(p.markers_for("ensemble")["informal"]) == {"이거", "뭐하는", "프로젝트"}
+    assert set(p.markers_for("guard")["informal"]) == {"이거", "뭐하는"}  # 사용처별 표지는 따로 매칭
+
+    p = profiler.profile("Perso.ai 고객센터는 어떻게 문의하나요?")
+    assert p.query_type("ensemble") == p.query_type("guard") == "formal"
+    assert p.length_class == "normal"
+
+    p = profiler.profile("  요금  ")
+    assert (p.query_type("guard"), p.length_class, p.normalized) == ("keyword", "short", "요금")
+
+
+# QueryProfile 도입 전 fusion / guard에 있던 판단 (그대로 복사) - 기본 표지가 바뀌면 안 됨
+def _legacy_weight_rule(query):
+    if re.search(r"무엇인가요|어떻게|어떤.{1,5}인가요|얼마인가요|누구|언제|어디|입니까", query, flags=re.IGNORECASE):
+        return "formal"
+    if len(query.strip()) < 5:
+        return "short"
+    informal = r"뭐야|뭐임|뭐예요|얼마야|있어\?|해\?|필요해|지원해|알려줘|설명해줘|가르쳐줘|말해줘|뭐하는|무슨|어떤|이거|그거|프로젝트"
+    if re.search(informal, query, flags=re.IGNORECASE):
+        return "informal"
+    return "default"
+
+
+def _legacy_threshold(query, base=0.75):
+    if len(query.strip()) < 5:
+        return 0.85
+    informal = r"뭐야|뭐임|뭐예요|얼마야|있어\?|해\?|필요해|지원해|알려줘|설명해줘|가르쳐줘|말해줘|뭐하는|무슨|어떤|이거"
+    if re.search(informal, query, flags=re.IGNORECASE):
+        return 0.35
+    if re.search(r"무엇인가요|어떻게|얼마인가요|누구|언제|어디|왜", query):
+        return base
+    if len(query.split()) <= 3:
+        return 0.65
+    return base
+
+
+def test_default_markers_keep_legacy_decisions():
+    queries = [
+        "요금", " 요 금 ", "요금제 알려줘", "그거 얼마", "이 프로젝트 소개", "그거 프로젝트 설명 좀 부탁",
+        "어떤 서비스인가요", "이 서비스는 유료입니까", "왜 느린가요", "회원 가입은 왜 해야 하나요 궁금합니다",
+        "Perso.ai 고객센터는 어떻게 문의하나요?", "Perso.ai 회원가입 필요", "누구한테 필요한 서비스야",
+        "이스트소프트는 어떤 회사인가요?", "Perso.ai 요금제 구성 안내 부탁드립니다",
+    ]
+    profiler = QueryProfiler()
+    engine = FusionEngine()
+    guard = HallucinationGuard(threshold=0.75, profiler=profiler)
+    for query in queries:
+        profile = profiler.profile(query)
+        assert engine.select_rule(profile).name == _legacy_weight_rule(query), query
+        assert guard.get_dynamic_threshold(query, profile=profile) == _legacy_threshold(query), query
+
+
+def test_guard_thresholds_from_shared_profile():
+    profiler = QueryProfiler()
+    guard = HallucinationGuard(threshold=0.75, profiler=profiler)
+    assert guard.get_dynamic_threshold("요금") == 0.85
+    assert guard.get_dynamic_threshold("요금제 알려줘") == 0.35
+    assert guard.get_dynamic_threshold("Perso.ai 고객센터는 어떻게 문의하나요?") == 0.75
+    assert guard.get_dynamic_threshold("Perso.ai 회원가입 필요") == 0.65
+
+    profile = profiler.profile("요금")
+    assert guard.is_valid(0.9, query="요금", profile=profile)
+    assert not guard.is_valid(0.8, query="요금", profile=profile)
+
+
+def test_shipped_rules_match_defaults(tmp_path):
+    rules = load_query_rules(str(RULES_PATH))
+    default_guard = HallucinationGuard(threshold=0.75)
+    guard = HallucinationGuard(
+        threshold=0.75,
+        profiler=QueryProfiler.from_config(rules["profile"]),
+        threshold_rules=threshold_rules_from_config(rules["thresholds"]),
+    )
+    engine = FusionEngine(weight_rules_from_config(rules["weights"]))
+    default_engine = FusionEngine()
+    for query in ["요금", "요금제 알려줘", "누구한테 필요한 서비스야", "Perso.ai 회원가입 필요", "이스트소프트는 어떤 회사인가요?", "그거 프로젝트 소개"]:
+        assert guard.get_dynamic_threshold(query) == default_guard.get_dynamic_threshold(query)
+        profile = guard.profiler.profile(query)
+        assert engine.select_rule(profile).name == default_engine.select_rule(QueryProfiler().profile(query)).name
+
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps({"thresholds": [{"name": "strict", "threshold": 0.9}]}), encoding="utf-8")
+    strict = HallucinationGuard(threshold=0.75, threshold_rules=threshold_rules_from_config(load_query_rules(str(path))["thresholds"]))
+    assert strict.get_dynamic_threshold("요금제 알려줘") == 0.9
@@ -0,0 +1,51 @@
+import json
+from app.application.replay import (
+    LabeledQuery,
+    RecordedRewriter,
+    evaluate,
+    format_reports,
+    load_log_queries,
+)
+from backend.tests.test_use_case import QUESTION, FakeRetriever, make_use_case
+
+
+def test_recorded_rewriter(tmp_path):
+    path = tmp_path / "responses.json"
+    path.write_text(json.dumps({"persoai 뭐야": QUESTION, "날씨": {"output": "[NO_MATCH]", "latency_ms": 300}}), encoding="utf-8")
+    rewriter = RecordedRewriter(str(path))
+    assert rewriter.rewrite("  persoai   뭐야 ") == QUESTION
+    assert rewriter.rewrite("날씨") == "[NO_MATCH]"
+    assert rewriter.rewrite("기록 없음") == "기록 없음"
+    assert rewriter.misses == 1
+
+
+def test_evaluate_accuracy_and_guard_metrics(tmp_path):
+    path = tmp_path / "responses.json"
+    path.write_text(json.dumps({"날씨 어때?": "[NO_MATCH]"}), encoding="utf-8")
+    use_case = make_use_case(FakeRetriever(score=0.9), RecordedRewriter(str(path)))
+    queries = [
+        LabeledQuery(QUESTION, QUESTION),  # TP
+        LabeledQuery("날씨 어때?", None),  # 거부 정답
+        LabeledQuery("요금제 알려줘", "Perso.ai의 요금제는 어떻게 구성되어 있나요?"),  # 잘못된 답변 (FP)
+    ]
+    report = evaluate("fake", use_case.search, queries, warmup=0)
+    assert (report.total, report.correct, report.tp, report.fp, report.fn) == (3, 2, 1, 1, 0)
+    assert report.precision == 0.5
+    assert report.recall == 1.0
+    assert len(report.timings["total"]) == 3
+
+    table = format_reports([report])
+    assert "| fake | 3 | 0.667 |" in table
+    assert "total p50/p95 (ms)" in table
+
+
+def test_load_log_queries(tmp_path):
+    path = tmp_path / "queries.jsonl"
+    rows = [
+        {"query": "요금 얼마야", "verdict": "ok", "matched_question": QUESTION},
+        {"query": "요금  얼마야", "verdict": "ok", "matched_question": QUESTION},
+        {"query": "날씨", "verdict": "fallback", "matched_question": ""},
+    ]
+    path.write_text("\n".join(json.dumps(r, ensure_ascii=False) for r in rows) + "\nnot json\n", encoding="utf-8")
+    queries = load_log_queries(str(path))
+    assert [(q.query, q.expected) for q in queries] == [("요금 얼마야", QUESTION), ("날씨", None)]
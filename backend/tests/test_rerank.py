@@ -0,0 +1,71 @@
+import time
+from typing import List
+from app.application.use_cases import QASearchUseCase
+from app.domain.entities import QAPair
+from app.domain.repositories import Reranker, Retriever
+from app.infrastructure.guards import HallucinationGuard
+from backend.tests.test_use_case import FakeRewriter
+
+
+class ListRetriever(Retriever):
+    def __init__(self, pairs: List[QAPair]):
+        self.pairs = pairs
+
+    def search(self, query: str, top_k: int = 3) -> List[QAPair]:
+        return [QAPair(p.question, p.answer, p.score) for p in self.pairs[:top_k]]
+
+
+class PreferSecondReranker(Reranker):
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls = 0
+
+    def score(self, query: str, candidates: List[QAPair]) -> List[float]:
+        self.calls += 1
+        time.sleep(self.delay)
+        return [1.0 if c.question == "b" else 0.0 for c in candidates]
+
+
+def make_use_case(pairs, reranker, timeout=0.5):
+    return QASearchUseCase(
+        retriever=ListRetriever(pairs),
+        guard=HallucinationGuard(threshold=0.5, use_dynamic=False),
+        top_k=3,
+        rewriter=FakeRewriter("[unused]"),
+        reranker=reranker,
+        rerank_margin=0.05,
+        rerank_timeout=timeout,
+    )
+
+
+def test_rerank_only_when_margin_is_small():
+    reranker = PreferSecondReranker()
+    close = make_use_case([QAPair("a", "A", 0.82), QAPair("b", "B", 0.80)], reranker)
+    result = close.search("질문")
+    assert result.matched_question == "b"
+    assert "rerank" in result.timings
+
+    clear = make_use_case([QAPair("a", "A", 0.90), QAPair("b", "B", 0.60)], reranker)
+    result = clear.search("질문")
+    assert result.matched_question == "a"
+    assert "rerank" not in result.timings
+    assert reranker.calls == 1
+
+
+def test_rerank_timeout_keeps_ensemble_order():
+    uc = make_use_case([QAPair("a", "A", 0.82), QAPair("b", "B", 0.80)], PreferSecondReranker(delay=0.3), timeout=0.05)
+    result = uc.search("질문")
+    assert result.matched_question == "a"
+    assert result.degradation == "no_rerank"
+
+
+def test_rerank_skipped_when_budget_is_spent():
+    from app.application.deadline import Deadline
+
+    reranker = PreferSecondReranker()
+    uc = make_use_case([QAPair("a", "A", 0.82), QAPair("b", "B", 0.80)], reranker)
+    candidates = ListRetriever([QAPair("a", "A", 0.82), QAPair("b", "B", 0.80)]).search("질문")
+    degraded, timings = [], {}
+    assert uc._rerank("질문", candidates, Deadline(0.0), degraded, timings) == candidates
+    assert degraded == ["no_rerank"]
+    assert reranker.calls == 0  # forward pass를 풀에 넣지 않음
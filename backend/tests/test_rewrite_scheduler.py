@@ -0,0 +1,121 @@
+import threading
+from app.application.rewrite_scheduler import (
+    BATCH, INTERACTIVE, RewriteScheduler, ScheduledRewriter, TokenBucket, current_lane, rewrite_priority,
+)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class RecordingRewriter:
+    system_prompt = "표준 질문 목록"
+
+    def __init__(self, gate: threading.Event = None):
+        self.gate = gate
+        self.entered = threading.Event()
+        self.calls = []
+
+    def rewrite(self, query):
+        if self.gate is not None and query == "block":
+            self.entered.set()
+            self.gate.wait(5)
+        self.calls.append(query)
+        return f"정식: {query}"
+
+
+def test_token_bucket_refill_and_reserve():
+    clock = Clock()
+    bucket = TokenBucket(rate_per_minute=6, clock=clock)
+    assert bucket.can_take(6) and not bucket.can_take(6, keep=1)
+    bucket.take(6)
+    assert not bucket.can_take(1)
+    assert bucket.time_until(1) == 10.0
+    clock.now = 10.0
+    assert bucket.can_take(1)
+    clock.now = 1000.0
+    assert bucket.available() == 6  # capacity 상한
+
+
+def test_interactive_fails_fast_to_original_when_quota_empty():
+    clock = Clock()
+    scheduler = RewriteScheduler(rpm=2, workers=1, clock=clock)
+    rewriter = ScheduledRewriter(RecordingRewriter(), scheduler)
+    assert rewriter.rewrite("요금 얼마야") == "정식: 요금 얼마야"
+    assert rewriter.rewrite("기능 뭐야") == "정식: 기능 뭐야"
+    assert rewriter.rewrite("언어 몇 개야") == "언어 몇 개야"  # 기다리지 않고 원본
+
+    clock.now = 30.0  # 30초 → 요청 1건 분량 충전
+    assert rewriter.rewrite("언어 몇 개야") == "정식: 언어 몇 개야"
+    stats = scheduler.stats()
+    assert stats["lanes"][INTERACTIVE]["rejected"] == 1
+    assert stats["lanes"][INTERACTIVE]["completed"] == 3
+    assert stats["quota"]["requests_used"] == 3 and "tpm" not in stats["quota"]  # 토큰 버킷 미설정
+    scheduler.close()
+
+
+def test_interactive_preempts_batch_and_duplicates_merge():
+    gate = threading.Event()
+    inner = RecordingRewriter(gate)
+    scheduler = RewriteScheduler(rpm=1000, tpm=10**6, workers=1)
+    blocker = scheduler.submit(inner, "block", BATCH)  # 워커 1개를 점유
+    assert inner.entered.wait(5)
+    queued = [scheduler.submit(inner, q, BATCH) for q in ("a", "b")]
+    c1 = scheduler.submit(inner, "c", INTERACTIVE)
+    c2 = scheduler.submit(inner, " c ", INTERACTIVE)  # 정규화 기준 중복 → 같은 Future
+    b2 = scheduler.submit(inner, "b", INTERACTIVE)  # 대기 중인 BATCH 작업 승격
+    assert c1 is c2 and b2 is queued[1]
+    gate.set()
+
+    assert [f.result(5) for f in (blocker, *queued, c1)] == ["정식: block", "정식: a", "정식: b", "정식: c"]
+    assert inner.calls == ["block", "c", "b", "a"]
+    stats = scheduler.stats()
+    assert stats["lanes"][INTERACTIVE]["merged"] == 2
+    assert stats["queue_depth"] == 0 and stats["quota"]["tokens_used"] > 0
+    scheduler.close()
+
+
+def test_rewrite_priority_context_and_batch_lane():
+    assert current_lane() == INTERACTIVE
+    with rewrite_priority(BATCH):
+        assert current_lane() == BATCH
+    assert current_lane() == INTERACTIVE
+
+    scheduler = RewriteScheduler(rpm=1000, workers=2)
+    rewriter = ScheduledRewriter(RecordingRewriter(), scheduler)
+    assert rewriter.rewrite_batch(["a", "b", "a"]) == ["정식: a", "정식: b", "정식: a"]
+    lanes = scheduler.stats()["lanes"]
+    assert lanes[BATCH]["submitted"] == 3 and lanes[INTERACTIVE]["submitted"] == 0
+    scheduler.close()
+
+
+def test_worker_share_below_one_rpm_and_rejection_log_rate_limit(capsys):
+    clock = Clock()
+    scheduler = RewriteScheduler(rpm=15 / 16, workers=1, clock=clock)  # 워커 16개가 15 RPM을 나눠 씀
+    rewriter = ScheduledRewriter(RecordingRewriter(), scheduler)
+    assert rewriter.rewrite("a") == "정식: a"  # 용량 최소 1건
+    assert [rewriter.rewrite(q) for q in ("b", "c", "d")] == ["b", "c", "d"]
+    assert scheduler.stats()["lanes"][INTERACTIVE]["rejected"] == 3
+    assert capsys.readouterr().out.count("quota 소진") == 1  # 거절 로그는 log_interval당 한 번
+    clock.now = 64.0  # 분당 15/16건 → 64초에 1건 충전
+    assert rewriter.rewrite("e") == "정식: e"
+    scheduler.close()
+
+
+def test_bound_rewrite_keeps_lane_and_gives_up_at_deadline():
+    from concurrent.futures import ThreadPoolExecutor
+    from app.application.deadline import Deadline
+
+    scheduler = RewriteScheduler(rpm=2, workers=1, clock=Clock())  # BATCH 예비분 때문에 두 번째는 충전 대기
+    rewriter = ScheduledRewriter(RecordingRewriter(), scheduler)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        with rewrite_priority(BATCH):
+            assert pool.submit(Deadline(1.0).bind(current_lane)).result() == BATCH  # 풀 스레드로 lane 전달
+            assert pool.submit(Deadline(1.0).bind(rewriter.rewrite), "a").result() == "정식: a"
+            assert pool.submit(Deadline(0.05).bind(rewriter.rewrite), "b").result() == "b"  # 충전 대기 중 예산 소진
+    assert scheduler.stats()["lanes"][BATCH]["submitted"] == 2
+    scheduler.close()
@@ -1,8 +1,10 @@
+import json
 from fastapi.testclient import TestClient
 import sys
 from pathlib import Path
-sys.path.insert(0, str(Path(__file__).parent.parent))
-from app import app
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from backend.app import app
+from app.domain.entities import SearchResult
 
 client = TestClient(app)
 
@@ -31,3 +33,84 @@ def test_healthz():
     r = client.get("/healthz")
     assert r.status_code == 200
     assert r.json()["ok"] is True
+
+
+def _sse_events(body: str):
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+class StubUseCase:
+    def __init__(self, provisional, final):
+        self.provisional = provisional
+        self.final = final
+
+    def search(self, query, deadline=None, on_provisional=None):
+        if self.provisional is not None and on_provisional is not None:
+            on_provisional(self.provisional)
+        return self.final
+
+
+def _result(answer, strategy, **timings):
+    return SearchResult(
+        answer=answer, score=0.9, matched_question=answer, sources=[], is_valid=True,
+        strategy=strategy, timings={"total": 10.0, **timings},
+    )
+
+
+def test_ask_stream_events(monkeypatch):
+    import backend.app as backend_app
+
+    provisional = _result("잠정", "provisional", provisional=3.0)
+    monkeypatch.setattr(backend_app, "get_use_case", lambda kb_id=None: StubUseCase(provisional, _result("최종", "ensemble")))
+    r = client.post("/ask/stream", json={"query": "요금 얼마야"})
+    assert r.status_code == 200 and r.headers["content-type"].startswith("text/event-stream")
+    events = _sse_events(r.text)
+    assert [name for name, _ in events] == ["provisional", "final", "timings"]
+    assert events[1][1]["answer"] == "최종" and events[1][1]["changed"] is True
+    assert events[2][1]["first_answer_ms"] == 3.0
+
+    # rewrite 후에도 답이 같으면 final 없이 timings만
+    monkeypatch.setattr(backend_app, "get_use_case", lambda kb_id=None: StubUseCase(provisional, _result("잠정", "ensemble")))
+    events = _sse_events(client.post("/ask/stream", json={"query": "요금 얼마야"}).text)
+    assert [name for name, _ in events] == ["provisional", "timings"]
+
+
+def test_deep_health_is_cached(monkeypatch):
+    import backend.app as backend_app
+
+    checks = []
+    monkeypatch.setattr(backend_app, "_check_deep_health", lambda: checks.append(1) or {"status": "ok"})
+    monkeypatch.setattr(backend_app, "_deep_health", {"checked_at": 0.0, "result": None})
+    monkeypatch.setattr(backend_app, "HEALTH_DEEP_TTL", 60.0)
+    assert client.get("/healthz/deep").json()["cached"] is False
+    assert client.get("/healthz/deep").json()["cached"] is True
+    assert len(checks) == 1
+
+    monkeypatch.setattr(backend_app, "_deep_health", {"checked_at": 0.0, "result": None})
+    monkeypatch.setattr(backend_app, "_check_deep_health", lambda: {"status": "error", "message": "down"})
+    assert client.get("/healthz/deep").status_code == 503
+
+
+def test_versioned_index_rebuilds_stale_file_without_alias(tmp_path):
+    import backend.app as app_module
+
+    class Index(list):
+        source = None
+
+        def save(self, path):
+            Path(path).write_text(json.dumps(self))
+
+    path = tmp_path / "local_index.json"
+    Index([1, 2]).save(path)
+    load = lambda p: Index(json.loads(Path(p).read_text()))
+    build = lambda source: Index([1, 2, 3])
+
+    fresh = lambda index: len(index) == 3  # 재인제스트 후 컬렉션 포인트 수
+    index = app_module._versioned_index(Index([1, 2]), None, str(path), load, build, "Test", fresh=fresh)
+    assert len(index) == 3 and json.loads(path.read_text()) == [1, 2, 3]
+    cached = app_module._versioned_index(index, None, str(path), load, build, "Test", fresh=fresh)
+    assert cached is index
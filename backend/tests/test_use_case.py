@@ -0,0 +1,187 @@
+import time
+from typing import List
+from app.application.deadline import Deadline
+from app.application.use_cases import QASearchUseCase
+from app.domain.entities import QAPair
+from app.domain.repositories import Retriever
+from app.infrastructure.guards import HallucinationGuard
+
+QUESTION = "Perso.ai는 어떤 서비스인가요?"
+ANSWER = "Perso.ai는 AI 영상 더빙 서비스입니다."
+
+
+class FakeRetriever(Retriever):
+    def __init__(self, score: float = 0.9, delay: float = 0.0, fail: bool = False):
+        self.score = score
+        self.delay = delay
+        self.fail = fail
+        self.queries: List[str] = []
+
+    def search(self, query: str, top_k: int = 3) -> List[QAPair]:
+        self.queries.append(query)
+        time.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError("qdrant down")
+        return [QAPair(question=QUESTION, answer=ANSWER, score=self.score)]
+
+
+class FakeRewriter:
+    def __init__(self, output: str = QUESTION, delay: float = 0.0):
+        self.output = output
+        self.delay = delay
+
+    def rewrite(self, query: str) -> str:
+        time.sleep(self.delay)
+        return self.output
+
+
+def make_use_case(retriever, rewriter, fallback=None):
+    return QASearchUseCase(
+        retriever=retriever,
+        guard=HallucinationGuard(threshold=0.75),
+        top_k=3,
+        rewriter=rewriter,
+        fallback_retriever=fallback,
+        search_reserve=0.05,
+    )
+
+
+def test_full_tier_without_deadline():
+    uc = make_use_case(FakeRetriever(), FakeRewriter())
+    result = uc.search(QUESTION)
+    assert result.is_valid
+    assert result.degradation == "full"
+    assert "total" in result.timings
+
+
+def test_no_match_rejected():
+    uc = make_use_case(FakeRetriever(), FakeRewriter("[NO_MATCH]"))
+    result = uc.search("오늘 날씨가 어때요?")
+    assert not result.is_valid
+    assert result.matched_question == ""
+
+
+def test_slow_rewrite_degrades_to_original_only():
+    retriever = FakeRetriever(score=0.8)
+    uc = make_use_case(retriever, FakeRewriter(delay=1.0))
+    result = uc.search(QUESTION, deadline=Deadline(0.2))
+    assert result.degradation == "no_rewrite"
+    # rewrite 없이 원본 점수를 그대로 사용
+    assert abs(result.score - 0.8) < 1e-9
+    assert retriever.queries == [QUESTION]
+
+
+def test_slow_qdrant_falls_back_to_local_index():
+    fallback = FakeRetriever(score=0.95)
+    uc = make_use_case(FakeRetriever(delay=1.0), FakeRewriter(), fallback=fallback)
+    result = uc.search(QUESTION, deadline=Deadline(0.2))
+    assert "local_index" in result.degradation
+    assert result.is_valid
+    assert fallback.queries
+
+
+def test_hung_rewrites_do_not_starve_search():
+    from concurrent.futures import ThreadPoolExecutor
+    retriever = FakeRetriever(score=0.8)
+    uc = QASearchUseCase(
+        retriever=retriever,
+        guard=HallucinationGuard(threshold=0.75),
+        top_k=3,
+        rewriter=FakeRewriter(delay=1.0),
+        search_reserve=0.05,
+        executor=ThreadPoolExecutor(max_workers=1),
+        external_executor=ThreadPoolExecutor(max_workers=1),
+    )
+    for _ in range(3):  # 끝나지 않은 Gemini 호출이 쌓여도 검색 풀은 비어 있음
+        t0 = time.perf_counter()
+        result = uc.search(QUESTION, deadline=Deadline(0.2))
+        assert time.perf_counter() - t0 < 0.5
+        assert result.degradation == "no_rewrite" and result.is_valid
+
+
+def test_slow_qdrant_without_fallback_respects_deadline():
+    uc = make_use_case(FakeRetriever(delay=1.0), FakeRewriter())
+    t0 = time.perf_counter()
+    result = uc.search(QUESTION, deadline=Deadline(0.2))
+    assert time.perf_counter() - t0 < 0.6
+    assert "search_timeout" in result.degradation
+    assert not result.is_valid
+
+
+def test_qdrant_error_falls_back_without_deadline():
+    uc = make_use_case(FakeRetriever(fail=True), FakeRewriter(), fallback=FakeRetriever())
+    result = uc.search(QUESTION)
+    assert result.degradation == "local_index"
+
+
+def test_strong_original_match_skips_rewrite():
+    rewriter = FakeRewriter("[NO_MATCH]")  # 호출되면 거절되므로 생략 여부를 확인할 수 있음
+    uc = make_use_case(FakeRetriever(score=0.92), rewriter)
+    uc.rewrite_skip_score = 0.85
+    result = uc.search("요금 얼마야")
+    assert result.is_valid
+    assert result.strategy == "vector"
+    assert "rewrite" not in result.timings
+
+
+def test_rewrite_runs_alongside_skip_check_search():
+    # rewrite 생략 판단이 원본 검색을 기다리는 동안 Gemini 호출은 이미 진행 중
+    retriever = FakeRetriever(score=0.8, delay=0.1)
+    uc = make_use_case(retriever, FakeRewriter(delay=0.1))
+    uc.rewrite_skip_score = 0.85
+    t0 = time.perf_counter()
+    result = uc.search("요금 얼마야", deadline=Deadline(1.0))
+    # 원본 검색(0.1) ∥ rewrite(0.1) → rewrite 변형 검색(0.1), 직렬이면 0.3초 이상
+    assert time.perf_counter() - t0 < 0.27
+    assert result.degradation == "full" and result.strategy == "ensemble"
+    assert retriever.queries == ["요금 얼마야", QUESTION]
+
+
+class RewriteAwareRetriever(FakeRetriever):
+    """rewrite된 질문(표준 질문)에는 다른 QA가 더 높은 점수로 매칭."""
+
+    def search(self, query: str, top_k: int = 3) -> List[QAPair]:
+        self.queries.append(query)
+        if query == "요금제는 어떻게 되나요?":
+            return [QAPair(question=query, answer="요금제 안내", score=0.95, id=2)]
+        return [QAPair(question=QUESTION, answer=ANSWER, score=self.score, id=1)]
+
+
+def test_provisional_answer_before_rewrite():
+    events = []
+    rewriter = FakeRewriter("요금제는 어떻게 되나요?", delay=0.1)
+    uc = make_use_case(RewriteAwareRetriever(score=0.8), rewriter)
+    t0 = time.perf_counter()
+    result = uc.search("가격 알려줘", on_provisional=lambda r: events.append((r, time.perf_counter() - t0)))
+
+    provisional, elapsed = events[0]
+    assert len(events) == 1 and elapsed < 0.1  # Gemini 응답 전
+    assert provisional.strategy == "provisional" and provisional.answer == ANSWER
+    assert result.answer == "요금제 안내" and result.strategy == "ensemble"
+    assert "provisional" in result.timings
+
+
+def test_stream_final_overlaps_rewrite_with_provisional_search():
+    class SlowRetriever(RewriteAwareRetriever):
+        def search(self, query, top_k=3):
+            time.sleep(0.1)
+            return super().search(query, top_k)
+
+    events = []
+    uc = make_use_case(SlowRetriever(score=0.8), FakeRewriter("요금제는 어떻게 되나요?", delay=0.15))
+    uc.rewrite_skip_score = 0.85
+    t0 = time.perf_counter()
+    result = uc.search("가격 알려줘", deadline=Deadline(1.0), on_provisional=lambda r: events.append(time.perf_counter() - t0))
+    elapsed = time.perf_counter() - t0
+    # 잠정 답변은 원본 검색(0.1) 직후, 그동안 Gemini(0.15)는 이미 진행 중
+    # → 최종 답변 ≈ 0.15 + rewrite 변형 검색(0.1), 직렬이면 0.35초 이상
+    assert len(events) == 1 and events[0] < 0.15
+    assert elapsed < 0.32
+    assert result.answer == "요금제 안내" and result.degradation == "full"
+
+
+def test_no_provisional_when_original_fails_guard():
+    events = []
+    uc = make_use_case(FakeRetriever(score=0.5), FakeRewriter())
+    result = uc.search("오늘 날씨가 어때요?", on_provisional=events.append)
+    assert events == [] and not result.is_valid
@@ -0,0 +1,45 @@
+import { NextRequest, NextResponse } from "next/server";
+
+// SSE는 응답 본문을 그대로 흘려보내야 하므로 캐시/정적 최적화 비활성
+export const dynamic = "force-dynamic";
+
+export async function POST(req: NextRequest) {
+  try {
+    const body = await req.json();
+
+    // Vercel 서버 측에서만 접근 가능한 환경변수
+    const backendBaseUrl = process.env.BACKEND_BASE_URL || "http://3.36.62.184:8000";
+
+    // EC2 백엔드 스트림을 버퍼링 없이 그대로 전달 (서버→서버이므로 HTTP 허용)
+    const backendRes = await fetch(`${backendBaseUrl}/ask/stream`, {
+      method: "POST",
+      headers: {
+        "Content-Type": "application/json",
+      },
+      body: JSON.stringify(body),
+    });
+
+    if (!backendRes.ok || !backendRes.body) {
+      // 백엔드 오류를 그대로 전달
+      const errorData = await backendRes.json().catch(() => ({}));
+      return NextResponse.json(
+        errorData,
+        { status: backendRes.status }
+      );
+    }
+
+    return new Response(backendRes.body, {
+      headers: {
+        "Content-Type": "text/event-stream",
+        "Cache-Control": "no-cache, no-transform",
+        "X-Accel-Buffering": "no",
+      },
+    });
+  } catch (error) {
+    console.error("API Route Error:", error);
+    return NextResponse.json(
+      { error: "서버 오류가 발생했습니다." },
+      { status: 500 }
+    );
+  }
+}
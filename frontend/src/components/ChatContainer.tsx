@@ -4,7 +4,7 @@ import { useState, useRef, useEffect } from "react";
 import styles from "./ChatContainer.module.css";
 import MessageList from "./MessageList";
 import ChatInput from "./ChatInput";
-import { ask } from "../lib/api";
+import { askStream, type AskResponse } from "../lib/api";
 
 export type Message = {
   id: string;
@@ -18,6 +18,8 @@ export type Message = {
 export default function ChatContainer() {
   const [messages, setMessages] = useState<Message[]>([]);
   const [isLoading, setIsLoading] = useState(false);
+  // 잠정 답변을 이미 표시한 경우 로딩 표시를 숨김 (최종 답변은 같은 메시지를 갱신)
+  const [hasAnswer, setHasAnswer] = useState(false);
   const [error, setError] = useState<string | null>(null);
   const messagesEndRef = useRef<HTMLDivElement>(null);
 
@@ -54,21 +56,33 @@ export default function ChatContainer() {
 
     setMessages((prev) => [...prev, userMessage]);
     setIsLoading(true);
+    setHasAnswer(false);
     setError(null);
 
-    try {
-      const response = await ask(content.trim());
-
+    const assistantId = (Date.now() + 1).toString();
+    // 잠정 답변은 새 메시지로 추가, 이후 최종 답변은 같은 메시지를 교체
+    const showAnswer = (response: AskResponse) => {
       const assistantMessage: Message = {
-        id: (Date.now() + 1).toString(),
+        id: assistantId,
         role: "assistant",
         content: response.answer,
         sources: response.sources,
         score: response.score,
         timestamp: new Date(),
       };
+      setMessages((prev) =>
+        prev.some((m) => m.id === assistantId)
+          ? prev.map((m) => (m.id === assistantId ? assistantMessage : m))
+          : [...prev, assistantMessage]
+      );
+      setHasAnswer(true);
+    };
 
-      setMessages((prev) => [...prev, assistantMessage]);
+    try {
+      await askStream(content.trim(), {
+        onProvisional: showAnswer,
+        onFinal: showAnswer,
+      });
     } catch (err) {
       setError(
         err instanceof Error
@@ -84,7 +98,8 @@ export default function ChatContainer() {
         timestamp: new Date(),
       };
 
-      setMessages((prev) => [...prev, errorMessage]);
+      // 잠정 답변이 이미 표시됐으면 그대로 두고 오류 배너만 표시
+      setMessages((prev) => (prev.some((m) => m.id === assistantId) ? prev : [...prev, errorMessage]));
     } finally {
       setIsLoading(false);
     }
@@ -214,7 +229,7 @@ export default function ChatContainer() {
           </div>
         ) : (
           <>
-            <MessageList messages={messages} isLoading={isLoading} />
+            <MessageList messages={messages} isLoading={isLoading && !hasAnswer} />
             <div ref={messagesEndRef} />
           </>
         )}
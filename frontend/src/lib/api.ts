@@ -4,8 +4,40 @@ export type AskResponse = {
   matched_question: string;
   sources: string[];
   topk?: Array<{ question: string; score: number }>;
+  degradation?: string;
 };
 
+export type StreamTimings = {
+  timings: Record<string, number>;
+  first_answer_ms: number;
+  strategy: string;
+  degradation: string;
+};
+
+export type AskStreamHandlers = {
+  // Gemini rewrite 전, 원본 질문 검색으로 찾은 잠정 답변
+  onProvisional?: (data: AskResponse) => void;
+  // 잠정 답변이 없었거나 rewrite 결과로 답이 바뀐 경우의 최종 답변
+  onFinal?: (data: AskResponse & { changed: boolean }) => void;
+  onTimings?: (data: StreamTimings) => void;
+};
+
+function errorForStatus(status: number): Error {
+  if (status === 400) {
+    return new Error("잘못된 요청입니다. 질문을 확인해주세요.");
+  }
+  if (status === 502) {
+    return new Error("백엔드 서버에 연결할 수 없습니다. 잠시 후 다시 시도해주세요.");
+  }
+  if (status === 503) {
+    return new Error("요청이 많아 잠시 처리할 수 없습니다. 잠시 후 다시 시도해주세요.");
+  }
+  if (status === 500) {
+    return new Error("서버 오류가 발생했습니다. 잠시 후 다시 시도해주세요.");
+  }
+  return new Error(`요청 실패 (${status})`);
+}
+
 export async function ask(
   query: string,
   signal?: AbortSignal
@@ -30,16 +62,7 @@ export async function ask(
     clearTimeout(timeoutId);
 
     if (!resp.ok) {
-      if (resp.status === 400) {
-        throw new Error("잘못된 요청입니다. 질문을 확인해주세요.");
-      }
-      if (resp.status === 502) {
-        throw new Error("백엔드 서버에 연결할 수 없습니다. 잠시 후 다시 시도해주세요.");
-      }
-      if (resp.status === 500) {
-        throw new Error("서버 오류가 발생했습니다. 잠시 후 다시 시도해주세요.");
-      }
-      throw new Error(`요청 실패 (${resp.status})`);
+      throw errorForStatus(resp.status);
     }
 
     const data: AskResponse = await resp.json();
@@ -58,5 +81,86 @@ export async function ask(
   }
 }
 
+/**
+ * /ask/stream (Server-Sent Events) 호출.
+ * provisional → (final) → timings 순으로 핸들러를 호출하고, 마지막으로 표시된 답변을 반환.
+ */
+export async function askStream(
+  query: string,
+  handlers: AskStreamHandlers = {},
+  signal?: AbortSignal
+): Promise<AskResponse> {
+  const controller = new AbortController();
+  const timeoutId = setTimeout(() => controller.abort(), 120000); // 120초 타임아웃 (모델 로딩 대응)
+
+  try {
+    const resp = await fetch("/api/ask/stream", {
+      method: "POST",
+      headers: {
+        "Content-Type": "application/json",
+      },
+      body: JSON.stringify({ query }),
+      signal: signal || controller.signal,
+    });
+
+    if (!resp.ok || !resp.body) {
+      throw errorForStatus(resp.status);
+    }
+
+    const reader = resp.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = "";
+    let latest = null as AskResponse | null; // dispatch 안에서 갱신 (좁히기 방지)
+
+    const dispatch = (block: string) => {
+      let event = "message";
+      let data = "";
+      for (const line of block.split("\n")) {
+        if (line.startsWith("event:")) event = line.slice(6).trim();
+        else if (line.startsWith("data:")) data += line.slice(5).trim();
+      }
+      if (!data) return;
+      const payload = JSON.parse(data);
+      if (event === "provisional") {
+        latest = payload;
+        handlers.onProvisional?.(payload);
+      } else if (event === "final") {
+        latest = payload;
+        handlers.onFinal?.(payload);
+      } else if (event === "timings") {
+        handlers.onTimings?.(payload);
+      } else if (event === "error") {
+        throw new Error("서버 오류가 발생했습니다. 잠시 후 다시 시도해주세요.");
+      }
+    };
+
+    while (true) {
+      const { done, value } = await reader.read();
+      if (done) break;
+      buffer += decoder.decode(value, { stream: true });
+      let boundary = buffer.indexOf("\n\n");
+      while (boundary !== -1) {
+        dispatch(buffer.slice(0, boundary));
+        buffer = buffer.slice(boundary + 2);
+        boundary = buffer.indexOf("\n\n");
+      }
+    }
+    if (buffer.trim()) dispatch(buffer);
 
+    if (!latest) {
+      throw new Error("응답을 받지 못했습니다. 다시 시도해주세요.");
+    }
+    return latest;
+  } catch (error) {
+    if (error instanceof Error) {
+      if (error.name === "AbortError") {
+        throw new Error("요청 시간이 초과되었습니다. 다시 시도해주세요.");
+      }
+      throw error;
+    }
 
+    throw new Error("알 수 없는 오류가 발생했습니다.");
+  } finally {
+    clearTimeout(timeoutId);
+  }
+}
@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+"""
+PCA 축소 벡터 벤치마크: 원본 768차원 검색 대비 recall@k 손실, 지연, 메모리 추정치 비교
+
+bench_quantization.py와 같은 코퍼스/질의/정답셋(numpy 전수 검색)을 사용해
+1) 원본 컬렉션 검색 (기준선)
+2) 축소 컬렉션 검색만 (재채점 없음)
+3) 축소 컬렉션 1차 검색 + 원본 벡터 재채점 (서빙 경로: ProjectedQdrantRetriever, 후보 배수별)
+을 측정합니다. 축소 컬렉션은 ingest와 같은 build_reduced_collection으로 만듭니다.
+
+메모리는 설정 기반 추정치입니다 (bench_quantization.estimate_memory_mb):
+    기준선 = 원본 벡터 RAM + HNSW, PCA = 축소 벡터 RAM + 축소 HNSW + 원본 HNSW (원본 벡터는 QDRANT_ON_DISK=1로 디스크)
+
+사용 예:
+    python scripts/bench_pca.py --source qa_collection --replicate 30000 --dims 128 256
+    python scripts/bench_pca.py --source qa_collection --replicate 50000 --dims 128 --candidates 2 4 8 --json pca.json
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+from qdrant_client import QdrantClient
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from bench_quantization import build_collection, estimate_memory_mb, exact_topk, make_corpus, make_queries, measure
+from app.infrastructure.projection import PcaProjection, build_reduced_collection
+from app.infrastructure.repositories import ProjectedQdrantRetriever, QdrantRetriever
+
+
+def measure_rescored(retriever: ProjectedQdrantRetriever, queries: np.ndarray, truth: List[set], k: int) -> Dict[str, float]:
+    """서빙 경로 그대로: 축소 배치 검색 1회 + 원본 벡터 조회 1회 (질의 1개씩)."""
+    latencies, hits = [], 0
+    for q, expected in zip(queries, truth):
+        t0 = time.perf_counter()
+        pairs = retriever.search_vectors(q[None, :], top_k=k)[0]
+        latencies.append((time.perf_counter() - t0) * 1000)
+        hits += len(expected & {int(p.id) for p in pairs})
+    lat = np.asarray(latencies)
+    return {
+        "recall": hits / (len(truth) * k),
+        "p50": float(np.percentile(lat, 50)),
+        "p95": float(np.percentile(lat, 95)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PCA 축소 벡터 + 원본 재채점의 recall·지연·메모리 벤치마크")
+    parser.add_argument("--url", default=os.getenv("QDRANT_URL", "http://localhost:6333"))
+    src = parser.add_mutually_exclusive_group()
+    src.add_argument("--source", default=os.getenv("QDRANT_COLLECTION", "qa_collection"), help="벡터를 가져올 컬렉션")
+    src.add_argument("--synthetic", type=int, default=0, help="합성 벡터 개수 (등방성 분포라 PCA에 불리 - 상한 확인용)")
+    parser.add_argument("--dim", type=int, default=int(os.getenv("EMBED_DIM", 768)), help="합성 벡터 차원")
+    parser.add_argument("--replicate", type=int, default=0, help="실제 벡터를 노이즈로 복제해 늘릴 목표 개수")
+    parser.add_argument("--noise", type=float, default=0.05, help="복제/질의 벡터 노이즈 표준편차")
+    parser.add_argument("--dims", type=int, nargs="+", default=[128, 256], help="PCA 축소 차원 목록")
+    parser.add_argument("--candidates", type=int, nargs="+", default=[2, 4, 8], help="재채점 후보 배수 목록")
+    parser.add_argument("--ef", type=int, default=0, help="검색 hnsw_ef (0 = 서버 기본값)")
+    parser.add_argument("-k", type=int, default=5, help="recall@k")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--m", type=int, default=16)
+    parser.add_argument("--ef-construct", type=int, default=100)
+    parser.add_argument("--indexing-threshold", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=512)
+    parser.add_argument("--index-timeout", type=float, default=600.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", help="결과를 JSON으로 저장할 경로")
+    parser.add_argument("--keep", action="store_true", help="벤치 컬렉션을 삭제하지 않음")
+    args = parser.parse_args()
+    args.compression = "x16"  # build_collection/estimate_memory_mb 공용 인자 (양자화 미사용)
+
+    client = QdrantClient(url=args.url)
+    rng = np.random.default_rng(args.seed)
+    corpus = make_corpus(args, client, rng)
+    queries = make_queries(corpus, args.queries, args.noise, rng)
+    truth = exact_topk(corpus, queries, args.k)
+    n, dim = corpus.shape
+    params = QdrantRetriever.build_search_params(hnsw_ef=args.ef or None)
+
+    base = "bench_pca_full"
+    build_collection(client, base, corpus, {"quantization": "none", "on_disk": False}, args)
+    rows = []
+    full_mem = estimate_memory_mb(n, dim, "none", False, args.m, args.compression)
+    rows.append({"config": f"full {dim}d", "dim": dim, "candidates": None, "ram_mb": full_mem,
+                 **measure(client, base, queries, truth, args.k, params)})
+
+    tmp = tempfile.mkdtemp(prefix="bench_pca_")
+    try:
+        for d in args.dims:
+            t0 = time.perf_counter()
+            projection = build_reduced_collection(
+                client, base, d, os.path.join(tmp, f"pca{d}.npz"), m=args.m, ef_construct=args.ef_construct,
+            )
+            print(f"[PCA] {dim}→{projection.dim}d, 설명 분산 {projection.explained:.1%} ({time.perf_counter() - t0:.1f}s)")
+            mem = (
+                estimate_memory_mb(n, projection.dim, "none", False, args.m, args.compression)
+                + estimate_memory_mb(n, dim, "none", True, args.m, args.compression)
+            )
+            reduced_queries = projection.apply(queries)
+            rows.append({"config": f"pca {projection.dim}d (재채점 없음)", "dim": projection.dim, "candidates": None,
+                         "ram_mb": mem, "explained": projection.explained,
+                         **measure(client, projection.collection, reduced_queries, truth, args.k, params)})
+            for c in args.candidates:
+                retriever = ProjectedQdrantRetriever(
+                    client, None, base, projection=projection, candidates=c, hnsw_ef=args.ef or None,
+                )
+                rows.append({"config": f"pca {projection.dim}d + 재채점 ×{c}", "dim": projection.dim, "candidates": c,
+                             "ram_mb": mem, "explained": projection.explained,
+                             **measure_rescored(retriever, queries, truth, args.k)})
+            if not args.keep:
+                client.delete_collection(projection.collection)
+    finally:
+        if not args.keep:
+            client.delete_collection(base)
+
+    baseline = rows[0]
+    print(f"\n# N={n}, dim={dim}, queries={len(queries)}, k={args.k}, m={args.m}, hnsw_ef={args.ef or 'default'}")
+    print(f"| config | recall@{args.k} | Δrecall | p50 (ms) | p95 (ms) | est. RAM (MB) | RAM 절감 |")
+    print("|---|---|---|---|---|---|---|")
+    for r in rows:
+        print(
+            f"| {r['config']} | {r['recall']:.3f} | {r['recall'] - baseline['recall']:+.3f} | {r['p50']:.2f} "
+            f"| {r['p95']:.2f} | {r['ram_mb']:.1f} | {1 - r['ram_mb'] / baseline['ram_mb']:.0%} |"
+        )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"n": n, "dim": dim, "k": args.k, "rows": rows}, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
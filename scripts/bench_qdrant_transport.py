@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+"""
+Qdrant 전송 방식 벤치마크: REST vs REST(HTTP/2) vs gRPC 왕복 시간 비교
+
+같은 컬렉션에 같은 질의 벡터로 검색을 보내며 전송 설정별로
+- 첫 요청 지연 (연결 수립 + TLS 포함, 콜드)
+- 순차 요청 p50/p95/p99 (keep-alive 연결 재사용)
+- 동시 요청 처리량 (워커 스레드 N개가 같은 클라이언트 공유)
+- 요청 본문 크기 추정 (768차원 float JSON vs protobuf)
+을 표로 출력합니다. Render → Qdrant Cloud처럼 왕복 지연이 큰 구간에서 QDRANT_PREFER_GRPC /
+QDRANT_KEEPALIVE / QDRANT_HTTP2를 고르기 위한 용도입니다.
+
+사용 예:
+    python scripts/bench_qdrant_transport.py --collection qa_collection
+    python scripts/bench_qdrant_transport.py --transports rest rest:nokeepalive rest+http2 grpc --requests 500 --concurrency 8
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+from dotenv import load_dotenv
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.infrastructure.qdrant_transport import QdrantTransportConfig, build_client
+
+load_dotenv()
+
+
+def transport_config(base: QdrantTransportConfig, spec: str) -> QdrantTransportConfig:
+    """'rest' | 'rest:nokeepalive' | 'rest+http2' | 'grpc' → 설정."""
+    kind, _, flag = spec.partition(":")
+    config = replace(base, prefer_grpc=kind == "grpc", http2=kind == "rest+http2")
+    if flag == "nokeepalive":
+        config = replace(config, keepalive=0)
+    return config
+
+
+def query_vectors(client, collection: str, n: int, rng: np.random.Generator) -> np.ndarray:
+    """컬렉션의 저장 벡터에 노이즈를 더한 질의 (컬렉션 차원과 분포 유지)."""
+    points, _ = client.scroll(collection_name=collection, limit=min(n, 256), with_payload=False, with_vectors=True)
+    if not points:
+        raise SystemExit(f"컬렉션이 비어 있습니다: {collection}")
+    base = np.asarray([p.vector for p in points], dtype=np.float32)
+    q = base[rng.integers(0, len(base), size=n)] + rng.standard_normal((n, base.shape[1])).astype(np.float32) * 0.05
+    return q / np.linalg.norm(q, axis=1, keepdims=True)
+
+
+def measure(client, collection: str, queries: np.ndarray, k: int, concurrency: int) -> Dict[str, float]:
+    def one(q: np.ndarray) -> float:
+        t0 = time.perf_counter()
+        client.search(collection_name=collection, query_vector=q.tolist(), limit=k, with_payload=["question"])
+        return (time.perf_counter() - t0) * 1000
+
+    cold = one(queries[0])  # 연결 수립 포함
+    one(queries[1 % len(queries)])  # 워밍업 (gRPC 채널/HTTP2 세션 준비)
+
+    latencies = np.asarray([one(q) for q in queries])
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, queries))
+    elapsed = time.perf_counter() - t0
+    return {
+        "cold_ms": cold,
+        "p50": float(np.percentile(latencies, 50)),
+        "p95": float(np.percentile(latencies, 95)),
+        "p99": float(np.percentile(latencies, 99)),
+        "qps": len(queries) / elapsed,
+    }
+
+
+def payload_bytes(vector: np.ndarray) -> Dict[str, int]:
+    """검색 요청의 벡터 부분 크기 추정 (JSON 텍스트 vs protobuf packed float)."""
+    return {"json": len(json.dumps(vector.tolist())), "protobuf": 4 * len(vector) + 4}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Qdrant REST vs gRPC 왕복 시간 벤치마크")
+    parser.add_argument("--url", default=os.getenv("QDRANT_URL", "http://localhost:6333"))
+    parser.add_argument("--collection", default=os.getenv("QDRANT_COLLECTION", "qa_collection"))
+    parser.add_argument("--transports", nargs="+", default=["rest:nokeepalive", "rest", "rest+http2", "grpc"],
+                        help="rest | rest:nokeepalive | rest+http2 | grpc")
+    parser.add_argument("--requests", type=int, default=200, help="설정별 순차/동시 요청 수")
+    parser.add_argument("--concurrency", type=int, default=4, help="동시 요청 스레드 수")
+    parser.add_argument("-k", type=int, default=12, help="검색 limit (TOP_K × PARAPHRASE_FANOUT 기본값)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", help="결과를 JSON으로 저장할 경로")
+    args = parser.parse_args()
+
+    base = QdrantTransportConfig.from_env(url=args.url)
+    rng = np.random.default_rng(args.seed)
+    queries = query_vectors(build_client(base), args.collection, args.requests, rng)
+    size = payload_bytes(queries[0])
+
+    rows: List[dict] = []
+    for spec in args.transports:
+        config = transport_config(base, spec)
+        client = build_client(config)
+        try:
+            r = measure(client, args.collection, queries, args.k, args.concurrency)
+        except Exception as e:
+            print(f"   ⚠️  {spec}: 측정 실패 ({type(e).__name__}: {e})")
+            continue
+        finally:
+            client.close()
+        rows.append({"transport": spec, **r})
+
+    print(f"\n# {args.url} / {args.collection}: dim={queries.shape[1]}, requests={len(queries)}, "
+          f"concurrency={args.concurrency}, limit={args.k}")
+    print(f"# 질의 벡터 본문: JSON {size['json']} B vs protobuf ~{size['protobuf']} B")
+    print("| transport | cold (ms) | p50 (ms) | p95 (ms) | p99 (ms) | QPS |")
+    print("|---|---|---|---|---|---|")
+    for r in rows:
+        print(f"| {r['transport']} | {r['cold_ms']:.1f} | {r['p50']:.2f} | {r['p95']:.2f} | {r['p99']:.2f} | {r['qps']:.0f} |")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"url": args.url, "collection": args.collection, "payload_bytes": size, "rows": rows}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
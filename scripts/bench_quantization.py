@@ -0,0 +1,211 @@
+#!/usr/bin/env python
+"""
+양자화/검색 파라미터 벤치마크: recall@k (전수 검색 대비), 지연, 메모리 추정치 비교
+
+기존 컬렉션의 벡터(또는 합성 벡터)로 설정별 임시 컬렉션을 만들고,
+numpy 전수 검색(정답) 대비 recall@k와 검색 지연(p50/p95)을 표로 출력합니다.
+KB가 커졌을 때 QDRANT_QUANTIZATION / QDRANT_ON_DISK / QDRANT_HNSW_EF 등을 고르기 위한 용도입니다.
+
+메모리는 Qdrant가 컬렉션별 RAM 사용량을 노출하지 않으므로 설정으로부터 계산한 추정치입니다:
+    원본 벡터(RAM 상주 시) + 양자화 벡터 + HNSW 링크(N × m × 2 × 4B)
+
+사용 예:
+    python scripts/bench_quantization.py --source qa_collection --replicate 20000
+    python scripts/bench_quantization.py --synthetic 100000 --dim 768 --configs none scalar product scalar:disk
+    python scripts/bench_quantization.py --source qa_collection --ef 16 64 128 --oversampling 2.0
+"""
+
+import os
+import sys
+import time
+import argparse
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+from qdrant_client import QdrantClient
+from qdrant_client.http import models
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.infrastructure.qdrant_admin import vector_params, wait_for_points
+from app.infrastructure.repositories import QdrantRetriever
+
+PQ_RATIO = {"x4": 4, "x8": 8, "x16": 16, "x32": 32, "x64": 64}
+
+
+def _normalize(x: np.ndarray) -> np.ndarray:
+    return x / np.maximum(np.linalg.norm(x, axis=1, keepdims=True), 1e-12)
+
+
+def load_vectors(client: QdrantClient, collection: str, page_size: int = 256) -> np.ndarray:
+    """기존 컬렉션의 벡터 전체 scroll."""
+    vectors, offset = [], None
+    while True:
+        points, offset = client.scroll(
+            collection_name=collection, limit=page_size, offset=offset, with_payload=False, with_vectors=True
+        )
+        vectors.extend(p.vector for p in points)
+        if offset is None:
+            break
+    return np.asarray(vectors, dtype=np.float32)
+
+
+def make_corpus(args, client: QdrantClient, rng: np.random.Generator) -> np.ndarray:
+    """
+    벤치용 코퍼스.
+
+    --replicate N: 실제 벡터에 가우시안 노이즈를 더해 N개로 확장 (실제 분포를 유지한 채 KB 규모만 키움)
+    """
+    if args.synthetic:
+        return _normalize(rng.standard_normal((args.synthetic, args.dim)).astype(np.float32))
+
+    base = _normalize(load_vectors(client, args.source))
+    if not args.replicate or args.replicate <= len(base):
+        return base
+    idx = rng.integers(0, len(base), size=args.replicate - len(base))
+    noise = rng.standard_normal((len(idx), base.shape[1])).astype(np.float32) * args.noise
+    return np.vstack([base, _normalize(base[idx] + noise)])
+
+
+def make_queries(corpus: np.ndarray, n: int, noise: float, rng: np.random.Generator) -> np.ndarray:
+    """코퍼스 벡터에 노이즈를 더한 질의 (동일 벡터 질의는 recall이 과대평가되므로)."""
+    idx = rng.choice(len(corpus), size=min(n, len(corpus)), replace=False)
+    q = corpus[idx] + rng.standard_normal((len(idx), corpus.shape[1])).astype(np.float32) * noise
+    return _normalize(q)
+
+
+def exact_topk(corpus: np.ndarray, queries: np.ndarray, k: int) -> List[set]:
+    """numpy 전수 검색 (정답셋)."""
+    truth = []
+    for start in range(0, len(queries), 256):
+        scores = queries[start:start + 256] @ corpus.T
+        top = np.argpartition(-scores, kth=min(k, corpus.shape[0] - 1), axis=1)[:, :k]
+        truth.extend(set(map(int, row)) for row in top)
+    return truth
+
+
+def estimate_memory_mb(n: int, dim: int, quantization: str, on_disk: bool, m: int, compression: str) -> float:
+    """설정으로부터 RAM 사용량 추정 (MB)."""
+    total = 0 if on_disk else n * dim * 4
+    if quantization == "scalar":
+        total += n * dim
+    elif quantization == "product":
+        total += n * dim * 4 // PQ_RATIO[compression]
+    total += n * m * 2 * 4
+    return total / 1024 / 1024
+
+
+def parse_config(spec: str) -> Dict:
+    """'scalar', 'product:disk', 'none' 형식."""
+    kind, _, flag = spec.partition(":")
+    return {"name": spec, "quantization": kind, "on_disk": flag == "disk"}
+
+
+def build_collection(client: QdrantClient, name: str, corpus: np.ndarray, cfg: Dict, args):
+    if client.collection_exists(name):
+        client.delete_collection(name)
+    client.create_collection(
+        collection_name=name,
+        vectors_config=vector_params(
+            corpus.shape[1],
+            quantization=cfg["quantization"],
+            on_disk=cfg["on_disk"],
+            m=args.m,
+            ef_construct=args.ef_construct,
+            compression=args.compression,
+        ),
+        optimizers_config=models.OptimizersConfigDiff(indexing_threshold=args.indexing_threshold),
+    )
+    for start in range(0, len(corpus), args.batch_size):
+        batch = corpus[start:start + args.batch_size]
+        client.upsert(
+            collection_name=name,
+            points=models.Batch(ids=list(range(start, start + len(batch))), vectors=batch.tolist()),
+            wait=False,
+        )
+    if not wait_for_points(client, name, expected=len(corpus), timeout=args.index_timeout):
+        print(f"   ⚠️  {name}: 인덱싱 미완료 상태로 측정 (결과가 전수 검색에 가까울 수 있음)")
+
+
+def measure(
+    client: QdrantClient,
+    name: str,
+    queries: np.ndarray,
+    truth: List[set],
+    k: int,
+    params: Optional[models.SearchParams],
+) -> Dict[str, float]:
+    latencies, hits = [], 0
+    for q, expected in zip(queries, truth):
+        t0 = time.perf_counter()
+        results = client.search(
+            collection_name=name, query_vector=q.tolist(), limit=k, search_params=params, with_payload=False
+        )
+        latencies.append((time.perf_counter() - t0) * 1000)
+        hits += len(expected & {int(r.id) for r in results})
+    lat = np.asarray(latencies)
+    return {
+        "recall": hits / (len(truth) * k),
+        "p50": float(np.percentile(lat, 50)),
+        "p95": float(np.percentile(lat, 95)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Qdrant 양자화/검색 파라미터별 recall·지연·메모리 벤치마크")
+    parser.add_argument("--url", default=os.getenv("QDRANT_URL", "http://localhost:6333"))
+    src = parser.add_mutually_exclusive_group()
+    src.add_argument("--source", default=os.getenv("QDRANT_COLLECTION", "qa_collection"), help="벡터를 가져올 컬렉션")
+    src.add_argument("--synthetic", type=int, default=0, help="합성 벡터 개수 (지정 시 --source 무시)")
+    parser.add_argument("--dim", type=int, default=int(os.getenv("EMBED_DIM", 768)), help="합성 벡터 차원")
+    parser.add_argument("--replicate", type=int, default=0, help="실제 벡터를 노이즈로 복제해 늘릴 목표 개수")
+    parser.add_argument("--noise", type=float, default=0.05, help="복제/질의 벡터 노이즈 표준편차")
+    parser.add_argument("--configs", nargs="+", default=["none", "scalar", "product", "scalar:disk"],
+                        help="양자화[:disk] 목록 (none | scalar | product)")
+    parser.add_argument("--ef", type=int, nargs="+", default=[0, 64, 128], help="검색 hnsw_ef 목록 (0 = 서버 기본값)")
+    parser.add_argument("--oversampling", type=float, default=None, help="양자화 검색 후보 배수")
+    parser.add_argument("--no-rescore", action="store_true", help="양자화 결과를 원본 벡터로 재채점하지 않음")
+    parser.add_argument("-k", type=int, default=5, help="recall@k")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--m", type=int, default=16)
+    parser.add_argument("--ef-construct", type=int, default=100)
+    parser.add_argument("--compression", default="x16", choices=sorted(PQ_RATIO))
+    parser.add_argument("--indexing-threshold", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=512)
+    parser.add_argument("--index-timeout", type=float, default=600.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--keep", action="store_true", help="벤치 컬렉션을 삭제하지 않음")
+    args = parser.parse_args()
+
+    client = QdrantClient(url=args.url)
+    rng = np.random.default_rng(args.seed)
+    corpus = make_corpus(args, client, rng)
+    queries = make_queries(corpus, args.queries, args.noise, rng)
+    truth = exact_topk(corpus, queries, args.k)
+    n, dim = corpus.shape
+
+    print(f"\n# N={n}, dim={dim}, queries={len(queries)}, k={args.k}, m={args.m}, ef_construct={args.ef_construct}")
+    print(f"| config | hnsw_ef | recall@{args.k} | p50 (ms) | p95 (ms) | est. RAM (MB) |")
+    print("|---|---|---|---|---|---|")
+    for spec in args.configs:
+        cfg = parse_config(spec)
+        name = f"bench_{cfg['quantization']}{'_disk' if cfg['on_disk'] else ''}"
+        build_collection(client, name, corpus, cfg, args)
+        mem = estimate_memory_mb(n, dim, cfg["quantization"], cfg["on_disk"], args.m, args.compression)
+        quantized = cfg["quantization"] != "none"
+        for ef in args.ef:
+            params = QdrantRetriever.build_search_params(
+                hnsw_ef=ef or None,
+                rescore=(not args.no_rescore) if quantized else None,
+                oversampling=args.oversampling if quantized else None,
+            )
+            r = measure(client, name, queries, truth, args.k, params)
+            print(f"| {spec} | {ef or 'default'} | {r['recall']:.3f} | {r['p50']:.2f} | {r['p95']:.2f} | {mem:.1f} |")
+        if not args.keep:
+            client.delete_collection(name)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+#!/usr/bin/env python
+"""
+멀티 워커 벤치마크: 워커당 메모리(RSS/PSS)와 QPS 스케일링 측정
+
+gunicorn을 워커 수(1..N)별로 띄워 /ask 부하를 주고, 워커별 RSS/PSS와 처리량을 표로 출력합니다.
+PSS(Proportional Set Size)는 공유 페이지를 공유 프로세스 수로 나눈 값이라,
+프리로드(copy-on-write 공유) 효과는 RSS보다 PSS에서 드러납니다. (Linux 전용: /proc 사용)
+
+사용 예:
+    python scripts/bench_workers.py --workers 1 2 4 --preload
+    python scripts/bench_workers.py --workers 1 2 4            # 프리로드 없이 비교
+"""
+
+import os
+import sys
+import time
+import signal
+import argparse
+import subprocess
+import threading
+from pathlib import Path
+from typing import Dict, List
+
+import httpx
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+DEFAULT_QUERIES = [
+    "Perso.ai는 어떤 서비스인가요?",
+    "주요 기능이 뭐야",
+    "요금 얼마야?",
+    "고객센터 어디야?",
+    "몇 개 언어 되는데?",
+]
+
+
+def _children(pid: int) -> List[int]:
+    """master 프로세스의 자식(워커) PID 목록."""
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as f:
+            return [int(p) for p in f.read().split()]
+    except OSError:
+        return []
+
+
+def _memory_kb(pid: int) -> Dict[str, int]:
+    """/proc/<pid>/smaps_rollup에서 Rss/Pss(kB) 읽기."""
+    mem = {"Rss": 0, "Pss": 0}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                key, _, rest = line.partition(":")
+                if key in mem:
+                    mem[key] = int(rest.split()[0])
+    except OSError:
+        pass
+    return mem
+
+
+def _wait_ready(base_url: str, timeout: float) -> bool:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if httpx.get(f"{base_url}/healthz", timeout=2).status_code == 200:
+                return True
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.5)
+    return False
+
+
+def _load(base_url: str, concurrency: int, duration: float, queries: List[str]) -> Dict[str, float]:
+    """duration초 동안 concurrency개 스레드로 /ask 호출, 성공 건수/지연시간 집계."""
+    stop_at = time.time() + duration
+    lock = threading.Lock()
+    latencies: List[float] = []
+    errors = [0]
+
+    def worker(idx: int):
+        with httpx.Client(base_url=base_url, timeout=120) as client:
+            i = idx
+            while time.time() < stop_at:
+                q = queries[i % len(queries)]
+                i += 1
+                t0 = time.perf_counter()
+                try:
+                    r = client.post("/ask", json={"query": q})
+                    ok = r.status_code == 200
+                except httpx.HTTPError:
+                    ok = False
+                elapsed = time.perf_counter() - t0
+                with lock:
+                    if ok:
+                        latencies.append(elapsed)
+                    else:
+                        errors[0] += 1
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2] if latencies else 0.0
+    p95 = latencies[int(len(latencies) * 0.95)] if latencies else 0.0
+    return {
+        "qps": len(latencies) / duration,
+        "p50_ms": p50 * 1000,
+        "p95_ms": p95 * 1000,
+        "errors": errors[0],
+    }
+
+
+def run_once(n_workers: int, args) -> Dict[str, float]:
+    env = dict(os.environ)
+    env.update({
+        "WEB_CONCURRENCY": str(n_workers),
+        "PRELOAD_MODEL": "1" if args.preload else "0",
+        "PORT": str(args.port),
+        "PYTHONPATH": str(project_root),
+    })
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "backend.app:app", "-c", "backend/gunicorn_conf.py"],
+        cwd=project_root,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    base_url = f"http://127.0.0.1:{args.port}"
+    try:
+        if not _wait_ready(base_url, args.startup_timeout):
+            raise RuntimeError(f"서버 기동 실패 (workers={n_workers})")
+
+        # 워밍업: 모든 워커가 모델을 실제로 사용하도록 충분히 호출
+        _load(base_url, n_workers * 2, args.warmup, DEFAULT_QUERIES)
+        stats = _load(base_url, args.concurrency, args.duration, DEFAULT_QUERIES)
+
+        workers = _children(proc.pid)
+        mems = [_memory_kb(pid) for pid in workers] or [{"Rss": 0, "Pss": 0}]
+        master = _memory_kb(proc.pid)
+        stats.update({
+            "workers": n_workers,
+            "rss_mb": sum(m["Rss"] for m in mems) / len(mems) / 1024,
+            "pss_mb": sum(m["Pss"] for m in mems) / len(mems) / 1024,
+            "total_pss_mb": (sum(m["Pss"] for m in mems) + master["Pss"]) / 1024,
+        })
+        return stats
+    finally:
+        proc.send_signal(signal.SIGTERM)
+        try:
+            proc.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="gunicorn 워커 수별 메모리/QPS 벤치마크")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="측정할 워커 수 목록")
+    parser.add_argument("--preload", action="store_true", help="PRELOAD_MODEL=1로 실행")
+    parser.add_argument("--concurrency", type=int, default=8, help="동시 클라이언트 수")
+    parser.add_argument("--duration", type=float, default=30.0, help="측정 시간(초)")
+    parser.add_argument("--warmup", type=float, default=10.0, help="워밍업 시간(초)")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--startup-timeout", type=float, default=180.0)
+    args = parser.parse_args()
+
+    rows = [run_once(n, args) for n in args.workers]
+    base_qps = rows[0]["qps"] or 1.0
+
+    print(f"\n# preload={'on' if args.preload else 'off'}, concurrency={args.concurrency}, cpu={os.cpu_count()}")
+    print("| workers | RSS/worker (MB) | PSS/worker (MB) | total PSS (MB) | QPS | scaling | p50 (ms) | p95 (ms) | errors |")
+    print("|---|---|---|---|---|---|---|---|---|")
+    for r in rows:
+        print(
+            f"| {r['workers']} | {r['rss_mb']:.0f} | {r['pss_mb']:.0f} | {r['total_pss_mb']:.0f} "
+            f"| {r['qps']:.1f} | x{r['qps'] / base_qps:.2f} | {r['p50_ms']:.0f} | {r['p95_ms']:.0f} | {r['errors']} |"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,11 @@
 """
 Qdrant Cloud 마이그레이션 스크립트
 로컬 Qdrant 데이터를 Qdrant Cloud로 이전
+
+- 기본: 컬렉션 스냅샷 생성 → 청크 단위 다운로드(SHA-256) → 대상에 업로드/복원
+  (실패 시 포인트 단위 scroll/upsert 경로로 폴백)
+- --mode points: 포인트 단위 경로만 사용 (체크포인트/--resume 지원)
+- --restore FILE: 로컬 스냅샷 파일로 서빙 컬렉션 복원 (재임베딩 없음)
 """
 
 import os
@@ -12,20 +17,36 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+import json
+import time
+import random
+import struct
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import httpx
 from dotenv import load_dotenv
 from qdrant_client import QdrantClient
-from qdrant_client.models import Distance, VectorParams, PointStruct
-import hashlib
+from qdrant_client.models import PointStruct
+
+from app.infrastructure.qdrant_admin import (
+    gc_versions, next_version_name, swap_alias, vector_params_from_env, warm_up,
+)
 
 # 환경변수 로드
 load_dotenv()
 
+LOCAL_URL = "http://localhost:6333"
+SNAPSHOT_DIR = project_root / "data" / "snapshots"
+
 def get_local_client():
     """로컬 Qdrant 클라이언트"""
-    return QdrantClient(url="http://localhost:6333")
+    return QdrantClient(url=LOCAL_URL)
 
-def get_cloud_client():
-    """Qdrant Cloud 클라이언트"""
+def get_cloud_credentials():
+    """Qdrant Cloud 접속 정보 (url, api_key)"""
     url = os.getenv("QDRANT_CLOUD_URL")
     api_key = os.getenv("QDRANT_CLOUD_API_KEY")
     
@@ -36,115 +57,429 @@ def get_cloud_client():
             "QDRANT_CLOUD_URL=https://xxxxx.cloud.qdrant.io\n"
             "QDRANT_CLOUD_API_KEY=your_api_key"
         )
-    
+    return url, api_key
+
+def get_cloud_client():
+    """Qdrant Cloud 클라이언트"""
+    url, api_key = get_cloud_credentials()
     return QdrantClient(url=url, api_key=api_key)
 
-def migrate_collection(collection_name: str = "qa_collection"):
-    """컬렉션 마이그레이션"""
-    print(f"🚀 {collection_name} 마이그레이션 시작...\n")
+# ====== 체크포인트 (중단 후 재개) ======
+
+def _checkpoint_path(collection_name: str) -> Path:
+    return project_root / f".migrate_{collection_name}.checkpoint.json"
+
+def load_checkpoint(collection_name: str) -> Optional[dict]:
+    path = _checkpoint_path(collection_name)
+    if not path.exists():
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def save_checkpoint(collection_name: str, next_offset, migrated: int):
+    path = _checkpoint_path(collection_name)
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"collection": collection_name, "next_offset": next_offset, "migrated": migrated}, f)
+    os.replace(tmp, path)  # 원자적 교체 (중단 시에도 깨지지 않음)
+
+def clear_checkpoint(collection_name: str):
+    _checkpoint_path(collection_name).unlink(missing_ok=True)
+
+# ====== 업로드 / 검증 유틸 ======
+
+def upsert_with_retry(client: QdrantClient, collection_name: str, points: List[PointStruct], retries: int = 5):
+    """지수 백오프 + jitter 재시도 업서트."""
+    for attempt in range(retries + 1):
+        try:
+            client.upsert(collection_name=collection_name, points=points, wait=True)
+            return
+        except Exception as e:
+            if attempt == retries:
+                raise
+            delay = min(30.0, (2 ** attempt) * 0.5) + random.uniform(0, 0.5)
+            print(f"   ⚠️  업로드 실패 ({e}), {delay:.1f}s 후 재시도 ({attempt + 1}/{retries})")
+            time.sleep(delay)
+
+def vector_checksum(vector) -> str:
+    """소수점 5자리 반올림 후 해시 (직렬화 오차 허용)."""
+    if isinstance(vector, dict):
+        # named vectors: 이름순으로 이어 붙임
+        parts = [vector_checksum(vector[k]) for k in sorted(vector)]
+        return hashlib.sha1("".join(parts).encode()).hexdigest()
+    rounded = [round(float(x), 5) for x in vector or []]
+    return hashlib.sha1(struct.pack(f"{len(rounded)}f", *rounded)).hexdigest()
+
+class _ProgressReporter:
+    """처리량/ETA 출력."""
+
+    def __init__(self, total: int, already: int = 0):
+        self.total = total
+        self.done = already
+        self._base = already
+        self._start = time.perf_counter()
+        self._last_print = 0.0
+
+    def add(self, n: int):
+        self.done += n
+        now = time.perf_counter()
+        if now - self._last_print < 1.0 and self.done < self.total:
+            return
+        self._last_print = now
+        elapsed = now - self._start
+        rate = (self.done - self._base) / elapsed if elapsed > 0 else 0.0
+        remaining = max(0, self.total - self.done)
+        eta = remaining / rate if rate > 0 else float("inf")
+        eta_str = f"{eta:.0f}s" if eta != float("inf") else "?"
+        print(f"   ⏳ {self.done}/{self.total} ({rate:.0f} pts/s, ETA {eta_str})")
+
+def migrate_collection(
+    collection_name: str = "qa_collection",
+    batch_size: int = 256,
+    workers: int = 4,
+    resume: bool = False,
+    sample_size: int = 50,
+):
+    """
+    컬렉션 마이그레이션 (스트리밍).
+
+    - scroll offset으로 전체 컬렉션을 페이지 단위로 순회 (1000개 제한 없음)
+    - 고정 크기 배치를 병렬 워커로 업로드 (재시도 포함)
+    - 연속으로 완료된 배치까지의 offset을 체크포인트로 저장 → --resume으로 이어서 실행
+    - 검증: 포인트 수 비교 + 샘플 포인트 벡터 체크섬 비교
+    """
+    print(f"🚀 {collection_name} 마이그레이션 시작 (포인트 단위)...\n")
+    started = time.perf_counter()
     
-    # 1. 로컬 데이터 가져오기
-    print("1️⃣ 로컬 Qdrant에서 데이터 읽기...")
+    # 1. 로컬 컬렉션 정보
+    print("1️⃣ 로컬 Qdrant 컬렉션 확인...")
     local_client = get_local_client()
     
     try:
-        # 컬렉션 정보 가져오기
         collection_info = local_client.get_collection(collection_name)
         vector_size = collection_info.config.params.vectors.size
-        print(f"   ✅ 컬렉션 찾음: {collection_name} (벡터 차원: {vector_size})")
-        
-        # 모든 포인트 가져오기
-        points, _ = local_client.scroll(
-            collection_name=collection_name,
-            limit=1000,
-            with_payload=True,
-            with_vectors=True
-        )
-        print(f"   ✅ {len(points)} 개 포인트 읽기 완료\n")
-        
+        total = local_client.count(collection_name, exact=True).count
+        print(f"   ✅ 컬렉션 찾음: {collection_name} (벡터 차원: {vector_size}, 포인트: {total})\n")
     except Exception as e:
         print(f"   ❌ 로컬 데이터 읽기 실패: {e}")
         print("   💡 먼저 로컬에서 'python backend/ingest.py'를 실행하세요.")
         sys.exit(1)
     
-    # 2. Qdrant Cloud에 컬렉션 생성
-    print("2️⃣ Qdrant Cloud에 컬렉션 생성...")
+    checkpoint = load_checkpoint(collection_name) if resume else None
     cloud_client = get_cloud_client()
     
-    try:
-        # 기존 컬렉션 삭제 (있다면)
-        collections = cloud_client.get_collections().collections
-        if any(c.name == collection_name for c in collections):
-            print(f"   ⚠️  기존 컬렉션 삭제 중...")
-            cloud_client.delete_collection(collection_name)
-        
-        # 새 컬렉션 생성
-        cloud_client.create_collection(
-            collection_name=collection_name,
-            vectors_config=VectorParams(
-                size=vector_size,
-                distance=Distance.COSINE
-            ),
-            hnsw_config={
-                "m": 16,
-                "ef_construct": 100,
-                "full_scan_threshold": 10000
-            }
-        )
-        print(f"   ✅ 컬렉션 생성 완료\n")
-        
-    except Exception as e:
-        print(f"   ❌ 컬렉션 생성 실패: {e}")
-        sys.exit(1)
+    # 2. Qdrant Cloud에 컬렉션 생성 (재개 시에는 기존 컬렉션 유지)
+    if checkpoint:
+        print(f"2️⃣ 체크포인트에서 재개: {checkpoint['migrated']}개 완료, offset={checkpoint['next_offset']}\n")
+    else:
+        print("2️⃣ Qdrant Cloud에 컬렉션 생성...")
+        try:
+            # 기존 컬렉션 삭제 (있다면)
+            collections = cloud_client.get_collections().collections
+            if any(c.name == collection_name for c in collections):
+                print(f"   ⚠️  기존 컬렉션 삭제 중...")
+                cloud_client.delete_collection(collection_name)
+            
+            # 새 컬렉션 생성
+            cloud_client.create_collection(
+                collection_name=collection_name,
+                vectors_config=vector_params_from_env(vector_size),  # HNSW + 양자화 (env)
+            )
+            print(f"   ✅ 컬렉션 생성 완료\n")
+            clear_checkpoint(collection_name)
+        except Exception as e:
+            print(f"   ❌ 컬렉션 생성 실패: {e}")
+            sys.exit(1)
+    
+    # 3. 페이지 단위 스트리밍 업로드
+    print(f"3️⃣ 데이터 업로드 중... (batch={batch_size}, workers={workers})")
     
-    # 3. 데이터 업로드
-    print("3️⃣ 데이터 업로드 중...")
+    offset = checkpoint["next_offset"] if checkpoint else None
+    migrated = checkpoint["migrated"] if checkpoint else 0
+    progress = _ProgressReporter(total, already=migrated)
     
+    # 샘플 id (reservoir sampling) - 검증용
+    sample_ids: list = []
+    seen = 0
+    
+    # 배치 완료 순서가 뒤섞여도, "연속으로 완료된 배치"까지만 체크포인트로 기록
+    lock = threading.Lock()
+    batch_results: Dict[int, tuple] = {}  # batch_no → (next_offset, count)
+    committed = {"batch": -1, "migrated": migrated}
+    
+    def on_done(batch_no: int, next_offset, count: int):
+        with lock:
+            batch_results[batch_no] = (next_offset, count)
+            progress.add(count)
+            advanced = False
+            while committed["batch"] + 1 in batch_results:
+                committed["batch"] += 1
+                nxt, cnt = batch_results.pop(committed["batch"])
+                committed["migrated"] += cnt
+                committed["next_offset"] = nxt
+                advanced = True
+            if advanced:
+                save_checkpoint(collection_name, committed["next_offset"], committed["migrated"])
+    
+    def upload(batch_no: int, points: List[PointStruct], next_offset):
+        try:
+            upsert_with_retry(cloud_client, collection_name, points)
+            on_done(batch_no, next_offset, len(points))
+        finally:
+            slots.release()
+    
+    slots = threading.BoundedSemaphore(workers * 2)  # 대기 배치 수 제한 → 메모리 상한
+    futures = []
+    batch_no = 0
     try:
-        # PointStruct로 변환
-        cloud_points = []
-        for point in points:
-            cloud_points.append(
-                PointStruct(
-                    id=point.id,
-                    vector=point.vector,
-                    payload=point.payload
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            # 체크포인트가 마지막 배치까지 기록된 상태면 업로드할 것이 없음
+            done_already = checkpoint is not None and checkpoint["next_offset"] is None
+            while not done_already:
+                points, next_offset = local_client.scroll(
+                    collection_name=collection_name,
+                    limit=batch_size,
+                    offset=offset,
+                    with_payload=True,
+                    with_vectors=True,
                 )
-            )
+                if not points:
+                    break
+                
+                for p in points:
+                    seen += 1
+                    if len(sample_ids) < sample_size:
+                        sample_ids.append(p.id)
+                    else:
+                        j = random.randrange(seen)
+                        if j < sample_size:
+                            sample_ids[j] = p.id
+                
+                cloud_points = [PointStruct(id=p.id, vector=p.vector, payload=p.payload) for p in points]
+                slots.acquire()
+                futures.append(pool.submit(upload, batch_no, cloud_points, next_offset))
+                batch_no += 1
+                
+                if next_offset is None:
+                    break
+                offset = next_offset
+            
+            for f in futures:
+                f.result()
         
-        # 배치 업로드
-        cloud_client.upsert(
-            collection_name=collection_name,
-            points=cloud_points
-        )
-        print(f"   ✅ {len(cloud_points)} 개 포인트 업로드 완료\n")
+        clear_checkpoint(collection_name)
+        print(f"   ✅ {committed['migrated']} 개 포인트 업로드 완료 ({time.perf_counter() - started:.1f}s)\n")
         
     except Exception as e:
         print(f"   ❌ 데이터 업로드 실패: {e}")
+        print(f"   💡 --resume 옵션으로 마지막 체크포인트부터 다시 실행할 수 있습니다.")
         sys.exit(1)
     
     # 4. 검증
     print("4️⃣ 마이그레이션 검증...")
     
     try:
-        cloud_info = cloud_client.get_collection(collection_name)
-        cloud_count = cloud_info.points_count
+        cloud_count = cloud_client.count(collection_name, exact=True).count
+        
+        # 샘플 벡터 체크섬 비교
+        mismatched = []
+        if sample_ids:
+            local_pts = {p.id: p for p in local_client.retrieve(collection_name, ids=sample_ids, with_vectors=True)}
+            cloud_pts = {p.id: p for p in cloud_client.retrieve(collection_name, ids=sample_ids, with_vectors=True)}
+            for pid in sample_ids:
+                lp, cp = local_pts.get(pid), cloud_pts.get(pid)
+                if cp is None or vector_checksum(lp.vector) != vector_checksum(cp.vector):
+                    mismatched.append(pid)
         
-        if cloud_count == len(points):
-            print(f"   ✅ 검증 성공: {cloud_count} 개 포인트")
-            print(f"\n🎉 마이그레이션 완료!")
-            print(f"\n📋 다음 단계:")
-            print(f"   1. Render 대시보드에서 환경변수 설정:")
-            print(f"      QDRANT_URL={os.getenv('QDRANT_CLOUD_URL')}")
-            print(f"      QDRANT_API_KEY=<your_cloud_api_key>")
-            print(f"   2. Backend 배포 진행")
+        if cloud_count == total and not mismatched:
+            print(f"   ✅ 검증 성공: {cloud_count} 개 포인트, 샘플 {len(sample_ids)}개 체크섬 일치")
+            print(f"\n🎉 마이그레이션 완료! (포인트 단위, {time.perf_counter() - started:.1f}s)")
+            print_next_steps()
         else:
-            print(f"   ⚠️  경고: 포인트 수 불일치 (로컬: {len(points)}, 클라우드: {cloud_count})")
+            if cloud_count != total:
+                print(f"   ⚠️  경고: 포인트 수 불일치 (로컬: {total}, 클라우드: {cloud_count})")
+            if mismatched:
+                print(f"   ⚠️  경고: 샘플 벡터 체크섬 불일치 {len(mismatched)}/{len(sample_ids)}개 (예: {mismatched[:5]})")
             
     except Exception as e:
         print(f"   ❌ 검증 실패: {e}")
         sys.exit(1)
 
+def print_next_steps():
+    print(f"\n📋 다음 단계:")
+    print(f"   1. Render 대시보드에서 환경변수 설정:")
+    print(f"      QDRANT_URL={os.getenv('QDRANT_CLOUD_URL')}")
+    print(f"      QDRANT_API_KEY=<your_cloud_api_key>")
+    print(f"   2. Backend 배포 진행")
+
+# ====== 스냅샷 전송 / 복원 ======
+
+def _headers(api_key: Optional[str]) -> dict:
+    return {"api-key": api_key} if api_key else {}
+
+def file_sha256(path: Path, chunk_size: int = 8 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(chunk_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def download_snapshot(
+    url: str,
+    api_key: Optional[str],
+    collection_name: str,
+    snapshot_name: str,
+    dest: Path,
+    expected_checksum: Optional[str] = None,
+    chunk_size: int = 8 << 20,
+) -> str:
+    """
+    스냅샷을 청크 단위로 디스크에 스트리밍 (메모리 사용 = 청크 1개).
+    .part 파일에 받으며 SHA-256을 계산하고, 서버가 알려준 체크섬과 다르면 실패 처리.
+    """
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    part = dest.with_suffix(dest.suffix + ".part")
+    digest = hashlib.sha256()
+    received = 0
+    progress_at = 0
+    endpoint = f"{url.rstrip('/')}/collections/{collection_name}/snapshots/{snapshot_name}"
+    timeout = httpx.Timeout(30.0, read=300.0)
+    with httpx.stream("GET", endpoint, headers=_headers(api_key), timeout=timeout) as response:
+        response.raise_for_status()
+        total = int(response.headers.get("content-length", 0))
+        with open(part, "wb") as f:
+            for block in response.iter_bytes(chunk_size):
+                f.write(block)
+                digest.update(block)
+                received += len(block)
+                if received - progress_at >= 64 << 20:
+                    progress_at = received
+                    print(f"   ⏳ {received >> 20}/{total >> 20} MB")
+    checksum = digest.hexdigest()
+    if expected_checksum and checksum != expected_checksum:
+        part.unlink(missing_ok=True)
+        raise ValueError(f"스냅샷 체크섬 불일치 (서버 {expected_checksum[:12]}…, 수신 {checksum[:12]}…)")
+    os.replace(part, dest)
+    return checksum
+
+def upload_snapshot(url: str, api_key: Optional[str], collection_name: str, path: Path, checksum: str):
+    """
+    스냅샷 파일을 대상 컬렉션으로 업로드/복원 (기존 컬렉션은 스냅샷 내용으로 교체).
+    multipart 본문은 파일에서 청크 단위로 읽어 전송하고, 서버가 checksum으로 무결성 확인.
+    """
+    endpoint = f"{url.rstrip('/')}/collections/{collection_name}/snapshots/upload"
+    timeout = httpx.Timeout(30.0, read=None, write=None)  # 대용량 업로드 + 서버 측 복원 대기
+    with open(path, "rb") as f:
+        response = httpx.post(
+            endpoint,
+            params={"priority": "snapshot", "wait": "true", "checksum": checksum},
+            headers=_headers(api_key),
+            files={"snapshot": (path.name, f, "application/octet-stream")},
+            timeout=timeout,
+        )
+    response.raise_for_status()
+
+def snapshot_collection(
+    collection_name: str,
+    snapshot_dir: Path = SNAPSHOT_DIR,
+    chunk_size: int = 8 << 20,
+    keep_file: bool = False,
+) -> bool:
+    """
+    스냅샷 기반 마이그레이션: 로컬 스냅샷 생성 → 디스크로 다운로드 → Cloud에 업로드/복원 → 포인트 수 검증.
+    포인트를 JSON PointStruct로 다시 보내지 않으므로 벡터 직렬화/HNSW 재구축 비용이 없음.
+    실패 시 False (호출자가 포인트 단위 경로로 폴백).
+    """
+    print(f"🚀 {collection_name} 마이그레이션 시작 (스냅샷)...\n")
+    started = time.perf_counter()
+    local_client = get_local_client()
+    snapshot = None
+    path = None
+    try:
+        total = local_client.count(collection_name, exact=True).count
+
+        print("1️⃣ 로컬 스냅샷 생성...")
+        t0 = time.perf_counter()
+        snapshot = local_client.create_snapshot(collection_name, wait=True)
+        print(f"   ✅ {snapshot.name} ({snapshot.size / 2**20:.1f} MB, {total} 포인트, {time.perf_counter() - t0:.1f}s)\n")
+
+        print(f"2️⃣ 스냅샷 다운로드... (chunk={chunk_size >> 20} MB)")
+        t0 = time.perf_counter()
+        path = snapshot_dir / snapshot.name
+        checksum = download_snapshot(
+            LOCAL_URL, None, collection_name, snapshot.name, path,
+            expected_checksum=snapshot.checksum, chunk_size=chunk_size,
+        )
+        print(f"   ✅ {path} (sha256 {checksum[:12]}…, {time.perf_counter() - t0:.1f}s)\n")
+
+        print("3️⃣ Qdrant Cloud에 업로드/복원...")
+        t0 = time.perf_counter()
+        url, api_key = get_cloud_credentials()
+        upload_snapshot(url, api_key, collection_name, path, checksum)
+        print(f"   ✅ 복원 완료 ({time.perf_counter() - t0:.1f}s)\n")
+
+        print("4️⃣ 마이그레이션 검증...")
+        cloud_count = get_cloud_client().count(collection_name, exact=True).count
+        if cloud_count != total:
+            print(f"   ⚠️  경고: 포인트 수 불일치 (로컬: {total}, 클라우드: {cloud_count})")
+            return False
+        print(f"   ✅ 검증 성공: {cloud_count} 개 포인트")
+    except Exception as e:
+        print(f"   ❌ 스냅샷 전송 실패: {type(e).__name__}: {e}")
+        return False
+    finally:
+        if snapshot is not None:
+            try:
+                local_client.delete_snapshot(collection_name, snapshot.name, wait=True)
+            except Exception as e:
+                print(f"   ⚠️  로컬 스냅샷 삭제 실패 ({snapshot.name}): {e}")
+        if path is not None and not keep_file:
+            path.unlink(missing_ok=True)
+
+    print(f"\n🎉 마이그레이션 완료! (스냅샷, {time.perf_counter() - started:.1f}s)")
+    print_next_steps()
+    return True
+
+def restore_collection(
+    path: Path,
+    collection_name: str,
+    url: str,
+    api_key: Optional[str] = None,
+    alias: bool = False,
+    keep_versions: int = 2,
+):
+    """
+    로컬 스냅샷 파일로 서빙 컬렉션 복원 (재임베딩 없음).
+
+    - alias=False: collection_name 컬렉션을 스냅샷 내용으로 교체
+    - alias=True: {collection_name}_v{n+1}에 복원 → 워밍업 → alias 원자적 전환 → 오래된 버전 GC
+      (ingest --blue-green과 같은 무중단 전환, 서버는 CollectionVersionWatcher로 새 버전을 감지)
+    """
+    if not path.exists():
+        print(f"❌ 스냅샷 파일이 없습니다: {path}")
+        sys.exit(1)
+    started = time.perf_counter()
+    client = QdrantClient(url=url, api_key=api_key)
+    target = next_version_name(client, collection_name) if alias else collection_name
+    print(f"♻️  {path.name} ({path.stat().st_size / 2**20:.1f} MB) → {url} / {target}")
+
+    checksum = file_sha256(path)
+    try:
+        upload_snapshot(url, api_key, target, path, checksum)
+    except Exception as e:
+        print(f"   ❌ 복원 실패: {type(e).__name__}: {e}")
+        sys.exit(1)
+    count = client.count(target, exact=True).count
+    print(f"   ✅ 복원 완료: {count} 개 포인트 ({time.perf_counter() - started:.1f}s)")
+
+    if alias:
+        print(f"   [WARMUP] {target}: {warm_up(client, target)} queries")
+        previous = swap_alias(client, collection_name, target)
+        removed = gc_versions(client, collection_name, keep=keep_versions)
+        print(f"   🔀 {collection_name}: {previous} → {target} (GC: {removed or '-'})")
+    print("   💡 BM25/PCA 사이드카 파일은 스냅샷에 포함되지 않습니다 - 필요하면 ingest로 다시 생성하세요.")
+    print(f"\n🎉 복원 완료! ({time.perf_counter() - started:.1f}s)")
+
 def test_connection():
     """연결 테스트"""
     print("🔍 Qdrant Cloud 연결 테스트...\n")
@@ -173,12 +508,63 @@ if __name__ == "__main__":
         default="qa_collection",
         help="마이그레이션할 컬렉션 이름"
     )
+    parser.add_argument("--batch-size", type=int, default=256, help="업로드 배치 크기")
+    parser.add_argument("--workers", type=int, default=4, help="병렬 업로드 워커 수")
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="체크포인트(.migrate_<collection>.checkpoint.json)에서 이어서 실행"
+    )
+    parser.add_argument("--sample-size", type=int, default=50, help="검증용 샘플 벡터 수")
+    parser.add_argument(
+        "--mode",
+        choices=["snapshot", "points"],
+        default="snapshot",
+        help="snapshot: 스냅샷 전송 (실패 시 points로 폴백), points: 포인트 단위 scroll/upsert",
+    )
+    parser.add_argument("--no-fallback", action="store_true", help="스냅샷 실패 시 포인트 단위로 폴백하지 않음")
+    parser.add_argument("--chunk-mb", type=int, default=8, help="스냅샷 다운로드 청크 크기 (MB)")
+    parser.add_argument("--snapshot-dir", default=str(SNAPSHOT_DIR), help="스냅샷 파일 저장 위치")
+    parser.add_argument("--keep-snapshot", action="store_true", help="전송 후 로컬 스냅샷 파일을 남김 (--restore용)")
+    parser.add_argument("--restore", metavar="FILE", help="로컬 스냅샷 파일로 컬렉션 복원 (재임베딩 없음)")
+    parser.add_argument(
+        "--target-url",
+        default=os.getenv("QDRANT_URL", LOCAL_URL),
+        help="--restore 대상 Qdrant (기본: QDRANT_URL, API 키는 QDRANT_API_KEY)",
+    )
+    parser.add_argument("--alias", action="store_true", help="--restore 시 새 버전 컬렉션에 복원 후 alias 전환")
+    parser.add_argument("--keep-versions", type=int, default=2, help="--alias 전환 후 남길 버전 수")
     
     args = parser.parse_args()
     
     if args.test:
         test_connection()
-    else:
-        if test_connection():
-            migrate_collection(args.collection)
-
+    elif args.restore:
+        restore_collection(
+            Path(args.restore),
+            args.collection,
+            url=args.target_url,
+            api_key=os.getenv("QDRANT_API_KEY") or None,
+            alias=args.alias,
+            keep_versions=args.keep_versions,
+        )
+    elif test_connection():
+        if args.mode == "snapshot" and not args.resume:  # --resume은 포인트 단위 체크포인트 기반
+            ok = snapshot_collection(
+                args.collection,
+                snapshot_dir=Path(args.snapshot_dir),
+                chunk_size=args.chunk_mb << 20,
+                keep_file=args.keep_snapshot,
+            )
+            if ok:
+                sys.exit(0)
+            if args.no_fallback:
+                sys.exit(1)
+            print("\n↩️  포인트 단위 경로로 폴백합니다.\n")
+        migrate_collection(
+            args.collection,
+            batch_size=args.batch_size,
+            workers=args.workers,
+            resume=args.resume,
+            sample_size=args.sample_size,
+        )
@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+"""
+질의 로그 분석: 빈도 상위 질의, 단계별 지연 백분위, fallback/강등/캐시 비율, 캐시 기회 추정
+
+컬럼형 질의 로그 저장소(QUERY_LOG_PATH, 기본 logs/queries)의 partition을 시간 범위로 골라
+numpy 배열로 적재한 뒤 벡터 연산으로 집계합니다.
+
+사용 예:
+    python scripts/query_log_stats.py                       # 전체 기간
+    python scripts/query_log_stats.py --since 24h --top 30   # 최근 24시간
+    python scripts/query_log_stats.py --since 2026-10-01 --until 2026-10-07 --ttl 3600
+    python scripts/query_log_stats.py --kb perso --json stats.json
+    python scripts/query_log_stats.py --import-jsonl logs/queries.jsonl   # 이전 JSONL 로그 변환
+"""
+
+import os
+import sys
+import json
+import time
+import calendar
+import argparse
+from pathlib import Path
+from typing import Optional
+
+from dotenv import load_dotenv
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.infrastructure.query_log import QueryLogWriter, iter_query_log, load_columns
+
+load_dotenv()
+
+
+def parse_time(value: Optional[str]) -> Optional[float]:
+    """'24h' / '7d' (현재 기준 상대) 또는 'YYYY-MM-DD[THH]' (UTC) → UNIX 시각."""
+    if not value:
+        return None
+    if value[-1] in "hd" and value[:-1].isdigit():
+        return time.time() - int(value[:-1]) * (3600 if value[-1] == "h" else 86400)
+    for fmt in ("%Y-%m-%dT%H", "%Y-%m-%d"):
+        try:
+            return calendar.timegm(time.strptime(value, fmt))
+        except ValueError:
+            continue
+    raise SystemExit(f"시각 형식 오류: {value} (예: 24h, 7d, 2026-10-01, 2026-10-01T13)")
+
+
+def import_jsonl(src: str, root: str) -> int:
+    """이전 JSONL 로그를 컬럼형 저장소로 변환 (레코드의 ts 기준으로 partition 배치)."""
+    writer = QueryLogWriter(root, writer_id=f"import-{Path(src).stem}-{int(time.time())}")
+    count = 0
+    try:
+        for record in iter_query_log(src):
+            if record.get("query"):
+                writer.write(record)
+                count += 1
+    finally:
+        writer.close()
+    return count
+
+
+def fmt_ms(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value:.1f}"
+
+
+def print_report(stats: dict, root: str):
+    rates = stats["rates"]
+    print(f"\n# {root}: {rates['requests']} requests")
+    if not rates["requests"]:
+        return
+    print(
+        f"fallback {rates['fallback_rate']:.1%} | answer cache hit {rates['answer_cache_hit_rate']:.1%} "
+        f"| rewrite cache hit {rates['rewrite_cache_hit_rate']:.1%}"
+    )
+    print("degradation: " + ", ".join(f"{k}={v}" for k, v in rates["degradation"].items()))
+    print("strategy:    " + ", ".join(f"{k}={v}" for k, v in rates["strategy"].items()))
+
+    print("\n| stage | n | p50 (ms) | p95 (ms) | p99 (ms) |")
+    print("|---|---|---|---|---|")
+    for stage, p in stats["latency"].items():
+        if p["n"]:
+            print(f"| {stage} | {p['n']} | {fmt_ms(p['p50'])} | {fmt_ms(p['p95'])} | {fmt_ms(p['p99'])} |")
+
+    print("\n| query | count | fallback | p50 (ms) | p95 (ms) | cache hit |")
+    print("|---|---|---|---|---|---|")
+    for q in stats["top_queries"]:
+        print(
+            f"| {q['query']} | {q['count']} | {q['fallback_rate']:.0%} | {fmt_ms(q['p50_ms'])} "
+            f"| {fmt_ms(q['p95_ms'])} | {q['cache_hit_rate']:.0%} |"
+        )
+
+    opp = stats["cache_opportunity"]
+    ttl = f"TTL {stats['ttl']:.0f}s" if stats["ttl"] else "TTL 없음"
+    print(
+        f"\n캐시 기회 ({ttl}): 반복 요청 {opp['repeat_requests']}건 ({opp['repeat_rate']:.1%}), "
+        f"절감 가능 지연 상한 {opp['saved_ms'] / 1000:.1f}s"
+    )
+    for q in opp["queries"]:
+        print(f"- {q['query']}: {q['repeats']}회, {q['saved_ms']:.0f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="질의 로그 분석 (컬럼형 저장소)")
+    parser.add_argument("--root", default=os.getenv("QUERY_LOG_PATH", "logs/queries"), help="질의 로그 저장소 디렉터리")
+    parser.add_argument("--since", help="시작 (24h, 7d, YYYY-MM-DD, YYYY-MM-DDTHH; UTC)")
+    parser.add_argument("--until", help="끝 (형식 동일)")
+    parser.add_argument("--kb", nargs="*", help="이 KB id들의 기록만 (\"\" = KB 구분 이전 기록)")
+    parser.add_argument("--top", type=int, default=20, help="빈도 상위 질의 수")
+    parser.add_argument("--ttl", type=float, default=float(os.getenv("ANSWER_CACHE_TTL", "3600")),
+                        help="캐시 기회 추정에 사용할 TTL 초 (0 = 만료 없음)")
+    parser.add_argument("--json", help="결과를 JSON으로 저장할 경로")
+    parser.add_argument("--import-jsonl", help="이전 JSONL 로그를 --root 저장소로 변환 후 종료")
+    args = parser.parse_args()
+
+    if args.import_jsonl:
+        count = import_jsonl(args.import_jsonl, args.root)
+        print(f"✅ {args.import_jsonl} → {args.root}: {count}건 변환")
+        return
+    if not os.path.isdir(args.root):
+        raise SystemExit(f"질의 로그 저장소가 없습니다: {args.root}")
+
+    t0 = time.perf_counter()
+    columns = load_columns(args.root, since=parse_time(args.since), until=parse_time(args.until), kbs=args.kb)
+    load_s = time.perf_counter() - t0
+    stats = {
+        "ttl": args.ttl or None,
+        "rates": columns.rates(),
+        "latency": columns.latency_percentiles(),
+        "top_queries": columns.top_queries(args.top),
+        "cache_opportunity": columns.cache_opportunity(ttl=args.ttl or None, top=args.top),
+    }
+    print_report(stats, args.root)
+    print(f"\n(적재 {len(columns)}행, {load_s:.2f}s / 집계 {time.perf_counter() - t0 - load_s:.2f}s)")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(stats, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
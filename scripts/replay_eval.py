@@ -0,0 +1,256 @@
+#!/usr/bin/env python
+"""
+오프라인 재생/평가: 정확도와 지연을 구성별로 함께 측정
+
+라벨 질의셋(또는 질의 로그 logs/queries)을 QASearchUseCase에 재생하고,
+구성(임베딩 모델 / 검색기 / rewriter / 어휘 검색 / 재정렬 등)별로
+정확도, 가드 판정 precision/recall, 단계별 지연(p50/p95)을 표로 출력합니다.
+
+Gemini 응답은 기록 파일(eval/gemini_responses.json)에서 재생하므로 결과가 결정적이고 오프라인으로 동작합니다.
+기록에 없는 질의는 원본 질의로 처리(누락 수 출력)하며, --record로 실제 Gemini를 호출해 기록을 채울 수 있습니다.
+
+사용 예:
+    python scripts/replay_eval.py --configs full no_gemini no_lexical
+    python scripts/replay_eval.py --queries logs/queries --from-logs --configs full exact
+    python scripts/replay_eval.py --config-file eval/configs.json --deadline-ms 800 --replay-latency
+    python scripts/replay_eval.py --record   # 누락된 Gemini 응답 기록 (GEMINI_API_KEY 필요)
+
+구성 파일 형식 (JSON 목록, 기본값 대비 변경할 항목만):
+    [{"name": "ko-sroberta", "embed_model": "jhgan/ko-sroberta-multitask", "collection": "qa_sroberta"},
+     {"name": "local", "preset": "local_index", "rewrite_skip_score": 0}]
+"""
+
+import os
+import sys
+import json
+import argparse
+from pathlib import Path
+from typing import Dict, List
+
+from dotenv import load_dotenv
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.application.fusion import FusionEngine, weight_rules_from_config
+from app.application.replay import (
+    IdentityRewriter,
+    RecordedRewriter,
+    evaluate,
+    format_reports,
+    load_labeled_queries,
+    load_log_queries,
+)
+from app.application.use_cases import QASearchUseCase
+from app.infrastructure.embedding_cache import open_default_cache
+from app.infrastructure.guards import HallucinationGuard, threshold_rules_from_config
+from app.infrastructure.query_profile import QueryProfiler, load_query_rules
+
+load_dotenv()
+
+DEFAULTS = {
+    "embed_model": os.getenv("EMBED_MODEL", "snunlp/KR-SBERT-V40K-klueNLI-augSTS"),
+    "embed_cache": False,  # 영구 임베딩 캐시 사용 (지연 측정에서 모델 forward 제외)
+    "retriever": "qdrant",  # qdrant | local
+    "collection": os.getenv("QDRANT_COLLECTION", "qa_collection"),
+    "local_index_path": os.getenv("LOCAL_INDEX_PATH", "data/local_index.npz"),
+    "hnsw_ef": 0,
+    "exact": False,
+    "fanout": int(os.getenv("PARAPHRASE_FANOUT", "4")),
+    "lexical": True,
+    "lexical_index_path": os.getenv("LEXICAL_INDEX_PATH", "data/lexical_index.json"),
+    "rewriter": "recorded",  # recorded | none | live
+    "rewrite_skip_score": float(os.getenv("REWRITE_SKIP_SCORE", "0.85")),
+    "rerank": False,
+    "rerank_model": os.getenv("RERANK_MODEL", "bongsoo/albert-small-kor-cross-encoder-v1"),
+    "rerank_margin": float(os.getenv("RERANK_MARGIN", "0.05")),
+    "threshold": float(os.getenv("SIM_THRESHOLD", "0.75")),
+    "top_k": int(os.getenv("TOP_K", "3")),
+    "rules": os.getenv("QUERY_RULES_PATH", "query_rules.json"),
+}
+
+PRESETS: Dict[str, dict] = {
+    "full": {},
+    "no_gemini": {"rewriter": "none"},
+    "always_gemini": {"rewrite_skip_score": 0},
+    "no_lexical": {"lexical": False},
+    "rerank": {"rerank": True},
+    "local_index": {"retriever": "local"},
+    "exact": {"exact": True},
+}
+
+
+def resolve_configs(args) -> List[dict]:
+    """프리셋 이름 / 구성 파일 → 기본값을 덮어쓴 구성 목록."""
+    specs = [{"name": name, "preset": name} for name in args.configs]
+    if args.config_file:
+        with open(args.config_file, encoding="utf-8") as f:
+            specs.extend(json.load(f))
+
+    configs = []
+    for spec in specs:
+        preset = spec.get("preset")
+        if preset and preset not in PRESETS:
+            raise SystemExit(f"알 수 없는 프리셋: {preset} (가능: {', '.join(PRESETS)})")
+        cfg = {**DEFAULTS, **PRESETS.get(preset, {}), **{k: v for k, v in spec.items() if k != "preset"}}
+        configs.append(cfg)
+    return configs
+
+
+class Components:
+    """구성 간 공유 리소스 (임베딩 모델/Qdrant 클라이언트/재정렬 모델은 한 번만 로드)."""
+
+    def __init__(self, args):
+        self.args = args
+        self._embedders: Dict[tuple, object] = {}
+        self._rerankers: Dict[str, object] = {}
+        self._client = None
+        self.recorded = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            from qdrant_client import QdrantClient
+            self._client = QdrantClient(url=self.args.url, api_key=os.getenv("QDRANT_API_KEY"))
+        return self._client
+
+    def embedder(self, cfg: dict):
+        from app.infrastructure.repositories import SentenceTransformerEmbedder
+        key = (cfg["embed_model"], cfg["embed_cache"])
+        if key not in self._embedders:
+            cache = open_default_cache() if cfg["embed_cache"] else None
+            self._embedders[key] = SentenceTransformerEmbedder(cfg["embed_model"], cache=cache)
+        return self._embedders[key]
+
+    def retriever(self, cfg: dict):
+        from app.infrastructure.repositories import LocalIndexRetriever, QdrantRetriever
+        embedder = self.embedder(cfg)
+        if cfg["retriever"] == "local":
+            if os.path.exists(cfg["local_index_path"]):
+                return LocalIndexRetriever.load(cfg["local_index_path"], embedder)
+            return LocalIndexRetriever.from_qdrant(self.client, cfg["collection"], embedder)
+        return QdrantRetriever(
+            client=self.client,
+            embedder=embedder,
+            collection=cfg["collection"],
+            hnsw_ef=cfg["hnsw_ef"] or None,
+            exact=cfg["exact"],
+            fanout=cfg["fanout"],
+        )
+
+    def lexical(self, cfg: dict):
+        if not cfg["lexical"]:
+            return None
+        from app.infrastructure.lexical import LexicalRetriever
+        if os.path.exists(cfg["lexical_index_path"]):
+            return LexicalRetriever.load(cfg["lexical_index_path"])
+        return LexicalRetriever.from_qdrant(self.client, cfg["collection"])
+
+    def rewriter(self, cfg: dict):
+        if cfg["rewriter"] == "none":
+            return IdentityRewriter()
+        if cfg["rewriter"] == "live":
+            from app.application.gemini_rewriter import GeminiQueryRewriter
+            return GeminiQueryRewriter()
+        if self.recorded is None:
+            live = None
+            if self.args.record:
+                from app.application.gemini_rewriter import GeminiQueryRewriter
+                live = GeminiQueryRewriter()
+            self.recorded = RecordedRewriter(self.args.responses, live=live, replay_latency=self.args.replay_latency)
+        return self.recorded
+
+    def reranker(self, cfg: dict):
+        if not cfg["rerank"]:
+            return None
+        from app.infrastructure.reranker import CrossEncoderReranker
+        if cfg["rerank_model"] not in self._rerankers:
+            self._rerankers[cfg["rerank_model"]] = CrossEncoderReranker(cfg["rerank_model"])
+        return self._rerankers[cfg["rerank_model"]]
+
+    def use_case(self, cfg: dict) -> QASearchUseCase:
+        rules = load_query_rules(cfg["rules"]) if cfg["rules"] and os.path.exists(cfg["rules"]) else {}
+        profiler = QueryProfiler.from_config(rules.get("profile"))
+        guard = HallucinationGuard(
+            threshold=cfg["threshold"],
+            profiler=profiler,
+            threshold_rules=threshold_rules_from_config(rules.get("thresholds")),
+        )
+        return QASearchUseCase(
+            retriever=self.retriever(cfg),
+            guard=guard,
+            top_k=cfg["top_k"],
+            rewriter=self.rewriter(cfg),
+            lexical_retriever=self.lexical(cfg),
+            rewrite_skip_score=cfg["rewrite_skip_score"] or None,
+            reranker=self.reranker(cfg),
+            rerank_margin=cfg["rerank_margin"],
+            fusion=FusionEngine(weight_rules_from_config(rules.get("weights"))),
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="라벨 질의셋 재생: 구성별 정확도 + 단계별 지연")
+    parser.add_argument("--queries", default="eval/labeled_queries.jsonl", help="라벨 질의셋 (JSONL)")
+    parser.add_argument("--from-logs", action="store_true", help="--queries를 질의 로그(logs/queries 디렉터리 또는 jsonl)로 해석")
+    parser.add_argument("--limit", type=int, default=0, help="로그에서 사용할 최대 질의 수 (0 = 전체)")
+    parser.add_argument("--responses", default="eval/gemini_responses.json", help="기록된 Gemini 응답")
+    parser.add_argument("--record", action="store_true", help="기록에 없는 질의는 실제 Gemini 호출 후 저장")
+    parser.add_argument("--replay-latency", action="store_true", help="기록된 Gemini 지연만큼 대기")
+    parser.add_argument("--configs", nargs="*", default=["full", "no_gemini"], help=f"프리셋 ({', '.join(PRESETS)})")
+    parser.add_argument("--config-file", help="추가 구성 목록 (JSON)")
+    parser.add_argument("--deadline-ms", type=float, default=0.0, help="요청 지연 예산 (0 = 제한 없음)")
+    parser.add_argument("--url", default=os.getenv("QDRANT_URL", "http://localhost:6333"))
+    parser.add_argument("--failures", action="store_true", help="구성별 오답 목록 출력")
+    parser.add_argument("--json", help="결과를 JSON으로 저장할 경로")
+    args = parser.parse_args()
+
+    if args.from_logs:
+        queries = load_log_queries(args.queries, limit=args.limit or None)
+    else:
+        queries = load_labeled_queries(args.queries)
+    configs = resolve_configs(args)
+    components = Components(args)
+
+    print(f"\n# queries={len(queries)} ({args.queries}), deadline={args.deadline_ms or 'none'} ms")
+    reports = []
+    for cfg in configs:
+        print(f"   ▶ {cfg['name']} ...")
+        use_case = components.use_case(cfg)
+        reports.append(evaluate(cfg["name"], use_case.search, queries, deadline_ms=args.deadline_ms))
+
+    print()
+    print(format_reports(reports))
+    if components.recorded is not None:
+        if components.recorded.misses:
+            print(f"\n⚠️  기록에 없는 Gemini 응답 {components.recorded.misses}건 → 원본 질의로 처리 (--record로 보충)")
+        if args.record:
+            components.recorded.save()
+            print(f"💾 Gemini 응답 기록 저장: {args.responses}")
+
+    if args.failures:
+        for r in reports:
+            print(f"\n## {r.name} 오답 ({len(r.failures)})")
+            for f in r.failures:
+                print(f"- {json.dumps(f, ensure_ascii=False)}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump([
+                {
+                    "config": cfg,
+                    "accuracy": r.accuracy,
+                    "precision": r.precision,
+                    "recall": r.recall,
+                    "f1": r.f1,
+                    "errors": r.errors,
+                    "strategies": r.strategies,
+                    "latency_ms": {s: {"p50": r.percentile(s, 50), "p95": r.percentile(s, 95)} for s in r.timings},
+                    "failures": r.failures,
+                }
+                for cfg, r in zip(configs, reports)
+            ], f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()